@@ -0,0 +1,3 @@
+from pyjac.autotune.autotune import autotune, autotuner
+
+__all__ = ['autotune', 'autotuner']
@@ -0,0 +1,101 @@
+import sys
+from argparse import ArgumentParser
+
+import loopy as lp
+
+from pyjac.autotune.autotune import autotune
+from pyjac.libgen import build_type
+from pyjac import utils
+
+
+def main(args=None):
+    lp.set_caching_enabled(False)
+    utils.setup_logging()
+    if args is None:
+        # command line arguments
+        parser = ArgumentParser(description='autotune: searches the code-generation '
+                                            'options of pyJac for the fastest '
+                                            'configuration on a target')
+        parser.add_argument('-l', '--lang',
+                            type=str,
+                            choices=['c', 'opencl'],
+                            required=True,
+                            help='The language to tune.')
+        parser.add_argument('-i', '--input',
+                            type=str,
+                            required=True,
+                            help='The mechanism file.')
+        parser.add_argument('-t', '--thermo',
+                            type=str,
+                            default=None,
+                            help='The thermodynamic database filename (if '
+                                 'not in the mechanism file).')
+        parser.add_argument('-s', '--state_file',
+                            type=str,
+                            required=True,
+                            help='A binary file of representative thermo-chemical '
+                                 'states, in the format used by the performance '
+                                 'tester.')
+        parser.add_argument('-p', '--platform',
+                            type=str,
+                            default='',
+                            help='The OpenCL platform (e.g., a CPU device) to '
+                                 'tune for.  Ignored for C.')
+        parser.add_argument('-w', '--working_directory',
+                            type=str,
+                            default='autotune',
+                            help='Directory to build / time the candidate '
+                                 'configurations in, and to write the resulting '
+                                 'code-generation platform file and report to.')
+        parser.add_argument('-v', '--vecsizes',
+                            type=int,
+                            nargs='+',
+                            default=[2, 4, 8],
+                            help='The vector widths to consider for OpenCL.')
+        parser.add_argument('-nt', '--num_threads',
+                            type=int,
+                            default=1,
+                            help='The number of OpenMP threads to use for C.')
+        parser.add_argument('-n', '--num_states',
+                            type=int,
+                            default=None,
+                            help='The number of states to evaluate, by default all '
+                                 'states in the state file.')
+        parser.add_argument('-r', '--repeats',
+                            type=int,
+                            default=5,
+                            help='The number of timed runs per configuration.')
+        parser.add_argument('-pf', '--prune_factor',
+                            type=float,
+                            default=1.5,
+                            help='Stop timing a configuration if it is slower than '
+                                 'the best configuration found so far by more than '
+                                 'this factor.')
+        parser.add_argument('-b', '--build_type',
+                            type=utils.EnumType(build_type),
+                            default='jacobian',
+                            help='The kernel to tune: {type}'.format(
+                                type=str(utils.EnumType(build_type))))
+        parser.add_argument('-conv', '--constant_volume',
+                            required=False,
+                            dest='conp',
+                            action='store_false',
+                            help='Use the constant-volume formulation (default: '
+                                 'constant-pressure).')
+        args = parser.parse_args()
+        autotune(args.lang, args.state_file,
+                 work_dir=args.working_directory,
+                 platform=args.platform,
+                 mech_name=args.input,
+                 therm_name=args.thermo,
+                 vecsizes=args.vecsizes,
+                 num_threads=args.num_threads,
+                 num_states=args.num_states,
+                 repeats=args.repeats,
+                 prune_factor=args.prune_factor,
+                 rtype=args.build_type,
+                 conp=args.conp)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
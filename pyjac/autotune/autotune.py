@@ -0,0 +1,508 @@
+"""
+autotune.py - automatic selection of the code-generation options of pyJac for a
+given mechanism and target
+
+Candidate configurations (vectorization, data-order, rate-specialization,
+kernel-splitting, etc.) are generated, built via :mod:`pyjac.libgen` and timed on a
+representative set of thermo-chemical states.  Rather than exhaustively testing
+every combination, the options are tuned one at a time (a coordinate search)
+starting from the pyJac defaults, with early-stopping heuristics to prune clearly
+inferior candidates.
+
+The winning configuration is written as a code-generation platform file (see
+:func:`pyjac.loopy_utils.loopy_utils.load_platform`), along with a ranked report
+of all tested configurations.
+
+Usage
+-----
+python -m pyjac.autotune -l c -i mech.cti -s data.bin
+python -m pyjac.autotune -l opencl -p intel -i mech.cti -s data.bin -v 2 4 8
+"""
+
+# Python 2 compatibility
+from __future__ import division
+from __future__ import print_function
+
+import os
+import csv
+import logging
+import subprocess
+from collections import OrderedDict
+
+import six
+import yaml
+
+from pyjac import utils
+from pyjac.core.create_jacobian import create_jacobian
+from pyjac.core import mech_interpret as mech
+from pyjac.libgen import build_type, generate_library
+from pyjac.schemas import build_and_validate
+
+platform_filename = 'codegen_platform.yaml'
+"""str: the name of the code-generation platform file written by the autotuner"""
+report_filename = 'autotune_report.csv'
+"""str: the name of the ranked report written by the autotuner"""
+
+default_options = OrderedDict([
+    ('vectype', 'par'),
+    ('vecsize', None),
+    ('order', 'C'),
+    ('rate_specialization', 'full'),
+    ('split_rate_kernels', True),
+    ('split_rop_net_kernels', False),
+    ('seperate_kernels', True),
+    ('atomics', True)])
+"""dict: the starting point of the search, i.e., the defaults of
+:func:`create_jacobian`"""
+
+
+def get_search_stages(lang, vecsizes=[2, 4, 8]):
+    """
+    Returns the stages of the (coordinate) search, in the order they are tuned
+
+    Parameters
+    ----------
+    lang: str
+        The language to tune
+    vecsizes: list of int [[2, 4, 8]]
+        The vector widths to consider for wide / deep vectorizations, ignored for
+        languages that cannot be vectorized
+
+    Returns
+    -------
+    stages: list of tuple of (str, list of dict)
+        The name of each stage, and the option updates to test in the stage
+    """
+
+    stages = []
+    if utils.can_vectorize_lang[lang]:
+        # vectorizations are tested in order of increasing vector size, see
+        # :meth:`autotuner._prune_vecsize`
+        vecs = [{'vectype': 'par', 'vecsize': None}]
+        for vectype in ['wide', 'deep']:
+            vecs.extend({'vectype': vectype, 'vecsize': x}
+                        for x in sorted(vecsizes))
+        stages.append(('vectorization', vecs))
+    stages.append(('order', [{'order': x} for x in ['C', 'F']]))
+    stages.append(('rate_specialization', [{'rate_specialization': x}
+                                           for x in ['fixed', 'hybrid', 'full']]))
+    for opt in ['split_rate_kernels', 'split_rop_net_kernels', 'seperate_kernels']:
+        stages.append((opt, [{opt: x} for x in [True, False]]))
+    if utils.can_vectorize_lang[lang]:
+        # only relevant for deep vectorizations
+        stages.append(('atomics', [{'atomics': x} for x in [True, False]]))
+    return stages
+
+
+def config_name(options):
+    """
+    Returns a unique name for the configuration described by :param:`options`
+    """
+
+    vec = options['vectype']
+    if options['vecsize']:
+        vec += str(options['vecsize'])
+    return '_'.join([vec, options['order'], options['rate_specialization'],
+                     'srk' if options['split_rate_kernels'] else 'nsrk',
+                     'srn' if options['split_rop_net_kernels'] else 'nsrn',
+                     'sep' if options['seperate_kernels'] else 'single',
+                     'atomic' if options['atomics'] else 'noatomic'])
+
+
+class tuning_result(object):
+    """
+    The result of timing a single candidate configuration
+
+    Attributes
+    ----------
+    options: dict
+        The code-generation options of this configuration
+    times: list of float
+        The measured kernel execution times, in milliseconds
+    status: ['ok', 'pruned', 'failed']
+        Whether the candidate was fully timed, stopped early as it was clearly
+        slower than the best configuration found so far, or failed to build / run
+    """
+
+    def __init__(self, options, times=[], status='ok'):
+        self.options = options.copy()
+        self.times = list(times)
+        self.status = status
+
+    @property
+    def name(self):
+        return config_name(self.options)
+
+    @property
+    def time(self):
+        """
+        The best measured execution time of this configuration, or infinity if
+        failed
+        """
+        if self.status == 'failed' or not self.times:
+            return float('inf')
+        return min(self.times)
+
+
+class autotuner(object):
+    """
+    Searches the code-generation options for the fastest configuration of a
+    mechanism on a target
+
+    Parameters
+    ----------
+    lang: str
+        The language to tune, 'c' or 'opencl'
+    state_file: str
+        The path to a binary file of representative thermo-chemical states, in
+        the format read by the generated calling program (the same as that used
+        by the performance tester)
+    work_dir: str ['autotune']
+        The directory to generate, build and time the candidates in
+    platform: str ['']
+        The OpenCL platform to target, ignored for C
+    mech_name: str [None]
+        The mechanism file, see :func:`create_jacobian`
+    therm_name: str [None]
+        The thermodynamic database, see :func:`create_jacobian`
+    gas: :class:`cantera.Solution` [None]
+        The mechanism, in place of :param:`mech_name`
+    vecsizes: list of int [[2, 4, 8]]
+        The vector widths to consider, see :func:`get_search_stages`
+    num_threads: int [1]
+        The number of OpenMP threads to time the candidates with, ignored for
+        OpenCL
+    num_states: int [None]
+        The number of states to evaluate, by default all states in the
+        :param:`state_file`
+    repeats: int [5]
+        The number of timed runs per candidate
+    prune_factor: float [1.5]
+        Stop timing a candidate after the first run if it is slower than the best
+        configuration found so far by more than this factor
+    rtype: :class:`build_type` [build_type.jacobian]
+        The kernel to tune, the Jacobian or species rates
+    conp: bool [True]
+        If true, use the constant-pressure formulation
+    """
+
+    def __init__(self, lang, state_file, work_dir='autotune', platform='',
+                 mech_name=None, therm_name=None, gas=None, vecsizes=[2, 4, 8],
+                 num_threads=1, num_states=None, repeats=5, prune_factor=1.5,
+                 rtype=build_type.jacobian, conp=True):
+        utils.check_lang(lang)
+        self.lang = lang
+        self.state_file = os.path.abspath(state_file)
+        self.work_dir = os.path.abspath(work_dir)
+        self.platform = platform if lang != 'c' else ''
+        self.mech_name = mech_name
+        self.therm_name = therm_name
+        self.gas = gas
+        self.vecsizes = vecsizes
+        self.num_threads = num_threads
+        self.num_states = num_states
+        self.repeats = repeats
+        self.prune_factor = prune_factor
+        self.rtype = rtype
+        self.conp = conp
+        self.results = OrderedDict()
+        assert repeats > 0, 'Must time each candidate at least once'
+
+    def get_num_states(self):
+        """
+        Returns the number of states to evaluate, by default all the states in the
+        :attr:`state_file`
+        """
+
+        if self.num_states is None:
+            if self.gas is not None or self.mech_name.endswith(
+                    tuple(['.cti', '.xml'])):
+                _, specs, _ = mech.read_mech_ct(self.mech_name, self.gas)
+            else:
+                _, specs, _ = mech.read_mech(self.mech_name, self.therm_name)
+            # each state in the file consists of the state vector (of length
+            # NN = the number of species + 1) and the fixed parameter
+            state_size = (len(specs) + 2) * 8
+            self.num_states = os.path.getsize(self.state_file) // state_size
+        return self.num_states
+
+    def build(self, options):
+        """
+        Generates and builds the performance-testing executable for the candidate
+        configuration
+
+        Parameters
+        ----------
+        options: dict
+            The code-generation options of the candidate
+
+        Returns
+        -------
+        executable: str
+            The path to the built executable
+        """
+
+        name = config_name(options)
+        build = os.path.join(self.work_dir, name, 'src')
+        obj = os.path.join(self.work_dir, name, 'obj')
+        out = os.path.join(self.work_dir, name, 'lib')
+        for path in [build, obj, out]:
+            utils.create_dir(path)
+
+        vectorized = options['vectype'] != 'par'
+        create_jacobian(self.lang,
+                        mech_name=self.mech_name,
+                        therm_name=self.therm_name,
+                        gas=self.gas,
+                        vector_size=options['vecsize'] if vectorized else None,
+                        wide=options['vectype'] == 'wide',
+                        deep=options['vectype'] == 'deep',
+                        build_path=build,
+                        skip_jac=self.rtype == build_type.species_rates,
+                        platform=self.platform,
+                        data_order=options['order'],
+                        rate_specialization=options['rate_specialization'],
+                        split_rate_kernels=options['split_rate_kernels'],
+                        split_rop_net_kernels=options['split_rop_net_kernels'],
+                        seperate_kernels=options['seperate_kernels'],
+                        use_atomics=options['atomics'],
+                        conp=self.conp,
+                        data_filename=self.state_file)
+        return generate_library(self.lang, build, obj_dir=obj, out_dir=out,
+                                shared=True, btype=self.rtype, as_executable=True)
+
+    def run(self, executable):
+        """
+        Runs the built executable once, and returns the kernel execution time in
+        milliseconds
+        """
+
+        output = subprocess.check_output(
+            [executable, str(self.get_num_states()), str(self.num_threads)])
+        # ignore any utf-8 characters in output (e.g., from error'd OpenCL builds)
+        output = output.decode('utf-8', 'ignore').strip().splitlines()
+        vals = output[-1].strip().split(',')
+        if len(vals) != 4:
+            raise ValueError('Unexpected performance tester output: {}'.format(
+                output[-1]))
+        return float(vals[3])
+
+    def time(self, options, best=float('inf')):
+        """
+        Builds and times a candidate configuration, stopping early if it is
+        clearly slower than the best configuration found so far
+
+        Parameters
+        ----------
+        options: dict
+            The code-generation options of the candidate
+        best: float [inf]
+            The execution time of the best configuration found so far
+
+        Returns
+        -------
+        result: :class:`tuning_result`
+            The result of the timing
+        """
+
+        logger = logging.getLogger(__name__)
+        try:
+            executable = self.build(options)
+            times = []
+            for i in range(self.repeats):
+                times.append(self.run(executable))
+                if times[-1] > self.prune_factor * best:
+                    logger.info('Pruning configuration {}, {:.3f} ms vs. best '
+                                '{:.3f} ms'.format(config_name(options), times[-1],
+                                                   best))
+                    return tuning_result(options, times, 'pruned')
+            return tuning_result(options, times)
+        except (Exception, SystemExit) as e:
+            # e.g., an unsupported vectorization for this platform, or a
+            # compilation / runtime error (note: libgen exits on a failed link)
+            logger.warn('Configuration {} failed: {}'.format(
+                config_name(options), str(e)))
+            return tuning_result(options, status='failed')
+
+    @property
+    def best(self):
+        """
+        The fastest configuration tested so far, or None
+        """
+        valid = [x for x in self.results.values() if x.status != 'failed']
+        if not valid:
+            return None
+        return min(valid, key=lambda x: x.time)
+
+    def _evaluate(self, options):
+        """
+        Returns the (cached) result of the candidate configuration
+        """
+        name = config_name(options)
+        if name not in self.results:
+            best = self.best
+            self.results[name] = self.time(
+                options, best.time if best is not None else float('inf'))
+        return self.results[name]
+
+    def _prune_vecsize(self, options, result, previous):
+        """
+        Returns True if larger vector sizes of the same vectorization type should
+        be skipped, i.e., if the candidate failed, or was no faster than the
+        previous (smaller) vector size
+        """
+        if result.status == 'failed':
+            return True
+        last = previous.get(options['vectype'])
+        previous[options['vectype']] = result.time
+        return last is not None and result.time >= last
+
+    def tune(self):
+        """
+        Tunes the code-generation options, one at a time in the order given by
+        :func:`get_search_stages`
+
+        Returns
+        -------
+        best: :class:`tuning_result`
+            The fastest configuration found
+        """
+
+        logger = logging.getLogger(__name__)
+        options = default_options.copy()
+        self._evaluate(options)
+        for stage, updates in get_search_stages(self.lang, self.vecsizes):
+            if stage == 'atomics' and options['vectype'] != 'deep':
+                continue
+            base = options.copy()
+            skipped = set()
+            previous = {}
+            for update in updates:
+                candidate = base.copy()
+                candidate.update(update)
+                if candidate['vectype'] in skipped:
+                    continue
+                result = self._evaluate(candidate)
+                if stage == 'vectorization' and candidate['vectype'] != 'par' and \
+                        self._prune_vecsize(candidate, result, previous):
+                    skipped.add(candidate['vectype'])
+            best = self.best
+            if best is None:
+                break
+            options = best.options.copy()
+            logger.info('Tuned {}: best configuration {} ({:.3f} ms)'.format(
+                stage, best.name, best.time))
+
+        return self.best
+
+    def write_platform(self, result, filename=None):
+        """
+        Writes the supplied configuration as a code-generation platform file
+
+        Parameters
+        ----------
+        result: :class:`tuning_result`
+            The configuration to write
+        filename: str [None]
+            The file to write to, by default :data:`platform_filename` in the
+            :attr:`work_dir`
+
+        Returns
+        -------
+        filename: str
+            The path of the written file
+        """
+
+        if filename is None:
+            filename = os.path.join(self.work_dir, platform_filename)
+        opts = result.options
+        platform = OrderedDict([('name', self.platform or 'openmp'),
+                                ('lang', self.lang),
+                                ('vectype', opts['vectype'])])
+        if opts['vectype'] != 'par':
+            platform['vecsize'] = opts['vecsize']
+        for key in ['order', 'atomics', 'rate_specialization',
+                    'split_rate_kernels', 'split_rop_net_kernels',
+                    'seperate_kernels']:
+            platform[key] = opts[key]
+
+        with open(filename, 'w') as file:
+            file.write('# The fastest configuration found by pyjac.autotune, '
+                       '{:.3f} ms for {} states\n'.format(
+                           result.time, self.get_num_states()))
+            file.write('platform:\n')
+            for key, value in six.iteritems(platform):
+                file.write('    {}: {}\n'.format(key, yaml.safe_dump(
+                    value, default_flow_style=True).splitlines()[0]))
+
+        # and check that the platform is valid
+        build_and_validate('codegen_platform.yaml', filename)
+        return filename
+
+    def write_report(self, filename=None):
+        """
+        Writes the ranked report of all tested configurations
+
+        Parameters
+        ----------
+        filename: str [None]
+            The file to write to, by default :data:`report_filename` in the
+            :attr:`work_dir`
+
+        Returns
+        -------
+        filename: str
+            The path of the written file
+        """
+
+        if filename is None:
+            filename = os.path.join(self.work_dir, report_filename)
+        # fully timed configurations first, then pruned and failed
+        status = {'ok': 0, 'pruned': 1, 'failed': 2}
+        ranked = sorted(self.results.values(), key=lambda x: (
+            status[x.status], x.time))
+        with open(filename, 'w') as file:
+            writer = csv.writer(file)
+            writer.writerow(['rank', 'config', 'status', 'time_ms', 'runs'] +
+                            list(default_options.keys()))
+            for i, result in enumerate(ranked):
+                writer.writerow([i + 1, result.name, result.status,
+                                 '{:.6f}'.format(result.time),
+                                 len(result.times)] +
+                                [result.options[x] for x in default_options])
+        return filename
+
+
+def autotune(lang, state_file, work_dir='autotune', **kwargs):
+    """
+    Tunes the code-generation options of a mechanism for the given target, and
+    writes the fastest configuration as a code-generation platform file along
+    with a ranked report of all tested configurations
+
+    Parameters
+    ----------
+    lang: str
+        The language to tune, 'c' or 'opencl'
+    state_file: str
+        The path to a binary file of representative thermo-chemical states
+    work_dir: str ['autotune']
+        The directory to generate, build and time the candidates in
+    kwargs: dict
+        Other options passed to :class:`autotuner`
+
+    Returns
+    -------
+    platform_file: str
+        The path to the code-generation platform file of the best configuration,
+        or None if no configuration could be built
+    """
+
+    tuner = autotuner(lang, state_file, work_dir=work_dir, **kwargs)
+    utils.create_dir(tuner.work_dir)
+    best = tuner.tune()
+    tuner.write_report()
+    if best is None:
+        logger = logging.getLogger(__name__)
+        logger.error('No configuration could be built and timed.')
+        return None
+    return tuner.write_platform(best)
@@ -1,7 +1,10 @@
 from pyjac.core.create_jacobian import create_jacobian, determine_jac_inds, \
     find_last_species
 from pyjac.core.rate_subs import assign_rates
-from pyjac.core.mech_interpret import read_mech, read_mech_ct
+from pyjac.core.mech_interpret import read_mech, read_mech_ct, sort_mechanism, \
+    SortType
+from pyjac.core.reference_eval import reference_evaluator
 
 __all__ = ["create_jacobian", "determine_jac_inds", "find_last_species",
-           "assign_rates", "read_mech", "read_mech_ct"]
+           "assign_rates", "read_mech", "read_mech_ct", "sort_mechanism",
+           "SortType", "reference_evaluator"]
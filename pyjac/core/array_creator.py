@@ -1369,6 +1369,20 @@ def __call__(self, *indicies, **kwargs):
         return super(jac_creator, self).__call__(*indicies, **kwargs)
 
 
+class jvp_creator(creator):
+    """
+    The creator for the Jacobian-vector product, which takes the place of the
+    Jacobian in a matrix-free kernel.  Updates of a Jacobian entry (row, col) are
+    accumulated into the product, `jvp[row]`, weighted by the entry, `vec[col]`, of
+    the supplied vector -- see :func:`instruction_creator.with_conditional_jacobian`
+    """
+
+    def __init__(self, *args, **kwargs):
+        # store the creator of the vector the Jacobian is multiplied by
+        self.vec = kwargs.pop('vec')
+        super(jvp_creator, self).__init__(*args, **kwargs)
+
+
 def _make_mask(map_arr, mask_size):
     """
     Create a mask array from the given map and total mask size
@@ -1404,10 +1418,13 @@ class NameStore(object):
     use_private_memory : Bool [False]
         If True, use _private_ OpenCL/CUDA/etc. memory for array creation.
         If False, use _global_ memory.
+    jac_vec : Boolean [False]
+        If true, the Jacobian is replaced by its product with a supplied vector,
+        see :class:`jvp_creator`
     """
 
     def __init__(self, loopy_opts, rate_info, conp=True,
-                 test_size='problem_size'):
+                 test_size='problem_size', jac_vec=False):
         self.loopy_opts = loopy_opts
         self.use_private_memory = loopy_opts.use_private_memory
         self.rate_info = rate_info
@@ -1416,6 +1433,7 @@ def __init__(self, loopy_opts, rate_info, conp=True,
         self.conp = conp
         self.jac_format = loopy_opts.jac_format
         self.jac_type = loopy_opts.jac_type
+        self.jac_vec = jac_vec
         self._add_arrays(rate_info, test_size)
 
     def __getattr__(self, name):
@@ -1549,6 +1567,20 @@ def _add_arrays(self, rate_info, test_size):
                                            order=self.order,
                                            initializer=ccs_col_ptr)
 
+            # the storage index of each (row-major) non-zero entry in the sparse
+            # Jacobian, used to traverse the Jacobian by rows
+            crs_jac_inds = np.arange(crs_col_ind.size, dtype=np.int32)
+            if self.order == 'F':
+                # the position of the entry in the compressed column storage
+                flat_F = rate_info['jac_inds']['flat_F']
+                crs_jac_inds = np.lexsort(
+                    (flat_F[:, 1], flat_F[:, 0])).astype(np.int32)
+            self.crs_jac_inds = creator('crs_jac_inds',
+                                        shape=crs_jac_inds.shape,
+                                        dtype=np.int32,
+                                        order=self.order,
+                                        initializer=crs_jac_inds)
+
             if self.jac_format == JacobianFormat.sparse or \
                     self.jac_type == JacobianType.finite_difference:
                 if self.order == 'C':
@@ -1560,6 +1592,92 @@ def _add_arrays(self, rate_info, test_size):
                     self.jac_row_inds = self.ccs_jac_row_ind
                     self.jac_col_inds = self.ccs_jac_col_ptr
 
+        # compressed finite difference jacobian coloring
+        if 'fd_coloring' in rate_info:
+            coloring = rate_info['fd_coloring']
+            self.fd_colors = creator('fd_colors',
+                                     shape=(coloring['num'],),
+                                     dtype=np.int32, order=self.order,
+                                     initializer=np.arange(coloring['num'],
+                                                           dtype=np.int32))
+            off = self.__make_offset(coloring['col_count'])
+            self.fd_color_col_offsets = creator('fd_color_col_offsets',
+                                                shape=off.shape,
+                                                dtype=np.int32,
+                                                order=self.order,
+                                                initializer=off)
+            self.fd_color_cols = creator('fd_color_cols',
+                                         shape=coloring['cols'].shape,
+                                         dtype=np.int32,
+                                         order=self.order,
+                                         initializer=coloring['cols'])
+            off = self.__make_offset(coloring['entry_count'])
+            self.fd_color_entry_offsets = creator('fd_color_entry_offsets',
+                                                  shape=off.shape,
+                                                  dtype=np.int32,
+                                                  order=self.order,
+                                                  initializer=off)
+            self.fd_color_entry_rows = creator('fd_color_entry_rows',
+                                               shape=coloring['entry_rows'].shape,
+                                               dtype=np.int32,
+                                               order=self.order,
+                                               initializer=coloring['entry_rows'])
+            self.fd_color_entry_cols = creator('fd_color_entry_cols',
+                                               shape=coloring['entry_cols'].shape,
+                                               dtype=np.int32,
+                                               order=self.order,
+                                               initializer=coloring['entry_cols'])
+
+        # sparse LU-factorization of the iteration matrix
+        if 'jac_lu' in rate_info:
+            lu_info = rate_info['jac_lu']
+            nnz = lu_info['col_ind'].size
+            self.lu_entries = creator('lu_entries',
+                                      shape=(nnz,),
+                                      dtype=np.int32,
+                                      order=self.order,
+                                      initializer=np.arange(nnz, dtype=np.int32))
+            # the corresponding (unpermuted) Jacobian entry of each entry in the
+            # factorization, fill-in entries point to the (always populated)
+            # first entry, and are masked out
+            jac_entry = lu_info['jac_entry']
+            is_fill = jac_entry < 0
+            jac_entry = np.where(is_fill, 0, jac_entry)
+            flat_C = rate_info['jac_inds']['flat_C']
+            self.lu_jac_rows = creator('lu_jac_rows',
+                                       shape=(nnz,),
+                                       dtype=np.int32,
+                                       order=self.order,
+                                       initializer=flat_C[jac_entry, 0])
+            self.lu_jac_cols = creator('lu_jac_cols',
+                                       shape=(nnz,),
+                                       dtype=np.int32,
+                                       order=self.order,
+                                       initializer=flat_C[jac_entry, 1])
+            # and the storage index of this entry in the sparse Jacobian
+            self.lu_jac_inds = creator('lu_jac_inds',
+                                       shape=(nnz,),
+                                       dtype=np.int32,
+                                       order=self.order,
+                                       initializer=np.array(
+                                           self.crs_jac_inds.initializer[
+                                               jac_entry], dtype=np.int32))
+            self.lu_jac_mask = creator('lu_jac_mask',
+                                       shape=(nnz,),
+                                       dtype=np.float64,
+                                       order=self.order,
+                                       initializer=np.where(is_fill, 0., 1.))
+            lu_diag = np.zeros(nnz, dtype=np.float64)
+            lu_diag[lu_info['diag']] = 1
+            self.lu_diag = creator('lu_diag',
+                                   shape=(nnz,),
+                                   dtype=np.float64,
+                                   order=self.order,
+                                   initializer=lu_diag)
+            self.jac_lu = creator('jac_lu', shape=(test_size, nnz),
+                                  dtype=np.float64, order=self.order,
+                                  is_input_or_output=True)
+
         # state arrays
         self.T_arr = creator('phi', shape=(test_size, rate_info['Ns'] + 1),
                              dtype=np.float64, order=self.order,
@@ -1629,6 +1747,29 @@ def _add_arrays(self, rate_info, test_size):
                                dtype=np.float64,
                                is_input_or_output=True)
 
+        # Jacobian-vector product
+        self.jvp_vec = creator('vec', shape=(test_size, rate_info['Ns'] + 1),
+                               dtype=np.float64, order=self.order,
+                               is_input_or_output=True)
+        self.jvp = jvp_creator('jvp', shape=(test_size, rate_info['Ns'] + 1),
+                               dtype=np.float64, order=self.order,
+                               is_input_or_output=True, vec=self.jvp_vec)
+        if self.jac_vec:
+            # the Jacobian is never stored, instead all updates of the Jacobian
+            # are accumulated directly into the product
+            self.jac = self.jvp
+
+        # linear system solution via the sparse LU-factorization
+        self.lu_gamma = creator('gamma', shape=(test_size,),
+                                dtype=np.float64, order=self.order,
+                                is_input_or_output=True)
+        self.lu_rhs = creator('rhs', shape=(test_size, rate_info['Ns'] + 1),
+                              dtype=np.float64, order=self.order,
+                              is_input_or_output=True)
+        self.lu_sol = creator('sol', shape=(test_size, rate_info['Ns'] + 1),
+                              dtype=np.float64, order=self.order,
+                              is_input_or_output=True)
+
         self.spec_rates = creator('wdot', shape=(test_size, rate_info['Ns']),
                                   dtype=np.float64, order=self.order)
 
@@ -1750,6 +1891,25 @@ def _add_arrays(self, rate_info, test_size):
                                     initializer=mask,
                                     order=self.order)
 
+            # per-reaction equilibrium constant polynomials
+            if rate_info['rev']['kc']['common']:
+                kc = rate_info['rev']['kc']
+                self.kc_lo = creator('kc_lo',
+                                     dtype=kc['lo'].dtype,
+                                     initializer=kc['lo'],
+                                     shape=kc['lo'].shape,
+                                     order=self.order)
+                self.kc_hi = creator('kc_hi',
+                                     dtype=kc['hi'].dtype,
+                                     initializer=kc['hi'],
+                                     shape=kc['hi'].shape,
+                                     order=self.order)
+                self.kc_T_mid = creator('kc_T_mid',
+                                        dtype=kc['T_mid'].dtype,
+                                        initializer=kc['T_mid'],
+                                        shape=kc['T_mid'].shape,
+                                        order=self.order)
+
         if rate_info['thd']['num']:
             self.pres_mod = creator('pres_mod',
                                     dtype=np.float64,
@@ -29,10 +29,12 @@
 from pyjac.loopy_utils import JacobianType, JacobianFormat, \
     FiniteDifferenceMode, load_platform
 from pyjac.kernel_utils import kernel_gen as k_gen
+from pyjac.kernel_utils.memory_manager import load_cache_topology
 from pyjac.core import array_creator as arc
 from pyjac.core.reaction_types import reaction_type, falloff_form, thd_body_type
 from pyjac.core import chem_model as chem
 from pyjac.core import instruction_creator as ic
+from pyjac.core import generation_cache as gcache
 from pyjac.core.array_creator import (global_ind, var_name, default_inds)
 from pyjac.core.rate_subs import assign_rates
 from pyjac.core.exceptions import IncorrectInputSpecificationException
@@ -78,21 +80,33 @@ def determine_jac_inds(reacs, specs, rate_spec, jacobian_type=JacobianType.exact
     assert jacobian_type in JacobianType
     val = assign_rates(reacs, specs, rate_spec)
 
-    inds = []
     row_size = len(specs) + 1  # Ns - 1 species + temperature + extra variable
     species_offset = 2  # temperature + extra variable
+    ns = val['Ns'] - 1
+    num_reacs = val['Nr']
 
-    def __add_row(row):
-        inds.extend([(row, x) for x in range(row_size)])
+    def __offset(arr):
+        return np.array(np.concatenate(
+            (np.cumsum(arr) - arr, np.array([np.sum(arr)]))),
+            dtype=np.int32)
+
+    def __expand(offsets, inds):
+        # returns the indicies of all entries in the compressed segments
+        # offsets[ind]:offsets[ind + 1] for each ind in inds, as well as the
+        # position in inds that each entry belongs to
+        inds = np.asarray(inds, dtype=np.int64)
+        counts = offsets[inds + 1] - offsets[inds]
+        owner = np.repeat(np.arange(inds.size), counts)
+        entries = np.repeat(offsets[inds] - (np.cumsum(counts) - counts), counts) \
+            + np.arange(owner.size)
+        return entries, owner
 
     # The first row is all derivatives of the dT/dt term, and no entries are
     # zero
-    __add_row(0)
-
-    # the second row is derivatives of the extra variable, and again is
+    #
+    # The second row is derivatives of the extra variable, and again is
     # non-zero
-    __add_row(1)
-
+    #
     # From here on out:
     #
     # The first entry is the derivative of dnj/dt w.r.t Temperature
@@ -102,146 +116,108 @@ def __add_row(row):
     # The second entry is the derivative of dnj/dt w.r.t. the extra variable (P/V)
     #       -> this is non-zero if this species has a non-zero net stoich. coeff in
     #          any reaction
-
-    def __offset(arr):
-        return np.array(np.concatenate(
-            (np.cumsum(arr) - arr, np.array([np.sum(arr)]))),
-            dtype=np.int32)
+    #
+    # note: this isn't _technically_ true, e.g., for a irreversible reaction
+    # with b = 0 and Ea = 0, the temperature derivative of the species is zero
+    # however it's not really worth writing a lot of complicated logic (e.g.,
+    # to test falloff, etc.) to check when it's true 95+% of the time.
 
     # get list of species that have a non-zero nu in some reaction
     non_zero_specs = val['net_per_spec']['map']
-    rxn_count = __offset(val['net_per_spec']['reac_count'])
-    rxn_maps = val['net_per_spec']['reacs']
-    rxn_to_specs_map = val['net']['reac_to_spec']
+    assert np.unique(non_zero_specs).size == non_zero_specs.size
+    # and the (species, reaction) pairs with non-zero net nu, ignoring the last
+    # species derivatives
+    pair_spec = np.repeat(non_zero_specs, val['net_per_spec']['reac_count'])
+    pair_rxn = val['net_per_spec']['reacs']
+    keep = pair_spec != ns
+    pair_spec = pair_spec[keep].astype(np.int64)
+    pair_rxn = pair_rxn[keep].astype(np.int64)
+
+    # the species in each reaction
     num_specs_in_rxn = val['net']['num_reac_to_spec']
-    num_specs_in_rxn = __offset(num_specs_in_rxn)
-    has_ns = val['reac_has_ns']
-    thd_has_ns = val['thd']['has_ns']
-    thd_spec = val['thd']['spec']
-    thd_eff = val['thd']['eff']
-    thd_map = val['thd']['map']
-    rev_map = val['rev']['map']
+    rxn_offsets = __offset(num_specs_in_rxn)
+    rxn_to_specs_map = val['net']['reac_to_spec']
+    entry_rxn = np.repeat(np.arange(num_reacs, dtype=np.int64), num_specs_in_rxn)
     nu_map = val['net']['nu']
-    num_specs_in_thd = __offset(val['thd']['spec_num'])
-    ns = val['Ns'] - 1
-
-    assert np.unique(non_zero_specs).size == non_zero_specs.size
-    for spec in non_zero_specs:
-        if spec == len(specs) - 1:
-            # ignore last species derivatives
-            continue
-        row = spec + species_offset
-        nonzero_derivs = set([0, 1])
-
-        def __add_specs(slist):
-            # add species to derivative list
-            nonzero_derivs.update([x + species_offset for x in slist
-                                   if x + species_offset < row_size])
-
-        # add the temperature and extra var derivative
-        # note: this isn't _technically_ true, e.g., for a irreversible reaction
-        # with b = 0 and Ea = 0, the temperature derivative of the species is zero
-        # however it's not really worth writing a lot of complicated logic (e.g.,
-        # to test falloff, etc.) to check when it's true 95+% of the time.
-        nonzero_derivs.update([0, 1])
-
-        # now we go through the reactions for which this species is non-zero
-        inner_ind = np.where(non_zero_specs == spec)[0][0]
-        for rxn in rxn_maps[rxn_count[inner_ind]:rxn_count[inner_ind + 1]]:
-            # get third body index
-            thd_ind = None
-            if rxn in thd_map:
-                thd_ind = np.where(thd_map == rxn)[0][0]
-
-            # if the last species directly participates in the reaction, and we're
-            # looking for a full Jacobian, this entire row has non-zero
-            # derivatives
-            if (rxn in has_ns or (thd_ind is not None and thd_ind in thd_has_ns)) \
-                    and jacobian_type != JacobianType.approximate:
-                __add_specs(range(row_size))
-                break
-
-            # test reversible
-            deriv_specs = rxn_to_specs_map[
-                num_specs_in_rxn[rxn]:num_specs_in_rxn[rxn + 1]]
-            rev = rxn in rev_map
-            if not rev:
-                # forward irreversible -- need to look at nu
-                nu = nu_map[2 * num_specs_in_rxn[rxn]:2 * num_specs_in_rxn[rxn + 1]]
-                is_prod = [nu[2 * i] != 0 for i in range(len(deriv_specs))]
-                is_reac = [nu[2 * i + 1] != 0 for i in range(len(deriv_specs))]
-                # find out which this species is
-                spec_ind = np.where(deriv_specs == spec)[0][0]
-                if is_prod[spec_ind] and is_reac[spec_ind]:
-                    # both product and reactant, all species contribute to derivative
-                    pass
-                else:
-                    # only reactants contribute to the derivative
-                    deriv_specs = [x for i, x in enumerate(deriv_specs)
-                                   if is_reac[i]]
-
-            # update species in the reaction
-            __add_specs(deriv_specs)
-
-            if thd_ind is not None:
-                # update third body species in the reaction where the efficiency
-                # is not equal to that of the last species
-                last_spec_eff = 1.0
-                # get species
-                third_body_inds = np.arange(num_specs_in_thd[
-                    thd_ind], num_specs_in_thd[thd_ind + 1])
-                third_body_species = thd_spec[third_body_inds]
-                # and efficiencies
-                third_body_eff = thd_eff[third_body_inds]
-                # check for ns in third body to get right efficiency
-                if ns in third_body_species:
-                    last_spec_eff = third_body_eff[np.where(
-                        third_body_species == ns)]
-                # now filter based on efficiencies
-                __add_specs([x for i, x in enumerate(third_body_species)
-                             if third_body_eff[i] != last_spec_eff])
-
-        # finally add the non-zero derivatives
-        if len(nonzero_derivs):
-            inds.extend([(row, x) for x in sorted(nonzero_derivs)])
-
-    # get the compressed storage
-    rows, cols = zip(*inds)
-
-    rows = np.array(rows, dtype=np.int32)
-    cols = np.array(cols, dtype=np.int32)
+    is_prod = nu_map[0::2] != 0
+    is_reac = nu_map[1::2] != 0
+    # and the reactants of each reaction
+    reac_offsets = __offset(np.bincount(entry_rxn[is_reac], minlength=num_reacs))
+    reac_to_specs_map = rxn_to_specs_map[is_reac]
+
+    # update third body species in the reaction where the efficiency is not equal
+    # to that of the last species
+    thd_map = val['thd']['map']
+    thd_has_ns = val['thd']['has_ns']
+    thd_entry = np.repeat(np.arange(thd_map.size), val['thd']['spec_num'])
+    last_spec_eff = np.ones(thd_map.size, dtype=np.float64)
+    last_spec_eff[thd_has_ns] = val['thd']['eff_ns']
+    thd_eff = val['thd']['eff'] != last_spec_eff[thd_entry]
+    thd_offsets = __offset(np.bincount(thd_entry[thd_eff], minlength=thd_map.size))
+    thd_spec = val['thd']['spec'][thd_eff]
+    rxn_to_thd = np.full(num_reacs, -1, dtype=np.int64)
+    rxn_to_thd[thd_map] = np.arange(thd_map.size)
+
+    # if the last species directly participates in the reaction, and we're
+    # looking for a full Jacobian, this entire row has non-zero derivatives
+    full_row = np.zeros(num_reacs, dtype=bool)
+    if jacobian_type != JacobianType.approximate:
+        full_row[val['reac_has_ns']] = True
+        full_row[thd_map[thd_has_ns]] = True
+
+    # for reversible reactions, or species that are both products and reactants of
+    # an irreversible reaction, all species in the reaction contribute to the
+    # derivative -- otherwise only the reactants contribute
+    rev = np.zeros(num_reacs, dtype=bool)
+    rev[val['rev']['map']] = True
+    both = np.isin(pair_rxn * row_size + pair_spec,
+                   (entry_rxn * row_size + rxn_to_specs_map)[is_prod & is_reac])
+    all_specs = rev[pair_rxn] | both
+
+    rows = []
+    cols = []
+
+    def __add_specs(pairs, offsets, slist, inds):
+        # add the species in the compressed segments to the rows of the pairs
+        entries, owner = __expand(offsets, inds[pairs])
+        rows.append(pair_spec[pairs][owner])
+        cols.append(slist[entries])
+
+    __add_specs(np.where(all_specs)[0], rxn_offsets, rxn_to_specs_map, pair_rxn)
+    __add_specs(np.where(~all_specs)[0], reac_offsets, reac_to_specs_map, pair_rxn)
+    pair_thd = rxn_to_thd[pair_rxn]
+    __add_specs(np.where(pair_thd >= 0)[0], thd_offsets, thd_spec, pair_thd)
+    full_specs = np.unique(pair_spec[full_row[pair_rxn]])
+    rows.append(np.repeat(full_specs, ns + 1))
+    cols.append(np.tile(np.arange(ns + 1), full_specs.size))
+
+    rows = np.concatenate(rows).astype(np.int64) + species_offset
+    cols = np.concatenate(cols).astype(np.int64) + species_offset
+    # remove last species
+    rows = rows[cols < row_size]
+    cols = cols[cols < row_size]
+    # and add the temperature and extra variable rows / derivatives
+    spec_rows = np.unique(pair_spec) + species_offset
+    rows = np.concatenate((np.repeat([0, 1], row_size), rows,
+                           np.repeat(spec_rows, 2)))
+    cols = np.concatenate((np.tile(np.arange(row_size), 2), cols,
+                           np.tile([0, 1], spec_rows.size)))
+
+    # get the unique, row-major non-zero indicies
+    flat = np.unique(rows * row_size + cols)
+    rows = flat // row_size
+    cols = flat % row_size
+    inds = np.column_stack((rows, cols))
 
     # get a column-major version for flat inds
-    inds_F = np.array(inds, copy=True)
-    offset = 0
-    for i, col in enumerate(np.unique(cols)):
-        # find the rows that contains this col
-        row_F = rows[np.where(cols == col)[0]]
-        # place in inds
-        inds_F[offset:offset + row_F.size] = np.asarray(
-            (row_F, [col] * row_F.size), dtype=np.int32).T
-        offset += row_F.size
+    order = np.lexsort((rows, cols))
+    inds_F = inds[order]
 
     # turn into row and colum counts
-    row_ptr = []
-    col_ind = []
-
-    col_ptr = []
-    row_ind = []
-    for i in range(row_size):
-        try:
-            in_row = np.where(rows == i)[0]
-            row_ptr.append(in_row.size)
-            col_ind.extend(cols[in_row])
-        except:
-            pass
-
-        try:
-            in_col = np.where(cols == i)[0]
-            col_ptr.append(in_col.size)
-            row_ind.extend(rows[in_col])
-        except:
-            pass
+    row_ptr = np.bincount(rows, minlength=row_size)
+    col_ind = cols
+    col_ptr = np.bincount(cols, minlength=row_size)
+    row_ind = rows[order]
 
     # update indicies in return value
     val['jac_inds'] = {
@@ -255,8 +231,210 @@ def __add_specs(slist):
     return val
 
 
+def determine_fd_coloring(jac_inds):
+    """
+    Determines a Curtis-Powell-Reid column coloring of the Jacobian sparsity
+    pattern, for use in the compressed finite-difference Jacobian (see
+    :func:`finite_difference_jacobian`).
+
+    Columns of the same color are structurally orthogonal, i.e., do not share any
+    non-zero rows, such that they may be perturbed simultaneously and the
+    resulting change in the species rates scattered back to the appropriate
+    Jacobian entries.
+
+    Notes
+    -----
+    The temperature and extra variable rows of the Jacobian are dense, hence
+    every column would otherwise require a separate color.  Instead, only the
+    species rows are considered in the coloring of the species columns, and the
+    temperature / extra variable rows of the species columns are computed from
+    the species rows by the analytical :func:`dTdot_dnj` and :func:`dEdot_dnj`
+    kernels.  The (dense) temperature and extra variable columns are each assigned
+    a separate color, which includes all rows.
+
+    Colors are assigned greedily, in order of decreasing number of non-zero species
+    rows in each column.
+
+    Parameters
+    ----------
+    jac_inds: dict
+        The 'jac_inds' entry of the result of :func:`determine_jac_inds`
+
+    Returns
+    -------
+    coloring: dict
+        A dictionary with keys:
+            'num': the number of colors
+            'col_count': the number of columns of each color
+            'cols': the columns of each color, concatenated
+            'entry_count': the number of Jacobian entries updated by each color
+            'entry_rows': the rows of the Jacobian entries of each color,
+                concatenated
+            'entry_cols': the columns of the Jacobian entries of each color,
+                concatenated
+    """
+
+    species_offset = 2  # temperature + extra variable
+    col_ptr = jac_inds['ccs']['col_ptr']
+    row_ind = jac_inds['ccs']['row_ind']
+    size = col_ptr.size - 1
+
+    col_rows = [row_ind[col_ptr[i]:col_ptr[i + 1]] for i in range(size)]
+    spec_rows = [set(rows[rows >= species_offset]) for rows in col_rows]
+
+    # the temperature and extra variable columns are colored separately
+    colors = [[i] for i in range(min(species_offset, size))]
+    used = []
+    order = sorted(range(species_offset, size), key=lambda i: -len(spec_rows[i]))
+    for col in order:
+        ind = next((i for i, rows in enumerate(used)
+                    if not rows & spec_rows[col]), None)
+        if ind is None:
+            colors.append([])
+            used.append(set())
+            ind = len(used) - 1
+        colors[ind + species_offset].append(col)
+        used[ind] |= spec_rows[col]
+
+    entry_rows = []
+    entry_cols = []
+    entry_count = []
+    for i, cols in enumerate(colors):
+        cols.sort()
+        count = 0
+        for col in cols:
+            rows = col_rows[col]
+            if i >= species_offset:
+                rows = rows[rows >= species_offset]
+            entry_rows.append(rows)
+            entry_cols.append(np.full(rows.size, col, dtype=np.int32))
+            count += rows.size
+        entry_count.append(count)
+
+    return {'num': len(colors),
+            'col_count': np.array([len(x) for x in colors], dtype=np.int32),
+            'cols': np.array([x for cols in colors for x in cols], dtype=np.int32),
+            'entry_count': np.array(entry_count, dtype=np.int32),
+            'entry_rows': np.array(np.concatenate(entry_rows), dtype=np.int32),
+            'entry_cols': np.array(np.concatenate(entry_cols), dtype=np.int32)}
+
+
+def determine_lu_structure(jac_inds):
+    """
+    Performs a symbolic LU-factorization of the Jacobian sparsity pattern, for use
+    in the generated sparse LU factorization and solution of the linear system:
+
+    .. math::
+        \\left(\\mathcal{I} - \\gamma \\mathcal{J}\\right) \\vec{x} = \\vec{b}
+
+    as found in (e.g.) the Newton iterations of implicit integrators, see
+    :func:`sparse_lu_factor` and :func:`sparse_lu_solve`.
+
+    Notes
+    -----
+    The rows and columns of the Jacobian are symmetrically permuted via a minimum
+    degree ordering of the (symmetrized) sparsity pattern to reduce fill-in.  As
+    the temperature and extra variable rows / columns are dense, these are
+    typically ordered last.
+
+    No numerical pivoting is performed, as the diagonal of the iteration matrix
+    is dominant for the (small) step-sizes typical of stiff chemical kinetics
+    integration; the diagonal of the Jacobian is always included in the
+    factorization pattern.
+
+    Parameters
+    ----------
+    jac_inds: dict
+        The 'jac_inds' entry of the result of :func:`determine_jac_inds`
+
+    Returns
+    -------
+    lu_info: dict
+        A dictionary with keys:
+            'perm': the permutation of the Jacobian rows / columns, i.e., row `i`
+                of the factored matrix is row `perm[i]` of the Jacobian
+            'row_ptr': the row pointers of the (permuted) factored matrix in
+                compressed row storage
+            'col_ind': the (permuted) column indicies of the factored matrix in
+                compressed row storage, sorted within each row
+            'diag': the position of the diagonal entry of each row in the
+                factored matrix
+            'jac_entry': the index of the (row-major) Jacobian entry corresponding
+                to each entry in the factored matrix, or -1 for fill-in
+    """
+
+    flat = jac_inds['flat_C']
+    size = jac_inds['crs']['row_ptr'].size - 1
+
+    # symmetrized adjacency of the Jacobian pattern
+    graph = [set() for i in range(size)]
+    for row, col in flat:
+        if row != col:
+            graph[row].add(col)
+            graph[col].add(row)
+
+    # minimum degree ordering, via elimination of the symmetrized graph
+    perm = []
+    remaining = set(range(size))
+    while remaining:
+        node = min(remaining, key=lambda i: (len(graph[i]), i))
+        neighbors = graph[node]
+        for other in neighbors:
+            graph[other] |= neighbors
+            graph[other] -= set([other, node])
+        remaining.remove(node)
+        perm.append(node)
+    perm = np.array(perm, dtype=np.int32)
+    iperm = np.empty_like(perm)
+    iperm[perm] = np.arange(size, dtype=np.int32)
+
+    # the permuted pattern, including the diagonal
+    rows = [set([i]) for i in range(size)]
+    for row, col in flat:
+        rows[iperm[row]].add(iperm[col])
+
+    # row-wise symbolic factorization: row i is updated by the upper-triangular
+    # part of each row k < i, for each (including fill-in) non-zero entry (i, k)
+    upper = []
+    for i in range(size):
+        row = rows[i]
+        lower = sorted(k for k in row if k < i)
+        seen = set(lower)
+        while lower:
+            k = lower.pop(0)
+            for col in upper[k]:
+                if col not in row:
+                    row.add(col)
+                    if col < i and col not in seen:
+                        # new fill-in in the lower part of the row
+                        seen.add(col)
+                        lower.append(col)
+                        lower.sort()
+        upper.append(sorted(col for col in row if col > i))
+
+    col_ind = [sorted(row) for row in rows]
+    row_ptr = np.concatenate(([0], np.cumsum([len(row) for row in col_ind])))
+    col_ind = np.array([col for row in col_ind for col in row], dtype=np.int32)
+    lu_rows = np.repeat(np.arange(size), np.diff(row_ptr))
+    diag = np.where(lu_rows == col_ind)[0]
+
+    # and map the Jacobian entries to the factored matrix
+    jac_flat = flat[:, 0].astype(np.int64) * size + flat[:, 1]
+    lu_flat = perm[lu_rows].astype(np.int64) * size + perm[col_ind]
+    pos = np.searchsorted(jac_flat, lu_flat)
+    pos[pos == jac_flat.size] = 0
+    jac_entry = np.where(jac_flat[pos] == lu_flat, pos, -1)
+
+    return {'perm': perm,
+            'row_ptr': np.array(row_ptr, dtype=np.int32),
+            'col_ind': col_ind,
+            'diag': np.array(diag, dtype=np.int32),
+            'jac_entry': np.array(jac_entry, dtype=np.int32)}
+
+
 def reset_arrays(loopy_opts, namestore, test_size=None, conp=True):
-    """Resets the Jacobian array for use in the evaluations
+    """Resets the Jacobian array (or the Jacobian-vector product, for a
+    matrix-free kernel) for use in the evaluations
 
     Parameters
     ----------
@@ -286,7 +464,18 @@ def reset_arrays(loopy_opts, namestore, test_size=None, conp=True):
     if namestore.problem_size is not None:
         kernel_data.append(namestore.problem_size)
 
-    if loopy_opts.jac_format == JacobianFormat.sparse:
+    if isinstance(namestore.jac, arc.jvp_creator):
+        # matrix-free, simply loop over the Jacobian-vector product
+        mapstore = arc.MapStore(loopy_opts, namestore.phi_inds,
+                                namestore.phi_inds)
+        jac_lp, jac_str = mapstore.apply_maps(namestore.jac, *default_inds)
+        instructions = Template(
+            """
+                ${jac_str} = 0d {id=reset}
+            """).substitute(**locals())
+
+        kernel_data.extend([jac_lp])
+    elif loopy_opts.jac_format == JacobianFormat.sparse:
         # simply loop over the whole jacobian array
         mapstore = arc.MapStore(loopy_opts,
                                 namestore.num_nonzero_jac_inds,
@@ -3321,8 +3510,14 @@ def dTdot_dnj(loopy_opts, namestore, test_size=None,
     ${tdot_jac_insn}
     """).safe_substitute(**locals())).safe_substitute(**locals())
 
-    can_vectorize, vec_spec = ic.get_deep_specializer(
-        loopy_opts, init_ids=['jac'])
+    if isinstance(namestore.jac, arc.jvp_creator):
+        # the entries of the row are all accumulated into the same entry of the
+        # Jacobian-vector product
+        can_vectorize, vec_spec = ic.get_deep_specializer(
+            loopy_opts, atomic_ids=['jac'])
+    else:
+        can_vectorize, vec_spec = ic.get_deep_specializer(
+            loopy_opts, init_ids=['jac'])
 
     return k_gen.knl_info(name='dTdot_dnj',
                           extra_inames=extra_inames,
@@ -4358,11 +4553,342 @@ def dRopi_dnj(loopy_opts, namestore, allint, test_size=None):
         if x is not None]
 
 
+def jacobian_vector_product(loopy_opts, namestore, test_size=None, conp=True):
+    """Generates instructions, kernel arguements, and data for completing the
+    product of the Jacobian with a supplied vector in a matrix-free kernel, i.e.:
+
+    .. math::
+        \\vec{w} = \\mathcal{J} \\vec{v}
+
+    The Jacobian is never stored in a matrix-free kernel; instead, the
+    sub-kernels accumulate each Jacobian entry directly into the product (see
+    :func:`instruction_creator.with_conditional_jacobian`).  The exception are
+    the contributions of the species rows to the temperature and extra variable
+    rows of the Jacobian (at the same column), e.g.:
+
+    .. math::
+        \\frac{\\partial \\dot{T}}{\\partial n_j} = -\\frac{\\sum_k (e_k -
+        e_{N_s} W_k / W_{N_s}) \\frac{\\partial \\dot{n}_k}{\\partial n_j}}
+        {V \\sum_k [C_k] c_k} + \\ldots
+
+    As these are linear in the species rows, with coefficients that are
+    independent of the column, they are added here from the completed species
+    rows of the product instead.
+
+    Parameters
+    ----------
+
+    loopy_opts : `loopy_options` object
+        A object containing all the loopy options to execute
+    namestore : :class:`array_creator.NameStore`
+        The namestore / creator for this method
+    test_size : int
+        If not none, this kernel is being used for testing.
+        Hence we need to size the arrays accordingly
+    conp : bool [True]
+        If supplied, True for constant pressure jacobian. False for constant
+        volume [Default: True]
+
+    Returns
+    -------
+    knl_list : list of :class:`knl_info`
+        The generated infos for feeding into the kernel generator for the
+        temperature and extra variable rows of the product, respectively
+    """
+
+    # loop over the species rows of the product
+    mapstore = arc.MapStore(loopy_opts,
+                            namestore.num_specs_no_ns,
+                            namestore.num_specs_no_ns)
+
+    # create arrays
+    jvp_lp, jvp_k_str = mapstore.apply_maps(
+        namestore.jvp, global_ind, var_name, affine={var_name: 2})
+    _, jvp_T_str = mapstore.apply_maps(namestore.jvp, global_ind, 0)
+    _, jvp_E_str = mapstore.apply_maps(namestore.jvp, global_ind, 1)
+    spec_energy_lp, spec_energy_str = mapstore.apply_maps(
+        namestore.spec_energy, *default_inds)
+    _, spec_energy_ns_str = mapstore.apply_maps(
+        namestore.spec_energy_ns, global_ind)
+    spec_heat_tot_lp, spec_heat_total_str = mapstore.apply_maps(
+        namestore.spec_heat_total, global_ind)
+    mw_lp, mw_str = mapstore.apply_maps(
+        namestore.mw_post_arr, var_name)
+    T_lp, T_str = mapstore.apply_maps(namestore.T_arr, global_ind)
+    V_lp, V_str = mapstore.apply_maps(namestore.V_arr, global_ind)
+    P_lp, P_str = mapstore.apply_maps(namestore.P_arr, global_ind)
+
+    kernel_data = []
+    if namestore.test_size == 'problem_size':
+        kernel_data.append(namestore.problem_size)
+
+    # temperature row
+    instructions = Template("""
+        sum = sum + (${spec_energy_str} - ${spec_energy_ns_str} * ${mw_str}) * \
+            ${jvp_k_str} {id=sum}
+    """).safe_substitute(**locals())
+    post_instructions = Template("""
+        ${jvp_T_str} = ${jvp_T_str} - sum / (${V_str} * ${spec_heat_total_str}) \
+            {id=jvp, dep=sum, nosync=sum}
+    """).safe_substitute(**locals())
+
+    can_vectorize, vec_spec = ic.get_deep_specializer(
+        loopy_opts, atomic_ids=['jvp'])
+
+    knl_list = [k_gen.knl_info(name='jvp_Tdot',
+                               instructions=instructions,
+                               pre_instructions=['<> sum = 0'],
+                               post_instructions=[post_instructions],
+                               var_name=var_name,
+                               kernel_data=kernel_data + [
+                                   spec_energy_lp, spec_heat_tot_lp, mw_lp,
+                                   V_lp, jvp_lp],
+                               mapstore=mapstore,
+                               can_vectorize=can_vectorize,
+                               vectorization_specializer=vec_spec)]
+
+    # and the extra variable row, which additionally depends on the temperature row
+    extra_var_str = V_str if conp else P_str
+    fixed_var_str = P_str if conp else V_str
+    instructions = Template("""
+        sum = sum + (1 - ${mw_str}) * ${jvp_k_str} {id=sum}
+    """).safe_substitute(**locals())
+    post_instructions = Template("""
+        ${jvp_E_str} = ${jvp_E_str} + Ru * ${T_str} * sum / ${fixed_var_str} \
+            {id=jvp, dep=sum, nosync=sum}
+        ${jvp_E_str} = ${jvp_E_str} + ${extra_var_str} * ${jvp_T_str} / ${T_str} \
+            {id=jvp_split, dep=sum, nosync=sum}
+    """).safe_substitute(**locals())
+
+    can_vectorize, vec_spec = ic.get_deep_specializer(
+        loopy_opts, atomic_ids=['jvp'], split_ids=['jvp_split'],
+        split_size=mapstore.map_domain.size)
+
+    knl_list.append(k_gen.knl_info(name='jvp_{}dot'.format('V' if conp else 'P'),
+                                   instructions=instructions,
+                                   pre_instructions=['<> sum = 0'],
+                                   post_instructions=[post_instructions],
+                                   var_name=var_name,
+                                   kernel_data=kernel_data + [
+                                       mw_lp, T_lp, V_lp, P_lp, jvp_lp],
+                                   mapstore=mapstore,
+                                   parameters={'Ru': chem.RU},
+                                   can_vectorize=can_vectorize,
+                                   vectorization_specializer=vec_spec))
+
+    return knl_list
+
+
+def __chain_insns(insns, prefix, first_dep):
+    """
+    Gives each of the (unrolled) instructions in :param:`insns` a unique id,
+    of the form `prefix_#`, dependent on the previous instruction such that they
+    are executed in order
+    """
+    chained = []
+    for i, insn in enumerate(insns):
+        dep = first_dep if not i else '{}_{}'.format(prefix, i - 1)
+        chained.append('{} {{id={}_{}, dep={}}}'.format(insn, prefix, i, dep))
+    return '\n'.join(chained)
+
+
+def sparse_lu_factor(loopy_opts, namestore, lu_info, test_size=None):
+    """Generates instructions, kernel arguements, and data for the sparse
+    LU-factorization of the iteration matrix:
+
+    .. math::
+        \\mathcal{A} = \\mathcal{I} - \\gamma \\mathcal{J}
+
+    as found in the Newton iterations of implicit integrators.  The iteration
+    matrix is scattered into the (permuted) factorization pattern found by
+    :func:`determine_lu_structure`, and the numeric factorization is fully unrolled
+    over this fixed pattern
+
+    Parameters
+    ----------
+
+    loopy_opts : `loopy_options` object
+        A object containing all the loopy options to execute
+    namestore : :class:`array_creator.NameStore`
+        The namestore / creator for this method
+    lu_info : dict
+        The symbolic factorization, from :func:`determine_lu_structure`
+    test_size : int
+        If not none, this kernel is being used for testing.
+        Hence we need to size the arrays accordingly
+
+    Returns
+    -------
+    knl_list : list of :class:`knl_info`
+        The generated infos for feeding into the kernel generator
+    """
+
+    # loop over the entries of the factored matrix
+    mapstore = arc.MapStore(loopy_opts, namestore.lu_entries, namestore.lu_entries)
+
+    kernel_data = []
+    if namestore.test_size == 'problem_size':
+        kernel_data.append(namestore.problem_size)
+
+    if loopy_opts.jac_format == JacobianFormat.sparse:
+        # the storage index of the corresponding entry in the sparse Jacobian
+        inds_lp, inds_str = mapstore.apply_maps(namestore.lu_jac_inds, var_name)
+        jac_lp, jac_str = mapstore.apply_maps(namestore.jac, global_ind, inds_str,
+                                              ignore_lookups=True)
+        kernel_data.append(inds_lp)
+    else:
+        rows_lp, rows_str = mapstore.apply_maps(namestore.lu_jac_rows, var_name)
+        cols_lp, cols_str = mapstore.apply_maps(namestore.lu_jac_cols, var_name)
+        jac_lp, jac_str = mapstore.apply_maps(namestore.jac, global_ind, rows_str,
+                                              cols_str)
+        kernel_data.extend([rows_lp, cols_lp])
+
+    mask_lp, mask_str = mapstore.apply_maps(namestore.lu_jac_mask, var_name)
+    diag_lp, diag_str = mapstore.apply_maps(namestore.lu_diag, var_name)
+    gamma_lp, gamma_str = mapstore.apply_maps(namestore.lu_gamma, global_ind)
+    lu_lp, lu_str = mapstore.apply_maps(namestore.jac_lu, *default_inds)
+    _, entry_str = mapstore.apply_maps(namestore.jac_lu, global_ind, '${entry}')
+
+    kernel_data.extend([jac_lp, mask_lp, diag_lp, gamma_lp, lu_lp])
+
+    # scatter the iteration matrix into the factorization pattern
+    instructions = Template("""
+    ${lu_str} = ${diag_str} - ${gamma_str} * ${mask_str} * ${jac_str} {id=lu_init}
+    """).safe_substitute(**locals())
+
+    def __entry(ind):
+        return Template(entry_str).safe_substitute(entry=ind)
+
+    # and unroll the row-wise numeric factorization
+    row_ptr = lu_info['row_ptr']
+    col_ind = lu_info['col_ind']
+    diag = lu_info['diag']
+    post_instructions = []
+    for i in range(row_ptr.size - 1):
+        pos = dict((col_ind[p], p) for p in range(row_ptr[i], row_ptr[i + 1]))
+        for p in range(row_ptr[i], diag[i]):
+            k = col_ind[p]
+            post_instructions.append('{0} = {0} * lu_inv_{1}'.format(
+                __entry(p), k))
+            for q in range(diag[k] + 1, row_ptr[k + 1]):
+                post_instructions.append('{0} = {0} - {1} * {2}'.format(
+                    __entry(pos[col_ind[q]]), __entry(p), __entry(q)))
+        if i < row_ptr.size - 2:
+            # store the inverse of the pivot for the following rows
+            post_instructions.append('<> lu_inv_{} = 1 / {}'.format(
+                i, __entry(diag[i])))
+    post_instructions = __chain_insns(post_instructions, 'lu_factor', 'lu_init')
+
+    # the unrolled factorization is sequential for each state
+    can_vectorize, vec_spec = ic.get_deep_specializer(
+        loopy_opts, init_ids=['lu_init'], atomic_ids=['lu_factor_*'],
+        use_atomics=False)
+
+    return k_gen.knl_info(name='sparse_lu_factor',
+                          instructions=instructions,
+                          post_instructions=post_instructions,
+                          var_name=var_name,
+                          kernel_data=kernel_data,
+                          mapstore=mapstore,
+                          can_vectorize=can_vectorize,
+                          vectorization_specializer=vec_spec
+                          )
+
+
+def sparse_lu_solve(loopy_opts, namestore, lu_info, test_size=None):
+    """Generates instructions, kernel arguements, and data for the solution of:
+
+    .. math::
+        \\left(\\mathcal{I} - \\gamma \\mathcal{J}\\right) \\vec{x} = \\vec{b}
+
+    using the factored iteration matrix from :func:`sparse_lu_factor`.  The
+    forward and backward substitutions are fully unrolled over the fixed
+    factorization pattern, and performed in-place on the solution vector.
+
+    Parameters
+    ----------
+
+    loopy_opts : `loopy_options` object
+        A object containing all the loopy options to execute
+    namestore : :class:`array_creator.NameStore`
+        The namestore / creator for this method
+    lu_info : dict
+        The symbolic factorization, from :func:`determine_lu_structure`
+    test_size : int
+        If not none, this kernel is being used for testing.
+        Hence we need to size the arrays accordingly
+
+    Returns
+    -------
+    knl_list : list of :class:`knl_info`
+        The generated infos for feeding into the kernel generator
+    """
+
+    # loop over the state vector
+    mapstore = arc.MapStore(loopy_opts, namestore.phi_inds, namestore.phi_inds)
+
+    kernel_data = []
+    if namestore.test_size == 'problem_size':
+        kernel_data.append(namestore.problem_size)
+
+    rhs_lp, rhs_str = mapstore.apply_maps(namestore.lu_rhs, *default_inds)
+    sol_lp, sol_str = mapstore.apply_maps(namestore.lu_sol, *default_inds)
+    lu_lp, lu_str = mapstore.apply_maps(namestore.jac_lu, global_ind, '${entry}')
+    _, entry_str = mapstore.apply_maps(namestore.lu_sol, global_ind, '${entry}')
+
+    kernel_data.extend([rhs_lp, sol_lp, lu_lp])
+
+    instructions = Template("""
+    ${sol_str} = ${rhs_str} {id=lu_copy}
+    """).safe_substitute(**locals())
+
+    def __lu(ind):
+        return Template(lu_str).safe_substitute(entry=ind)
+
+    def __sol(ind):
+        return Template(entry_str).safe_substitute(entry=ind)
+
+    # the rows of the factored matrix are permuted w.r.t. the state vector
+    perm = lu_info['perm']
+    row_ptr = lu_info['row_ptr']
+    col_ind = lu_info['col_ind']
+    diag = lu_info['diag']
+    post_instructions = []
+    # forward substitution with the unit lower-triangular factor
+    for i in range(perm.size):
+        for p in range(row_ptr[i], diag[i]):
+            post_instructions.append('{0} = {0} - {1} * {2}'.format(
+                __sol(perm[i]), __lu(p), __sol(perm[col_ind[p]])))
+    # and backward substitution with the upper-triangular factor
+    for i in reversed(range(perm.size)):
+        for p in range(diag[i] + 1, row_ptr[i + 1]):
+            post_instructions.append('{0} = {0} - {1} * {2}'.format(
+                __sol(perm[i]), __lu(p), __sol(perm[col_ind[p]])))
+        post_instructions.append('{0} = {0} / {1}'.format(
+            __sol(perm[i]), __lu(diag[i])))
+    post_instructions = __chain_insns(post_instructions, 'lu_solve', 'lu_copy')
+
+    # the unrolled substitution is sequential for each state
+    can_vectorize, vec_spec = ic.get_deep_specializer(
+        loopy_opts, init_ids=['lu_copy'], atomic_ids=['lu_solve_*'],
+        use_atomics=False)
+
+    return k_gen.knl_info(name='sparse_lu_solve',
+                          instructions=instructions,
+                          post_instructions=post_instructions,
+                          var_name=var_name,
+                          kernel_data=kernel_data,
+                          mapstore=mapstore,
+                          can_vectorize=can_vectorize,
+                          vectorization_specializer=vec_spec
+                          )
+
+
 @ic.with_conditional_jacobian
 def finite_difference_jacobian(reacs, specs, loopy_opts, conp=True, test_size=None,
                                order=1, rtol=1e-8, atol=1e-15,
                                mode=FiniteDifferenceMode.forward,
-                               jac_create=None, mem_limits=''):
+                               jac_create=None, mem_limits='', coloring=False):
     """
     Creates a wrapper around the species rates kernels that evaluates a central,
     forward or backwards finite difference Jacobian of the given :param:`order`,
@@ -4402,6 +4928,11 @@ def finite_difference_jacobian(reacs, specs, loopy_opts, conp=True, test_size=No
         the generated pyjac code may allocate.  Useful for testing, or otherwise
         limiting memory usage during runtime. The keys of this file are the
         members of :class:`pyjac.kernel_utils.memory_manager.mem_type`
+    coloring: bool [False]
+        If True, perturb structurally orthogonal columns of the Jacobian
+        simultaneously, as determined by :func:`determine_fd_coloring`.  This
+        reduces the number of species rates evaluations from the number of
+        columns of the Jacobian to the number of colors.
 
     Returns
     -------
@@ -4420,6 +4951,8 @@ def finite_difference_jacobian(reacs, specs, loopy_opts, conp=True, test_size=No
     # figure out rates and info
     rate_info = determine_jac_inds(reacs, specs, loopy_opts.rate_spec,
                                    loopy_opts.jac_type)
+    if coloring:
+        rate_info['fd_coloring'] = determine_fd_coloring(rate_info['jac_inds'])
 
     # create the namestore
     namestore = arc.NameStore(loopy_opts, rate_info, conp, test_size=test_size)
@@ -4429,9 +4962,14 @@ def finite_difference_jacobian(reacs, specs, loopy_opts, conp=True, test_size=No
     if namestore.test_size == 'problem_size':
         kernel_data.append(namestore.problem_size)
 
-    # need to loop over all non-zero phi entries
-    mapstore = arc.MapStore(loopy_opts, namestore.phi_inds,
-                            namestore.phi_inds)
+    if coloring:
+        # need to loop over all colors
+        mapstore = arc.MapStore(loopy_opts, namestore.fd_colors,
+                                namestore.fd_colors)
+    else:
+        # need to loop over all non-zero phi entries
+        mapstore = arc.MapStore(loopy_opts, namestore.phi_inds,
+                                namestore.phi_inds)
 
     # next, define our FD coefficients
     # take from https://en.wikipedia.org/wiki/Finite_difference_coefficient
@@ -4502,11 +5040,7 @@ def finite_difference_jacobian(reacs, specs, loopy_opts, conp=True, test_size=No
     i_sum = 'i_sum'
     i_copy = 'i_copy'
     i_end = 'i_end'
-    # copy and end use non-zero inds
-    nnz_phi = namestore.net_nonzero_phi
     extra_inames = [(i_sum, '0 <= {} < {}'.format(i_sum, phi_size)),
-                    (i_copy, '0 <= {} < {}'.format(i_copy, nnz_phi.size)),
-                    (i_end, '0 <= {} < {}'.format(i_end, nnz_phi.size)),
                     ('k', '0 <= k < {}'.format(xcoeffs.shape[0]))]
 
     # start creating our variables
@@ -4515,36 +5049,6 @@ def finite_difference_jacobian(reacs, specs, loopy_opts, conp=True, test_size=No
     phi_lp, phi_isum = mapstore.apply_maps(namestore.n_arr, global_ind, i_sum)
     dphi_lp, dphi_isum = mapstore.apply_maps(namestore.n_dot, global_ind, i_sum)
 
-    # iterate over net non-zero phi (i.e. those w / non-zero derivatives)
-    _, phi_str = mapstore.apply_maps(namestore.n_arr, global_ind, var_name)
-
-    # jacobian update
-    jac_var_template = '{}'
-    if not mapstore._is_contiguous(nnz_phi):
-        # need to add a map
-        nnz_phi_lp, jac_var_template = mapstore.apply_maps(nnz_phi, jac_var_template)
-        kernel_data.append(nnz_phi_lp)
-
-    # dphi for the update instruction needs to be keyed on the same non-zero phi
-    # index
-    _, dphi_copy = mapstore.apply_maps(namestore.n_dot, global_ind,
-                                       jac_var_template.format(i_copy))
-
-    # update the jacobian for this ycoeff * dphi
-    jac_update_insn = Template('${jac_str} = ${jac_str} + ycoeffs[k] * ${dphi_copy} \
-                       {id=update, dep=${deps}}').safe_substitute(
-                       dphi_copy=dphi_copy)
-    jac_lp, jac_update_insn = jac_create(
-        mapstore, namestore.jac, global_ind, jac_var_template.format(i_copy),
-        var_name, deps='call_barrier', insn=jac_update_insn)
-    # finite difference division
-    jac_finite_diff_insn = '${jac_str} = ${jac_str} / r \
-                           {id=final, dep=${deps}, nosync=update}'
-    _, jac_finite_diff_insn = jac_create(
-        mapstore, namestore.jac, global_ind, jac_var_template.format(i_end),
-        var_name, deps='update', insn=jac_finite_diff_insn)
-    kernel_data.extend([phi_lp, dphi_lp, jac_lp])
-
     # we will have to replace this during kernel creation, but for now we just
     # need to put a call
     spec_rate_call = 'dummy()'
@@ -4604,22 +5108,184 @@ def finite_difference_jacobian(reacs, specs, loopy_opts, conp=True, test_size=No
 
     # and join
     pre_instructions = '\n'.join([sum_init, ewt_calcs, fac_inits])
+    post_instructions = []
+
+    if coloring:
+        # loop over the perturbed columns of this color
+        i_col = 'i_col'
+        i_set = 'i_set'
+        i_reset = 'i_reset'
+        for iname in [i_col, i_set, i_reset]:
+            extra_inames.append(
+                (iname, 'col_offset <= {} < col_offset_next'.format(iname)))
+        # and the Jacobian entries updated by this color
+        for iname in [i_copy, i_end]:
+            extra_inames.append(
+                (iname, 'entry_offset <= {} < entry_offset_next'.format(iname)))
+
+        col_offset_lp, col_offset_str = mapstore.apply_maps(
+            namestore.fd_color_col_offsets, var_name)
+        _, col_offset_next_str = mapstore.apply_maps(
+            namestore.fd_color_col_offsets, var_name, affine=1)
+        entry_offset_lp, entry_offset_str = mapstore.apply_maps(
+            namestore.fd_color_entry_offsets, var_name)
+        _, entry_offset_next_str = mapstore.apply_maps(
+            namestore.fd_color_entry_offsets, var_name, affine=1)
+
+        # perturbed columns
+        cols_lp, col_str = mapstore.apply_maps(namestore.fd_color_cols, i_col)
+        _, col_set = mapstore.apply_maps(namestore.fd_color_cols, i_set)
+        _, col_reset = mapstore.apply_maps(namestore.fd_color_cols, i_reset)
+        _, phi_str = mapstore.apply_maps(namestore.n_arr, global_ind, col_str)
+        _, phi_set_str = mapstore.apply_maps(namestore.n_arr, global_ind, col_set)
+        _, phi_reset_str = mapstore.apply_maps(
+            namestore.n_arr, global_ind, col_reset)
+
+        # and updated Jacobian entries
+        rows_lp, row_copy = mapstore.apply_maps(
+            namestore.fd_color_entry_rows, i_copy)
+        _, row_end = mapstore.apply_maps(namestore.fd_color_entry_rows, i_end)
+        entry_cols_lp, col_copy = mapstore.apply_maps(
+            namestore.fd_color_entry_cols, i_copy)
+        _, col_end = mapstore.apply_maps(namestore.fd_color_entry_cols, i_end)
+        _, dphi_copy = mapstore.apply_maps(namestore.n_dot, global_ind, row_copy)
+
+        # as multiple columns are perturbed at once, we need to store the original
+        # phi and perturbation of each
+        phi_orig = lp.TemporaryVariable('phi_orig', order=loopy_opts.order,
+                                        shape=(phi_size,), dtype=np.float64,
+                                        scope=scopes.PRIVATE)
+        perturbation = lp.TemporaryVariable('r', order=loopy_opts.order,
+                                            shape=(phi_size,), dtype=np.float64,
+                                            scope=scopes.PRIVATE)
+
+        # update the jacobian for this ycoeff * dphi
+        jac_update_insn = Template('${jac_str} = ${jac_str} + ycoeffs[k] * \
+                           ${dphi_copy} {id=update, dep=${deps}}').safe_substitute(
+                           dphi_copy=dphi_copy)
+        jac_lp, jac_update_insn = jac_create(
+            mapstore, namestore.jac, global_ind, row_copy, col_copy,
+            deps='call_barrier', insn=jac_update_insn, entry_exists=True)
+        # finite difference division
+        jac_finite_diff_insn = Template('${jac_str} = ${jac_str} / r[${col_end}] \
+                               {id=final, dep=${deps}, nosync=update}'
+                                        ).safe_substitute(col_end=col_end)
+        _, jac_finite_diff_insn = jac_create(
+            mapstore, namestore.jac, global_ind, row_end, col_end,
+            deps='update', insn=jac_finite_diff_insn, entry_exists=True)
+        kernel_data.extend([phi_lp, dphi_lp, jac_lp, phi_orig, perturbation,
+                            col_offset_lp, cols_lp, entry_offset_lp, rows_lp,
+                            entry_cols_lp])
+
+        # color offsets
+        offsets = Template("""
+        <> col_offset = ${col_offset_str}
+        <> col_offset_next = ${col_offset_next_str}
+        <> entry_offset = ${entry_offset_str}
+        <> entry_offset_next = ${entry_offset_next_str}
+        """).safe_substitute(**locals())
 
-    # inner loop instructions
-    per_spec_fac = Template("""
-    <> phi_orig = ${phi_str} {dep=*}
-    <> r = fmax(srur * fabs(phi_orig), r0 / ewt[i])
-    """).safe_substitute(**locals())
-    # put in vecloop
-    per_spec_fac, iname = ic.place_in_vectorization_loop(
-        loopy_opts, per_spec_fac, namer, vectorize=True)
-    if iname:
-        extra_inames.append(iname)
+        # inner loop instructions
+        per_spec_fac = Template("""
+        for ${i_col}
+            phi_orig[${col_str}] = ${phi_str} {id=orig, dep=*}
+            r[${col_str}] = fmax(srur * fabs(phi_orig[${col_str}]), \
+                r0 / ewt[${col_str}]) {id=perturb, dep=orig}
+        end
+        """).safe_substitute(**locals())
+        # put in vecloop
+        per_spec_fac, iname = ic.place_in_vectorization_loop(
+            loopy_opts, per_spec_fac, namer, vectorize=True)
+        if iname:
+            extra_inames.append(iname)
+        per_spec_fac = offsets + per_spec_fac
+
+        # phi update instruction in FD loop
+        phi_set = Template("""
+        for ${i_set}
+            ${phi_set_str} = phi_orig[${col_set}] + xcoeffs[k] * r[${col_set}] \
+                {id=change, nosync=*}
+        end
+        """).safe_substitute(**locals())
+
+        # and reset the phi values to original
+        phi_reset = Template("""
+        for ${i_reset}
+            ${phi_reset_str} = phi_orig[${col_reset}] {id=phi_reset, \
+                dep=*:update, nosync=*}
+        end
+        """).safe_substitute(**locals())
+
+        # finally, the species rates must be evaluated at the original state
+        # to compute the temperature and extra variable rows of the species
+        # columns (see :func:`determine_fd_coloring`)
+        base_call = Template("""
+        ${spec_rate_call} {id=base_call, dep=end}
+        ${barrier} {id=base_barrier, dep=base_call${mem_kind}}
+        """).safe_substitute(**locals())
+        base_call, iname = ic.place_in_vectorization_loop(
+            loopy_opts, base_call, namer, vectorize=True)
+        if iname:
+            extra_inames.append(iname)
+        post_instructions.append(base_call)
+    else:
+        # copy and end use non-zero inds
+        nnz_phi = namestore.net_nonzero_phi
+        extra_inames.extend([
+            (i_copy, '0 <= {} < {}'.format(i_copy, nnz_phi.size)),
+            (i_end, '0 <= {} < {}'.format(i_end, nnz_phi.size))])
+
+        # iterate over net non-zero phi (i.e. those w / non-zero derivatives)
+        _, phi_str = mapstore.apply_maps(namestore.n_arr, global_ind, var_name)
+
+        # jacobian update
+        jac_var_template = '{}'
+        if not mapstore._is_contiguous(nnz_phi):
+            # need to add a map
+            nnz_phi_lp, jac_var_template = mapstore.apply_maps(
+                nnz_phi, jac_var_template)
+            kernel_data.append(nnz_phi_lp)
+
+        # dphi for the update instruction needs to be keyed on the same non-zero
+        # phi index
+        _, dphi_copy = mapstore.apply_maps(namestore.n_dot, global_ind,
+                                           jac_var_template.format(i_copy))
+
+        # update the jacobian for this ycoeff * dphi
+        jac_update_insn = Template('${jac_str} = ${jac_str} + ycoeffs[k] * \
+                           ${dphi_copy} {id=update, dep=${deps}}').safe_substitute(
+                           dphi_copy=dphi_copy)
+        jac_lp, jac_update_insn = jac_create(
+            mapstore, namestore.jac, global_ind, jac_var_template.format(i_copy),
+            var_name, deps='call_barrier', insn=jac_update_insn)
+        # finite difference division
+        jac_finite_diff_insn = '${jac_str} = ${jac_str} / r \
+                               {id=final, dep=${deps}, nosync=update}'
+        _, jac_finite_diff_insn = jac_create(
+            mapstore, namestore.jac, global_ind, jac_var_template.format(i_end),
+            var_name, deps='update', insn=jac_finite_diff_insn)
+        kernel_data.extend([phi_lp, dphi_lp, jac_lp])
+
+        # inner loop instructions
+        per_spec_fac = Template("""
+        <> phi_orig = ${phi_str} {dep=*}
+        <> r = fmax(srur * fabs(phi_orig), r0 / ewt[i])
+        """).safe_substitute(**locals())
+        # put in vecloop
+        per_spec_fac, iname = ic.place_in_vectorization_loop(
+            loopy_opts, per_spec_fac, namer, vectorize=True)
+        if iname:
+            extra_inames.append(iname)
+
+        # phi update instruction in FD loop
+        phi_set = Template("""
+        ${phi_str} = phi_orig + xcoeffs[k] * r {id=change, nosync=*}
+        """).safe_substitute(**locals())
+
+        # and reset the phi value to original
+        phi_reset = Template('${phi_str} = phi_orig {id=phi_reset, dep=*:update, '
+                             'nosync=*}').safe_substitute(**locals())
 
-    # phi update instruction in FD loop
-    phi_set = Template("""
-    ${phi_str} = phi_orig + xcoeffs[k] * r {id=change, nosync=*}
-    """).safe_substitute(**locals())
     phi_set, iname = ic.place_in_vectorization_loop(
         loopy_opts, phi_set, namer, vectorize=ic.use_atomics(loopy_opts))
     if iname:
@@ -4641,9 +5307,6 @@ def finite_difference_jacobian(reacs, specs, loopy_opts, conp=True, test_size=No
     if iname:
         extra_inames.append(iname)
 
-    # and reset the phi value to original
-    phi_reset = Template('${phi_str} = phi_orig {id=phi_reset, dep=*:update, '
-                         'nosync=*}').safe_substitute(**locals())
     phi_reset, iname = ic.place_in_vectorization_loop(
         loopy_opts, phi_reset, namer, vectorize=ic.use_atomics(loopy_opts))
     if iname:
@@ -4700,6 +5363,7 @@ def __fixer(knl):
     info = k_gen.knl_info(name='fd_jac',
                           instructions=instructions,
                           pre_instructions=pre_instructions,
+                          post_instructions=post_instructions,
                           mapstore=mapstore,
                           var_name=var_name,
                           kernel_data=kernel_data,
@@ -4716,18 +5380,27 @@ def __fixer(knl):
     output_arrays = ['jac']
 
     # and finally add a reset array
-    reset = reset_arrays(loopy_opts, namestore, test_size=test_size)
+    kernels = [reset_arrays(loopy_opts, namestore, test_size=test_size), info]
+
+    if coloring:
+        # the temperature and extra variable rows of the species columns are
+        # computed from the finite difference species rows
+        kernels.extend([
+            total_specific_energy(loopy_opts, namestore, conp=conp,
+                                  test_size=test_size),
+            dTdot_dnj(loopy_opts, namestore, conp=conp, test_size=test_size),
+            dEdot_dnj(loopy_opts, namestore, conp=conp, test_size=test_size)])
 
     # and barriers
     barriers = []
     if loopy_opts.depth:
-        barriers.append((0, 1, 'global'))
+        barriers.extend([(i, i + 1, 'global') for i in range(len(kernels) - 1)])
 
     # and return the full generator
     return k_gen.make_kernel_generator(
         loopy_opts=loopy_opts,
         name='jacobian_kernel',
-        kernels=sub_kernels + [reset, info],
+        kernels=sub_kernels + kernels,
         namestore=namestore,
         depends_on=[sgen],
         input_arrays=input_arrays,
@@ -4739,7 +5412,8 @@ def __fixer(knl):
 
 
 def get_jacobian_kernel(reacs, specs, loopy_opts, conp=True, test_size=None,
-                        mem_limits=''):
+                        mem_limits='', output_species_rates=False, jac_vec=False,
+                        jac_lu=False):
     """Helper function that generates kernels for
        evaluation of analytical jacobian
 
@@ -4762,6 +5436,27 @@ def get_jacobian_kernel(reacs, specs, loopy_opts, conp=True, test_size=None,
         the generated pyjac code may allocate.  Useful for testing, or otherwise
         limiting memory usage during runtime. The keys of this file are the
         members of :class:`pyjac.kernel_utils.memory_manager.mem_type`
+    output_species_rates: bool [False]
+        If True, the species rates (i.e., the time derivative of the state vector,
+        `dphi`) evaluated as part of the Jacobian will also be output from the
+        generated kernel.  As the rate constants, pressure modifications,
+        thermodynamic properties, etc. are evaluated only once and shared
+        between the species rates and Jacobian, this is cheaper than separate
+        species rates and Jacobian evaluations (e.g., for Newton iterations in
+        an implicit integrator)
+    jac_vec: bool [False]
+        If True, the generated kernel takes an additional input vector, `vec`,
+        and outputs the product of the Jacobian with this vector, `jvp`, rather
+        than the Jacobian itself.  The Jacobian is never stored, as the Jacobian
+        entries are accumulated directly into the product, see
+        :func:`jacobian_vector_product`
+    jac_lu: bool [False]
+        If True, the generated kernel takes the additional inputs `gamma` and
+        `rhs`, and outputs the sparse LU-factorization of the iteration matrix
+        :math:`\\mathcal{I} - \\gamma \\mathcal{J}`, `jac_lu`, as well as the
+        solution of the corresponding linear system for the right hand side,
+        `sol`, rather than the Jacobian itself.  See :func:`sparse_lu_factor`
+        and :func:`sparse_lu_solve`
 
     Returns
     -------
@@ -4770,16 +5465,24 @@ def get_jacobian_kernel(reacs, specs, loopy_opts, conp=True, test_size=None,
 
     """
 
+    assert not (jac_vec and jac_lu), (
+        'The Jacobian-vector product and sparse LU-factorization outputs are '
+        'mutually exclusive')
+
     # figure out rates and info
     rate_info = determine_jac_inds(reacs, specs, loopy_opts.rate_spec,
                                    loopy_opts.jac_type)
+    if jac_lu:
+        # and the symbolic factorization
+        rate_info['jac_lu'] = determine_lu_structure(rate_info['jac_inds'])
 
     # set test size
     if test_size is None:
         test_size = 'problem_size'
 
     # create the namestore
-    nstore = arc.NameStore(loopy_opts, rate_info, conp, test_size)
+    nstore = arc.NameStore(loopy_opts, rate_info, conp, test_size,
+                           jac_vec=jac_vec)
 
     kernels = []
     barriers = []
@@ -4949,6 +5652,33 @@ def __insert_at(name, before=True):
 
     input_arrays = ['phi', 'P_arr' if conp else 'V_arr']
     output_arrays = ['jac']
+    if jac_vec:
+        # and finally, complete the temperature and extra variable rows of the
+        # product from the species rows
+        for knl in jacobian_vector_product(loopy_opts, nstore, conp=conp,
+                                           test_size=test_size):
+            __add_knl(knl)
+            # (depends on the preceeding rows of the product)
+            __insert_at(kernels[-1].name)
+        input_arrays += ['vec']
+        output_arrays = ['jvp']
+    if jac_lu:
+        # factor the iteration matrix
+        __add_knl(sparse_lu_factor(loopy_opts, nstore, rate_info['jac_lu'],
+                                   test_size=test_size))
+        # (depends on the entire Jacobian)
+        __insert_at(kernels[-1].name)
+        # and solve the linear system
+        __add_knl(sparse_lu_solve(loopy_opts, nstore, rate_info['jac_lu'],
+                                  test_size=test_size))
+        # (depends on the factorization)
+        __insert_at(kernels[-1].name)
+        input_arrays += ['gamma', 'rhs']
+        output_arrays = ['jac_lu', 'sol']
+    if output_species_rates:
+        # the species rates are already evaluated by the sub-kernels, and simply
+        # need to be copied back to the host
+        output_arrays = ['dphi'] + output_arrays
 
     # create the specrates subkernel
     sgen = rate.get_specrates_kernel(reacs, specs, loopy_opts, conp=conp,
@@ -5056,14 +5786,18 @@ def find_last_species(specs, last_spec=None, return_map=False):
 def create_jacobian(lang, mech_name=None, therm_name=None, gas=None,
                     vector_size=None, wide=False, deep=False, ilp=None, unr=None,
                     build_path='./out/', last_spec=None, skip_jac=False, platform='',
-                    data_order='C', rate_specialization='full',
-                    split_rate_kernels=True, split_rop_net_kernels=False,
+                    data_order='C', rate_specialization=None,
+                    split_rate_kernels=None, split_rop_net_kernels=None,
                     conp=True, data_filename='data.bin', output_full_rop=False,
                     use_atomics=True, jac_type='exact', jac_format='full',
-                    for_validation=False, seperate_kernels=True,
+                    for_validation=False, seperate_kernels=None,
                     fd_order=1, fd_mode='forward', mem_limits='',
-                    fixed_size=None,
-                    ):
+                    fixed_size=None, cache_dir=None, jobs=1,
+                    output_species_rates=False, sort_type=None,
+                    fd_coloring=False, kc_polynomials=False,
+                    temperature_binning=False, jac_vec=False, jac_lu=False,
+                    arena=False, cache_tile=None, profile=False,
+                    double_buffer=None, prefix=''):
     """Create Jacobian subroutine from mechanism.
 
     Parameters
@@ -5106,17 +5840,21 @@ def create_jacobian(lang, mech_name=None, therm_name=None, gas=None,
     data_order : {'C', 'F'}
         The data ordering, 'C' (row-major) recommended for deep vectorizations,
         while 'F' (column-major) recommended for wide vectorizations
-    rate_specialization : {'fixed', 'hybrid', 'full'}
+    rate_specialization : {'fixed', 'hybrid', 'full'} [None]
         The level of specialization in evaluating reaction rates.
         'Full' is the full form suggested by Lu et al. (citation)
         'Hybrid' turns off specializations in the exponential term (Ta = 0, b = 0)
         'Fixed' is a fixed expression exp(logA + b logT + Ta / T)
-    split_rate_kernels : bool
+        If not supplied, the value in the code-generation :param:`platform` file,
+        or 'full' is used
+    split_rate_kernels : bool [None]
         If True, and the :param"`rate_specialization` is not 'Fixed', split different
-        valuation types into different kernels
-    split_rop_net_kernels : bool
+        valuation types into different kernels.  If not supplied, the value in the
+        code-generation :param:`platform` file, or True is used
+    split_rop_net_kernels : bool [None]
         If True, break different ROP values (fwd / back / pdep) into different
-        kernels
+        kernels.  If not supplied, the value in the code-generation
+        :param:`platform` file, or False is used
     conp : bool
         If True, use the constant pressure assumption.  If False, use the constant
         volume assumption.
@@ -5150,18 +5888,56 @@ def create_jacobian(lang, mech_name=None, therm_name=None, gas=None,
     for_validation: bool [False]
         If True, this kernel is being generated to validate pyJac, hence we need
         to save output data to a file
-    seperate_kernels: bool [True]
+    seperate_kernels: bool [None]
         If True, separate evaluation into different functions in the generated kernel
         in order to improve compiler vectorization / optimization.
         However, on some platforms / vectorization combinations this breaks
         (or greatly slows) kernel compilation, hence we provide a method to turn if
-        off if necessary.
+        off if necessary.  If not supplied, the value in the code-generation
+        :param:`platform` file, or True is used
     fd_order: int [1]
         The order of the finite difference jacobian -- used if :param:`jac_type` ==
         'finite_difference'
     fd_mode: ['forward', 'backward', 'central']
         The mode of the finite difference Jacobian, forward, backwards or central
         used if :param:`jac_type` == 'finite_difference'
+    fd_coloring: bool [False]
+        If True, use a compressed (column-colored) finite difference Jacobian,
+        see :func:`finite_difference_jacobian`.  Used if :param:`jac_type` ==
+        'finite_difference'
+    kc_polynomials: bool [False]
+        If True, evaluate the equilibrium constants of the reversible reactions
+        from per-reaction polynomials precomputed during code-generation, and skip
+        the evaluation of the species Gibbs polynomials.  See
+        :class:`pyjac.loopy_utils.loopy_utils.loopy_options`
+    temperature_binning: bool [False]
+        If True, the generated calling program partitions the states about the
+        temperature breakpoint of the NASA polynomials before kernel execution.
+        See :class:`pyjac.loopy_utils.loopy_utils.loopy_options`
+    arena: bool [False]
+        If True, the generated calling program allocates its working buffers in a
+        single arena, in which intermediate arrays with disjoint lifetimes share
+        space. See :class:`pyjac.loopy_utils.loopy_utils.loopy_options`
+    cache_tile: int or 'auto' [None]
+        If supplied, limit the number of states each OpenMP thread evaluates per
+        kernel call such that its working buffers remain resident in cache.  If
+        'auto', the number of states is chosen based on the host's cache topology.
+        See :class:`pyjac.loopy_utils.loopy_utils.loopy_options`
+    profile: bool [False]
+        If True, the generated code times the execution of each sub-kernel, and
+        the calling program writes the timings to a CSV file.
+        See :class:`pyjac.loopy_utils.loopy_utils.loopy_options`
+    double_buffer: bool [None]
+        If True, the generated OpenCL calling program overlaps the memory
+        transfers of the next chunk of states with kernel execution of the
+        current chunk, using a pair of device buffers for the input / output
+        arrays.  If None, the setting of the code-generation :param:`platform` is
+        used (if any).  See :class:`pyjac.loopy_utils.loopy_utils.loopy_options`
+    prefix: str ['']
+        If supplied, prepended to every exported symbol and include guard of the
+        generated code, e.g., such that the kernels of multiple mechanisms may be
+        linked into one program.  The generated file names are unchanged.
+        See :class:`pyjac.loopy_utils.loopy_utils.loopy_options`
     mem_limits: str ['']
         Path to a .yaml file indicating desired memory limits that control the
         desired maximum amount of global / local / or constant memory that
@@ -5175,6 +5951,39 @@ def create_jacobian(lang, mech_name=None, therm_name=None, gas=None,
         library that that has already been parallelized, e.g., via OpenMP).
         This setting will also fix array strides as discussed in the documentation,
         :see:`todo`.
+    cache_dir: str [None]
+        If specified, the directory of the persistent generated source cache.
+        The generated sources are stored keyed by a hash of the mechanism, the
+        code-generation options and the pyJac version, such that subsequent calls
+        with the same inputs simply copy the cached sources to the
+        :param:`build_path`.  If None, the cache is not used.
+    jobs: int [1]
+        The number of processes to use for constructing the loopy kernels.  The
+        generated source is identical regardless of the number of jobs.
+    output_species_rates: bool [False]
+        If True, generate a fused kernel that outputs both the species rates and
+        the (analytical) Jacobian, sharing all intermediate quantities -- see
+        :func:`get_jacobian_kernel`
+    sort_type: :class:`pyjac.core.mech_interpret.SortType` or str [None]
+        If specified, reorder the species and reactions of the mechanism to
+        improve the memory locality of the generated kernels -- see
+        :func:`pyjac.core.mech_interpret.sort_mechanism`.  The generated driver
+        converts the inputs / outputs of the kernel to / from the original
+        species and reaction order, with the exception of the sparse
+        LU-factorization of :param:`jac_lu`.  The resulting permutation is written
+        to the :param:`build_path`, and may be loaded via
+        :class:`pyjac.pywrap.MechanismOrder` to convert the latter
+    jac_vec: bool [False]
+        If True, generate a kernel that outputs the product of the (analytical)
+        Jacobian with a supplied vector rather than the Jacobian itself, for use
+        in matrix-free solvers -- see :func:`get_jacobian_kernel`
+    jac_lu: bool [False]
+        If True, generate a kernel that outputs the sparse LU-factorization of the
+        iteration matrix of an implicit integrator, and the solution of the
+        corresponding linear system, rather than the (analytical) Jacobian itself
+        -- see :func:`get_jacobian_kernel`.  The factorization pattern is written
+        to the :param:`build_path`, and may be loaded via
+        :class:`pyjac.pywrap.LUPattern` to reuse the factorization
 
     Returns
     -------
@@ -5221,6 +6030,39 @@ def create_jacobian(lang, mech_name=None, therm_name=None, gas=None,
                         'wide' if wide else 'deep'))
         raise IncorrectInputSpecificationException(['wide', 'deep', 'vector_size'])
 
+    # the kernel options in a code-generation platform file (e.g., as selected by
+    # pyjac.autotune) are used unless otherwise specified
+    kernel_opts = {}
+    if platform and os.path.isfile(platform):
+        kernel_opts = lp_utils.load_kernel_options(platform)
+    checks = [(kernel_opts.get('rate_specialization'), rate_specialization,
+               'rate_specialization'),
+              (kernel_opts.get('split_rate_kernels'), split_rate_kernels,
+               'split_rate_kernels'),
+              (kernel_opts.get('split_rop_net_kernels'), split_rop_net_kernels,
+               'split_rop_net_kernels'),
+              (kernel_opts.get('seperate_kernels'), seperate_kernels,
+               'seperate_kernels')]
+    bad_checks = [x for x in checks if x[0] is not None and x[1] is not None and
+                  x[0] != x[1]]
+    if bad_checks:
+        raise Exception('Kernel options from supplied code-generation platform: '
+                        '{}, do not match supplied arguements.\n'.format(
+                            platform) + '\n'.join('{}:{}!={}'.format(
+                                x[-1], x[0], x[1]) for x in bad_checks))
+
+    def __option(name, value, default):
+        if value is not None:
+            return value
+        return kernel_opts.get(name, default)
+
+    rate_specialization = __option(
+        'rate_specialization', rate_specialization, 'full')
+    split_rate_kernels = __option('split_rate_kernels', split_rate_kernels, True)
+    split_rop_net_kernels = __option(
+        'split_rop_net_kernels', split_rop_net_kernels, False)
+    seperate_kernels = __option('seperate_kernels', seperate_kernels, True)
+
     # convert enums
     rate_spec_val = utils.EnumType(lp_utils.RateSpecialization)(
         rate_specialization.lower())
@@ -5261,6 +6103,14 @@ def create_jacobian(lang, mech_name=None, therm_name=None, gas=None,
         platform = loopy_opts.platform
         device = loopy_opts.device
         device_type = loopy_opts.device_type
+        if double_buffer is None:
+            double_buffer = loopy_opts.double_buffer
+
+    # resolve the cache topology for automatic cache tiling up front, such that the
+    # tile sizes baked into the generated source are reflected in its cache key
+    cache_topology = None
+    if cache_tile == 'auto':
+        cache_topology = load_cache_topology()
 
     # create the loopy options
     loopy_opts = lp_utils.loopy_options(width=width,
@@ -5278,7 +6128,15 @@ def create_jacobian(lang, mech_name=None, therm_name=None, gas=None,
                                         jac_type=jac_type,
                                         seperate_kernels=seperate_kernels,
                                         device=device,
-                                        device_type=device_type)
+                                        device_type=device_type,
+                                        kc_polynomials=kc_polynomials,
+                                        temperature_binning=temperature_binning,
+                                        arena=arena,
+                                        cache_tile=cache_tile,
+                                        cache_topology=cache_topology,
+                                        profile=profile,
+                                        double_buffer=bool(double_buffer),
+                                        prefix=prefix)
 
     # create output directory if none exists
     build_path = os.path.abspath(build_path)
@@ -5301,6 +6159,11 @@ def create_jacobian(lang, mech_name=None, therm_name=None, gas=None,
         logger.error('No reactions found in file: {}'.format(mech_name))
         sys.exit(3)
 
+    # reorder the mechanism for memory locality, if requested
+    if sort_type is not None:
+        spec_names = [sp.name for sp in specs]
+        specs, reacs, _, reac_map = mech.sort_mechanism(specs, reacs, sort_type)
+
     # find and move last species to end
     specs = find_last_species(specs, last_spec=last_spec)
 
@@ -5321,6 +6184,45 @@ def create_jacobian(lang, mech_name=None, therm_name=None, gas=None,
                                        ', '.join([specs[rxn.pdep_sp].name
                                                   for rxn in rxns])))
 
+    if output_species_rates and (
+            skip_jac or jac_type == JacobianType.finite_difference):
+        logger = logging.getLogger(__name__)
+        logger.warn('Species rates output is only supported for analytical '
+                    'Jacobian kernels, and will be ignored.')
+        output_species_rates = False
+
+    if jac_vec and (skip_jac or jac_type == JacobianType.finite_difference):
+        logger = logging.getLogger(__name__)
+        logger.warn('The Jacobian-vector product is only supported for analytical '
+                    'Jacobian kernels, and will be ignored.')
+        jac_vec = False
+
+    if jac_lu and (skip_jac or jac_type == JacobianType.finite_difference):
+        logger = logging.getLogger(__name__)
+        logger.warn('The sparse LU-factorization is only supported for analytical '
+                    'Jacobian kernels, and will be ignored.')
+        jac_lu = False
+
+    if jac_lu and jac_vec:
+        logger = logging.getLogger(__name__)
+        logger.warn('The sparse LU-factorization cannot be combined with the '
+                    'Jacobian-vector product, and will be ignored.')
+        jac_lu = False
+
+    # check the generated source cache
+    if cache_dir:
+        cache_key = gcache.get_cache_key(
+            specs, reacs, loopy_opts, mem_limits=mem_limits, conp=conp,
+            skip_jac=skip_jac, data_filename=data_filename,
+            output_full_rop=output_full_rop, for_validation=for_validation,
+            fd_order=fd_order, fd_mode=fd_mode, fd_coloring=fd_coloring,
+            fixed_size=fixed_size, output_species_rates=output_species_rates,
+            sort_type=None if sort_type is None else str(sort_type),
+            jac_vec=jac_vec, jac_lu=jac_lu)
+        if gcache.load(cache_dir, cache_key, build_path):
+            return 0
+        before = gcache.snapshot(build_path)
+
     # write headers
     aux.write_aux(build_path, loopy_opts, specs, reacs)
 
@@ -5328,11 +6230,14 @@ def create_jacobian(lang, mech_name=None, therm_name=None, gas=None,
     if not skip_jac and jac_type != JacobianType.finite_difference:
         # get Jacobian subroutines
         gen = get_jacobian_kernel(reacs, specs, loopy_opts, conp=conp,
-                                  mem_limits=mem_limits, test_size=fixed_size)
+                                  mem_limits=mem_limits, test_size=fixed_size,
+                                  output_species_rates=output_species_rates,
+                                  jac_vec=jac_vec, jac_lu=jac_lu)
         #  write_sparse_multiplier(build_path, lang, touched, len(specs))
     elif not skip_jac and jac_type == JacobianType.finite_difference:
         gen = finite_difference_jacobian(reacs, specs, loopy_opts, conp=conp,
                                          mode=fd_mode, order=fd_order,
+                                         coloring=fd_coloring,
                                          mem_limits=mem_limits, test_size=fixed_size)
     else:
         # just specrates
@@ -5340,9 +6245,53 @@ def create_jacobian(lang, mech_name=None, therm_name=None, gas=None,
                                         conp=conp, output_full_rop=output_full_rop,
                                         mem_limits=mem_limits, test_size=fixed_size)
 
+    pattern = None
+    if not skip_jac and jac_format == JacobianFormat.sparse:
+        # the (fixed) sparsity pattern of the kernel output
+        from pyjac.pywrap.sparse_jacobian import pattern_from_jac_inds
+        jac_inds = determine_jac_inds(reacs, specs, loopy_opts.rate_spec,
+                                      jacobian_type=jac_type)['jac_inds']
+        pattern = pattern_from_jac_inds(jac_inds, loopy_opts.order)
+
+    entry_maps = None
+    if sort_type is not None:
+        # the permutation to / from the original mechanism order, applied to the
+        # inputs / outputs by the kernel's driver
+        from pyjac.pywrap.mechanism_order import MechanismOrder
+        order = MechanismOrder([spec_names.index(sp.name) for sp in specs],
+                               reac_map)
+        rate_info = assign_rates(reacs, specs, loopy_opts.rate_spec)
+        entry_maps = order.entry_maps(loopy_opts.order,
+                                      rev_map=rate_info['rev']['map'],
+                                      thd_map=rate_info['thd']['map'],
+                                      pattern=pattern)
+        if pattern is not None:
+            pattern, _ = order.pattern_from_kernel(pattern)
+
     # write the kernel
     gen.generate(build_path, data_filename=data_filename,
-                 for_validation=for_validation)
+                 for_validation=for_validation, jobs=jobs, entry_maps=entry_maps)
+
+    if pattern is not None:
+        # write the sparsity pattern for use with the kernel output
+        from pyjac.pywrap.sparse_jacobian import pattern_filename
+        pattern.save(os.path.join(build_path, pattern_filename))
+
+    if jac_lu:
+        # write the (fixed) factorization pattern for reuse of the factors
+        from pyjac.pywrap.sparse_jacobian import lu_pattern_filename, LUPattern
+        jac_inds = determine_jac_inds(reacs, specs, loopy_opts.rate_spec,
+                                      jacobian_type=jac_type)['jac_inds']
+        LUPattern.from_lu_info(determine_lu_structure(jac_inds)).save(
+            os.path.join(build_path, lu_pattern_filename))
+
+    if sort_type is not None:
+        # write the permutation to / from the original mechanism order
+        from pyjac.pywrap.mechanism_order import order_filename
+        order.save(os.path.join(build_path, order_filename))
+
+    if cache_dir:
+        gcache.store(cache_dir, cache_key, build_path, before)
     return 0
 
 
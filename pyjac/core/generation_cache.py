@@ -0,0 +1,327 @@
+"""
+generation_cache.py - a persistent, content-addressed cache of generated pyJac
+source code
+
+Generation of the kernels for large mechanisms can take a significant amount of
+time.  As the generated source is a pure function of the mechanism, the code
+generation options and the version of pyJac itself, we store the output of
+:func:`pyjac.core.create_jacobian.create_jacobian` on disk keyed by a hash of
+these inputs, and simply copy the stored sources to the build path on a cache hit.
+The cache is bounded in size, with the least-recently used entries evicted first.
+"""
+
+from __future__ import division
+
+import os
+import re
+import json
+import shutil
+import hashlib
+import logging
+import tempfile
+from enum import Enum
+
+import six
+import numpy as np
+
+from pyjac import utils
+from pyjac._version import __version__
+
+build_path_placeholder = b'@PYJAC_BUILD_PATH@'
+"""bytes: token substituted for the build path in cached source files"""
+
+package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+"""str: the root directory of the pyJac package"""
+
+entry_re = re.compile(r'^[0-9a-f]{64}$')
+"""re: matches the names of the cache entries, i.e., the :func:`get_cache_key`"""
+
+source_exts = ('.py', '.in', '.c', '.h', '.ocl', '.oclh')
+"""tuple of str: file extensions of the code-generation sources of pyJac"""
+
+
+def default_cache_dir():
+    """
+    Returns the default directory for the generated source cache.
+
+    If the environment variable `PYJAC_CACHE_DIR` is set, it will be used;
+    otherwise the cache will be placed in ~/.cache/pyjac
+
+    Returns
+    -------
+    cache_dir: str
+        The default cache directory
+    """
+    return os.environ.get('PYJAC_CACHE_DIR', os.path.join(
+        os.path.expanduser('~'), '.cache', 'pyjac'))
+
+
+def default_max_size():
+    """
+    Returns the default maximum size of the generated source cache.
+
+    If the environment variable `PYJAC_CACHE_SIZE` is set, it will be used;
+    otherwise the cache is limited to 1 GiB
+
+    Returns
+    -------
+    max_size: int
+        The maximum size of the cache, in bytes
+    """
+    return int(os.environ.get('PYJAC_CACHE_SIZE', 1 << 30))
+
+
+def _normalize(value):
+    """
+    Converts :param:`value` into a JSON-serializable form that is independent of
+    memory addresses, dictionary ordering, etc. for hashing purposes
+    """
+    if isinstance(value, Enum):
+        return utils.enum_to_string(value)
+    if isinstance(value, np.ndarray):
+        return _normalize(value.tolist())
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in six.iteritems(value)}
+    if isinstance(value, (list, tuple, set)):
+        return [_normalize(v) for v in value]
+    if value is None or isinstance(value, six.string_types + (bool, int, float)):
+        return value
+    if hasattr(value, '__dict__'):
+        return {'__class__': type(value).__name__,
+                'attrs': _normalize(vars(value))}
+    return str(value)
+
+
+def _hash_file(hasher, filename):
+    """
+    Updates :param:`hasher` with the contents of :param:`filename`, if it exists
+    """
+    if filename and os.path.isfile(filename):
+        with open(filename, 'rb') as file:
+            hasher.update(file.read())
+
+
+def source_digest():
+    """
+    Returns a digest of the code-generation sources of pyJac, such that
+    changes to the code-generator (that may not result in a version change, e.g.,
+    during development) invalidate the cache
+
+    Returns
+    -------
+    digest: str
+        The hexadecimal digest of the pyJac sources
+    """
+
+    hasher = hashlib.sha256()
+    for root, dirs, files in os.walk(package_dir):
+        # ignore tests & testing outputs
+        dirs[:] = sorted(d for d in dirs if d != 'tests' and not d.startswith('.'))
+        for f in sorted(files):
+            if f.endswith(source_exts):
+                hasher.update(os.path.relpath(
+                    os.path.join(root, f), package_dir).encode('utf-8'))
+                _hash_file(hasher, os.path.join(root, f))
+    return hasher.hexdigest()
+
+
+def get_cache_key(specs, reacs, loopy_opts, mem_limits='', **kwargs):
+    """
+    Returns the cache key for a given mechanism & set of code-generation options
+
+    Parameters
+    ----------
+    specs: list of :class:`SpecInfo`
+        The species in the mechanism (after reordering of the last species)
+    reacs: list of :class:`ReacInfo`
+        The reactions in the mechanism
+    loopy_opts: :class:`loopy_options`
+        The code-generation options
+    mem_limits: str ['']
+        Path to the memory limits file, the contents of which will be hashed
+    **kwargs: dict
+        Any other options that affect the generated code (e.g., conp, jac_type,
+        jac_format, etc.)
+
+    Returns
+    -------
+    key: str
+        The hexadecimal cache key
+    """
+
+    # take the platform & device by name to avoid hashing the pyopencl objects
+    opts = {k: v for k, v in six.iteritems(vars(loopy_opts))
+            if k not in ['platform', 'device']}
+    opts['platform'] = loopy_opts.platform_name
+    opts['device'] = getattr(loopy_opts.device, 'name', loopy_opts.device)
+
+    description = {'version': __version__,
+                   'source': source_digest(),
+                   'specs': _normalize(specs),
+                   'reacs': _normalize(reacs),
+                   'loopy_opts': _normalize(opts),
+                   'options': _normalize(kwargs)}
+    hasher = hashlib.sha256()
+    hasher.update(json.dumps(description, sort_keys=True).encode('utf-8'))
+    _hash_file(hasher, mem_limits)
+    return hasher.hexdigest()
+
+
+def snapshot(path):
+    """
+    Returns a snapshot of the files in :param:`path`, used to determine which
+    files were written during code-generation
+
+    Parameters
+    ----------
+    path: str
+        The directory to examine
+
+    Returns
+    -------
+    snapshot: dict
+        A mapping of filename -> (modification time, size, digest of the contents),
+        such that rewrites within the resolution of the modification time are
+        detected by the change in contents
+    """
+    snap = {}
+    for f in os.listdir(path):
+        fname = os.path.join(path, f)
+        if os.path.isfile(fname):
+            stat = os.stat(fname)
+            hasher = hashlib.sha256()
+            _hash_file(hasher, fname)
+            snap[f] = (getattr(stat, 'st_mtime_ns', stat.st_mtime), stat.st_size,
+                       hasher.hexdigest())
+    return snap
+
+
+def load(cache_dir, key, build_path):
+    """
+    Copies the cached sources for :param:`key` (if any) to :param:`build_path`
+
+    Parameters
+    ----------
+    cache_dir: str
+        The cache directory
+    key: str
+        The cache key, from :func:`get_cache_key`
+    build_path: str
+        The output directory for the generated files
+
+    Returns
+    -------
+    hit: bool
+        True if the sources were found in the cache and copied
+    """
+
+    entry = os.path.join(cache_dir, key)
+    if not os.path.isdir(entry):
+        return False
+
+    path = os.path.abspath(build_path).encode('utf-8')
+    for f in sorted(os.listdir(entry)):
+        with open(os.path.join(entry, f), 'rb') as file:
+            src = file.read()
+        with open(os.path.join(build_path, f), 'wb') as file:
+            file.write(src.replace(build_path_placeholder, path))
+
+    # mark as recently used
+    os.utime(entry, None)
+
+    logger = logging.getLogger(__name__)
+    logger.info('Loaded generated source from cache entry {}'.format(entry))
+    return True
+
+
+def store(cache_dir, key, build_path, before):
+    """
+    Stores the files written to :param:`build_path` during code-generation
+    in the cache under :param:`key`
+
+    Parameters
+    ----------
+    cache_dir: str
+        The cache directory
+    key: str
+        The cache key, from :func:`get_cache_key`
+    build_path: str
+        The output directory of the generated files
+    before: dict
+        The :func:`snapshot` of the :param:`build_path` before generation
+
+    Returns
+    -------
+    None
+    """
+
+    utils.create_dir(cache_dir)
+    after = snapshot(build_path)
+    written = sorted(f for f in after if before.get(f) != after[f])
+
+    path = os.path.abspath(build_path).encode('utf-8')
+    # write to a temporary directory & move into place, such that concurrent
+    # generations never see a partially populated entry
+    temp = tempfile.mkdtemp(dir=cache_dir)
+    try:
+        for f in written:
+            with open(os.path.join(build_path, f), 'rb') as file:
+                src = file.read()
+            with open(os.path.join(temp, f), 'wb') as file:
+                file.write(src.replace(path, build_path_placeholder))
+        os.rename(temp, os.path.join(cache_dir, key))
+    except OSError:
+        # another process beat us to it
+        shutil.rmtree(temp, ignore_errors=True)
+
+    evict(cache_dir, default_max_size())
+
+
+def evict(cache_dir, max_size):
+    """
+    Removes the least-recently used entries from the cache until the total size
+    of the cache entries is no larger than :param:`max_size`
+
+    Parameters
+    ----------
+    cache_dir: str
+        The cache directory
+    max_size: int
+        The maximum size of the cache, in bytes
+
+    Returns
+    -------
+    evicted: list of str
+        The keys of the evicted entries
+    """
+
+    entries = []
+    for key in os.listdir(cache_dir):
+        entry = os.path.join(cache_dir, key)
+        # ignore temporary entries, or anything else stored in the directory
+        if not entry_re.match(key) or not os.path.isdir(entry):
+            continue
+        try:
+            size = sum(os.path.getsize(os.path.join(entry, f))
+                       for f in os.listdir(entry))
+            entries.append((os.stat(entry).st_mtime, size, key))
+        except OSError:
+            # removed by another process
+            continue
+
+    total = sum(size for _, size, _ in entries)
+    evicted = []
+    for _, size, key in sorted(entries):
+        if total <= max_size:
+            break
+        shutil.rmtree(os.path.join(cache_dir, key), ignore_errors=True)
+        total -= size
+        evicted.append(key)
+
+    if evicted:
+        logger = logging.getLogger(__name__)
+        logger.info('Evicted {} entries from cache {}'.format(
+            len(evicted), cache_dir))
+    return evicted
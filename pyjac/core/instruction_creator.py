@@ -17,7 +17,7 @@
 from pytools import UniqueNameGenerator
 import numpy as np
 
-from pyjac.core.array_creator import var_name, jac_creator
+from pyjac.core.array_creator import var_name, jac_creator, jvp_creator
 
 
 def use_atomics(loopy_opts):
@@ -433,6 +433,73 @@ def place_in_vectorization_loop(loopy_opts, insn, namer, vectorize=True):
     """).safe_substitute(iname=iname, insn=insn), (iname, spec)
 
 
+def _jacobian_vector_update(mapstore, jvp, insn, deps, *jac_inds, **kwargs):
+    """
+    Converts the update / setting :param:`insn` of the Jacobian entry
+    :param:`jac_inds` for a matrix-free kernel, i.e., the Jacobian entry is
+    instead accumulated directly into the Jacobian-vector product:
+
+    .. math::
+        w_{row} = w_{row} + \\mathcal{J}_{row, col} v_{col}
+
+    Any other (read) access of the Jacobian entry evaluates to zero.  The
+    analytical Jacobian only reads the species rows (and the temperature row) to
+    form the temperature and extra variable rows, and these contributions are
+    instead added from the completed product, see
+    :func:`create_jacobian.jacobian_vector_product`
+
+    Parameters
+    ----------
+    mapstore: :class:`MapStore`
+        The mapstore use in creation of the jacobian
+    jvp: :class:`jvp_creator`
+        The Jacobian-vector product creator from the mapstore's :class:`NameStore`
+    insn: str
+        The update or Jacobian setting instruction to convert, see
+        :func:`with_conditional_jacobian`.  If empty, the access string of the
+        Jacobian entry is returned
+    deps: list of str
+        The dependencies of the insn
+    jac_inds: tuple of int/str
+        The Jacobian indicies to use, of length 3
+    **kwargs: dict
+        Any other arguements will be passed to the :func:`mapstore.apply_maps`
+        call
+
+    Returns
+    -------
+    jvp_lp: :class:`loopy.GlobalArg`
+        The created Jacobian-vector product
+    insn: str
+        The converted instructions, or access string
+    """
+
+    ind, row, col = jac_inds
+    jvp_lp, jvp_str = mapstore.apply_maps(jvp, ind, row, **kwargs)
+    _, vec_str = mapstore.apply_maps(jvp.vec, ind, col, **kwargs)
+    if not insn:
+        # a plain read of the Jacobian entry
+        return jvp_lp, '0d'
+
+    # find the updates / settings of the Jacobian entry, i.e.:
+    #   ${jac_str} = [${jac_str} +/-] value {options}
+    update = re.compile(r'^(\s*)\$\{jac_str\}\s*=\s*(?:\$\{jac_str\}\s*([+-]))?'
+                        r'\s*(.+?)(\s*\{(?:id|dep|nosync)=.*\})?\s*$')
+    lines = []
+    for line in insn.split('\n'):
+        match = update.match(line)
+        if match:
+            indent, op, value, options = match.groups()
+            line = '{indent}{jvp} = {jvp} {op} ({value}) * {vec}{options}'.format(
+                indent=indent, jvp=jvp_str, op=op if op else '+', value=value,
+                vec=vec_str, options=options if options else '')
+        else:
+            line = line.replace('${jac_str}', '0d')
+        lines.append(line)
+
+    return jvp_lp, Template('\n'.join(lines)).safe_substitute(deps=':'.join(deps))
+
+
 def with_conditional_jacobian(func):
     """
     A function wrapper that makes available the :func:`_conditional_jacobian`
@@ -500,6 +567,14 @@ def _conditional_jacobian(mapstore, jac, *jac_inds, **kwargs):
         deps = kwargs.pop('deps', '')
         deps = deps.split(':')
 
+        if isinstance(jac, jvp_creator):
+            # matrix-free, accumulate into the Jacobian-vector product instead
+            jvp_lp, retv = _jacobian_vector_update(
+                mapstore, jac, insn, deps, *jac_inds, **kwargs)
+            if return_arg:
+                return jvp_lp, retv
+            return retv
+
         created_index = _conditional_jacobian.created_index
         if not index_insn and is_sparse:
             logger.warn('Using a sparse jacobian without precomputing the index'
@@ -14,23 +14,26 @@
 
 
 def write_aux(path, loopy_opts, specs, reacs):
-    write_mechanism_header(path, loopy_opts.lang, specs, reacs)
-    write_vec_header(path, loopy_opts.lang, loopy_opts)
+    # the include guards are prefixed as the generated kernels, if any
+    prefix = getattr(loopy_opts, 'prefix', '')
+    write_mechanism_header(path, loopy_opts.lang, specs, reacs, prefix=prefix)
+    write_vec_header(path, loopy_opts.lang, loopy_opts, prefix=prefix)
 
 
-def write_mechanism_header(path, lang, specs, reacs):
+def write_mechanism_header(path, lang, specs, reacs, prefix=''):
     with filew.get_header_file(
-            os.path.join(path, 'mechanism' + utils.header_ext[lang]), lang) as file:
+            os.path.join(path, 'mechanism' + utils.header_ext[lang]), lang,
+            guard_prefix=prefix) as file:
         # define NR, NS, NN, etc.
         file.add_define('NS', len(specs))
         file.add_define('NR', len(reacs))
         file.add_define('NN', len(specs) + 1)
 
 
-def write_vec_header(path, lang, loopy_opts):
+def write_vec_header(path, lang, loopy_opts, prefix=''):
     with filew.get_header_file(
             os.path.join(path, 'vectorization' + utils.header_ext[lang]),
-            lang) as file:
+            lang, guard_prefix=prefix) as file:
         # define deep / wide / vecwidth
         if loopy_opts.width:
             file.add_define('WIDE')
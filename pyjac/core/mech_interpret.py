@@ -11,12 +11,14 @@
 import re
 from copy import deepcopy
 import logging
+from enum import IntEnum
 
 import numpy as np
 
 # Local imports
 from pyjac import utils
 from pyjac.core import chem_model as chem
+from pyjac.core.reaction_types import reaction_type
 
 # Related module
 CANTERA_FLAG = False
@@ -55,6 +57,135 @@
 elem_wt = chem.get_elem_wt()
 
 
+class SortType(IntEnum):
+    """
+    The reordering applied to the species and reactions of a mechanism to improve
+    the memory locality of the generated kernels
+
+    - rcm: Species are ordered via the reverse Cuthill-McKee ordering of the
+      species-reaction graph (i.e., species are connected if they participate in
+      the same reaction), while reactions are grouped by type and then by the
+      (reordered) species they contain
+    """
+    rcm = 1
+
+
+def _reverse_cuthill_mckee(neighbors):
+    """
+    Returns the reverse Cuthill-McKee ordering of a graph
+
+    Parameters
+    ----------
+    neighbors: list of set of int
+        The adjacent nodes of each node in the graph
+
+    Returns
+    -------
+    order: :class:`numpy.ndarray`
+        The nodes of the graph, in reverse Cuthill-McKee order
+    """
+
+    degree = np.array([len(x) for x in neighbors], dtype=np.int32)
+    visited = np.zeros(len(neighbors), dtype=bool)
+    order = []
+    # start each connected component from a node of minimum degree
+    for start in np.argsort(degree, kind='mergesort'):
+        if visited[start]:
+            continue
+        visited[start] = True
+        queue = [start]
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for adj in sorted(neighbors[node], key=lambda x: (degree[x], x)):
+                if not visited[adj]:
+                    visited[adj] = True
+                    queue.append(adj)
+        order.extend(queue)
+    return np.array(order[::-1], dtype=np.int32)
+
+
+def sort_mechanism(specs, reacs, sort_type=SortType.rcm):
+    """
+    Reorders the species and reactions of a (fully interpreted) mechanism
+    according to the given :param:`sort_type`, updating the species indicies of
+    the reactions to match.  The supplied species and reactions are not modified.
+
+    Parameters
+    ----------
+    specs : list of `SpecInfo`
+        List of species in mechanism.
+    reacs : list of `ReacInfo`
+        List of reactions in mechanism, with species lists assigned to integer
+        indicies (see :func:`pyjac.utils.reassign_species_lists`)
+    sort_type : :class:`SortType` or str
+        The type of reordering to apply
+
+    Returns
+    -------
+    specs : list of `SpecInfo`
+        The reordered species
+    reacs : list of `ReacInfo`
+        The reordered reactions
+    spec_map : :class:`numpy.ndarray`
+        The original index of each species in the reordered mechanism, i.e.,
+        `specs[i] == old_specs[spec_map[i]]`
+    reac_map : :class:`numpy.ndarray`
+        The original index of each reaction in the reordered mechanism
+    """
+
+    if not isinstance(sort_type, SortType):
+        sort_type = utils.EnumType(SortType)(str(sort_type))
+
+    def __participants(rxn):
+        parts = set(rxn.reac) | set(rxn.prod)
+        if rxn.pdep_sp is not None:
+            parts.add(rxn.pdep_sp)
+        return parts
+
+    # note: third-body efficiencies are ignored in creation of the species graph,
+    # as a single mixture-averaged third-body reaction would otherwise connect
+    # most species in the mechanism
+    neighbors = [set() for sp in specs]
+    for rxn in reacs:
+        parts = __participants(rxn)
+        for sp in parts:
+            neighbors[sp].update(parts - set([sp]))
+
+    spec_map = _reverse_cuthill_mckee(neighbors)
+    new_index = np.empty_like(spec_map)
+    new_index[spec_map] = np.arange(spec_map.size, dtype=np.int32)
+
+    def __key(irxn):
+        rxn = reacs[irxn]
+        rtype = next(x for x in rxn.type if isinstance(x, reaction_type))
+        return (rtype.value, sorted(str(x) for x in rxn.type),
+                sorted(new_index[sp] for sp in __participants(rxn)))
+
+    reac_map = np.array(sorted(range(len(reacs)), key=__key), dtype=np.int32)
+
+    def __remap(species, nus):
+        # note: the reactants / products may be empty, e.g., for irreversible
+        # reactions with no products
+        remapped = sorted([(int(new_index[sp]), nu) for sp, nu in zip(
+            species, nus)], key=lambda x: x[0])
+        return [x[0] for x in remapped], [x[1] for x in remapped]
+
+    # work on copies, such that the caller's mechanism is left untouched
+    specs = [deepcopy(specs[i]) for i in spec_map]
+    reacs = [deepcopy(reacs[i]) for i in reac_map]
+    for rxn in reacs:
+        rxn.reac, rxn.reac_nu = __remap(rxn.reac, rxn.reac_nu)
+        rxn.prod, rxn.prod_nu = __remap(rxn.prod, rxn.prod_nu)
+        rxn.thd_body_eff = sorted([(int(new_index[thd[0]]), thd[1])
+                                   for thd in rxn.thd_body_eff], key=lambda x: x[0])
+        if rxn.pdep_sp is not None:
+            rxn.pdep_sp = int(new_index[rxn.pdep_sp])
+
+    return specs, reacs, spec_map, reac_map
+
+
 def read_mech(mech_filename, therm_filename, sort_type=None):
     """Read and interpret mechanism file for elements, species, and reactions.
 
@@ -64,8 +195,8 @@ def read_mech(mech_filename, therm_filename, sort_type=None):
         Reaction mechanism filename (e.g. 'mech.dat')
     therm_filename : str, optional
         Thermodynamic database filename (e.g., 'therm.dat')
-    sort_type : ?
-        If not none, call the mechanism sorter
+    sort_type : :class:`SortType` or str, optional
+        If not None, reorder the mechanism via :func:`sort_mechanism`
 
     Returns
     -------
@@ -748,9 +879,6 @@ def read_mech(mech_filename, therm_filename, sort_type=None):
         logger.error('Missing thermo data for ' + ', '.join(missing_mw))
         sys.exit(1)
 
-    if sort_type:
-        pass  # stub for mechanism sorting
-
     # reassign the reaction's product / reactant / third body list
     # to integer indexes for speed
     utils.reassign_species_lists(reacs, specs)
@@ -760,6 +888,9 @@ def read_mech(mech_filename, therm_filename, sort_type=None):
         reac.finalize(len(specs))
     for spec in specs:
         spec.finalize()
+
+    if sort_type is not None:
+        specs, reacs, _, _ = sort_mechanism(specs, reacs, sort_type)
     return (elems, specs, reacs)
 
 
@@ -932,8 +1063,8 @@ def read_mech_ct(filename=None, gas=None, sort_type=None):
         Reaction mechanism filename (e.g. 'mech.cti'). Optional.
     gas : `cantera.Solution` object
         Existing Cantera Solution object to be used. Optional.
-    sort_type : ?
-        If not none, call the mechanism sorter
+    sort_type : :class:`SortType` or str, optional
+        If not None, reorder the mechanism via :func:`sort_mechanism`
 
     Returns
     -------
@@ -1184,9 +1315,6 @@ def handle_effiencies(reac, ct_rxn):
 
         reacs.append(reac)
 
-    if sort_type:
-        pass  # stub for mechanism sorting
-
     # reassign the reaction's product / reactant / third body list
     # to integer indexes for speed
     utils.reassign_species_lists(reacs, specs)
@@ -1196,4 +1324,7 @@ def handle_effiencies(reac, ct_rxn):
         reac.finalize(len(specs))
     for spec in specs:
         spec.finalize()
+
+    if sort_type is not None:
+        specs, reacs, _, _ = sort_mechanism(specs, reacs, sort_type)
     return (elems, specs, reacs)
@@ -31,6 +31,66 @@
 from pyjac.core.array_creator import (global_ind, var_name, default_inds)
 
 
+def get_stoichiometry(reacs, specs):
+    """
+    Constructs the (sparse) reactant and product stoichiometric matrices of the
+    mechanism, in coordinate form
+
+    Parameters
+    ----------
+    reacs : list of `ReacInfo`
+        The reactions in the mechanism
+    specs : list of `SpecInfo`
+        The species in the mechanism
+
+    Notes
+    -----
+    The matrices share a single sparsity pattern -- the union of the species
+    participating in each reaction -- and are stored in row-major order, i.e.,
+    sorted by reaction and then by species.  If a species appears more than
+    once in the reactants (or products) of a reaction, the first coefficient is
+    used.
+
+    Returns
+    -------
+    rxn : :class:`numpy.ndarray`
+        The reaction index of each entry
+    spec : :class:`numpy.ndarray`
+        The species index of each entry
+    prod_nu : :class:`numpy.ndarray`
+        The product stoichiometric coefficient of each entry, or zero if the species
+        is not a product of the reaction
+    reac_nu : :class:`numpy.ndarray`
+        The reactant stoichiometric coefficient of each entry, or zero if the
+        species is not a reactant of the reaction
+    """
+
+    num_specs = len(specs)
+
+    def __matrix(spec_attr, nu_attr):
+        counts = [len(getattr(x, spec_attr)) for x in reacs]
+        rows = np.repeat(np.arange(len(reacs), dtype=np.int64), counts)
+        cols = np.array([s for x in reacs for s in getattr(x, spec_attr)],
+                        dtype=np.int64)
+        nu = np.array([n for x in reacs for n in getattr(x, nu_attr)],
+                      dtype=np.float64)
+        # take the first occurence of any (reaction, species) pair
+        keys, first = np.unique(rows * num_specs + cols, return_index=True)
+        return keys, nu[first]
+
+    reac_keys, reac_vals = __matrix('reac', 'reac_nu')
+    prod_keys, prod_vals = __matrix('prod', 'prod_nu')
+
+    # and combine into the shared sparsity pattern
+    keys = np.union1d(reac_keys, prod_keys)
+    reac_nu = np.zeros(keys.size, dtype=np.float64)
+    reac_nu[np.searchsorted(keys, reac_keys)] = reac_vals
+    prod_nu = np.zeros(keys.size, dtype=np.float64)
+    prod_nu[np.searchsorted(keys, prod_keys)] = prod_vals
+
+    return keys // num_specs, keys % num_specs, prod_nu, reac_nu
+
+
 def assign_rates(reacs, specs, rate_spec):
     """
     From a given set of reactions, determine the rate types for evaluation
@@ -87,84 +147,37 @@ def assign_rates(reacs, specs, rate_spec):
     rev_map = np.array([i for i, x in enumerate(reacs) if x.rev],
                        dtype=np.int32)
     num_rev = len(rev_map)
-    # next, find the species / nu values
-    nu_sum = []
-    net_num_spec = []
-    net_spec = []
-    net_nu = []
-    reac_has_ns = []
-    ns_nu = []
-    for i_rxn, rxn in enumerate(reacs):
-        # get list of species in reaction
-        spec_list = sorted(set(rxn.reac[:] + rxn.prod[:]))
-        # add species / num
-        net_spec.extend(spec_list)
-        net_num_spec.append(len(spec_list))
-        # get fwd / reverse nu for species
-        for spec in spec_list:
-            # get reactant index
-            ind = next((i for i, x in enumerate(rxn.reac) if x == spec), None)
-            reac_nu = rxn.reac_nu[ind] if ind is not None else 0
-
-            # get product index
-            ind = next((i for i, x in enumerate(rxn.prod) if x == spec), None)
-            prod_nu = rxn.prod_nu[ind] if ind is not None else 0
-
-            # and add nu values
-            net_nu.extend([prod_nu, reac_nu])
-
-        # and nu sum for equilibrium constants
-        nu_sum.append(sum([utils.get_nu(isp, rxn) for isp in spec_list]))
-
-        # handle fwd / rev nu for last species indicator
-        ns_reac_ind = next((i for i, x in enumerate(rxn.reac[:])
-                            if x == len(specs) - 1), None)
-        ns_reac_nu = rxn.reac_nu[ns_reac_ind] if ns_reac_ind is not None else 0
-        ns_prod_ind = next((i for i, x in enumerate(rxn.prod[:])
-                            if x == len(specs) - 1), None)
-        ns_prod_nu = rxn.prod_nu[ns_prod_ind] if ns_prod_ind is not None else 0
-        if ns_reac_nu or ns_prod_nu:
-            reac_has_ns.append(i_rxn)
-            ns_nu.extend([ns_prod_nu, ns_reac_nu])
-
-    # create numpy versions
-    reac_has_ns = np.array(reac_has_ns, dtype=np.int32)
-    net_nu_integer = all(utils.is_integer(nu) for nu in net_nu)
-    if net_nu_integer:
-        nu_sum = np.array(nu_sum, dtype=np.int32)
-        net_nu = np.array(net_nu, dtype=np.int32)
-        ns_nu = np.array(ns_nu, dtype=np.int32)
-    else:
-        nu_sum = np.array(nu_sum)
-        net_nu = np.array(net_nu)
-        ns_nu = np.array(ns_nu)
-    net_num_spec = np.array(net_num_spec, dtype=np.int32)
-    net_spec = np.array(net_spec, dtype=np.int32)
+    # next, find the species / nu values from the stoichiometric matrices
+    rxn, spec, prod_nu, reac_nu = get_stoichiometry(reacs, specs)
+    net_nu_integer = bool(np.all(np.floor(prod_nu) == prod_nu) and
+                          np.all(np.floor(reac_nu) == reac_nu))
+    nu_dtype = np.int32 if net_nu_integer else np.float64
+
+    # the species / number of species in each reaction
+    net_spec = spec.astype(np.int32)
+    net_num_spec = np.bincount(rxn, minlength=len(reacs)).astype(np.int32)
+    # interleaved fwd / reverse nu for species
+    net_nu = np.column_stack((prod_nu, reac_nu)).flatten().astype(nu_dtype)
+    # and nu sum for equilibrium constants
+    nu = prod_nu - reac_nu
+    nu_sum = np.bincount(rxn, weights=nu, minlength=len(reacs)).astype(nu_dtype)
+
+    # handle fwd / rev nu for last species indicator
+    has_ns = (spec == len(specs) - 1) & ((prod_nu != 0) | (reac_nu != 0))
+    reac_has_ns = rxn[has_ns].astype(np.int32)
+    ns_nu = np.column_stack((prod_nu[has_ns], reac_nu[has_ns])).flatten().astype(
+        nu_dtype)
 
     # sometimes we need the net properties forumlated per species rather than
-    # per reaction as above
-    spec_to_reac = []
-    spec_nu = []
-    spec_reac_count = []
-    spec_list = []
-    for ispec, spec in enumerate(specs):
-        # first, find all non-zero nu reactions
-        reac_list = [x for x in [(irxn, utils.get_nu(ispec, rxn))
-                                 for irxn, rxn in enumerate(reacs)] if x[1]]
-        if reac_list:
-            reac_list, nu_list = zip(*reac_list)
-            spec_to_reac.extend(reac_list)
-            spec_nu.extend(nu_list)
-            spec_reac_count.append(len(reac_list))
-            spec_list.append(ispec)
-
-    spec_to_reac = np.array(spec_to_reac, dtype=np.int32)
-    if net_nu_integer:
-        spec_nu = np.array(spec_nu, dtype=np.int32)
-    else:
-        spec_nu = np.array(spec_nu)
-    spec_reac_count = np.array(spec_reac_count, dtype=np.int32)
-    spec_list = np.array(spec_list, dtype=np.int32)
+    # per reaction as above -- i.e., the non-zero entries of the net
+    # stoichiometric matrix in column-major order
+    non_zero = np.where(nu != 0)[0]
+    non_zero = non_zero[np.argsort(spec[non_zero], kind='mergesort')]
+    spec_to_reac = rxn[non_zero].astype(np.int32)
+    spec_nu = nu[non_zero].astype(nu_dtype)
+    spec_list, spec_reac_count = np.unique(spec[non_zero], return_counts=True)
+    spec_list = spec_list.astype(np.int32)
+    spec_reac_count = spec_reac_count.astype(np.int32)
 
     def __seperate(reacs, matchers):
         # find all reactions / indicies that match this offset
@@ -377,6 +390,34 @@ def __specialize(rates, fall=False):
         a_hi[ind, :] = spec.hi[:]
         T_mid[ind] = spec.Trange[1]
 
+    # the per-reaction equilibrium constant polynomials -- as the Gibbs
+    # polynomials (b) of the species are linear in the NASA coefficients, the
+    # net stoichiometric sum over the species in each reaction may be collapsed
+    # into a single polynomial per temperature range
+    def __kc_poly(a):
+        coeffs = np.zeros((len(reacs), poly_dim), dtype=np.float64)
+        np.add.at(coeffs, rxn, nu[:, np.newaxis] * a[spec])
+        return np.column_stack((coeffs[:, 0] - nu_sum,
+                                coeffs[:, 1] / 2,
+                                coeffs[:, 2] / 6,
+                                coeffs[:, 3] / 12,
+                                coeffs[:, 4] / 20,
+                                -coeffs[:, 5],
+                                coeffs[:, 6] - coeffs[:, 0]))[rev_map]
+
+    kc_lo = __kc_poly(a_lo)
+    kc_hi = __kc_poly(a_hi)
+    # which is only valid if the species share a common breakpoint
+    kc_T_min = np.full(len(reacs), np.inf)
+    kc_T_max = np.full(len(reacs), -np.inf)
+    nonzero = np.where(nu != 0)[0]
+    np.minimum.at(kc_T_min, rxn[nonzero], T_mid[spec[nonzero]])
+    np.maximum.at(kc_T_max, rxn[nonzero], T_mid[spec[nonzero]])
+    kc_T_min = kc_T_min[rev_map]
+    kc_T_max = kc_T_max[rev_map]
+    kc_common = bool(np.all(np.isinf(kc_T_max) | (kc_T_min == kc_T_max)))
+    kc_T_mid = np.where(np.isinf(kc_T_max), 0, kc_T_max)
+
     # post processing
 
     # chebyshev parameter reordering
@@ -462,7 +503,9 @@ def __specialize(rates, fall=False):
                     'spec': thd_spec, 'eff': thd_eff,
                     'has_ns': thd_has_ns, 'eff_ns': thd_ns_eff},
             'fwd': {'map': np.arange(len(reacs)), 'num': len(reacs)},
-            'rev': {'map': rev_map, 'num': num_rev},
+            'rev': {'map': rev_map, 'num': num_rev,
+                    'kc': {'lo': kc_lo, 'hi': kc_hi, 'T_mid': kc_T_mid,
+                           'common': kc_common}},
             'net': {'num_reac_to_spec': net_num_spec, 'nu_sum': nu_sum,
                     'nu': net_nu, 'reac_to_spec': net_spec,
                     'allint': net_nu_integer},
@@ -1622,13 +1665,17 @@ def get_rev_rates(loopy_opts, namestore, allint, test_size=None):
     rev_map = arc.MapStore(loopy_opts, namestore.num_rev_reacs,
                            namestore.rev_mask)
 
+    # use the per-reaction equilibrium constant polynomials if available
+    kc_polynomials = loopy_opts.kc_polynomials and namestore.kc_lo is not None
+
     # map from reverse reaction index to forward reaction index
     rev_map.check_and_add_transform(
         namestore.nu_sum, namestore.rev_map)
-    rev_map.check_and_add_transform(
-        namestore.rxn_to_spec, namestore.rev_map)
-    rev_map.check_and_add_transform(
-        namestore.rxn_to_spec_offsets, namestore.rev_map)
+    if not kc_polynomials:
+        rev_map.check_and_add_transform(
+            namestore.rxn_to_spec, namestore.rev_map)
+        rev_map.check_and_add_transform(
+            namestore.rxn_to_spec_offsets, namestore.rev_map)
     rev_map.check_and_add_transform(
         namestore.kf, namestore.rev_map)
 
@@ -1636,27 +1683,6 @@ def get_rev_rates(loopy_opts, namestore, allint, test_size=None):
     nu_sum_lp, nu_sum_str = rev_map.apply_maps(namestore.nu_sum,
                                                var_name)
 
-    # all species in reaction on spec loop
-    spec_lp, spec_str = rev_map.apply_maps(namestore.rxn_to_spec,
-                                           spec_loop)
-
-    # species offsets on main loop
-    num_spec_offsets_lp, num_spec_offsets_str = rev_map.apply_maps(
-        namestore.rxn_to_spec_offsets, var_name)
-
-    # species offset on main loop with offset of 1
-    _, num_spec_offsets_next_str = rev_map.apply_maps(
-        namestore.rxn_to_spec_offsets, var_name, affine=1)
-
-    # B array on spec_ind
-    B_lp, B_str = rev_map.apply_maps(namestore.b, global_ind, spec_ind)
-
-    # net nu on species loop
-    nu_lp, prod_nu_str = rev_map.apply_maps(namestore.rxn_to_spec_prod_nu,
-                                            spec_loop, affine=spec_loop)
-    _, reac_nu_str = rev_map.apply_maps(namestore.rxn_to_spec_reac_nu,
-                                        spec_loop, affine=spec_loop)
-
     # the Kc array on the main loop, no map as this is only reversible
     Kc_lp, Kc_str = rev_map.apply_maps(namestore.Kc, *default_inds)
 
@@ -1669,8 +1695,96 @@ def get_rev_rates(loopy_opts, namestore, allint, test_size=None):
         namestore.kr, *default_inds)
 
     # update kernel data
-    kernel_data.extend([nu_sum_lp, spec_lp, num_spec_offsets_lp,
-                        B_lp, Kc_lp, nu_lp, kf_arr, kr_arr])
+    kernel_data.extend([nu_sum_lp, Kc_lp, kf_arr, kr_arr])
+
+    if kc_polynomials:
+        param_ind = 'dummy'
+        # polynomial coefficients and breakpoint on the main loop, no map as these
+        # are only reversible
+        kc_lo_lp, _ = rev_map.apply_maps(namestore.kc_lo, var_name, param_ind)
+        kc_hi_lp, _ = rev_map.apply_maps(namestore.kc_hi, var_name, param_ind)
+        T_mid_lp, T_mid_str = rev_map.apply_maps(namestore.kc_T_mid, var_name)
+        T_lp, T_str = rev_map.apply_maps(namestore.T_arr, global_ind)
+        kernel_data.extend([kc_lo_lp, kc_hi_lp, T_mid_lp, T_lp])
+
+        poly_dim = namestore.kc_lo.shape[1]
+        kc_lo_strs = [rev_map.apply_maps(namestore.kc_lo, var_name, str(i))[1]
+                      for i in range(poly_dim)]
+        kc_hi_strs = [rev_map.apply_maps(namestore.kc_hi, var_name, str(i))[1]
+                      for i in range(poly_dim)]
+        # see :func:`assign_rates`
+        B_eqn = Template(
+            "T * (T * (T * (T * ${a4} + ${a3}) + ${a2}) + ${a1}) + "
+            "${a0} * logT + ${a5} * Tinv + ${a6}")
+        lo_eq = B_eqn.safe_substitute(
+            {'a' + str(i): a for i, a in enumerate(kc_lo_strs)})
+        hi_eq = B_eqn.safe_substitute(
+            {'a' + str(i): a for i, a in enumerate(kc_hi_strs)})
+        pre_instructions = [ic.default_pre_instructs('T', T_str, 'VAL'),
+                            ic.default_pre_instructs('Tinv', T_str, 'INV'),
+                            ic.default_pre_instructs('logT', T_str, 'LOG')]
+
+        # evaluate the B sum directly
+        Bsum_inst = Template("""
+    if T < ${T_mid_str}
+        <>B_sum = ${lo_eq} {id=B_accum}
+    else
+        B_sum = ${hi_eq} {id=B_accum1}
+    end
+    B_sum = exp(B_sum) {id=B_final, dep=B_accum*}
+    """).safe_substitute(**locals())
+        extra_inames = []
+    else:
+        # all species in reaction on spec loop
+        spec_lp, spec_str = rev_map.apply_maps(namestore.rxn_to_spec,
+                                               spec_loop)
+
+        # species offsets on main loop
+        num_spec_offsets_lp, num_spec_offsets_str = rev_map.apply_maps(
+            namestore.rxn_to_spec_offsets, var_name)
+
+        # species offset on main loop with offset of 1
+        _, num_spec_offsets_next_str = rev_map.apply_maps(
+            namestore.rxn_to_spec_offsets, var_name, affine=1)
+
+        # B array on spec_ind
+        B_lp, B_str = rev_map.apply_maps(namestore.b, global_ind, spec_ind)
+
+        # net nu on species loop
+        nu_lp, prod_nu_str = rev_map.apply_maps(namestore.rxn_to_spec_prod_nu,
+                                                spec_loop, affine=spec_loop)
+        _, reac_nu_str = rev_map.apply_maps(namestore.rxn_to_spec_reac_nu,
+                                            spec_loop, affine=spec_loop)
+
+        kernel_data.extend([spec_lp, num_spec_offsets_lp, B_lp, nu_lp])
+        pre_instructions = []
+
+        # and the b sum loop
+        Bsum_inst = Template("""
+    <>offset = ${spec_offset} {id=offset}
+    <>spec_end = ${spec_offset_next} {id=B_bound}
+    <>B_sum = 0 {id=B_init}
+    for ${spec_loop}
+        <>${spec_ind} = ${spec_mapper} {dep=offset:B_bound}
+        <>net_nu = ${prod_nu_str} - ${reac_nu_str}
+        if net_nu != 0
+            B_sum = B_sum + net_nu * ${B_val} {id=B_accum, dep=B_init}
+        end
+    end
+    B_sum = exp(B_sum) {id=B_final, dep=B_accum}
+    """).substitute(spec_offset=num_spec_offsets_str,
+                    spec_offset_next=num_spec_offsets_next_str,
+                    spec_loop=spec_loop,
+                    spec_ind=spec_ind,
+                    spec_mapper=spec_str,
+                    nu_val=nu_sum_str,
+                    prod_nu_str=prod_nu_str,
+                    reac_nu_str=reac_nu_str,
+                    B_val=B_str
+                    )
+
+        # create the extra inames
+        extra_inames = [(spec_loop, 'offset <= {} < spec_end'.format(spec_loop))]
 
     # create the pressure product loop
     pressure_prod = Template("""
@@ -1702,30 +1816,6 @@ def get_rev_rates(loopy_opts, namestore, allint, test_size=None):
         pressure_prod = k_gen.subs_at_indent(pressure_prod_temp, 'pprod',
                                              pressure_prod)
 
-    # and the b sum loop
-    Bsum_inst = Template("""
-    <>offset = ${spec_offset} {id=offset}
-    <>spec_end = ${spec_offset_next} {id=B_bound}
-    <>B_sum = 0 {id=B_init}
-    for ${spec_loop}
-        <>${spec_ind} = ${spec_mapper} {dep=offset:B_bound}
-        <>net_nu = ${prod_nu_str} - ${reac_nu_str}
-        if net_nu != 0
-            B_sum = B_sum + net_nu * ${B_val} {id=B_accum, dep=B_init}
-        end
-    end
-    B_sum = exp(B_sum) {id=B_final, dep=B_accum}
-    """).substitute(spec_offset=num_spec_offsets_str,
-                    spec_offset_next=num_spec_offsets_next_str,
-                    spec_loop=spec_loop,
-                    spec_ind=spec_ind,
-                    spec_mapper=spec_str,
-                    nu_val=nu_sum_str,
-                    prod_nu_str=prod_nu_str,
-                    reac_nu_str=reac_nu_str,
-                    B_val=B_str
-                    )
-
     Rate_assign = Template("""
     <>Kc_temp = P_sum * B_sum {dep=P_accum*:B_final}
     ${Kc_str} = Kc_temp
@@ -1734,12 +1824,10 @@ def get_rev_rates(loopy_opts, namestore, allint, test_size=None):
 
     instructions = '\n'.join([Bsum_inst, pressure_prod, Rate_assign])
 
-    # create the extra inames
-    extra_inames = [(spec_loop, 'offset <= {} < spec_end'.format(spec_loop))]
-
     # and return the rateinfo
     return k_gen.knl_info(name='rateconst_Kc',
                           instructions=instructions,
+                          pre_instructions=pre_instructions,
                           var_name=var_name,
                           kernel_data=kernel_data,
                           mapstore=rev_map,
@@ -2979,11 +3067,19 @@ def __add_knl(knls, klist=None):
     depends_on = []
     # check for reverse rates
     if rate_info['rev']['num']:
-        # add the 'b' eval
-        __add_knl(polyfit_kernel_gen('b', loopy_opts,
-                                     nstore, test_size))
-        # addd the 'b' eval to depnediencies
-        depends_on.append(kernels[-1])
+        kc_polynomials = loopy_opts.kc_polynomials and nstore.kc_lo is not None
+        if loopy_opts.kc_polynomials and not kc_polynomials:
+            logger = logging.getLogger(__name__)
+            logger.warn('The species in some reversible reactions do not share '
+                        'a common temperature breakpoint, hence the equilibrium '
+                        'constants will be evaluated from the species Gibbs '
+                        'polynomials.')
+        if not kc_polynomials:
+            # add the 'b' eval
+            __add_knl(polyfit_kernel_gen('b', loopy_opts,
+                                         nstore, test_size))
+            # addd the 'b' eval to depnediencies
+            depends_on.append(kernels[-1])
         # add Kc / rev rates
         __add_knl(get_rev_rates(loopy_opts,
                                 nstore,
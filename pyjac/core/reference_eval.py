@@ -0,0 +1,510 @@
+"""A pure-NumPy, batched evaluator of the chemical source terms.
+
+Evaluates the thermodynamic properties, rate constants, pressure modifications,
+rates of progress, species rates and state-vector derivatives for many
+thermo-chemical states at once, directly from the :class:`SpecInfo` /
+:class:`ReacInfo` lists returned by :func:`read_mech` / :func:`read_mech_ct`.
+
+This requires neither Cantera nor a compilation step, and provides an
+independent oracle for testing the generated kernels.  Where the kernels and
+Cantera differ in convention (e.g., the forward rates of progress of
+pressure-dependent reactions), the evaluator follows the kernels.
+"""
+
+# Python 2 compatibility
+from __future__ import division
+
+# Standard libraries
+from collections import OrderedDict
+
+import numpy as np
+from numpy.polynomial.chebyshev import chebval2d
+
+from pyjac.core.chem_model import RU, PA
+from pyjac.core.reaction_types import reaction_type, thd_body_type, \
+    falloff_form, reversible_type
+
+__all__ = ['reference_evaluator']
+
+
+def _arrhenius(logT, Tinv, A, b, E):
+    """
+    Evaluates the Arrhenius rate constants :math:`A T^b \\exp(-E / T)`
+
+    Parameters
+    ----------
+    logT: :class:`numpy.ndarray`
+        The natural logarithm of the temperatures, shape (n, 1)
+    Tinv: :class:`numpy.ndarray`
+        The inverse temperatures, shape (n, 1)
+    A, b, E: :class:`numpy.ndarray`
+        The pre-exponential factors, temperature exponents and activation
+        temperatures [K] of the rate constants
+
+    Returns
+    -------
+    k: :class:`numpy.ndarray`
+        The rate constants, shape (n, A.size)
+    """
+    return A * np.exp(b * logT - E * Tinv)
+
+
+def _padded_species(species, nus, num_reacs):
+    """
+    Converts the reactants / products of each reaction into rectangular arrays
+    of species indicies and stoichiometric coefficients, padded with zero
+    coefficients
+    """
+    width = max([len(x) for x in species] + [1])
+    spec = np.zeros((num_reacs, width), dtype=np.int32)
+    nu = np.zeros((num_reacs, width))
+    for i, (s, n) in enumerate(zip(species, nus)):
+        spec[i, :len(s)] = s
+        nu[i, :len(n)] = n
+    return spec, nu
+
+
+class reference_evaluator(object):
+    """
+    Evaluates the chemical source terms of a mechanism for a batch of states,
+    using only array operations
+
+    The state vectors are in pyJac's molar form, i.e.,
+    :math:`\\phi = [T, V, n_1, \\ldots, n_{N_s - 1}]` for constant-pressure and
+    :math:`\\phi = [T, P, n_1, \\ldots, n_{N_s - 1}]` for constant-volume
+    problems, with one state per row.
+
+    Attributes
+    ----------
+    rev_map: :class:`numpy.ndarray`
+        The indicies of the reversible reactions, i.e., the reactions in the
+        reverse rate constants / equilibrium constants / reverse rates of progress
+    thd_map: :class:`numpy.ndarray`
+        The indicies of the third-body and falloff / chemically-activated
+        reactions, i.e., the reactions in the pressure modifications
+    """
+
+    def __init__(self, specs, reacs):
+        """
+        Parameters
+        ----------
+        specs: list of :class:`SpecInfo`
+            The species in the mechanism
+        reacs: list of :class:`ReacInfo`
+            The reactions in the mechanism
+        """
+
+        self.specs = specs
+        self.reacs = reacs
+        ns = len(specs)
+        nr = len(reacs)
+
+        # thermodynamic properties
+        self.mw = np.array([spec.mw for spec in specs])
+        self.Tmid = np.array([spec.Trange[1] for spec in specs])
+        self.hi = np.array([spec.hi for spec in specs], dtype=np.float64)
+        self.lo = np.array([spec.lo for spec in specs], dtype=np.float64)
+
+        # stoichiometry
+        self.reac_spec, self.reac_nu = _padded_species(
+            [reac.reac for reac in reacs], [reac.reac_nu for reac in reacs], nr)
+        self.prod_spec, self.prod_nu = _padded_species(
+            [reac.prod for reac in reacs], [reac.prod_nu for reac in reacs], nr)
+        self.nu = np.zeros((nr, ns))
+        for i, reac in enumerate(reacs):
+            self.nu[i, list(reac.prod)] += reac.prod_nu
+            self.nu[i, list(reac.reac)] -= reac.reac_nu
+        self.nu_sum = np.sum(self.nu, axis=1)
+
+        # Arrhenius parameters
+        self.A = np.array([reac.A for reac in reacs], dtype=np.float64)
+        self.b = np.array([reac.b for reac in reacs], dtype=np.float64)
+        self.E = np.array([reac.E for reac in reacs], dtype=np.float64)
+
+        # reversible reactions
+        self.rev_map = np.array(
+            [i for i, reac in enumerate(reacs)
+             if not reac.match(reversible_type.non_reversible)], dtype=np.int32)
+        # those with explicit reverse parameters, as indicies in the rev_map
+        self.explicit_map = np.array(
+            [i for i, j in enumerate(self.rev_map)
+             if reacs[j].match(reversible_type.explicit)], dtype=np.int32)
+        self.rev_par = np.array(
+            [reacs[self.rev_map[i]].rev_par for i in self.explicit_map],
+            dtype=np.float64).reshape((-1, 3))
+
+        # third-body efficiencies
+        self.thd_map = np.array(
+            [i for i, reac in enumerate(reacs) if reac.match(
+                (reaction_type.thd, reaction_type.fall, reaction_type.chem))],
+            dtype=np.int32)
+        self.thd_eff = np.ones((self.thd_map.size, ns))
+        for i, j in enumerate(self.thd_map):
+            reac = reacs[j]
+            if reac.match(thd_body_type.species):
+                self.thd_eff[i, :] = 0
+                self.thd_eff[i, reac.pdep_sp] = 1
+            elif reac.match(thd_body_type.mix):
+                for spec, eff in reac.thd_body_eff:
+                    self.thd_eff[i, spec] = eff
+
+        # falloff / chemically-activated reactions, as indicies in the thd_map
+        self.fall_map = np.array(
+            [i for i, j in enumerate(self.thd_map) if reacs[j].match(
+                (reaction_type.fall, reaction_type.chem))], dtype=np.int32)
+        fall_reacs = [reacs[self.thd_map[i]] for i in self.fall_map]
+        self.is_chem = np.array(
+            [reac.match(reaction_type.chem) for reac in fall_reacs], dtype=bool)
+        # the other (low- / high-pressure limit) Arrhenius parameters
+        self.fall_par = np.array(
+            [reac.high if reac.match(reaction_type.chem) else reac.low
+             for reac in fall_reacs], dtype=np.float64).reshape((-1, 3))
+
+        # blending functions, as indicies in the fall_map
+        self.troe_map = np.array(
+            [i for i, reac in enumerate(fall_reacs)
+             if reac.match(falloff_form.troe)], dtype=np.int32)
+        # [a, T3, T1, T2], where T2 is optional
+        self.troe_par = np.array(
+            [(list(fall_reacs[i].troe_par) + [0])[:4] for i in self.troe_map],
+            dtype=np.float64).reshape((-1, 4))
+        self.sri_map = np.array(
+            [i for i, reac in enumerate(fall_reacs)
+             if reac.match(falloff_form.sri)], dtype=np.int32)
+        # [a, b, c, d, e], where d & e are optional
+        self.sri_par = np.array(
+            [(list(fall_reacs[i].sri_par) + [1, 0])[:5] for i in self.sri_map],
+            dtype=np.float64).reshape((-1, 5))
+
+        # pressure-dependent Arrhenius reactions
+        self.plog_map = np.array(
+            [i for i, reac in enumerate(reacs) if reac.match(reaction_type.plog)],
+            dtype=np.int32)
+        # sorted by pressure, and stored as [log(P), log(A), b, E]
+        self.plog_par = []
+        for i in self.plog_map:
+            par = np.array(sorted(reacs[i].plog_par, key=lambda x: x[0]),
+                           dtype=np.float64)
+            par[:, 0] = np.log(par[:, 0])
+            par[:, 1] = np.log(par[:, 1])
+            self.plog_par.append(par)
+
+        # Chebyshev reactions
+        self.cheb_map = np.array(
+            [i for i, reac in enumerate(reacs) if reac.match(reaction_type.cheb)],
+            dtype=np.int32)
+        self.cheb_par = [np.array(reacs[i].cheb_par, dtype=np.float64)
+                         for i in self.cheb_map]
+        self.cheb_tlim = [reacs[i].cheb_tlim for i in self.cheb_map]
+        self.cheb_plim = [reacs[i].cheb_plim for i in self.cheb_map]
+
+    def thermo(self, T):
+        """
+        Evaluates the species' thermodynamic properties from their NASA
+        polynomials
+
+        Parameters
+        ----------
+        T: :class:`numpy.ndarray`
+            The temperatures [K], shape (n,)
+
+        Returns
+        -------
+        thermo: :class:`collections.OrderedDict`
+            The constant-pressure and constant-volume specific heats
+            ('cp', 'cv') [J/(kmol K)], enthalpies and internal energies ('h',
+            'u') [J/kmol], entropies ('s') [J/(kmol K)], and the
+            equilibrium-constant term :math:`B = S/R - H/(RT) - \\log(T)` ('b'),
+            each of shape (n, N_s)
+        """
+
+        T = np.asarray(T, dtype=np.float64).reshape((-1, 1))
+        # pick the low / high temperature coefficients of each species
+        a = np.where((T <= self.Tmid)[:, :, np.newaxis], self.lo[np.newaxis],
+                     self.hi[np.newaxis])
+        a = [a[:, :, i] for i in range(7)]
+        logT = np.log(T)
+
+        cp = RU * (a[0] + T * (a[1] + T * (a[2] + T * (a[3] + T * a[4]))))
+        h = RU * (T * (a[0] + T * (a[1] / 2 + T * (
+            a[2] / 3 + T * (a[3] / 4 + T * a[4] / 5)))) + a[5])
+        s = RU * (a[0] * logT + T * (a[1] + T * (
+            a[2] / 2 + T * (a[3] / 3 + T * a[4] / 4))) + a[6])
+        return OrderedDict([('cp', cp), ('cv', cp - RU), ('h', h),
+                            ('u', h - RU * T), ('s', s),
+                            ('b', s / RU - h / (RU * T) - logT)])
+
+    def state(self, phi, param, conp=True):
+        """
+        Unpacks a batch of state vectors
+
+        Parameters
+        ----------
+        phi: :class:`numpy.ndarray`
+            The state vectors, shape (n, N_s + 1)
+        param: float or :class:`numpy.ndarray`
+            The pressure [Pa] for constant-pressure, or the volume [m^3] for
+            constant-volume problems
+        conp: bool [True]
+            If True, constant-pressure, else constant-volume
+
+        Returns
+        -------
+        T, P, V: :class:`numpy.ndarray`
+            The temperatures, pressures and volumes, each of shape (n,)
+        conc: :class:`numpy.ndarray`
+            The species concentrations [kmol/m^3], shape (n, N_s)
+        """
+
+        phi = np.asarray(phi, dtype=np.float64)
+        T = phi[:, 0]
+        param = np.broadcast_to(np.asarray(param, dtype=np.float64), T.shape)
+        if conp:
+            P, V = param, phi[:, 1]
+        else:
+            P, V = phi[:, 1], param
+        # the last species' moles are determined from the ideal gas law
+        n_ns = P * V / (RU * T) - np.sum(phi[:, 2:], axis=1)
+        conc = np.concatenate((phi[:, 2:], n_ns[:, np.newaxis]), axis=1) / \
+            V[:, np.newaxis]
+        return T, P, V, conc
+
+    def fwd_rate_constants(self, T, P):
+        """
+        Evaluates the forward rate constants.  For third-body and
+        falloff / chemically-activated reactions, these do not include the
+        pressure modification
+
+        Parameters
+        ----------
+        T, P: :class:`numpy.ndarray`
+            The temperatures [K] and pressures [Pa], shape (n,)
+
+        Returns
+        -------
+        kf: :class:`numpy.ndarray`
+            The forward rate constants, shape (n, N_r)
+        """
+
+        T = np.asarray(T, dtype=np.float64).reshape((-1, 1))
+        logT = np.log(T)
+        Tinv = 1. / T
+        logP = np.log(np.broadcast_to(P, T.shape[:1]))
+
+        kf = _arrhenius(logT, Tinv, self.A, self.b, self.E)
+
+        # logarithmic interpolation between the nearest PLOG pressures, and
+        # clamped to the outermost rates
+        for i, par in zip(self.plog_map, self.plog_par):
+            logk = par[:, 1] + par[:, 2] * logT - par[:, 3] * Tinv
+            if par.shape[0] == 1:
+                kf[:, i] = np.exp(logk[:, 0])
+                continue
+            hi = np.clip(np.searchsorted(par[:, 0], logP), 1, par.shape[0] - 1)
+            lo = hi - 1
+            frac = np.clip((logP - par[lo, 0]) / (par[hi, 0] - par[lo, 0]), 0, 1)
+            rows = np.arange(T.shape[0])
+            kf[:, i] = np.exp(logk[rows, lo] + frac * (
+                logk[rows, hi] - logk[rows, lo]))
+
+        # Chebyshev polynomials in reduced inverse-temperature & log-pressure
+        for i, par, (Tmin, Tmax), (Pmin, Pmax) in zip(
+                self.cheb_map, self.cheb_par, self.cheb_tlim, self.cheb_plim):
+            Tred = (2. * Tinv[:, 0] - 1. / Tmin - 1. / Tmax) / (
+                1. / Tmax - 1. / Tmin)
+            Pred = (2. * logP - np.log(Pmin) - np.log(Pmax)) / (
+                np.log(Pmax) - np.log(Pmin))
+            kf[:, i] = np.power(10., chebval2d(Tred, Pred, par))
+
+        return kf
+
+    def pres_mod(self, T, conc, kf):
+        """
+        Evaluates the pressure modification of the third-body and
+        falloff / chemically-activated reactions
+
+        Parameters
+        ----------
+        T: :class:`numpy.ndarray`
+            The temperatures [K], shape (n,)
+        conc: :class:`numpy.ndarray`
+            The species concentrations [kmol/m^3], shape (n, N_s)
+        kf: :class:`numpy.ndarray`
+            The forward rate constants, shape (n, N_r)
+
+        Returns
+        -------
+        pres_mod: :class:`numpy.ndarray`
+            The pressure modifications, shape (n, :attr:`thd_map`.size)
+        """
+
+        T = np.asarray(T, dtype=np.float64).reshape((-1, 1))
+        # third-body concentrations
+        pres_mod = np.dot(conc, self.thd_eff.T)
+        if not self.fall_map.size:
+            return pres_mod
+
+        # reduced pressures
+        k = kf[:, self.thd_map[self.fall_map]]
+        k_other = _arrhenius(np.log(T), 1. / T, *self.fall_par.T)
+        Pr = np.where(self.is_chem, k / k_other, k_other / k) * \
+            pres_mod[:, self.fall_map]
+        Pr = np.maximum(Pr, 1e-300)
+        logPr = np.log10(Pr)
+
+        # blending functions
+        F = np.ones_like(Pr)
+        if self.troe_map.size:
+            a, T3, T1, T2 = self.troe_par.T
+            Fcent = (1 - a) * np.exp(-T / T3) + a * np.exp(-T / T1) + \
+                np.where(T2 != 0, np.exp(-T2 / T), 0)
+            logFcent = np.log10(np.maximum(Fcent, 1e-300))
+            logPr_troe = logPr[:, self.troe_map]
+            Atroe = -0.67 * logFcent + logPr_troe - 0.4
+            Btroe = -1.1762 * logFcent - 0.14 * logPr_troe + 0.806
+            F[:, self.troe_map] = np.power(
+                Fcent, 1. / (np.square(Atroe / Btroe) + 1))
+        if self.sri_map.size:
+            a, b, c, d, e = self.sri_par.T
+            X = 1. / (np.square(logPr[:, self.sri_map]) + 1)
+            F[:, self.sri_map] = d * np.power(
+                a * np.exp(-b / T) + np.exp(-T / c), X) * np.power(T, e)
+
+        pres_mod[:, self.fall_map] = np.where(
+            self.is_chem, 1., Pr) / (1. + Pr) * F
+        return pres_mod
+
+    def equilibrium_constants(self, b):
+        """
+        Evaluates the equilibrium constants of the reversible reactions
+
+        Parameters
+        ----------
+        b: :class:`numpy.ndarray`
+            The equilibrium-constant term from :meth:`thermo`, shape (n, N_s)
+
+        Returns
+        -------
+        Kc: :class:`numpy.ndarray`
+            The equilibrium constants, shape (n, :attr:`rev_map`.size)
+        """
+
+        nu = self.nu[self.rev_map]
+        return np.exp(np.dot(b, nu.T) + self.nu_sum[self.rev_map] * np.log(
+            PA / RU))
+
+    def rev_rate_constants(self, T, kf, Kc):
+        """
+        Evaluates the reverse rate constants of the reversible reactions
+
+        Parameters
+        ----------
+        T: :class:`numpy.ndarray`
+            The temperatures [K], shape (n,)
+        kf: :class:`numpy.ndarray`
+            The forward rate constants, shape (n, N_r)
+        Kc: :class:`numpy.ndarray`
+            The equilibrium constants, shape (n, :attr:`rev_map`.size)
+
+        Returns
+        -------
+        kr: :class:`numpy.ndarray`
+            The reverse rate constants, shape (n, :attr:`rev_map`.size)
+        """
+
+        kr = kf[:, self.rev_map] / Kc
+        if self.explicit_map.size:
+            T = np.asarray(T, dtype=np.float64).reshape((-1, 1))
+            kr[:, self.explicit_map] = _arrhenius(
+                np.log(T), 1. / T, *self.rev_par.T)
+        return kr
+
+    def rates_of_progress(self, conc, kf, kr, pres_mod):
+        """
+        Evaluates the rates of progress
+
+        Parameters
+        ----------
+        conc: :class:`numpy.ndarray`
+            The species concentrations [kmol/m^3], shape (n, N_s)
+        kf, kr: :class:`numpy.ndarray`
+            The forward and reverse rate constants
+        pres_mod: :class:`numpy.ndarray`
+            The pressure modifications
+
+        Returns
+        -------
+        rop_fwd: :class:`numpy.ndarray`
+            The forward rates of progress, excluding the pressure modification,
+            shape (n, N_r)
+        rop_rev: :class:`numpy.ndarray`
+            The reverse rates of progress, excluding the pressure modification,
+            shape (n, :attr:`rev_map`.size)
+        rop_net: :class:`numpy.ndarray`
+            The net rates of progress, including the pressure modification,
+            shape (n, N_r)
+        """
+
+        rop_fwd = kf * np.prod(np.power(conc[:, self.reac_spec], self.reac_nu),
+                               axis=2)
+        rop_rev = kr * np.prod(np.power(
+            conc[:, self.prod_spec[self.rev_map]], self.prod_nu[self.rev_map]),
+            axis=2)
+        rop_net = rop_fwd.copy()
+        rop_net[:, self.rev_map] -= rop_rev
+        rop_net[:, self.thd_map] *= pres_mod
+        return rop_fwd, rop_rev, rop_net
+
+    def eval(self, phi, param, conp=True):
+        """
+        Evaluates all source terms for a batch of states
+
+        Parameters
+        ----------
+        phi: :class:`numpy.ndarray`
+            The state vectors, shape (n, N_s + 1)
+        param: float or :class:`numpy.ndarray`
+            The pressure [Pa] for constant-pressure, or the volume [m^3] for
+            constant-volume problems
+        conp: bool [True]
+            If True, constant-pressure, else constant-volume
+
+        Returns
+        -------
+        values: :class:`collections.OrderedDict`
+            The thermodynamic properties (see :meth:`thermo`), the concentrations
+            ('conc'), forward & reverse rate constants ('kf', 'kr'), equilibrium
+            constants ('Kc'), pressure modifications ('pres_mod'), rates of
+            progress ('rop_fwd', 'rop_rev', 'rop_net'), net species production
+            rates ('wdot') [kmol/(m^3 s)] and state-vector derivatives ('dphi')
+        """
+
+        T, P, V, conc = self.state(phi, param, conp)
+        values = self.thermo(T)
+        values['conc'] = conc
+        values['kf'] = self.fwd_rate_constants(T, P)
+        values['Kc'] = self.equilibrium_constants(values['b'])
+        values['kr'] = self.rev_rate_constants(T, values['kf'], values['Kc'])
+        values['pres_mod'] = self.pres_mod(T, conc, values['kf'])
+        values['rop_fwd'], values['rop_rev'], values['rop_net'] = \
+            self.rates_of_progress(conc, values['kf'], values['kr'],
+                                   values['pres_mod'])
+        wdot = np.dot(values['rop_net'], self.nu)
+        values['wdot'] = wdot
+
+        # temperature rate
+        energy, heat_capacity = ('h', 'cp') if conp else ('u', 'cv')
+        Tdot = -np.sum(values[energy] * wdot, axis=1) / np.sum(
+            values[heat_capacity] * conc, axis=1)
+
+        # extra variable (volume / pressure) rate
+        mws = 1 - self.mw[:-1] / self.mw[-1]
+        if conp:
+            Edot = V * (T * RU / P * np.dot(wdot[:, :-1], mws) + Tdot / T)
+        else:
+            Edot = T * RU * np.dot(wdot[:, :-1], mws) + Tdot * P / T
+
+        values['dphi'] = np.concatenate((
+            Tdot[:, np.newaxis], Edot[:, np.newaxis],
+            wdot[:, :-1] * V[:, np.newaxis]), axis=1)
+        return values
@@ -7,10 +7,20 @@
 from __future__ import print_function
 
 # Standard libraries
+import os
 import sys
+import hashlib
 import itertools
+import importlib
+import importlib.util
+import sysconfig
 from argparse import ArgumentParser
 
+# Local imports
+from pyjac.core.chem_model import RU
+from pyjac.core.mech_interpret import read_mech_ct
+from pyjac.core.reference_eval import reference_evaluator
+
 # More Python 2 compatibility
 if sys.version_info.major == 2:
     from itertools import izip as zip
@@ -41,6 +51,10 @@
     print('Warning: multiprocessing not installed')
     parallel = False
 
+# The compiled python wrappers loaded by `compile_source`, by path
+_loaded_sources = {}
+
+
 class Stream(object):
     """Class for inlet flow stream into reactor.
     """
@@ -63,6 +77,9 @@ def __init__(self, gas, flow):
         self.comp = np.hstack((gas.enthalpy_mass, gas.Y))
         self.flow = flow
 
+        # Temperature of stream
+        self.T = gas.T
+
         # Running variable of flow rate
         self.xflow = 0.0
 
@@ -545,17 +562,85 @@ def pairwise(iterable):
     return zip(a, a)
 
 
-def mix_substep(particles, dt, tau_mix):
+def enthalpy(thermo, T, Y):
+    """Calculate the mass-specific enthalpy of a batch of mixtures.
+
+    Parameters
+    ----------
+    thermo : `pyjac.core.reference_evaluator`
+        Evaluator of the species thermodynamic properties.
+    T : numpy.array
+        Temperatures [K] of the mixtures.
+    Y : numpy.ndarray
+        Mass fractions of the mixtures, shape (number of mixtures, number of
+        species).
+
+    Returns
+    -------
+    h : numpy.array
+        Mass-specific enthalpy [J/kg] of the mixtures.
+
+    """
+    return np.sum(thermo.thermo(T)['h'] * Y / thermo.mw, axis=1)
+
+
+def temperature(thermo, h, Y, T, tol=1.e-10, max_iter=50):
+    """Calculate the temperature of a batch of mixtures from their enthalpy.
+
+    Uses a Newton iteration on all mixtures at once.
+
+    Parameters
+    ----------
+    thermo : `pyjac.core.reference_evaluator`
+        Evaluator of the species thermodynamic properties.
+    h : numpy.array
+        Mass-specific enthalpy [J/kg] of the mixtures.
+    Y : numpy.ndarray
+        Mass fractions of the mixtures, shape (number of mixtures, number of
+        species).
+    T : numpy.array
+        Initial guess of the temperatures [K].
+    tol : Optional[float]
+        Relative tolerance of the temperatures. Optional, default 1e-10.
+    max_iter : Optional[int]
+        Maximum number of Newton iterations. Optional, default 50.
+
+    Returns
+    -------
+    T : numpy.array
+        Temperatures [K] of the mixtures.
+
+    """
+    T = np.array(T, dtype=np.float64)
+    Y_mw = Y / thermo.mw
+    for i in range(max_iter):
+        props = thermo.thermo(T)
+        dT = ((h - np.sum(props['h'] * Y_mw, axis=1)) /
+              np.sum(props['cp'] * Y_mw, axis=1))
+        T += dT
+        if np.all(np.abs(dT) <= tol * T):
+            break
+    return T
+
+
+def mix_substep(particles, dt, tau_mix, thermo):
     """Pairwise mixing step.
 
+    The enthalpy and mass fractions of each pair of neighboring particles
+    (i.e., particles 0 & 1, 2 & 3, ...) relax towards their mean, after
+    which the temperatures are updated.
+
     Parameters
     ----------
-    particles : list of `Particle`
-        List of `Particle` objects.
+    particles : numpy.ndarray
+        Particle states (temperature, enthalpy and mass fractions), shape
+        (number of particles, number of species + 2). Updated in place.
     dt : float
         Time step [s] to increment particles.
     tau_mix : float
         Mixing timescale [s].
+    thermo : `pyjac.core.reference_evaluator`
+        Evaluator of the species thermodynamic properties.
 
     Returns
     -------
@@ -564,89 +649,461 @@ def mix_substep(particles, dt, tau_mix):
     """
 
     decay = 0.5 * (1.0 - np.exp(-2.0 * dt / tau_mix))
-    for p1, p2 in pairwise(particles):
-        delt = (p1 - p2) * decay
-        p1 -= delt
-        p2 += delt
+    num = 2 * (particles.shape[0] // 2)
+    first = particles[0:num:2, 1:]
+    second = particles[1:num:2, 1:]
+    delt = (first - second) * decay
+    first -= delt
+    second += delt
 
-        # Update with new compositions
-        comp1 = p1()
-        comp2 = p2()
-        particles[particles.index(p1)](comp1)
-        particles[particles.index(p2)](comp2)
+    particles[:num, 0] = temperature(thermo, particles[:num, 1],
+                                     particles[:num, 2:], particles[:num, 0])
 
 
-def reaction_worker(part_tup):
-    """Worker for performing reaction substep given initial state.
+# Cantera solution of each worker of a `ReactorPool`
+_worker_gas = None
+
+
+def init_reaction_worker(mech):
+    """Initialize a worker for performing reaction substeps.
 
     Parameters
     ----------
-    part_tup : tuple
-        Tuple with mechanism file, temperature, pressure, mass fractions, and time step.
+    mech : str
+        Mechanism filename.
 
     Returns
     -------
-    p : `numpy.array`
-        Thermochemical composition of particle following reaction.
+    None
 
     """
-    mech, T, P, Y, dt = part_tup
-    gas = ct.Solution(mech)
-    gas.TPY = T,P,Y
-    p = Particle(gas)
-    p.react(dt)
-    return p()
+    global _worker_gas
+    _worker_gas = ct.Solution(mech)
 
 
-def reaction_substep(particles, dt, mech):
-    """Advance each of the particles in time through reactions.
+def reaction_worker(part_tup):
+    """Worker for performing reaction substep given initial states.
 
     Parameters
     ----------
-    particles : list of `Particle`
-        List of Particle objects to be reacted.
-    dt : float
-        Time step [s] to increment particles.
-    mech : str
-        Mechanism filename.
+    part_tup : tuple
+        Tuple with particle states, pressure [Pa], and time step.
 
     Returns
     -------
-    None
+    states : `numpy.ndarray`
+        Particle states following reaction.
 
     """
-    if not parallel:
-        for p in particles:
-            p.react(dt)
-    else:
-        pool = multiprocessing.Pool()
-        jobs = []
+    states, P, dt = part_tup
+    for state in states:
+        _worker_gas.TPY = state[0], P, state[2:]
+        p = Particle(_worker_gas)
+        p.react(dt)
+        state[0] = _worker_gas.T
+        state[2:] = _worker_gas.Y
+    return states
+
 
-        #set up a new particle runner for each
-        for p in particles:
-            jobs.append([mech, p.gas.T, p.gas.P, p.gas.Y, dt])
-        jobs = tuple(jobs)
-        results = pool.map(reaction_worker, jobs)
+class ReactorPool(object):
+    """Advance particles through reaction with Cantera reactors.
 
-        pool.close()
-        pool.join()
-        #and finally update the states of our particles on the main
-        #thread
-        for i, p in enumerate(particles):
-            p(comp=results[i])
+    The mechanism is parsed once per worker, and the pool of workers persists
+    over all reaction substeps.
+    """
+
+    def __init__(self, mech, num_procs=None):
+        """Initializes reactor pool.
+
+        Parameters
+        ----------
+        mech : str
+            Mechanism filename.
+        num_procs : Optional[int]
+            Number of worker processes. Optional, default the number of CPUs.
+            If 1, particles are reacted serially.
+
+        Returns
+        -------
+        None
+
+        """
+        if num_procs is None:
+            num_procs = multiprocessing.cpu_count() if parallel else 1
+        self.num_procs = num_procs
+        self.pool = None
+        if parallel and num_procs > 1:
+            self.pool = multiprocessing.Pool(num_procs, init_reaction_worker,
+                                             (mech,))
+        else:
+            init_reaction_worker(mech)
+
+    def __call__(self, particles, P, dt):
+        """Advance each of the particles in time through reactions.
+
+        Parameters
+        ----------
+        particles : numpy.ndarray
+            Particle states (temperature, enthalpy and mass fractions).
+            Updated in place.
+        P : float
+            Pressure [Pa].
+        dt : float
+            Time step [s] to increment particles.
+
+        Returns
+        -------
+        None
+
+        """
+        if self.pool is None:
+            reaction_worker((particles, P, dt))
+            return
+
+        # a few chunks of particles per worker, to balance the load
+        chunks = [c for c in np.array_split(np.arange(particles.shape[0]),
+                                            4 * self.num_procs) if c.size]
+        results = self.pool.map(reaction_worker,
+                                [(particles[c], P, dt) for c in chunks])
+        for c, result in zip(chunks, results):
+            particles[c] = result
+
+    def close(self):
+        """Shut down the pool of workers.
+        """
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+
+class pyjac_source(object):
+    """Constant-pressure source terms and Jacobian from a pyJac python wrapper.
+
+    The wrapper must be of a C Jacobian kernel that also outputs the species
+    rates, as generated by :func:`compile_source`.
+    """
+
+    def __init__(self, package, num_threads=1, order='C'):
+        """Initializes source.
+
+        Parameters
+        ----------
+        package : module or str
+            The (name of the) compiled python wrapper.
+        num_threads : Optional[int]
+            Number of OpenMP threads used by the kernel. Optional, default 1.
+        order : Optional[{'C', 'F'}]
+            Data ordering of the kernel. Optional, default 'C'.
+
+        Returns
+        -------
+        None
+
+        """
+        if isinstance(package, str):
+            package = importlib.import_module(package)
+        self.package = package
+        self.num_threads = num_threads
+        self.order = order
+
+    def jacobian(self, phi, P):
+        """Evaluate the source terms and Jacobian of a batch of states.
+
+        Parameters
+        ----------
+        phi : numpy.ndarray
+            State vectors, shape (number of states, number of species + 1).
+        P : numpy.array
+            Pressures [Pa].
+
+        Returns
+        -------
+        dphi : numpy.ndarray
+            Time derivatives of the state vectors.
+        jac : numpy.ndarray
+            Jacobian of the time derivatives, where ``jac[:, i, j]`` is the
+            derivative of ``dphi[:, i]`` with respect to ``phi[:, j]``.
+
+        """
+        num, size = phi.shape
+        dphi = np.zeros(num * size)
+        jac = np.zeros(num * size * size)
+        self.package.jacobian(num, self.num_threads, phi.flatten(self.order),
+                              np.array(P, dtype=np.float64), dphi, jac)
+        return (dphi.reshape((num, size), order=self.order),
+                jac.reshape((num, size, size), order=self.order))
+
+    def __call__(self, phi, P):
+        """Evaluate the source terms of a batch of states.
+        """
+        return self.jacobian(phi, P)[0]
+
+
+class reference_source(object):
+    """Constant-pressure source terms and Jacobian from array operations.
+
+    Source terms are evaluated by `pyjac.core.reference_evaluator`, and the
+    Jacobian by forward finite differences thereof. This requires no compiled
+    code, but is only practical for small mechanisms.
+    """
+
+    def __init__(self, evaluator):
+        """Initializes source.
+
+        Parameters
+        ----------
+        evaluator : `pyjac.core.reference_evaluator`
+            Evaluator of the source terms.
+
+        Returns
+        -------
+        None
+
+        """
+        self.evaluator = evaluator
+
+    def jacobian(self, phi, P):
+        """Evaluate the source terms and Jacobian of a batch of states.
+
+        See :meth:`pyjac_source.jacobian`.
+        """
+        num, size = phi.shape
+        dphi = self(phi, P)
+
+        # perturb each entry of the state vectors, for all states at once
+        delta = np.sqrt(np.finfo(np.float64).eps) * np.maximum(
+            np.abs(phi), 1.e-10)
+        perturbed = np.repeat(phi[:, np.newaxis, :], size, axis=1)
+        diag = np.arange(size)
+        perturbed[:, diag, diag] += delta
+        dphi_p = self(perturbed.reshape((-1, size)),
+                      np.repeat(P, size)).reshape((num, size, size))
+        jac = (dphi_p - dphi[:, np.newaxis, :]) / delta[:, :, np.newaxis]
+        return dphi, np.swapaxes(jac, 1, 2)
+
+    def __call__(self, phi, P):
+        """Evaluate the source terms of a batch of states.
+        """
+        return self.evaluator.eval(phi, P, conp=True)['dphi']
+
+
+class BatchedReactor(object):
+    """Advance all particles through reaction at once.
+
+    Uses the fourth-order, L-stable Rosenbrock method ROS4 (Hairer & Wanner,
+    1996) with adaptive time steps, vectorized over the particles. Each
+    particle (of 1 kg) is integrated at constant pressure in pyJac's molar
+    state vector form, :math:`[T, V, n_1, \\ldots, n_{N_s - 1}]`.
+    """
+
+    # ROS4 coefficients, with the stage couplings (A, C) stored by row of the
+    # lower triangle
+    ros_gamma = 0.57282
+    ros_A = [2.0, 1.867943637803922, 0.2344449711399156, 1.867943637803922,
+             0.2344449711399156, 0.0]
+    ros_C = [-7.137615036412310, 2.580708087951457, 0.6515950076447975,
+             -2.137148994382534, -0.3214669691237626, -0.6949742501781779]
+    ros_M = [2.255570073418735, 0.2870493262186792, 0.4353179431840180,
+             1.093502252409163]
+    ros_E = [-0.2815431932141155, -0.07276199124938920, -0.1082196201495311,
+             -1.093502252409163]
+    # whether each stage evaluates the source terms, or reuses the previous
+    ros_new_f = [True, True, True, False]
+    ros_order = 4
+
+    def __init__(self, source, mw, spec_map=None, rtol=1.e-6, atol=1.e-12,
+                 max_steps=100000):
+        """Initializes reactor.
+
+        Parameters
+        ----------
+        source : `pyjac_source` or `reference_source`
+            Source terms and Jacobian of the state vectors.
+        mw : numpy.array
+            Molecular weights [kg/kmol] of the species, in the order of the
+            source.
+        spec_map : Optional[numpy.array]
+            Index of each of the species of the source in the particle mass
+            fractions. Optional, default the same order.
+        rtol : Optional[float]
+            Relative integration tolerance. Optional, default 1e-6.
+        atol : Optional[float]
+            Absolute integration tolerance. Optional, default 1e-12.
+        max_steps : Optional[int]
+            Maximum number of steps per reaction substep. Optional, default
+            100000.
+
+        Returns
+        -------
+        None
+
+        """
+        self.source = source
+        self.mw = np.asarray(mw, dtype=np.float64)
+        if spec_map is None:
+            spec_map = np.arange(self.mw.size)
+        self.spec_map = np.asarray(spec_map)
+        self.rtol = rtol
+        self.atol = atol
+        self.max_steps = max_steps
+
+    def to_phi(self, T, Y, P):
+        """Convert temperatures and mass fractions to state vectors.
+        """
+        # moles of each species in 1 kg of mixture
+        n = Y[:, self.spec_map] / self.mw
+        V = np.sum(n, axis=1) * RU * T / P
+        return np.hstack((T[:, np.newaxis], V[:, np.newaxis], n[:, :-1]))
+
+    def from_phi(self, phi, P):
+        """Convert state vectors to temperatures and mass fractions.
+        """
+        T = phi[:, 0]
+        n = np.empty((phi.shape[0], self.mw.size))
+        n[:, :-1] = phi[:, 2:]
+        n[:, -1] = P * phi[:, 1] / (RU * T) - np.sum(phi[:, 2:], axis=1)
+        mass = n * self.mw
+        Y = np.empty_like(mass)
+        Y[:, self.spec_map] = mass / np.sum(mass, axis=1)[:, np.newaxis]
+        return T, Y
+
+    def __call__(self, particles, P, dt):
+        """Advance each of the particles in time through reactions.
+
+        Parameters
+        ----------
+        particles : numpy.ndarray
+            Particle states (temperature, enthalpy and mass fractions).
+            Updated in place.
+        P : float
+            Pressure [Pa].
+        dt : float
+            Time step [s] to increment particles.
+
+        Returns
+        -------
+        None
+
+        """
+        num = particles.shape[0]
+        P = np.full(num, P, dtype=np.float64)
+        phi = self.to_phi(particles[:, 0], particles[:, 2:], P)
+        diag = np.arange(phi.shape[1])
+
+        time = np.zeros(num)
+        h = np.full(num, dt)
+        active = np.arange(num)
+        num_steps = 0
+        while active.size:
+            if num_steps == self.max_steps:
+                print('Error: maximum number of steps ({}) exceeded in reaction '
+                      'substep.'.format(self.max_steps))
+                sys.exit(1)
+            num_steps += 1
+
+            y = phi[active]
+            P_act = P[active]
+            remaining = dt - time[active]
+            h_act = np.minimum(h[active], remaining)
+
+            # the stages, each solving with (I / (gamma * h) - J)
+            f, jac = self.source.jacobian(y, P_act)
+            lhs = -jac
+            lhs[:, diag, diag] += (1. / (self.ros_gamma * h_act))[:, np.newaxis]
+            lhs = np.linalg.inv(lhs)
+            k = []
+            for i in range(len(self.ros_M)):
+                offset = i * (i - 1) // 2
+                if i and self.ros_new_f[i]:
+                    f = self.source(y + sum(self.ros_A[offset + j] * k[j]
+                                            for j in range(i)), P_act)
+                rhs = f + sum(self.ros_C[offset + j] * k[j]
+                              for j in range(i)) / h_act[:, np.newaxis]
+                k.append(np.einsum('ijk,ik->ij', lhs, rhs))
+            y_new = y + sum(m * k_i for m, k_i in zip(self.ros_M, k))
+
+            # error control
+            scale = self.atol + self.rtol * np.maximum(np.abs(y), np.abs(y_new))
+            with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+                err = sum(e * k_i for e, k_i in zip(self.ros_E, k))
+                err = np.sqrt(np.mean((err / scale) ** 2, axis=1))
+                err[~np.isfinite(err)] = np.inf
+                fac = np.clip(0.9 * err ** (-1. / self.ros_order), 0.2, 6.)
+            accept = err <= 1.
+            fac[~accept] = np.minimum(fac[~accept], 1.)
+
+            phi[active[accept]] = y_new[accept]
+            time[active[accept]] += h_act[accept]
+            h[active] = h_act * fac
+            active = active[~(accept & (h_act >= remaining))]
+
+        particles[:, 0], particles[:, 2:] = self.from_phi(phi, P)
+
+
+def compile_source(gas, build_dir, last_spec=None):
+    """Generate and compile the python wrapper of a pyJac Jacobian kernel.
+
+    The kernel also outputs the species rates, see `pyjac_source`.
+
+    Parameters
+    ----------
+    gas : `cantera.Solution`
+        The mechanism.
+    build_dir : str
+        Directory for the generated source, library and wrapper.
+    last_spec : Optional[str]
+        The species to move to the end of the mechanism, see
+        `pyjac.core.create_jacobian.find_last_species`. Optional.
+
+    Returns
+    -------
+    package : module
+        The compiled python wrapper.
+
+    """
+    # the code generator is only required by this engine
+    from pyjac.core.create_jacobian import create_jacobian
+    from pyjac.libgen import build_type
+    from pyjac.pywrap import generate_wrapper
+
+    build_dir = os.path.abspath(build_dir)
+    create_jacobian('c', gas=gas, build_path=build_dir, last_spec=last_spec,
+                    output_species_rates=True)
+    generate_wrapper('c', build_dir, build_dir=os.path.join(build_dir, 'lib'),
+                     obj_dir=os.path.join(build_dir, 'obj'), out_dir=build_dir,
+                     btype=build_type.jacobian, output_species_rates=True)
+
+    # load the wrapper from its path, as an extension module cannot be reloaded
+    path = os.path.join(build_dir, 'pyjac_c' + (
+        sysconfig.get_config_var('EXT_SUFFIX') or sysconfig.get_config_var('SO')))
+    with open(path, 'rb') as file:
+        digest = hashlib.sha256(file.read()).hexdigest()
+    if path in _loaded_sources:
+        loaded, package = _loaded_sources[path]
+        if loaded != digest:
+            raise RuntimeError('A different pyJac wrapper was already loaded from '
+                               '{}, use a new build_dir.'.format(path))
+        return package
+
+    spec = importlib.util.spec_from_file_location('pyjac_c', path)
+    package = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(package)
+    _loaded_sources[path] = (digest, package)
+    return package
 
 
 def select_pairs(particles, num_pairs, num_skip=0):
-    """Randomly select pair(s) of particles and move to end of list.
+    """Randomly select pair(s) of particles and move to end of array.
 
     Parameters
     ----------
-    particles : list of `Particle`
-        List of `Particle` objects.
+    particles : numpy.ndarray
+        Particle states. Updated in place.
     num_pairs : int
         Number of pairs to be selected and moved.
     num_skip : Optional[int]
-        Number of pairs at end of list to be skipped. Optional, default 0.
+        Number of pairs at end of array to be skipped. Optional, default 0.
 
     Returns
     -------
@@ -654,25 +1111,30 @@ def select_pairs(particles, num_pairs, num_skip=0):
 
     """
 
-    for i_pair in range(num_pairs):
-        i = 2 * np.random.randint((len(particles) // 2) - i_pair - num_skip)
-        j = i + 1
+    total_pairs = particles.shape[0] // 2
+    num_avail = total_pairs - num_skip
+    selected = np.random.permutation(num_avail)[:num_pairs]
+    if not selected.size:
+        return
 
-        # Commute particles at random
-        if np.random.random() > 0.5:
-            temp_comp = particles[i]()
-            particles[i](particles[j]())
-            particles[j](temp_comp)
+    # the selected pairs are placed (in reverse order of selection) before
+    # the skipped pairs
+    order = np.concatenate((np.setdiff1d(np.arange(num_avail), selected),
+                            selected[::-1],
+                            np.arange(num_avail, total_pairs)))
+    first = 2 * order
+    second = first + 1
 
-        # Swap with pair at end of list
-        i_last = -2 * (i_pair + num_skip + 1)
-        temp_comp = particles[i]()
-        particles[i](particles[i_last]())
-        particles[i_last](temp_comp)
+    # Commute particles at random
+    commute = np.zeros(total_pairs, dtype=bool)
+    commute[num_avail - selected.size:num_avail] = np.random.random(
+        selected.size) > 0.5
+    first[commute], second[commute] = second[commute], first[commute]
 
-        temp_comp = particles[j]()
-        particles[j](particles[i_last + 1]())
-        particles[i_last + 1](temp_comp)
+    index = np.empty(2 * total_pairs, dtype=np.intp)
+    index[0::2] = first
+    index[1::2] = second
+    particles[:2 * total_pairs] = particles[index]
 
 
 def inflow(streams):
@@ -712,7 +1174,7 @@ def inflow(streams):
     return i_inflow
 
 
-def save_data(idx, time, particles, data):
+def save_data(idx, time, particles, P, data):
     """Save temperature and species mass fraction from all particles to array.
 
     Parameters
@@ -721,8 +1183,10 @@ def save_data(idx, time, particles, data):
         Index of timestep.
     time : float
         Current time [s].
-    particles : list of `Particle`
-        List of `Particle` objects.
+    particles : numpy.ndarray
+        Particle states (temperature, enthalpy and mass fractions).
+    P : float
+        Pressure [Pa].
     data : `numpy.ndarray`
         ndarray of particle data for all timesteps.
 
@@ -731,21 +1195,19 @@ def save_data(idx, time, particles, data):
     None
 
     """
-    for i, p in enumerate(particles):
-        data[idx, i, 0] = time
-        data[idx, i, 1] = p.gas.T
-        data[idx, i, 2] = p.gas.P
+    data[idx, :, 0] = time
+    data[idx, :, 1] = particles[:, 0]
+    data[idx, :, 2] = P
 
-        mass_frac = p()[1:]
-        # Zero out any negative mass fractions
-        mass_frac[mass_frac < 0.0] = 0.0
-        data[idx, i, 3:] = mass_frac
+    # Zero out any negative mass fractions
+    data[idx, :, 3:] = np.maximum(particles[:, 2:], 0.0)
 
 
 def run_simulation(mech, case, init_temp, pres, eq_ratio, fuel, oxidizer,
                    complete_products=['CO2','H2O','N2'],
                    num_part=100, tau_res=(10./1000.), tau_mix=(1./1000.),
-                   tau_pair=(1./1000.), num_res=10
+                   tau_pair=(1./1000.), num_res=10, engine='cantera',
+                   build_dir='pasr_build', num_threads=1, num_procs=None
                    ):
     """Perform partially stirred reactor (PaSR) simulation.
 
@@ -780,6 +1242,22 @@ def run_simulation(mech, case, init_temp, pres, eq_ratio, fuel, oxidizer,
         Pairing timescale [s]. Optional, default 1 [ms].
     num_res : Optional[int]
         Numer of residence times to simulate. Optional, default 5.
+    engine : Optional[{'pyjac', 'reference', 'cantera'}]
+        Method of the reaction substep; {'pyjac', 'reference', 'cantera'}. \
+        'pyjac' and 'reference' integrate all particles at once using \
+        `BatchedReactor`, with source terms from a compiled pyJac kernel \
+        (see `compile_source`) or `pyjac.core.reference_evaluator`, \
+        respectively. 'cantera' reacts each particle with a Cantera \
+        reactor on a `ReactorPool`. Optional, default 'cantera'.
+    build_dir : Optional[str]
+        Directory for the compiled pyJac kernel, if ``engine`` is 'pyjac'. \
+        Optional, default 'pasr_build'.
+    num_threads : Optional[int]
+        Number of OpenMP threads for the compiled pyJac kernel. \
+        Optional, default 1.
+    num_procs : Optional[int]
+        Number of worker processes, if ``engine`` is 'cantera'. \
+        Optional, default the number of CPUs.
 
     Returns
     -------
@@ -802,6 +1280,11 @@ def run_simulation(mech, case, init_temp, pres, eq_ratio, fuel, oxidizer,
 
     # Set initial conditions
     gas = ct.Solution(mech)
+    P = pres * ct.one_atm
+
+    # Species thermodynamic properties
+    _, specs, rxns = read_mech_ct(gas=gas)
+    thermo = reference_evaluator(specs, rxns)
 
     # Determine reactants
     reactants = equivalence_ratio(gas, eq_ratio, fuel,
@@ -819,6 +1302,10 @@ def run_simulation(mech, case, init_temp, pres, eq_ratio, fuel, oxidizer,
         print('Error: case needs to be either premixed or non-premixed.')
         sys.exit(1)
 
+    if engine not in ['pyjac', 'reference', 'cantera']:
+        print('Error: engine needs to be one of pyjac, reference or cantera.')
+        sys.exit(1)
+
     inlet_streams = []
     for src in flow_rates.keys():
         if src == 'fuel':
@@ -828,7 +1315,7 @@ def run_simulation(mech, case, init_temp, pres, eq_ratio, fuel, oxidizer,
                 reacs = ','.join([reacs, add_sp])
             reacs = reacs[1:]
 
-            gas.TPX = init_temp, pres * ct.one_atm, fuel + ':1.0'
+            gas.TPX = init_temp, P, reacs
             fuel_stream = Stream(gas, flow_rates['fuel'])
             inlet_streams.append(fuel_stream)
         elif src == 'air':
@@ -838,27 +1325,43 @@ def run_simulation(mech, case, init_temp, pres, eq_ratio, fuel, oxidizer,
                 reacs = ','.join([reacs, add_sp])
             reacs = reacs[1:]
 
-            gas.TPX = init_temp, pres * ct.one_atm, 'O2:0.21,N2:0.79'
+            gas.TPX = init_temp, P, 'O2:0.21,N2:0.79'
             air_stream = Stream(gas, flow_rates['air'])
             inlet_streams.append(air_stream)
         elif src == 'fuel_air':
-            gas.TPX = init_temp, pres * ct.one_atm, reactants
+            gas.TPX = init_temp, P, reactants
             fuel_air_stream = Stream(gas, flow_rates['fuel_air'])
             inlet_streams.append(fuel_air_stream)
 
     # Pilot always present
     # Get equilibrium composition for pilot and initial conditions
-    gas.TPX = init_temp, pres * ct.one_atm, reactants
+    gas.TPX = init_temp, P, reactants
     gas.equilibrate('HP')
     pilot_stream = Stream(gas, flow_rates['pilot'])
     inlet_streams.append(pilot_stream)
 
+    # States (temperature, enthalpy, mass fractions) of the streams
+    inlet_states = np.array([np.hstack((stream.T, stream()))
+                             for stream in inlet_streams])
+    inlet_states[:, 1] = enthalpy(thermo, inlet_states[:, 0],
+                                  inlet_states[:, 2:])
+
     # Initialize all particles with pilot composition
-    particles = []
-    for i in range(num_part):
-        g = ct.Solution(mech)
-        g.TPX = gas.T, gas.P, gas.X
-        particles.append(Particle(g))
+    particles = np.tile(inlet_states[-1], (num_part, 1))
+    # Particles are paired with their neighbor, and an odd one out is unused
+    num_paired = 2 * (num_part // 2)
+
+    # Reaction substep
+    if engine == 'cantera':
+        reactor = ReactorPool(mech, num_procs)
+    elif engine == 'reference':
+        reactor = BatchedReactor(reference_source(thermo), thermo.mw)
+    else:
+        from pyjac.core.create_jacobian import find_last_species
+        # The kernel moves a bath-gas species to the end of the mechanism
+        spec_map = find_last_species(specs, return_map=True)
+        source = pyjac_source(compile_source(gas, build_dir), num_threads)
+        reactor = BatchedReactor(source, thermo.mw[spec_map], spec_map)
 
     # Random seed
     np.random.seed()
@@ -871,75 +1374,78 @@ def run_simulation(mech, case, init_temp, pres, eq_ratio, fuel, oxidizer,
 
     times = np.zeros(num_steps + 1)
     temp_mean = np.zeros(num_steps + 1)
-    temp_mean[0] = np.mean([p.gas.T for p in particles])
+    temp_mean[0] = np.mean(particles[:, 0])
 
     # Array of full particle data for all timesteps
     particle_data = np.empty([num_steps + 1, num_part, gas.n_species + 3])
-    save_data(i_step, time, particles, particle_data)
+    save_data(i_step, time, particles, P, particle_data)
 
     print('Time [ms]  Temperature [K]')
-    temp_mean[i_step] = np.mean([p.gas.T for p in particles])
+    temp_mean[i_step] = np.mean(particles[:, 0])
     print('{:6.2f}  {:9.1f}'.format(time*1000., temp_mean[i_step]))
 
-    while time < time_end:
-        if i_step + 1 >= num_steps:
-            #need to resize arrays
-            times = np.hstack((times, np.zeros(num_steps + 1)))
-            temp_mean = np.hstack((temp_mean, np.zeros(num_steps + 1)))
-            particle_data = np.concatenate((particle_data,
-                np.empty([num_steps + 1, num_part, gas.n_species + 3])),
-                axis=0)
-            num_steps *= 2
-
-        if (time + dt_max) > time_end:
-            dt = time_end - time
-        else:
-            dt = dt_max
-
-        part_out += num_part * dt / tau_res
-        npart_out = int(round(part_out))
-        part_out -= npart_out
-
-        # Select num_pairs random pairs of particles for each
-        # inflow/outflow particle and shift to end.
-        num_fl_pairs = 2 * npart_out
-        select_pairs(particles, num_fl_pairs)
-
-        # Set alternate particles to inflow properties
-        for i in range(npart_out):
-            i_str = inflow(inlet_streams)
-            particles[1 - 2 * (i+1)](inlet_streams[i_str]())
-
-        # Now perform pairing
-        part_pair += 0.5 * num_part * dt / tau_pair
-        num_pairs = int(round(part_pair))
-        part_pair -= num_pairs
-        select_pairs(particles, num_pairs, num_fl_pairs)
-
-        # Rotate particles
-        temp_comp = particles[-1]()
-        for i in [i*2 + 1 for i in range(num_pairs - 1)]:
-            #particles[-i] = particles[-(i+2)]
-            particles[-i](particles[-(i+2)])
-        particles[-(num_pairs * 2 - 1)](temp_comp)
-
-        # Now loop over mix-react substeps
-        dt_sub = dt / num_substeps
-        for i in range(num_substeps):
-            mix_substep(particles, dt_sub, tau_mix)
-            reaction_substep(particles, dt_sub, mech)
-
-        time += dt
-        i_step += 1
-
-        # Save mean properties
-        temp_mean[i_step] = np.mean([p.gas.T for p in particles])
-        times[i_step] = time
-
-        # Save full data
-        save_data(i_step, time, particles, particle_data)
-
-        print('{:6.2f}  {:9.1f}'.format(time*1000., temp_mean[i_step]))
+    try:
+        while time < time_end:
+            if i_step + 1 >= num_steps:
+                # need to resize arrays
+                times = np.hstack((times, np.zeros(num_steps + 1)))
+                temp_mean = np.hstack((temp_mean, np.zeros(num_steps + 1)))
+                particle_data = np.concatenate((particle_data,
+                                                np.empty([num_steps + 1, num_part,
+                                                          gas.n_species + 3])),
+                                               axis=0)
+                num_steps *= 2
+
+            if (time + dt_max) > time_end:
+                dt = time_end - time
+            else:
+                dt = dt_max
+
+            part_out += num_part * dt / tau_res
+            npart_out = int(round(part_out))
+            part_out -= npart_out
+
+            # Select num_pairs random pairs of particles for each
+            # inflow/outflow particle and shift to end.
+            num_fl_pairs = 2 * npart_out
+            select_pairs(particles, num_fl_pairs)
+
+            # Set alternate particles to inflow properties
+            i_str = np.array([inflow(inlet_streams) for i in range(npart_out)],
+                             dtype=np.intp)
+            particles[num_paired - 1 - 2 * np.arange(npart_out)] = \
+                inlet_states[i_str]
+
+            # Now perform pairing
+            part_pair += 0.5 * num_part * dt / tau_pair
+            num_pairs = int(round(part_pair))
+            part_pair -= num_pairs
+            select_pairs(particles, num_pairs, num_fl_pairs)
+
+            # Rotate the second particles of the last pairs
+            rotate = num_paired - 1 - 2 * np.arange(num_pairs)
+            particles[rotate] = particles[np.roll(rotate, -1)]
+
+            # Now loop over mix-react substeps
+            dt_sub = dt / num_substeps
+            for i in range(num_substeps):
+                mix_substep(particles, dt_sub, tau_mix, thermo)
+                reactor(particles, P, dt_sub)
+
+            time += dt
+            i_step += 1
+
+            # Save mean properties
+            temp_mean[i_step] = np.mean(particles[:, 0])
+            times[i_step] = time
+
+            # Save full data
+            save_data(i_step, time, particles, P, particle_data)
+
+            print('{:6.2f}  {:9.1f}'.format(time*1000., temp_mean[i_step]))
+    finally:
+        if engine == 'cantera':
+            reactor.close()
 
     times = times[:i_step + 1]
     temp_mean = temp_mean[:i_step + 1]
@@ -1033,6 +1539,29 @@ def parse_input_file(input_file):
                         type=str, default='pasr_output.npy',
                         help='PaSR results file (.npy).'
                         )
+    parser.add_argument('-e', '--engine',
+                        type=str, default='cantera',
+                        choices=['pyjac', 'reference', 'cantera'],
+                        help='Method of the reaction substep: integrate all '
+                             'particles at once with source terms from a '
+                             'compiled pyJac kernel (pyjac) or NumPy '
+                             '(reference), or react each particle with a '
+                             'Cantera reactor (cantera).'
+                        )
+    parser.add_argument('-b', '--build_dir',
+                        type=str, default='pasr_build',
+                        help='Directory for the compiled pyJac kernel.'
+                        )
+    parser.add_argument('-nt', '--num_threads',
+                        type=int, default=1,
+                        help='Number of OpenMP threads for the compiled pyJac '
+                             'kernel.'
+                        )
+    parser.add_argument('-np', '--num_procs',
+                        type=int, default=None,
+                        help='Number of worker processes for the cantera '
+                             'engine, by default the number of CPUs.'
+                        )
     args = parser.parse_args()
 
     inputs = parse_input_file(args.input)
@@ -1042,6 +1571,7 @@ def parse_input_file(input_file):
         inputs['fuel'], inputs['oxidizer'],
         inputs['complete products'], inputs['number of particles'],
         inputs['residence time'], inputs['mixing time'],
-        inputs['pairing time'], inputs['number of residence times']
+        inputs['pairing time'], inputs['number of residence times'],
+        args.engine, args.build_dir, args.num_threads, args.num_procs
         )
     np.save(args.output, particle_data)
@@ -9,10 +9,12 @@
 import os
 import subprocess
 import logging
+import multiprocessing
+from itertools import islice
+from collections import deque
 
 # Related modules
 import numpy as np
-import numpy.ma as ma
 import cantera as ct
 from six.moves import range
 from six import iteritems
@@ -24,8 +26,7 @@
 # Local imports
 from pyjac.core.mech_interpret import read_mech_ct
 from pyjac.tests.test_jacobian import _get_fd_jacobian
-from pyjac.tests.test_utils import parse_split_index, _run_mechanism_tests, runner, \
-    inNd
+from pyjac.tests.test_utils import parse_split_index, _run_mechanism_tests, runner
 from pyjac.tests import test_utils, get_matrix_file, _get_test_input
 from pyjac.loopy_utils.loopy_utils import JacobianFormat, RateSpecialization
 from pyjac.libgen import build_type, generate_library
@@ -535,28 +536,224 @@ def _check_file(self, err, names, mods):
         return allclear
 
 
+def nasa_cp_h(specs, T):
+    """
+    Evaluates the molar constant-pressure specific heat and enthalpy of each
+    species at each of the supplied temperatures, vectorized over the
+    temperatures via the species' NASA polynomials
+
+    Parameters
+    ----------
+    specs: list of :class:`cantera.Species`
+        The species to evaluate
+    T: :class:`numpy.ndarray`
+        The temperatures [K]
+
+    Returns
+    -------
+    cp: :class:`numpy.ndarray`
+        The molar specific heats [J/kmol/K], of shape (T.size, len(specs))
+    h: :class:`numpy.ndarray`
+        The molar enthalpies [J/kmol], of shape (T.size, len(specs))
+    """
+
+    T = np.asarray(T, dtype=np.float64)
+    cp = np.empty((T.size, len(specs)))
+    h = np.empty((T.size, len(specs)))
+    # powers of the temperature, and the integration factors of the enthalpy
+    Tpow = np.vstack([T ** i for i in range(5)]).T
+    hfac = 1. / np.arange(1, 6)
+    for j, spec in enumerate(specs):
+        if not isinstance(spec.thermo, ct.NasaPoly2):
+            # not a NASA polynomial, fall back to Cantera's evaluation
+            cp[:, j] = [spec.thermo.cp(t) for t in T]
+            h[:, j] = [spec.thermo.h(t) for t in T]
+            continue
+        # coefficients are stored as [T_mid, high (7), low (7)]
+        coeffs = spec.thermo.coeffs
+        a = np.where((T <= coeffs[0])[:, np.newaxis], coeffs[np.newaxis, 8:15],
+                     coeffs[np.newaxis, 1:8])
+        cp[:, j] = np.sum(a[:, :5] * Tpow, axis=1)
+        h[:, j] = np.sum(a[:, :5] * Tpow * hfac, axis=1) + a[:, 5] / T
+    cp *= ct.gas_constant
+    h *= ct.gas_constant * T[:, np.newaxis]
+    return cp, h
+
+
+def _imap_ordered(func, jobs, num_procs):
+    """
+    Maps :param:`func` over the :param:`jobs` on a pool of forked worker processes,
+    yielding the results in order.  At most a window of jobs is in flight at any
+    time (a new job is submitted as soon as the oldest result is consumed), such
+    that only a bounded number of jobs / results are held in memory
+
+    Parameters
+    ----------
+    func: Callable
+        The (picklable) function to call on each job
+    jobs: iterable
+        The arguments of each job, lazily evaluated
+    num_procs: int
+        The number of worker processes.  If one (or if :func:`os.fork` is not
+        available), the jobs are evaluated serially in this process
+
+    Yields
+    ------
+    result:
+        The result of :param:`func` for each job, in order
+    """
+
+    if num_procs <= 1 or not hasattr(os, 'fork'):
+        for job in jobs:
+            yield func(job)
+        return
+
+    try:
+        pool = multiprocessing.get_context('fork').Pool(num_procs)
+    except AttributeError:
+        # python 2, always forks
+        pool = multiprocessing.Pool(num_procs)
+    try:
+        jobs = iter(jobs)
+        window = 2 * num_procs
+        pending = deque(pool.apply_async(func, (job,))
+                        for job in islice(jobs, window))
+        while pending:
+            result = pending.popleft().get()
+            # keep the window full
+            for job in islice(jobs, 1):
+                pending.append(pool.apply_async(func, (job,)))
+            yield result
+    finally:
+        pool.close()
+        pool.join()
+
+
+# the Cantera solution used by the (forked) reference answer workers
+_reference_gas = None
+
+
+def _eval_spec_rates_shard(phi, conp, rev_map):
+    """
+    Evaluates the reference answers of the species rates tester for a shard of the
+    thermo-chemical states, using the module's :data:`_reference_gas`
+
+    Parameters
+    ----------
+    phi: :class:`numpy.ndarray`
+        The states to evaluate
+    conp: bool
+        If True, :param:`phi` is in constant-pressure form, i.e., phi[:, 1] is
+        the pressure and phi[:, 2] the volume, and vice versa if False
+    rev_map: :class:`numpy.ndarray`
+        The indicies of the reversible reactions
+
+    Returns
+    -------
+    dphi_cp: :class:`numpy.ndarray`
+        The constant-pressure state vector rates
+    dphi_cv: :class:`numpy.ndarray`
+        The constant-volume state vector rates
+    rop_fwd: :class:`numpy.ndarray`
+        The forward rates of progress
+    rop_rev: :class:`numpy.ndarray`
+        The reverse rates of progress of the reversible reactions
+    rop_net: :class:`numpy.ndarray`
+        The net rates of progress
+    """
+
+    gas = _reference_gas
+    gas.basis = 'molar'
+    num_conds = phi.shape[0]
+
+    T = phi[:, 0]
+    P = phi[:, 1] if conp else phi[:, 2]
+    V = phi[:, 2] if conp else phi[:, 1]
+    # it's actually more accurate to set the density
+    # (total concentration) due to the cantera internals
+    D = P / (ct.gas_constant * T)
+
+    # get the last species's concentrations as D - sum(other species)
+    concs = phi[:, 3:] / V[:, np.newaxis]
+    last_spec = np.expand_dims(D - np.sum(concs, axis=1), 1)
+    concs = np.concatenate((concs, last_spec), axis=1)
+
+    spec_rates = np.empty((num_conds, gas.n_species))
+    rop_fwd = np.empty((num_conds, gas.n_reactions))
+    rop_rev = np.empty((num_conds, rev_map.size))
+    rop_net = np.empty((num_conds, gas.n_reactions))
+    for i in range(num_conds):
+        # first, set T / D
+        gas.TD = T[i], D[i]
+        # now set concentrations
+        gas.concentrations = concs[i]
+        # assert allclose
+        assert np.allclose(gas.T, T[i], atol=1e-12)
+        assert np.allclose(gas.density, D[i], atol=1e-12)
+        assert np.allclose(gas.concentrations, concs[i], atol=1e-12)
+        # get molar species rates
+        spec_rates[i, :] = gas.net_production_rates[:]
+        # info vars
+        rop_fwd[i, :] = gas.forward_rates_of_progress[:]
+        rop_rev[i, :] = gas.reverse_rates_of_progress[:][rev_map]
+        rop_net[i, :] = gas.net_rates_of_progress[:]
+
+    # molecular weight fraction
+    mw_frac = 1 - gas.molecular_weights[:-1] / gas.molecular_weights[-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # find temperature rates
+        cp, h = nasa_cp_h(gas.species(), T)
+        cv = cp - ct.gas_constant
+        u = h - T[:, np.newaxis] * ct.gas_constant
+        conp_temperature_rates = -np.sum(h * spec_rates, axis=1) / np.sum(
+            cp * concs, axis=1)
+        conv_temperature_rates = -np.sum(u * spec_rates, axis=1) / np.sum(
+            cv * concs, axis=1)
+
+        # finally find extra variable rates
+        mw_rates = np.sum(mw_frac * spec_rates[:, :-1], axis=1)
+        conp_extra_rates = V * (T * ct.gas_constant * mw_rates / P +
+                                conp_temperature_rates / T)
+        conv_extra_rates = (P / T) * conv_temperature_rates + \
+            T * ct.gas_constant * mw_rates
+
+    molar_rates = spec_rates[:, :-1] * V[:, np.newaxis]
+
+    def _dphi(temperature_rates, extra_rates):
+        return np.concatenate((temperature_rates[:, np.newaxis],
+                               extra_rates[:, np.newaxis],
+                               molar_rates), axis=1)
+
+    return (_dphi(conp_temperature_rates, conp_extra_rates),
+            _dphi(conv_temperature_rates, conv_extra_rates),
+            rop_fwd, rop_rev, rop_net)
+
+
+def _spec_rates_job(args):
+    return _eval_spec_rates_shard(*args)
+
+
 class spec_rate_eval(eval):
     """
     Helper class for the species rates tester
+
+    The reference answers are evaluated in shards of :attr:`chunk_size` states
+    by a pool of :attr:`num_procs` (forked) worker processes, each with its own
+    copy of the Cantera solution, and streamed into HDF5 files
     """
-    def __init__(self, gas, num_conditions, atol=1e-10, rtol=1e-6):
+    def __init__(self, gas, num_conditions, atol=1e-10, rtol=1e-6,
+                 num_procs=_get_test_input('num_procs', None)):
         self.atol = atol
         self.rtol = rtol
-        self.molar_rates = np.zeros((num_conditions, gas.n_species - 1))
-        self.conp_temperature_rates = np.zeros((num_conditions, 1))
-        self.conv_temperature_rates = np.zeros((num_conditions, 1))
-        self.conp_extra_rates = np.zeros((num_conditions, 1))
-        self.conv_extra_rates = np.zeros((num_conditions, 1))
-        self.h = np.zeros((gas.n_species))
-        self.u = np.zeros((gas.n_species))
-        self.cp = np.zeros((gas.n_species))
-        self.cv = np.zeros((gas.n_species))
         self.num_conditions = num_conditions
+        self.num_procs = int(num_procs) if num_procs is not None else \
+            multiprocessing.cpu_count()
 
         # get mappings
         self.fwd_map = np.array(range(gas.n_reactions))
         self.rev_map = np.array(
-            [x for x in range(gas.n_reactions) if gas.is_reversible(x)])
+            [x for x in range(gas.n_reactions) if gas.is_reversible(x)],
+            dtype=np.int32)
         self.thd_map = []
         for x in range(gas.n_reactions):
             try:
@@ -565,9 +762,6 @@ def __init__(self, gas, num_conditions, atol=1e-10, rtol=1e-6):
             except:
                 pass
         self.thd_map = np.array(self.thd_map, dtype=np.int32)
-        self.rop_fwd_test = np.zeros((num_conditions, self.fwd_map.size))
-        self.rop_rev_test = np.zeros((num_conditions, self.rev_map.size))
-        self.rop_net_test = np.zeros((num_conditions, self.fwd_map.size))
         # need special maps for rev/thd
         self.rev_to_thd_map = np.where(np.in1d(self.rev_map, self.thd_map))[0]
         self.thd_to_rev_map = np.where(np.in1d(self.thd_map, self.rev_map))[0]
@@ -577,11 +771,7 @@ def __init__(self, gas, num_conditions, atol=1e-10, rtol=1e-6):
         # hence we create it as a placeholder for the testing script
         self.pres_mod_test = np.zeros((num_conditions, self.thd_map.size))
 
-        # molecular weight fraction
-        self.mw_frac = 1 - gas.molecular_weights[:-1] / gas.molecular_weights[-1]
-
         # predefines
-        self.specs = gas.species()[:]
         self.gas = gas
         self.evaled = False
         self.name = 'spec'
@@ -597,98 +787,46 @@ def ref_answers(self, state):
         return self.outputs_cp if state['conp'] else self.outputs_cv
 
     def eval_answer(self, phi, state):
-        def __eval_cp(j, T):
-            return self.specs[j].thermo.cp(T)
-        eval_cp = np.vectorize(__eval_cp, cache=True)
-
-        def __eval_h(j, T):
-            return self.specs[j].thermo.h(T)
-        eval_h = np.vectorize(__eval_h, cache=True)
-
-        if not self.evaled:
-            ns_range = np.arange(self.gas.n_species)
-
-            T = phi[:, 0]
-            P = phi[:, 1] if state['conp'] else phi[:, 2]
-            V = phi[:, 2] if state['conp'] else phi[:, 1]
-            # it's actually more accurate to set the density
-            # (total concentration) due to the cantera internals
-            D = P / (ct.gas_constant * T)
-
-            # get the last species's concentrations as D - sum(other species)
-            concs = phi[:, 3:] / V[:, np.newaxis]
-            last_spec = np.expand_dims(D - np.sum(concs, axis=1), 1)
-            concs = np.concatenate((concs, last_spec), axis=1)
-
-            self.gas.basis = 'molar'
-            with np.errstate(divide='ignore', invalid='ignore'):
-                for i in range(self.num_conditions):
-                    if not i % 10000:
-                        print(i)
-                    # first, set T / D
-                    self.gas.TD = T[i], D[i]
-                    # now set concentrations
-                    self.gas.concentrations = concs[i]
-                    # assert allclose
-                    assert np.allclose(self.gas.T, T[i], atol=1e-12)
-                    assert np.allclose(self.gas.density, D[i], atol=1e-12)
-                    assert np.allclose(self.gas.concentrations, concs[i], atol=1e-12)
-                    # get molar species rates
-                    spec_rates = self.gas.net_production_rates[:]
-                    self.molar_rates[i, :] = spec_rates[:-1] * V[i]
-                    # info vars
-                    self.rop_fwd_test[i, :] = self.gas.forward_rates_of_progress[:]
-                    self.rop_rev_test[i, :] = self.gas.reverse_rates_of_progress[:][
-                        self.rev_map]
-                    self.rop_net_test[i, :] = self.gas.net_rates_of_progress[:]
-
-                    # find temperature rates
-                    cp = eval_cp(ns_range, T[i])
-                    h = eval_h(ns_range, T[i])
-                    cv = cp - ct.gas_constant
-                    u = h - T[i] * ct.gas_constant
-                    np.divide(-np.dot(h, spec_rates), np.dot(cp, concs[i]),
-                              out=self.conp_temperature_rates[i, :])
-                    np.divide(-np.dot(u, spec_rates), np.dot(cv, concs[i]),
-                              out=self.conv_temperature_rates[i, :])
-
-                    # finally find extra variable rates
-                    self.conp_extra_rates[i] = V[i] * (
-                        T[i] * ct.gas_constant * np.sum(
-                            self.mw_frac * spec_rates[:-1]) / P[i] +
-                        self.conp_temperature_rates[i, :] / T[i])
-                    self.conv_extra_rates[i] = (
-                        P[i] / T[i]) * self.conv_temperature_rates[i, :] + \
-                        T[i] * ct.gas_constant * np.sum(
-                            self.mw_frac * spec_rates[:-1])
-
-            def _dphi(conp):
-                temperature_rates = self.conp_temperature_rates if conp \
-                    else self.conv_temperature_rates
-                extra_rates = self.conp_extra_rates if conp else\
-                    self.conv_extra_rates
-                return np.concatenate((temperature_rates, extra_rates,
-                                      self.molar_rates), axis=1)
-
-            # finally convert to HDF5
-            self.dphi_cp = _dphi(True)
-            self.dphi_cp = self.to_file(self.dphi_cp, 'dphi_cp.hdf5')
-            self.dphi_cv = _dphi(False)
-            self.dphi_cv = self.to_file(self.dphi_cp, 'dphi_cv.hdf5')
-            self.molar_rates = self.to_file(self.molar_rates, 'molar_rates.hdf5')
-            self.rop_fwd_test = self.to_file(self.rop_fwd_test, 'rop_fwd_test.hdf5')
-            self.rop_rev_test = self.to_file(self.rop_rev_test, 'rop_rev_test.hdf5')
-            self.rop_net_test = self.to_file(self.rop_net_test, 'rop_net_test.hdf5')
-            self.conp_extra_rates = self.to_file(
-                self.conp_extra_rates, 'conp_extra_rates.hdf5')
-            self.conv_extra_rates = self.to_file(
-                self.conv_extra_rates, 'conv_extra_rates.hdf5')
-            # and store outputs
-            outputs = [self.rop_fwd_test, self.rop_rev_test, self.pres_mod_test,
-                       self.rop_net_test]
-            self.outputs_cp = [self.dphi_cp] + outputs
-            self.outputs_cv = [self.dphi_cv] + outputs
-            self.evaled = True
+        if self.evaled:
+            return
+
+        global _reference_gas
+        # the reference answers, as chunked HDF5 arrays
+        ns = self.gas.n_species
+        names = ['dphi_cp', 'dphi_cv', 'rop_fwd_test', 'rop_rev_test',
+                 'rop_net_test']
+        shapes = [(0, ns + 1), (0, ns + 1), (0, self.fwd_map.size),
+                  (0, self.rev_map.size), (0, self.fwd_map.size)]
+        answers = [self.open_for_chunked_write(
+            name + '.hdf5', shape, self.num_conditions)
+            for name, shape in zip(names, shapes)]
+
+        shards = [(offset, min(offset + self.chunk_size, self.num_conditions))
+                  for offset in range(0, self.num_conditions, self.chunk_size)]
+
+        _reference_gas = self.gas
+        try:
+            # the workers must be forked, such that each inherits its own copy of
+            # the Cantera solution
+            jobs = ((phi[start:end], state['conp'], self.rev_map)
+                    for start, end in shards)
+            num_procs = self.num_procs if len(shards) > 1 else 1
+            for result in _imap_ordered(_spec_rates_job, jobs, num_procs):
+                for answer, arr in zip(answers, result):
+                    answer.append(arr)
+        finally:
+            _reference_gas = None
+
+        # reopen for reading
+        self.dphi_cp, self.dphi_cv, self.rop_fwd_test, self.rop_rev_test, \
+            self.rop_net_test = [self.open_for_read(name + '.hdf5')
+                                 for name in names]
+        # and store outputs
+        outputs = [self.rop_fwd_test, self.rop_rev_test, self.pres_mod_test,
+                   self.rop_net_test]
+        self.outputs_cp = [self.dphi_cp] + outputs
+        self.outputs_cv = [self.dphi_cv] + outputs
+        self.evaled = True
 
     def eval_error(self, offset, this_run, state, output, answers, err_dict):
         # get indicies
@@ -872,14 +1010,164 @@ def check_file(self, filename, Ns, Nr, Nrev, current_vecsize):
                 return False
 
 
+class _jacobian_view(object):
+    """
+    A read-only view of the sparse (C-ordered) reference Jacobian stored in a
+    :class:`pytables.EArray`, converted on access to a different format.  Only the
+    requested initial conditions are read into memory, i.e., the view may be
+    sliced along the first (initial condition) axis as in
+    :func:`validation_runner.arrays_per_run`
+    """
+
+    def __init__(self, sparse, shape):
+        self.sparse = sparse
+        self.shape = shape
+        self.dtype = sparse.dtype
+        self.ndim = len(shape)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def _convert(self, values):
+        raise NotImplementedError
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        return self._convert(self.sparse[key[0]])[(slice(None),) + key[1:]]
+
+
+class _reordered_jacobian(_jacobian_view):
+    """
+    The sparse reference Jacobian, in a different (i.e., F-) ordering of the
+    non-zero entries
+    """
+
+    def __init__(self, sparse, order_map):
+        super(_reordered_jacobian, self).__init__(sparse, sparse.shape)
+        self.order_map = order_map
+
+    def _convert(self, values):
+        return values[:, self.order_map]
+
+
+class _densified_jacobian(_jacobian_view):
+    """
+    The dense reference Jacobian, with zeros outside of the sparsity pattern
+    """
+
+    def __init__(self, sparse, inds, size):
+        super(_densified_jacobian, self).__init__(
+            sparse, (sparse.shape[0], size, size))
+        self.inds = inds
+
+    def _convert(self, values):
+        dense = np.zeros((values.shape[0],) + self.shape[1:], dtype=self.dtype)
+        dense[:, self.inds[:, 0], self.inds[:, 1]] = values
+        return dense
+
+
+# the :class:`jacobian_eval` and pregenerated finite difference Jacobian kernel
+# used by the (forked) reference answer workers
+_fd_jacobian_kernel = None
+
+
+def _eval_fd_jacobian_shard(phi, P, V, conp, num_conds):
+    """
+    Evaluates the finite difference Jacobian for a shard of the thermo-chemical
+    states using the module's :data:`_fd_jacobian_job`, and sparsifies the result
+
+    Parameters
+    ----------
+    phi: :class:`numpy.ndarray`
+        The state vectors, padded to the size of the pregenerated kernel
+    P: :class:`numpy.ndarray`
+        The pressures
+    V: :class:`numpy.ndarray`
+        The volumes
+    conp: bool
+        If True, constant-pressure, else constant-volume
+    num_conds: int
+        The number of (non-padding) states in the shard
+
+    Returns
+    -------
+    values: :class:`numpy.ndarray`
+        The Jacobian entries in the (C-ordered) sparsity pattern
+    dense_sum: float
+        The sum of squares of all finite (and not effectively infinite) entries
+    sparse_sum: float
+        The sum of squares of the finite entries in the sparsity pattern
+    all_finite: bool
+        False if any Jacobian entry is NaN or infinite
+    outside: :class:`numpy.ndarray`
+        The flattened indicies of the non-zero entries outside the sparsity pattern
+    """
+
+    helper, pregen = _fd_jacobian_kernel
+    inds = helper.inds['flat_C']
+    # seed all 'zero' concentrations with a tiny epsilon to avoid NaN's
+    # and enable valid comparison
+    phi = phi.copy()
+    phi[:, 2:] = np.maximum(phi[:, 2:], 1e-300)
+    helper.store = type('', (object,), {
+        'reacs': helper.reacs,
+        'specs': helper.specs,
+        'phi_cp': phi if conp else None,
+        'phi_cv': phi if not conp else None,
+        'P': P,
+        'V': V,
+        'test_size': phi.shape[0]
+        })
+    jac = _get_fd_jacobian(helper, phi.shape[0], conp, pregen)[:num_conds]
+
+    values = jac[:, inds[:, 0], inds[:, 1]]
+    dense_sum = 0
+    all_finite = True
+    non_zero = np.zeros_like(helper.pattern)
+    # temporarily turn off NaN comparison warnings
+    settings = np.seterr(invalid='ignore')
+    # reduce the dense Jacobian a state at a time, such that the temporaries are
+    # no larger than a single Jacobian
+    for state in jac:
+        # filter out any nan's / infinites for tresholding
+        finite = np.isfinite(state)
+        all_finite = all_finite and np.all(finite)
+        dense = state[np.logical_and(finite, np.abs(state) < inf_cutoff)]
+        dense_sum += np.dot(dense, dense)
+        # and find any non-zero (or NaN) entries outside of the pattern
+        non_zero |= state != 0
+    sparse = values[np.logical_and(np.isfinite(values),
+                                   np.abs(values) < inf_cutoff)]
+    outside = np.flatnonzero(np.logical_and(non_zero, ~helper.pattern))
+    np.seterr(**settings)
+
+    return values, dense_sum, np.dot(sparse, sparse), all_finite, outside
+
+
+def _fd_jacobian_job(args):
+    return _eval_fd_jacobian_shard(*args)
+
+
 class jacobian_eval(eval):
     """
     Helper class for the Jacobian tester
+
+    The reference finite difference Jacobian is evaluated in shards of states by a
+    pool of :attr:`num_procs` (forked) worker processes, where the shards are sized
+    such that the dense Jacobians of all workers hold no more entries than the
+    sparse output of :attr:`chunk_size` states.  Each worker sparsifies its shard
+    using the sparsity pattern of :func:`determine_jac_inds`, such that only the
+    non-zero entries are streamed into the HDF5 file; the dense and F-ordered
+    reference answers are converted from this on access
     """
-    def __init__(self, gas, num_conditions, atol=1e-2, rtol=1e-6):
+    def __init__(self, gas, num_conditions, atol=1e-2, rtol=1e-6,
+                 num_procs=_get_test_input('num_procs', None)):
         self.atol = atol
         self.rtol = rtol
         self.evaled = False
+        self.num_procs = int(num_procs) if num_procs is not None else \
+            multiprocessing.cpu_count()
 
         self.num_conditions = num_conditions
         # read mech
@@ -896,6 +1184,18 @@ def __init__(self, gas, num_conditions, atol=1e-2, rtol=1e-6):
             # remove last species
             self.non_zero_specs = self.non_zero_specs[:-1]
 
+        # the sparsity pattern
+        size = len(self.specs) + 1
+        inds = self.inds['flat_C']
+        self.pattern = np.zeros((size, size), dtype=bool)
+        self.pattern[inds[:, 0], inds[:, 1]] = True
+        # and the map from the C-ordered to F-ordered non-zero entries
+        flat_C = np.ravel_multi_index((inds[:, 0], inds[:, 1]), (size, size))
+        flat_F = np.ravel_multi_index(
+            (self.inds['flat_F'][:, 0], self.inds['flat_F'][:, 1]), (size, size))
+        sorter = np.argsort(flat_C)
+        self.F_map = sorter[np.searchsorted(flat_C, flat_F, sorter=sorter)]
+
         super(jacobian_eval, self).__init__()
 
     def release(self):
@@ -918,81 +1218,10 @@ def try_delete(file):
             except (IOError, OSError):
                 pass
 
-        try_delete('fd_jac_cp.hdf5')
         try_delete('fd_jac_cp_sp_C.hdf5')
-        try_delete('fd_jac_cp_sp_F.hdf5')
-        try_delete('fd_jac_cv.hdf5')
-        try_delete('fd_jac_cv_sp.hdf5')
         try_delete('fd_jac_cv_sp_C.hdf5')
-        try_delete('fd_jac_cv_sp_F.hdf5')
         super(jacobian_eval, self).release()
 
-    def __sparsify(self, jac, name, order, check=True):
-        # get the sparse indicies
-        inds = self.inds['flat_' + order]
-        if check:
-            # get check array as max(|jac|) down the IC axis
-            def __get_jac_chunk(start, end, compare=None):
-                # limit end to actual end
-                end = np.minimum(end, jac.shape[0])
-                # create indexer
-                index = tuple(
-                    [slice(start, end)] + [slice(None)] * (len(jac.shape) - 1))
-                # return abs of chunk
-                chunk = np.maximum(np.min(jac[index], axis=0),
-                                   np.max(jac[index], axis=0))
-                if compare is not None:
-                    return np.maximum(chunk, compare)
-                return chunk
-
-            check = None
-            for i in range(0, jac.shape[0], self.chunk_size):
-                # perform in chunks to avoid memory errors for huge arrays
-                check = __get_jac_chunk(i, i + self.chunk_size, check)
-            # set T / parameter derivatives to non-zero by assumption
-            check[self.non_zero_specs + 2, :2] = 1
-            # convert nan's or inf's to some non-zero number
-            check[np.where(~np.isfinite(check))] = 1
-            # get masked where > 0
-            mask = np.asarray(np.where(ma.masked_where(check != 0, check).mask)).T
-            # and check that all our non-zero entries are in the sparse indicies
-            if inNd(mask, inds).size != mask.shape[0]:
-                logger = logging.getLogger(__name__)
-                logger.warn(
-                    "Autodifferentiated Jacobian sparsity pattern "
-                    "does not match pyJac's.  There are legitimate reasons "
-                    "why this might be the case -- e.g., matching "
-                    "arrhenius parameters for two reactions containing "
-                    "the same species, with one reaction involving the "
-                    "(selected) last species in the mechanism -- if you "
-                    "are not sure why this error is appearing, feel free to "
-                    "contact the developers to ensure this is not a bug.")
-            del mask
-            del check
-
-        # and finally return the sparse array
-        # need to do this in chunks to avoid memory errors
-        num_conds = jac.shape[0]
-        shape = (0, inds[:, 0].size)
-        out = self.open_for_chunked_write(name + '.hdf5', shape, num_conds)
-        # temporarily turn off nan warnings
-        settings = np.seterr(invalid='ignore')
-        threshold = 0
-        for offset in range(0, num_conds, self.chunk_size):
-            end = np.minimum(num_conds, offset + self.chunk_size)
-            # need to preslice the pytables array to get numpy indexing
-            jtemp = jac[offset:end][:, inds[:, 0], inds[:, 1]]
-            # filter out any nan's / infinites for tresholding
-            good_locs = np.where(np.logical_and(
-                np.logical_and(jtemp < inf_cutoff,
-                               jtemp > -inf_cutoff),
-                np.isfinite(jtemp)))
-            threshold += np.linalg.norm(jtemp[good_locs]) ** 2
-            out.append(jtemp)
-        # and turn back on
-        settings = np.seterr(**settings)
-        return out, np.sqrt(threshold)
-
     def __fast_jac(self, conp, sparse, order, require=False):
         jac = None
         # check for stored jacobian
@@ -1018,123 +1247,113 @@ def eval_answer(self, phi, state):
         if jac is not None:
             return jac
 
+        global _fd_jacobian_kernel
         # number of IC's
         num_conds = self.num_conditions
         # open the pytables file for writing
         name = 'fd_jac_' + ('cp' if state['conp'] else 'cv')
-        jac = self.open_for_chunked_write(
-            name + '.hdf5', (0, len(self.specs) + 1, len(self.specs) + 1),
-            num_conds)
+        inds = self.inds['flat_C']
+        sparse = self.open_for_chunked_write(
+            name + '_sp_C.hdf5', (0, inds.shape[0]), num_conds)
 
-        # create the "store" for the AD-jacobian eval
         # mask phi to get rid of parameter stored in there for data input
         phi_mask = np.array([0] + list(range(2, phi.shape[1])))
-        # note that we have to do this piecewise in order to avoid memory overflows
-        # eval jacobian
-        P = phi[:, 1] if state['conp'] else phi[:, 2]
-        V = phi[:, 2] if state['conp'] else phi[:, 1]
-
-        def __get_state(offset, end):
-            end = np.minimum(end, num_conds)
-            retval = type('', (object,), {
-                'reacs': self.reacs,
-                'specs': self.specs,
-                'phi_cp': (phi[offset:end, phi_mask].copy() if state['conp']
-                           else None),
-                'phi_cv': (phi[offset:end, phi_mask].copy() if not state['conp']
-                           else None),
-                'P': P[offset:end],
-                'V': V[offset:end],
-                'test_size': end - offset
-                })
-            # seed all 'zero' concentrations with a tiny epsilon to avoid NaN's
-            # and enable valid comparison
-            if retval.phi_cp is not None:
-                retval.phi_cp[:, 2:] = np.maximum(retval.phi_cp[:, 2:], 1e-300)
-            if retval.phi_cv is not None:
-                retval.phi_cv[:, 2:] = np.maximum(retval.phi_cv[:, 2:], 1e-300)
-            return retval
+        P_ind, V_ind = (1, 2) if state['conp'] else (2, 1)
+        # the size of the pregenerated kernel -- each worker evaluates a dense
+        # Jacobian for all states in its shard, hence we bound the total dense
+        # working memory of the workers by that of a (sparse) chunk of the output
+        jac_size = self.pattern.size
+        size = max(1, min(self.chunk_size, num_conds,
+                          (self.chunk_size * inds.shape[0]) // (
+                              jac_size * self.num_procs)))
+        shards = [(offset, min(offset + size, num_conds))
+                  for offset in range(0, num_conds, size)]
+
+        def __get_shard(start, end):
+            # pad the last shard to the size of the pregenerated kernel
+            rows = np.minimum(np.arange(start, start + size), end - 1)
+            data = phi[start:end]
+            data = data[rows - start]
+            return (data[:, phi_mask], data[:, P_ind], data[:, V_ind],
+                    state['conp'], end - start)
 
         # pregenerated kernel for speed
-        self.store = __get_state(0, self.chunk_size)
-        pregen = _get_fd_jacobian(self, self.store.test_size, state['conp'],
-                                  None, True)
-        store_size = self.store.test_size
-        threshold = 0
+        phi_pregen, P_pregen, V_pregen, _, _ = __get_shard(*shards[0])
+        self.store = type('', (object,), {
+            'reacs': self.reacs,
+            'specs': self.specs,
+            'phi_cp': phi_pregen if state['conp'] else None,
+            'phi_cv': phi_pregen if not state['conp'] else None,
+            'P': P_pregen,
+            'V': V_pregen,
+            'test_size': size
+            })
+        pregen = _get_fd_jacobian(self, size, state['conp'], None, True)
+
+        dense_sum = 0
+        sparse_sum = 0
         all_finite = True
-        for offset in range(0, num_conds, self.chunk_size):
-            self.store = __get_state(offset, offset + self.chunk_size)
-            if self.store.test_size != store_size:
-                # need to regenerate
-                pregen = _get_fd_jacobian(self, self.store.test_size, state['conp'],
-                                          None, True)
-                # and store size to check for regen
-                store_size = self.store.test_size
-
-            # and add to Jacobian
-            jtemp = _get_fd_jacobian(self, self.store.test_size, state['conp'],
-                                     pregen)
-
-            # temporary turn off NaN comparison warnings
-            settings = np.seterr(invalid='ignore')
-            # check for NaN's
-            if np.any(~np.isfinite(jtemp)) and all_finite:
-                logger = logging.getLogger(__name__)
-                logger.warn("NaN's or Inf's detected in autodifferentiated Jacobian "
-                            "output, these typically result from derivatives of "
-                            "falloff reactions with a reduced pressure equal to "
-                            "zero, (normally as the result of a third-body "
-                            "concentration based on a species with "
-                            "zero-concentration).  These locations will be checked "
-                            "against pyJac's output to ensure they are similarly "
-                            "large (effectively infinite).")
-                all_finite = False
-
-            # get threshold
-            if np.any(jtemp >= inf_cutoff) or np.any(jtemp <= -inf_cutoff) \
-                    or np.any(~np.isfinite(jtemp)):
-                # have infinities / nan's -> need to remove them from the threshold
-                good_locs = np.where(np.logical_and(
-                    np.logical_and(jtemp < inf_cutoff, jtemp > -inf_cutoff),
-                    np.isfinite(jtemp)))
-                threshold += np.linalg.norm(jtemp[good_locs]) ** 2
-            else:
-                threshold += np.linalg.norm(jtemp) ** 2
-            # restore numpy settings
-            np.seterr(**settings)
-            # and add to data array
-            jac.append(jtemp)
+        # set T / parameter derivatives to non-zero by assumption
+        assumed = np.zeros_like(self.pattern)
+        assumed[self.non_zero_specs + 2, :2] = True
+        outside = set(np.flatnonzero(np.logical_and(assumed, ~self.pattern)))
+        _fd_jacobian_kernel = (self, pregen)
+        try:
+            jobs = (__get_shard(start, end) for start, end in shards)
+            num_procs = self.num_procs if len(shards) > 1 else 1
+            for result in _imap_ordered(_fd_jacobian_job, jobs, num_procs):
+                values, dsum, ssum, finite, out = result
+                if not finite and all_finite:
+                    logger = logging.getLogger(__name__)
+                    logger.warn(
+                        "NaN's or Inf's detected in autodifferentiated Jacobian "
+                        "output, these typically result from derivatives of "
+                        "falloff reactions with a reduced pressure equal to "
+                        "zero, (normally as the result of a third-body "
+                        "concentration based on a species with "
+                        "zero-concentration).  These locations will be checked "
+                        "against pyJac's output to ensure they are similarly "
+                        "large (effectively infinite).")
+                    all_finite = False
+                dense_sum += dsum
+                sparse_sum += ssum
+                outside.update(out)
+                # and add to data array
+                sparse.append(values)
+        finally:
+            _fd_jacobian_kernel = None
+
+        # check that all our non-zero entries are in the sparse indicies
+        if outside:
+            logger = logging.getLogger(__name__)
+            logger.warn(
+                "Autodifferentiated Jacobian sparsity pattern "
+                "does not match pyJac's.  There are legitimate reasons "
+                "why this might be the case -- e.g., matching "
+                "arrhenius parameters for two reactions containing "
+                "the same species, with one reaction involving the "
+                "(selected) last species in the mechanism -- if you "
+                "are not sure why this error is appearing, feel free to "
+                "contact the developers to ensure this is not a bug.")
 
         # and reload for reading
-        jac = self.open_for_read(name + '.hdf5')
+        sparse = self.open_for_read(name + '_sp_C.hdf5')
         # store for later use
-        setattr(self, name, jac)
-
-        # store threshold for single computation
-        thresh_name = 'threshold_' + 'cp' if state['conp'] else 'cv'
-        setattr(self, thresh_name, np.sqrt(threshold))
+        setattr(self, name, _densified_jacobian(sparse, inds, len(self.specs) + 1))
+        setattr(self, name + '_sp_C', sparse)
+        setattr(self, name + '_sp_F', _reordered_jacobian(sparse, self.F_map))
 
-        if state['sparse'] == 'sparse':
-            name += '_sp'
-            thresh_name += '_sp'
-
-            def __sparsify_order(order):
-                order_name = name + '_{}'.format(order)
-                order_thresh_name = thresh_name + '_{}'.format(order)
-                sjac, threshold = self.__sparsify(
-                    jac, order_name, order, check=True)
-                setattr(self, order_name, sjac)
-                setattr(self, order_thresh_name, threshold)
+        # store thresholds for single computation
+        thresh_name = 'threshold_' + ('cp' if state['conp'] else 'cv')
+        setattr(self, thresh_name, np.sqrt(dense_sum))
+        for order in ['C', 'F']:
+            setattr(self, thresh_name + '_sp_{}'.format(order), np.sqrt(sparse_sum))
 
-            # do C-order
-            __sparsify_order('C')
-            __sparsify_order('F')
-
-        return jac
+        return self.__fast_jac(state['conp'], state['sparse'], state['order'])
 
     def threshold(self, state):
         # find appropriate threshold from state
-        name = 'threshold_' + 'cp' if state['conp'] else 'cv'
+        name = 'threshold_' + ('cp' if state['conp'] else 'cv')
         if state['sparse'] == 'sparse':
             name += '_sp'
             name += '_{}'.format(state['order'])
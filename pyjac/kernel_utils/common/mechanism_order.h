@@ -0,0 +1,110 @@
+/*
+	mechanism_order.h - shared convenience functions to convert the arrays passed
+	to a pyJac kernel generated for a reordered mechanism between the original
+	species / reaction order of the mechanism and the order used by the kernel
+
+	\author Nick Curtis
+	\date Nov 2017
+*/
+#ifndef MECHANISM_ORDER_H
+#define MECHANISM_ORDER_H
+
+#include <stdlib.h>
+#include <stdbool.h>
+
+/*
+The work buffers holding the copies of the input / output arrays of a kernel in
+the kernel's order, such that the caller's arrays are never reordered in place
+*/
+typedef struct
+{
+    // the number of states the buffers are allocated for
+    size_t size;
+    // the reordered arrays, one after another
+    double* data;
+} reorder_buffers;
+
+/*
+Ensure the work buffers can hold problem_size states, reallocating them if needed
+
+Parameters
+----------
+buffers : reorder_buffers*
+    The work buffers
+problem_size : size_t
+    The number of states
+width : size_t
+    The total number of entries per state of all the reordered arrays
+
+Returns
+-------
+success : bool
+    False if the work buffers could not be allocated
+*/
+static bool reserve_reorder_buffers(reorder_buffers* buffers, size_t problem_size,
+                                    size_t width)
+{
+    if (problem_size <= buffers->size)
+        return true;
+    free(buffers->data);
+    buffers->data = (double*)malloc(problem_size * width * sizeof(double));
+    buffers->size = buffers->data != NULL ? problem_size : 0;
+    return buffers->size > 0;
+}
+
+/*
+Release the work buffers
+*/
+static void free_reorder_buffers(reorder_buffers* buffers)
+{
+    free(buffers->data);
+    buffers->data = NULL;
+    buffers->size = 0;
+}
+
+/*
+Copy an array from the original order of the mechanism to the order of the
+kernel (or, from the kernel's order back to the original order)
+
+Parameters
+----------
+src : const double*
+    The array to reorder, of shape (problem_size, width) in the given order
+dest : double*
+    The reordered array, of the same shape as src
+map : const int*
+    The entry of the array in the original order corresponding to each entry in
+    the kernel's order
+problem_size : size_t
+    The number of states
+width : size_t
+    The number of entries of the array per state
+order : char
+    The data-order of the array, 'C' or 'F'
+to_kernel : bool
+    If true, convert from the original order to the kernel's order, else convert
+    from the kernel's order to the original order
+*/
+static void reorder_entries(const double* src, double* dest, const int* map,
+                            size_t problem_size, size_t width, char order,
+                            bool to_kernel)
+{
+    size_t state_stride = order == 'C' ? width : 1;
+    size_t entry_stride = order == 'C' ? 1 : problem_size;
+    for (size_t k = 0; k < width; ++k)
+    {
+        size_t kernel_entry = k * entry_stride;
+        size_t original_entry = map[k] * entry_stride;
+        for (size_t i = 0; i < problem_size; ++i)
+        {
+            if (to_kernel)
+                dest[kernel_entry + i * state_stride] =
+                    src[original_entry + i * state_stride];
+            else
+                dest[original_entry + i * state_stride] =
+                    src[kernel_entry + i * state_stride];
+        }
+    }
+}
+
+#endif
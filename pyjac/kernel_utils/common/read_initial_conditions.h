@@ -1,8 +1,54 @@
 #ifndef READ_IC_H
 #define READ_IC_H
 
+#include <stddef.h>
+
+// the magic string identifying an initial conditions file stored in the native
+// data layout of the kernel, see map_initial_conditions
+#define NATIVE_IC_MAGIC "PYJAC_IC"
+
+/*
+The (possibly) memory-mapped initial conditions, as returned by
+map_initial_conditions
+*/
+typedef struct
+{
+    // the memory-mapped input file, if used directly (zero-copy)
+    void* mapping;
+    // the size of the mapping, in bytes
+    size_t size;
+    // the user-supplied state vector / parameter buffers
+    double* phi_host;
+    double* param_host;
+} mapped_initial_conditions;
+
 void read_initial_conditions(
     const char* filename, unsigned int NUM, double* phi_host,
     double* param_host, const char order);
 
-#endif
\ No newline at end of file
+/*
+Memory-maps the initial conditions in filename, and loads them into the state
+vector / parameter arrays using OpenMP-parallel blocked copies.
+
+The file may either be stored as sequential, C-ordered initial conditions (as
+for read_initial_conditions) or in the native data layout of the kernel, i.e.:
+
+    a 64-byte header of uint64_t's:
+        NATIVE_IC_MAGIC, order, NN, SPLIT, number of initial conditions,
+        parameter offset (bytes), state vector offset (bytes), 0
+    the parameter array
+    the (split) state vector
+
+If zero_copy is non-zero and the file is in the native data layout,
+*phi_host / *param_host may be pointed directly at the mapped file.  The
+returned mapping must then be released via unmap_initial_conditions (which
+restores the user-supplied buffers) before the buffers are freed.
+*/
+mapped_initial_conditions map_initial_conditions(
+    const char* filename, unsigned int NUM, double** phi_host,
+    double** param_host, const char order, int zero_copy);
+
+void unmap_initial_conditions(mapped_initial_conditions* ics, double** phi_host,
+                              double** param_host);
+
+#endif
@@ -0,0 +1,152 @@
+/*
+	state_binning.h - shared convenience functions to partition the states
+	passed to a pyJac kernel about the temperature breakpoint of the NASA
+	polynomials, and to scatter the results back to the original order
+
+	\author Nick Curtis
+	\date Nov 2017
+*/
+#ifndef STATE_BINNING_H
+#define STATE_BINNING_H
+
+#include <stdlib.h>
+#include <stdbool.h>
+
+/*
+Determine the stable partition of the states into those below and those at or
+above the temperature breakpoint
+
+Parameters
+----------
+problem_size : size_t
+    The number of states
+T : const double*
+    The temperature of the first state
+stride : size_t
+    The distance between the temperatures of consecutive states
+T_mid : double
+    The temperature breakpoint
+perm : size_t*
+    The output permutation, such that the i-th binned state is the
+    perm[i]-th original state
+
+Returns
+-------
+num_lo : size_t
+    The number of states below the breakpoint
+*/
+static size_t bin_states(size_t problem_size, const double* T, size_t stride,
+                         double T_mid, size_t* perm)
+{
+    size_t num_lo = 0;
+    for (size_t i = 0; i < problem_size; ++i)
+    {
+        if (T[i * stride] < T_mid)
+            perm[num_lo++] = i;
+    }
+    size_t num_hi = num_lo;
+    for (size_t i = 0; i < problem_size; ++i)
+    {
+        if (!(T[i * stride] < T_mid))
+            perm[num_hi++] = i;
+    }
+    return num_lo;
+}
+
+/*
+The work buffers holding the binned copies of the input / output arrays of a
+kernel, such that the caller's arrays are never permuted in place
+*/
+typedef struct
+{
+    // the number of states the buffers are allocated for
+    size_t size;
+    // the permutation of the states, see bin_states
+    size_t* perm;
+    // the binned arrays, one after another
+    double* data;
+} state_bins;
+
+/*
+Ensure the work buffers can hold problem_size states, reallocating them if needed
+
+Parameters
+----------
+bins : state_bins*
+    The work buffers
+problem_size : size_t
+    The number of states
+width : size_t
+    The total number of entries per state of all the binned arrays
+
+Returns
+-------
+success : bool
+    False if the work buffers could not be allocated
+*/
+static bool reserve_state_bins(state_bins* bins, size_t problem_size, size_t width)
+{
+    if (problem_size <= bins->size)
+        return true;
+    free(bins->perm);
+    free(bins->data);
+    bins->perm = (size_t*)malloc(problem_size * sizeof(size_t));
+    bins->data = (double*)malloc(problem_size * width * sizeof(double));
+    bins->size = bins->perm != NULL && bins->data != NULL ? problem_size : 0;
+    return bins->size > 0;
+}
+
+/*
+Release the work buffers
+*/
+static void free_state_bins(state_bins* bins)
+{
+    free(bins->perm);
+    free(bins->data);
+    bins->perm = NULL;
+    bins->data = NULL;
+    bins->size = 0;
+}
+
+/*
+Copy an array into the binned order of the states found by bin_states (or, for the
+inverse, copy a binned array back to the original order of the states)
+
+Parameters
+----------
+src : const double*
+    The array to permute, of shape (problem_size, width) in the given order
+dest : double*
+    The permuted array, of the same shape as src
+perm : const size_t*
+    The permutation, see bin_states
+problem_size : size_t
+    The number of states
+width : size_t
+    The number of entries of the array per state
+order : char
+    The data-order of the array, 'C' or 'F'
+inverse : bool
+    If true, scatter the binned states back to their original order
+*/
+static void permute_states(const double* src, double* dest, const size_t* perm,
+                           size_t problem_size, size_t width, char order,
+                           bool inverse)
+{
+    size_t state_stride = order == 'C' ? width : 1;
+    size_t entry_stride = order == 'C' ? 1 : problem_size;
+    for (size_t k = 0; k < width; ++k)
+    {
+        const double* src_entry = &src[k * entry_stride];
+        double* dest_entry = &dest[k * entry_stride];
+        for (size_t i = 0; i < problem_size; ++i)
+        {
+            if (inverse)
+                dest_entry[perm[i] * state_stride] = src_entry[i * state_stride];
+            else
+                dest_entry[i * state_stride] = src_entry[perm[i] * state_stride];
+        }
+    }
+}
+
+#endif
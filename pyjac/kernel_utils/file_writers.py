@@ -8,6 +8,9 @@
 import subprocess
 import textwrap
 
+# external imports
+import numpy as np
+
 # local imports
 from pyjac import utils
 
@@ -90,6 +93,63 @@ def get_file(name, lang, mode='w', **kwargs):
     return FileWriter(name, lang, mode=mode, is_header=False, **kwargs)
 
 
+native_ic_magic = b'PYJAC_IC'
+"""bytes: the magic string identifying a native-layout initial conditions file"""
+
+
+def write_native_initial_conditions(filename, phi, param, loopy_opts):
+    """
+    Writes the supplied initial conditions to a binary file in the native (i.e.,
+    ordered and split) data layout of a generated kernel, such that they may be
+    used by the kernel's `map_initial_conditions` without reordering (and if
+    possible, copying) the data.
+
+    Parameters
+    ----------
+    filename : str
+        The output file name
+    phi : :class:`numpy.ndarray`
+        The state vectors, of shape (number of initial conditions, NN)
+    param : :class:`numpy.ndarray`
+        The fixed parameter (pressure or volume) of each initial condition
+    loopy_opts : :class:`loopy_options`
+        The options the kernel was generated with
+
+    Notes
+    -----
+    The file consists of a 64-byte header of unsigned 64-bit integers:
+
+        magic string, data order, NN, vector split width (1 if unsplit),
+        number of initial conditions, parameter offset (bytes),
+        state vector offset (bytes), 0
+
+    followed by the parameter array and the (split) state vector, each of which
+    is aligned to 64 bytes
+
+    Returns
+    -------
+    None
+    """
+
+    from pyjac.core.array_creator import array_splitter
+    asplit = array_splitter(loopy_opts)
+    split = asplit.vector_width if asplit._have_split() else 1
+
+    num, nn = phi.shape
+    phi, = asplit.split_numpy_arrays(np.asarray(phi, dtype=np.float64))
+    param_offset = 64
+    phi_offset = param_offset + int(np.ceil(num * 8 / 64.)) * 64
+
+    header = np.zeros(8, dtype=np.uint64)
+    header[0] = np.frombuffer(native_ic_magic, dtype=np.uint64)[0]
+    header[1:7] = [ord(loopy_opts.order), nn, split, num, param_offset, phi_offset]
+    with open(filename, 'wb') as file:
+        header.tofile(file)
+        np.asarray(param, dtype=np.float64).tofile(file)
+        file.write(b'\0' * (phi_offset - param_offset - num * 8))
+        phi.flatten(order=loopy_opts.order).tofile(file)
+
+
 class FileWriter(object):
 
     """
@@ -121,10 +181,14 @@ class FileWriter(object):
             Preamble filters for source files
     try_indent : bool [False]
         Use GNU's indent to indent source file
+    guard_prefix : str ['']
+        If supplied, prepended to the include guard of a header file, see
+        :attr:`pyjac.loopy_utils.loopy_utils.loopy_options.prefix`
     """
 
     def __init__(self, name, lang, mode='w', is_header=False,
-                 include_own_header=False, use_filter=True, try_indent=False):
+                 include_own_header=False, use_filter=True, try_indent=False,
+                 guard_prefix=''):
         self.name = name
         self.mode = mode
         self.lang = lang
@@ -148,6 +212,7 @@ def __init__(self, name, lang, mode='w', is_header=False,
         self.lines = []
         self.defines = []
         self.try_indent = try_indent
+        self.guard_prefix = guard_prefix
 
     def __enter__(self):
         self.file = open(self.name, self.mode)
@@ -200,13 +265,16 @@ def write(self):
         filename = os.path.basename(self.name)
         filename, ext = filename.split('.')
         if self.is_header:
-            filename, ext = filename.upper(), ext.upper()
-            lines.append('#ifndef {}_{}'.format(filename, ext))
-            lines.append('#define {}_{}'.format(filename, ext))
+            guard = '{}{}_{}'.format(self.guard_prefix, filename, ext).upper()
+            lines.append('#ifndef {}'.format(guard))
+            lines.append('#define {}'.format(guard))
             lines.extend(self.preamble)
         else:
             if self.include_own_header:
                 self.headers.append(filename)
+            # defines in source files (e.g., feature test macros) must precede
+            # any includes
+            lines.extend(self.__get_defines())
 
         ext = utils.header_ext[self.lang]
         for header in self.std_headers:
@@ -220,16 +288,19 @@ def write(self):
             else:
                 lines.append(header)
 
-        if self.is_header and self.defines:
-            lines.extend(['#define {name} ({value})'.format(name=x[0], value=x[1])
-                          if x[1] is not None else '#define {name}'.format(name=x[0])
-                          for x in self.defines])
+        if self.is_header:
+            lines.extend(self.__get_defines())
 
         lines.extend(self.lines)
         if self.is_header:
             lines.append('#endif')
         self.file.write('\n'.join(lines))
 
+    def __get_defines(self):
+        return ['#define {name} ({value})'.format(name=x[0], value=x[1])
+                if x[1] is not None else '#define {name}'.format(name=x[0])
+                for x in self.defines]
+
     def add_headers(self, headers):
         if isinstance(headers, list):
             self.headers.extend(headers)
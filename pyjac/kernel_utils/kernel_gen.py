@@ -5,6 +5,7 @@
 import shutil
 import textwrap
 import os
+import multiprocessing
 import re
 from string import Template
 import logging
@@ -93,6 +94,10 @@ class kernel_generator(object):
     The base class for the kernel generators
     """
 
+    context = ''
+    """str: the name of the pointer to the evaluation context holding the device
+    arrays in the calling program, if any -- see :class:`memory_manager`"""
+
     def __init__(self, loopy_opts, name, kernels,
                  namestore,
                  external_kernels=[],
@@ -176,9 +181,14 @@ def __init__(self, loopy_opts, name, kernels,
 
         self.mem = memory_manager(self.lang, self.loopy_opts.order,
                                   self.array_split._have_split(),
-                                  dev_type=self.loopy_opts.device_type)
+                                  dev_type=self.loopy_opts.device_type,
+                                  double_buffer=self.loopy_opts.double_buffer,
+                                  context=self.context,
+                                  arena=self.loopy_opts.arena)
         self.name = name
         self.kernels = kernels
+        # scheduled kernels built in parallel, see :meth:`_make_kernels`
+        self.scheduled_kernels = {}
         self.namestore = namestore
         self.seperate_kernels = loopy_opts.seperate_kernels
         self.test_size = test_size
@@ -197,6 +207,9 @@ def __init__(self, loopy_opts, name, kernels,
         self.bin_name = ''
         self.header_name = ''
         self.file_prefix = ''
+        # the conversion to / from the original order of a reordered mechanism,
+        # see :meth:`generate`
+        self.entry_maps = None
 
         self.depends_on = depends_on[:]
         self.array_props = array_props.copy()
@@ -236,6 +249,10 @@ def __init__(self, loopy_opts, name, kernels,
             self.extra_preambles.append(lp_pregen.jac_indirect_lookup(
                 self.namestore.jac_col_inds if self.loopy_opts.order == 'C'
                 else self.namestore.jac_row_inds))
+        elif isinstance(namestore.jac, arc.jvp_creator):
+            # need to add the vector the Jacobian is multiplied by
+            self.extra_kernel_data.append(
+                self.namestore.jac.vec(global_ind, '')[0])
 
         # calls smuggled past loopy
         self.fake_calls = fake_calls.copy()
@@ -340,14 +357,101 @@ def add_depencencies(self, k_gens):
 
         self.depends_on.extend(k_gens)
 
-    def _make_kernels(self):
+    def _build_kernel(self, info):
+        """
+        Creates a loopy kernel from the supplied :class:`knl_info`, and applies
+        any vectorization / array splitting
+
+        Parameters
+        ----------
+        info : :class:`knl_info`
+            The kernel info to build
+
+        Returns
+        -------
+        knl : :class:`loopy.LoopKernel`
+            The built kernel
+        """
+
+        # create kernel from k_gen.knl_info
+        knl = self.make_kernel(info, self.target, self.test_size)
+        # apply vectorization
+        knl = self.apply_specialization(
+            self.loopy_opts,
+            info.var_name,
+            knl,
+            vecspec=info.vectorization_specializer,
+            can_vectorize=info.can_vectorize)
+
+        # update the kernel args
+        return self.array_split.split_loopy_arrays(knl)
+
+    @property
+    def symbol_name(self):
+        """
+        The name of the generated kernel, and the base name of its calling
+        interface, i.e., the kernel :attr:`name` prefixed by the
+        :attr:`loopy_options.prefix`.  The generated file names are based on the
+        unprefixed :attr:`name`
+        """
+        return self.loopy_opts.prefix + self.name
+
+    def _get_guard(self, filename):
+        """
+        Returns the (prefixed) include guard of the header :param:`filename`, in
+        the same form as those of :class:`pyjac.kernel_utils.file_writers.FileWriter`
+        """
+        return (self.loopy_opts.prefix +
+                os.path.basename(filename).replace('.', '_')).upper()
+
+    def _all_generators(self):
+        """
+        Returns this :class:`kernel_generator` and all its (recursive)
+        dependencies, in the order their kernels are built
+        """
+        gens = [self]
+        for x in self.depends_on:
+            gens.extend(g for g in x._all_generators() if not any(
+                g is y for y in gens))
+        return gens
+
+    def _get_scheduled_kernel(self, knl):
+        """
+        Returns the scheduled version of :param:`knl` built by a worker process
+        in :meth:`_make_kernels` (if any), such that code-generation need not
+        preprocess & schedule it again
+
+        Parameters
+        ----------
+        knl : :class:`loopy.LoopKernel`
+            The kernel to generate code for
+
+        Returns
+        -------
+        knl : :class:`loopy.LoopKernel`
+            The scheduled kernel, or :param:`knl` if it was not scheduled by a
+            worker, or has since been modified
+        """
+
+        for gen in self._all_generators():
+            built, scheduled = gen.scheduled_kernels.get(knl.name, (None, None))
+            if built is knl:
+                return scheduled
+        return knl
+
+    def _make_kernels(self, jobs=1):
         """
         Turns the supplied kernel infos into loopy kernels,
         and vectorizes them!
 
         Parameters
         ----------
-        None
+        jobs : int [1]
+            The number of processes to use in kernel construction.  If greater
+            than one, the independent kernels of this generator and its
+            dependencies are built (and scheduled for code-generation)
+            concurrently in a process pool, and merged back in their original
+            order
 
         Returns
         -------
@@ -358,40 +462,37 @@ def _make_kernels(self):
         # to functions, in the meantime use a Template
 
         # now create the kernels!
-        self.target = lp_utils.get_target(self.lang, self.loopy_opts.device,
-                                          self.compiler)
-        for i, info in enumerate(self.kernels):
-            # if external, or already built
-            if isinstance(info, lp.LoopKernel):
-                continue
-            # create kernel from k_gen.knl_info
-            self.kernels[i] = self.make_kernel(info, self.target, self.test_size)
-            # apply vectorization
-            self.kernels[i] = self.apply_specialization(
-                self.loopy_opts,
-                info.var_name,
-                self.kernels[i],
-                vecspec=info.vectorization_specializer,
-                can_vectorize=info.can_vectorize)
-
-            # update the kernel args
-            self.kernels[i] = self.array_split.split_loopy_arrays(
-                self.kernels[i])
-
-            # and add a mangler
-            # func_manglers.append(create_function_mangler(kernels[i]))
-
-            # set the editor
-            self.kernels[i] = lp_utils.set_editor(self.kernels[i])
+        gens = self._all_generators()
+        for gen in gens:
+            gen.target = lp_utils.get_target(gen.lang, gen.loopy_opts.device,
+                                             gen.compiler)
+
+        built = {}
+        if jobs > 1:
+            built = _build_kernels_parallel(gens, jobs)
+
+        for gen in gens:
+            for i, info in enumerate(gen.kernels):
+                # if external, or already built
+                if isinstance(info, lp.LoopKernel):
+                    continue
+                if (id(gen), i) in built:
+                    knl, scheduled = built[(id(gen), i)]
+                    if scheduled is not None:
+                        gen.scheduled_kernels[knl.name] = (knl, scheduled)
+                else:
+                    # set the editor
+                    knl = lp_utils.set_editor(gen._build_kernel(info))
+
+                # and add a mangler
+                # func_manglers.append(create_function_mangler(kernels[i]))
+
+                gen.kernels[i] = knl
 
         # and finally register functions
         # for func in func_manglers:
         #    knl = lp.register_function_manglers(knl, [func])
 
-        # need to call make_kernels on dependencies
-        for x in self.depends_on:
-            x._make_kernels()
-
     def __copy_deps(self, scan_path, out_path, change_extension=True):
         """
         Convenience function to copy the dependencies of this
@@ -422,7 +523,7 @@ def __copy_deps(self, scan_path, out_path, change_extension=True):
                             os.path.join(out_path, dep_dest))
 
     def generate(self, path, data_order=None, data_filename='data.bin',
-                 for_validation=False):
+                 for_validation=False, jobs=1, entry_maps=None):
         """
         Generates wrapping kernel, compiling program (if necessary) and
         calling / executing program for this kernel
@@ -440,13 +541,22 @@ def generate(self, path, data_order=None, data_filename='data.bin',
         for_validation: bool [False]
             If True, this kernel is being generated to validate pyJac, hence we need
             to save output data to a file
+        jobs: int [1]
+            The number of processes to use in constructing the loopy kernels,
+            see :meth:`_make_kernels`
+        entry_maps: dict of str: :class:`numpy.ndarray` [None]
+            If supplied, the kernel was generated for a reordered mechanism, and
+            the driver converts the named host arrays from (and back to) the
+            original order of the mechanism, see
+            :meth:`memory_manager.get_mechanism_reordering`
 
         Returns
         -------
         None
         """
         utils.create_dir(path)
-        self._make_kernels()
+        self.entry_maps = entry_maps
+        self._make_kernels(jobs=jobs)
         max_per_run = self._generate_wrapping_kernel(path)
         self._generate_compiling_program(path)
         self._generate_calling_program(path, data_filename, max_per_run,
@@ -485,7 +595,8 @@ def _generate_common(self, path):
                             use_filter=False) as file:
             file.add_lines(file_src.safe_substitute(
                 mechanism='mechanism' + utils.header_ext[self.lang],
-                vectorization='vectorization' + utils.header_ext[self.lang]))
+                vectorization='vectorization' + utils.header_ext[self.lang],
+                header_ext=utils.header_ext[self.lang]))
 
         # and any other deps
         self.__copy_deps(common_dir, path)
@@ -504,7 +615,7 @@ def _get_pass(self, argv, include_type=True, is_host=True, postfix=''):
         postfix : str
             Optional postfix to append to the variable name [Default:'']
         """
-        prefix = 'h_' if is_host else 'd_'
+        prefix = 'h_' if is_host else self.mem.device_prefix
         return '{type}{prefix}{name}'.format(
             type=self.type_map[argv.dtype] + '* ' if include_type else '',
             prefix=prefix,
@@ -539,7 +650,8 @@ def _generate_calling_header(self, path):
                     x for x in self.mem.arrays if x.name == a))
                     for a in self.mem.host_arrays
                     if not any(x.name == a for x in self.mem.host_constants)]),
-                knl_name=self.name))
+                knl_name=self.symbol_name,
+                guard=self._get_guard(self.header_name)))
 
     def _special_kernel_subs(self, file_src):
         """
@@ -578,14 +690,108 @@ def _special_wrapper_subs(self, file_src):
         """
         return file_src
 
+    def _profile_instructions(self, names, instructions):
+        """
+        Instruments the sub-kernel evaluations in the wrapping kernel to time
+        their execution, to be specialized by subclasses of the
+        :class:`kernel_generator`.  By default, no instrumentation is applied.
+
+        Parameters
+        ----------
+        names: list of str
+            The name of the sub-kernel evaluated by each instruction
+        instructions: list of str
+            The instructions of the wrapping kernel
+
+        Returns
+        -------
+        defines: str
+            The declarations of the profiling data & functions, to place at the
+            top of the wrapping kernel
+        instructions: list of str
+            The instrumented instructions
+        headers: list of str
+            The declarations of the profiling functions, to place in the
+            wrapping kernel's header
+        argument: str
+            The declaration of the profiling data argument to append to the
+            wrapping kernel's signature, if any
+        """
+        return '', instructions, [], ''
+
     def _set_sort(self, arr):
         return sorted(set(arr), key=lambda x: arr.index(x))
 
+    def _get_state_binning(self):
+        """
+        Returns the host code to partition the states about the temperature
+        breakpoint of the species' NASA polynomials before execution (and to
+        restore their order afterwards), if :attr:`loopy_opts.temperature_binning`
+        is set
+
+        Returns
+        -------
+        bin_states: str
+            The code to bin the states, or an empty string if not used
+        unbin_states: str
+            The code to restore the order of the states, or an empty string if
+            not used
+        """
+
+        if not self.loopy_opts.temperature_binning:
+            return '', ''
+
+        logger = logging.getLogger(__name__)
+        T_mid = getattr(self.namestore, 'T_mid', None)
+        if T_mid is None or 'phi' not in self.mem.in_arrays or \
+                self.array_split._have_split():
+            logger.warn('Temperature binning is not supported for kernel {} '
+                        '(with split arrays, or without a state vector input), '
+                        'and will be ignored.'.format(self.name))
+            return '', ''
+
+        breakpoints, counts = np.unique(T_mid.initializer, return_counts=True)
+        T_mid = breakpoints[np.argmax(counts)]
+        if breakpoints.size > 1:
+            logger.warn('The species of the mechanism do not share a common '
+                        'temperature breakpoint, the states will be binned about '
+                        'the most common breakpoint ({} K).'.format(T_mid))
+        return self.mem.get_state_binning(T_mid)
+
+    def _get_mechanism_reordering(self):
+        """
+        Returns the host code to convert the kernel's inputs from the original
+        species / reaction order of the mechanism to the order of the kernel before
+        execution (and to restore the original order of the outputs afterwards),
+        if :attr:`entry_maps` were supplied to :meth:`generate`
+
+        Returns
+        -------
+        reorder_states: str
+            The code to reorder the inputs, or an empty string if not used
+        restore_states: str
+            The code to restore the order of the outputs, or an empty string if
+            not used
+        """
+
+        if not self.entry_maps:
+            return '', ''
+
+        if self.array_split._have_split():
+            logger = logging.getLogger(__name__)
+            logger.warn('Reordering of the mechanism is not supported for kernel '
+                        '{} with split arrays, hence the arrays must be passed in '
+                        'the order of the kernel, see '
+                        ':class:`pyjac.pywrap.MechanismOrder`.'.format(self.name))
+            return '', ''
+        return self.mem.get_mechanism_reordering(self.entry_maps)
+
     def _generate_calling_program(self, path, data_filename, max_per_run,
                                   for_validation=False):
         """
         Needed for all languages, this generates a simple C file that
-        reads in data, sets up the kernel call, executes, etc.
+        sets up the kernel call, executes, etc., and a driver program that reads
+        in data and evaluates the kernel from the command line
 
         Parameters
         ----------
@@ -624,6 +830,12 @@ def _generate_calling_program(self, path, data_filename, max_per_run,
             next(x for x in self.mem.arrays if x.name == a),
             include_type=False) for a in self.mem.host_arrays
             if not any(x.name == a for x in self.mem.host_constants)])
+        # the number of entries per state of the output array (passed last), such
+        # that callers may check the size of the arrays they supply
+        output_name = [a for a in self.mem.host_arrays if not any(
+            x.name == a for x in self.mem.host_constants)][-1]
+        output_size = self.mem.get_entries_per_state(next(
+            x for x in self.mem.arrays if x.name == output_name))
         # these are passed from the main method (exclude type, add _local
         # postfix)
         local_input_args = ', '.join([self._get_pass(
@@ -650,6 +862,21 @@ def _generate_calling_program(self, path, data_filename, max_per_run,
             elif x == 'V_arr':
                 knl_args_doc.append(knl_args_doc_template.safe_substitute(
                     name=x, type='double*', desc='The array of volumes'))
+            elif x == 'vec':
+                knl_args_doc.append(knl_args_doc_template.safe_substitute(
+                    name=x, type='double*', desc=(
+                        'The vector to multiply the Jacobian by, in {}-order'
+                        ).format(self.loopy_opts.order)))
+            elif x == 'gamma':
+                knl_args_doc.append(knl_args_doc_template.safe_substitute(
+                    name=x, type='double*', desc=(
+                        'The array of Jacobian scaling factors in the iteration '
+                        'matrix (I - gamma * J)')))
+            elif x == 'rhs':
+                knl_args_doc.append(knl_args_doc_template.safe_substitute(
+                    name=x, type='double*', desc=(
+                        'The right hand side of the linear system to solve, in '
+                        '{}-order').format(self.loopy_opts.order)))
             elif x == 'dphi':
                 knl_args_doc.append(knl_args_doc_template.safe_substitute(
                     name=x, type='double*', desc=('The time rate of change of'
@@ -674,11 +901,16 @@ def _generate_calling_program(self, path, data_filename, max_per_run,
         mem_allocs = self.mem.get_mem_allocs()
         # input allocs
         local_allocs = self.mem.get_mem_allocs(True)
-        # read args are those that aren't initalized elsewhere
-        read_args = ', '.join(['h_' + x + '_local' for x in self.mem.in_arrays
+        # read args are those that aren't initalized elsewhere, passed by
+        # reference such that they may be pointed at the mapped input data
+        read_args = ', '.join(['&h_' + x + '_local' for x in self.mem.in_arrays
                                if x in ['phi', 'P_arr', 'V_arr']])
         # memory frees
         mem_frees = self.mem.get_mem_frees()
+        # partitioning of the states about the temperature breakpoint
+        bin_states, unbin_states = self._get_state_binning()
+        # conversion to / from the original order of a reordered mechanism
+        reorder_states, restore_states = self._get_mechanism_reordering()
         # input frees
         local_frees = self.mem.get_mem_frees(True)
 
@@ -708,6 +940,9 @@ def _generate_calling_program(self, path, data_filename, max_per_run,
             outputs = ''
             output_sizes = ''
 
+        profile = 'PROFILE' if self.loopy_opts.profile and not self.auto_diff \
+            else 'NO_PROFILE'
+
         with filew.get_file(os.path.join(path, self.name + '_main' + utils.file_ext[
                 self.lang]), self.lang, use_filter=False) as file:
             file.add_lines(subs_at_indent(
@@ -715,25 +950,78 @@ def _generate_calling_program(self, path, data_filename, max_per_run,
                 mem_declares=mem_declares,
                 knl_args=knl_args,
                 knl_args_doc=knl_args_doc,
-                knl_name=self.name,
+                knl_name=self.symbol_name,
+                knl_file=self.name,
                 input_args=input_args,
-                local_input_args=local_input_args,
                 mem_transfers_in=mem_in,
                 mem_transfers_out=mem_out,
+                bin_states=bin_states,
+                unbin_states=unbin_states,
+                BIN_STATES='BIN_STATES' if bin_states else 'NO_BIN_STATES',
+                reorder_states=reorder_states,
+                restore_states=restore_states,
+                REORDER='REORDER' if reorder_states else 'NO_REORDER',
                 mem_allocs=mem_allocs,
                 mem_frees=mem_frees,
+                order=self.loopy_opts.order,
+                max_per_run=max_per_run,
+                output_size=output_size,
+                cache_tile=self._get_cache_tile(),
+                PROFILE=profile
+            ))
+
+        # and the driver program, kept out of the kernel source such that the
+        # library may be linked into other programs
+        with open(os.path.join(script_dir, self.lang,
+                               'driver.c.in'), 'r') as file:
+            file_src = file.read()
+
+        with filew.get_file(os.path.join(path, self.name + '_driver' +
+                                         utils.file_ext[self.lang]),
+                            self.lang, use_filter=False) as file:
+            file.add_lines(subs_at_indent(
+                file_src,
+                knl_name=self.symbol_name,
+                knl_file=self.name,
+                local_input_args=local_input_args,
                 read_args=read_args,
                 order=self.loopy_opts.order,
                 data_filename=data_filename,
                 local_allocs=local_allocs,
                 local_frees=local_frees,
-                max_per_run=max_per_run,
+                PROFILE=profile,
+                profile_filename=self.name + '_profile.csv',
                 num_outputs=num_outputs,
                 output_paths=output_paths,
                 outputs=outputs,
                 output_sizes=output_sizes
             ))
 
+    def _get_cache_tile(self):
+        """
+        Returns the number of states each OpenMP thread evaluates per kernel call,
+        such that the thread's working buffers remain resident in cache, see
+        :attr:`loopy_options.cache_tile`
+
+        Returns
+        -------
+        cache_tile: int
+            The number of states per thread, or zero if not limited
+        """
+
+        cache_tile = self.loopy_opts.cache_tile
+        if not cache_tile or self.lang != 'c':
+            return 0
+        if cache_tile == 'auto':
+            cache_tile = self.mem.get_cache_tile(
+                caches=self.loopy_opts.cache_topology)
+            logger = logging.getLogger(__name__)
+            logger.info('Evaluating {} states per thread per kernel call for '
+                        'kernel {}, with {} bytes of working buffers per '
+                        'state.'.format(cache_tile, self.name,
+                                        self.mem.get_state_size()))
+        return int(cache_tile)
+
     def _generate_compiling_program(self, path):
         """
         Needed for some languages (e.g., OpenCL) this may be overriden in
@@ -885,7 +1173,7 @@ def _get_kernel_call(self, knl=None, passed_locals=[]):
                 # arguements
                 args += [type('', (object,), {'name': l.subdecl.name})
                          for l in passed_locals]
-            name = self.name
+            name = self.symbol_name
         else:
             # otherwise used passed kernel
             if passed_locals:
@@ -1039,6 +1327,10 @@ def __raise():
 
         # update memory args
         self.mem.add_arrays(kernel_data)
+        if not self.fake_calls:
+            # the kernels are called in order, hence we can determine the lifetimes
+            # of the arrays for sharing space in the working memory arena
+            self.mem.set_lifetimes(self.kernels)
 
         # generate the kernel definition
         self.vec_width = self.loopy_opts.depth
@@ -1153,7 +1445,7 @@ def _name_assign(arr, use_atomics=True):
                              '\n'.join(_name_assign(arr)
                                        for arr in kernel_data),
                              kernel_data[:],
-                             name=self.name,
+                             name=self.symbol_name,
                              target=self.target)
         # force vector width
         if self.vec_width != 0:
@@ -1167,6 +1459,8 @@ def _name_assign(arr, use_atomics=True):
         extra_kernels = []
         inits = []
         instructions = []
+        # the sub-kernel evaluated by each instruction, for profiling
+        profiled = []
         local_decls = []
 
         def _update_for_host_constants(kernel, return_new_args=False):
@@ -1237,7 +1531,7 @@ def _hoist_local_decls(k):
                     # get call w/ migrated locals
                     insns = self._get_kernel_call(k, passed_locals=ldecls)
                     # and generate code / func body
-                    cgr = lp.generate_code_v2(k)
+                    cgr = lp.generate_code_v2(self._get_scheduled_kernel(k))
                     assert len(cgr.device_programs) == 1
                     subs = {}
                     if ldecls:
@@ -1263,6 +1557,7 @@ def _hoist_local_decls(k):
 
                 if insns:
                     instructions.append(insns)
+                    profiled.append(k.name)
                 if pre and pre not in preambles:
                     preambles.extend(pre)
                 if init:
@@ -1282,7 +1577,7 @@ def _hoist_local_decls(k):
             if self.seperate_kernels:
                 k = _update_for_host_constants(k)
 
-            cgr = lp.generate_code_v2(k)
+            cgr = lp.generate_code_v2(self._get_scheduled_kernel(k))
             # grab preambles
             preamble_list = []
             for _, preamble in cgr.device_preambles:
@@ -1348,6 +1643,7 @@ def partition(l, p):
                 # and put the body in
                 instructions.append('// {name}\n{body}\n'.format(
                     name=k.name, body=str(cgr.body_ast)))
+                profiled.append(k.name)
             else:
                 # we need to place the call in the instructions and the extra kernels
                 # in their own array
@@ -1355,6 +1651,7 @@ def partition(l, p):
                 # additionally, we need to hoist the local declarations to the call
                 instructions.append(self._get_kernel_call(
                     k, passed_locals=ldecls))
+                profiled.append(k.name)
 
             if instruction_store is not None:
                 assert k.name not in instruction_store
@@ -1385,6 +1682,14 @@ def partition(l, p):
             # and place within a single extra kernel
             extra_kernels.append(lp_utils.get_code(code, self.loopy_opts))
 
+        # instrument the sub-kernels for profiling, if enabled
+        defines = ''
+        profile_headers = []
+        profile_arg = ''
+        if self.loopy_opts.profile and not self.auto_diff:
+            defines, instructions, profile_headers, profile_arg = \
+                self._profile_instructions(profiled, instructions)
+
         # insert barriers if any
         instructions = self.apply_barriers(instructions,
                                            use_sub_barriers=not self.fake_calls)
@@ -1401,15 +1706,24 @@ def partition(l, p):
         self.filename = os.path.join(
             path,
             self.file_prefix + self.name + utils.file_ext[self.lang])
+        # the kernel definition, accepting the profiling data (if any)
+        func_define = self.__get_kernel_defn()
+        if profile_arg:
+            func_define = func_define[:func_define.rindex(')')] + ', {})'.format(
+                profile_arg)
+
         # create the file
         with filew.get_file(
                 self.filename, self.lang, include_own_header=True) as file:
+            if profile_headers:
+                # needed for clock_gettime under c99
+                file.add_define('_POSIX_C_SOURCE', '199309L')
             instructions = _find_indent(file_str, 'body', instructions)
             preamble = _find_indent(file_str, 'preamble', preamble)
             lines = file_src.safe_substitute(
-                defines='',
+                defines=defines,
                 preamble=preamble,
-                func_define=self.__get_kernel_defn(),
+                func_define=func_define,
                 body=instructions,
                 extra_kernels='\n'.join(extra_kernels)).split('\n')
 
@@ -1419,10 +1733,11 @@ def partition(l, p):
 
         # and the header file (only include self now, as we're using embedded
         # kernels)
-        headers = [self.__get_kernel_defn() + utils.line_end[self.lang]]
+        headers = profile_headers + [func_define + utils.line_end[self.lang]]
         with filew.get_header_file(
             os.path.join(path, self.file_prefix + self.name +
-                         utils.header_ext[self.lang]), self.lang) as file:
+                         utils.header_ext[self.lang]), self.lang,
+                guard_prefix=self.loopy_opts.prefix) as file:
 
             lines = '\n'.join(headers).split('\n')
             if self.auto_diff:
@@ -1431,6 +1746,13 @@ def partition(l, p):
                 lines = [x.replace('double', 'adouble') for x in lines]
             file.add_lines(lines)
 
+        if self.mem.buffered_arrays:
+            # the input / output arrays of a double-buffered kernel are allocated
+            # twice, hence need to be accounted for in the global memory limits
+            mem_limits.arrays[memory_type.m_global] = \
+                mem_limits.arrays[memory_type.m_global] + [
+                    x for x in self.mem.arrays
+                    if x.name in self.mem.buffered_arrays]
         max_per_run = mem_limits.can_fit(memory_type.m_global)
         # normalize to divide evenly into vec_width
         if self.vec_width != 0:
@@ -1584,7 +1906,7 @@ def subs_preprocess(key, value):
         knl = lp.make_kernel(iname_arr,
                              kernel_str,
                              kernel_data=kernel_data,
-                             name=info.name,
+                             name=self.loopy_opts.prefix + info.name,
                              target=target,
                              assumptions=' and '.join(assumptions),
                              default_offset=0,
@@ -1694,6 +2016,8 @@ class c_kernel_generator(kernel_generator):
     A C-kernel generator that handles OpenMP parallelization
     """
 
+    context = 'ctx'
+
     def __init__(self, *args, **kwargs):
 
         super(c_kernel_generator, self).__init__(*args, **kwargs)
@@ -1782,6 +2106,70 @@ def get_assumptions(self, test_size):
 
         return []
 
+    def _profile_instructions(self, names, instructions):
+        """
+        An override of the :method:`kernel_generator._profile_instructions` that
+        times each sub-kernel evaluation with :func:`clock_gettime`, accumulated
+        per OpenMP thread
+
+        Parameters
+        ----------
+        names: list of str
+            The name of the sub-kernel evaluated by each instruction
+        instructions: list of str
+            The instructions of the wrapping kernel
+
+        Returns
+        -------
+        defines: str
+            The declarations of the profiling data & functions, to place at the
+            top of the wrapping kernel
+        instructions: list of str
+            The instrumented instructions
+        headers: list of str
+            The declarations of the profiling data & functions, to place in the
+            wrapping kernel's header
+        argument: str
+            The declaration of the profiling data argument to append to the
+            wrapping kernel's signature, such that the timings are accumulated in
+            the calling evaluation context
+        """
+
+        with open(os.path.join(script_dir, self.lang, 'profile.c.in'), 'r') as file:
+            file_src = Template(file.read())
+
+        # pad the per-thread timings to a cache line (of doubles)
+        stride = int(np.ceil(len(names) / 8.) * 8)
+        defines = file_src.safe_substitute(
+            knl_name=self.symbol_name,
+            num_profiled=len(names),
+            profiled=', '.join('"{}"'.format(x) for x in names),
+            stride=stride)
+
+        timed = """
+{
+    struct timespec profile_start, profile_end;
+    clock_gettime(CLOCK_MONOTONIC, &profile_start);
+    ${insn}
+    clock_gettime(CLOCK_MONOTONIC, &profile_end);
+    ${knl_name}_profile_record(profile, ${index}, &profile_start, &profile_end);
+}
+"""
+        instructions = [subs_at_indent(timed, insn=insn,
+                                       knl_name=self.symbol_name, index=i)
+                        for i, insn in enumerate(instructions)]
+
+        headers = Template("""
+typedef struct ${knl_name}_profile ${knl_name}_profile;
+${knl_name}_profile* ${knl_name}_profile_create(void);
+void ${knl_name}_profile_destroy(${knl_name}_profile* profile);
+void ${knl_name}_profile_reset(${knl_name}_profile* profile);
+void ${knl_name}_profile_write(const ${knl_name}_profile* profile,
+                               const char* filename);
+""").substitute(knl_name=self.symbol_name).strip().split('\n')
+        return defines, instructions, headers, '{}_profile* profile'.format(
+            self.symbol_name)
+
     def _special_kernel_subs(self, file_src):
         """
         An override of the :method:`kernel_generator._special_wrapping_subs`
@@ -1805,6 +2193,9 @@ def _special_kernel_subs(self, file_src):
         full_kernel_args = ', '.join(self._set_sort(
             [self._get_pass(a, include_type=False, is_host=False)
              for a in self.mem.arrays]))
+        if self.loopy_opts.profile and not self.auto_diff:
+            # accumulate the sub-kernel timings in the evaluation context
+            full_kernel_args += ', {}->profile'.format(self.context)
 
         return Template(file_src).safe_substitute(
             full_kernel_args=full_kernel_args)
@@ -1860,6 +2251,8 @@ class opencl_kernel_generator(kernel_generator):
     An opencl specific kernel generator
     """
 
+    context = 'ctx'
+
     def __init__(self, *args, **kwargs):
         super(opencl_kernel_generator, self).__init__(*args, **kwargs)
 
@@ -1936,6 +2329,10 @@ def _special_kernel_subs(self, file_src):
 
         # get host memory syncs if necessary
         mem_strat = self.mem.get_mem_strategy()
+        # and the double-buffered execution, if enabled
+        buffer_strat = self.mem.get_buffer_strategy()
+        buffer_select = self.mem.get_buffer_selection()
+        buffer_arg_set = self.get_kernel_arg_setting(self.mem.buffered_arrays)
 
         return subs_at_indent(file_src,
                               vec_width=vec_width,
@@ -1949,16 +2346,21 @@ def _special_kernel_subs(self, file_src):
                               max_size=max_size,  # max size for CL1.1 mem init
                               host_constants=host_constants,
                               host_constants_transfers=host_constants_transfers,
-                              MEM_STRATEGY=mem_strat
+                              MEM_STRATEGY=mem_strat,
+                              BUFFER_STRATEGY=buffer_strat,
+                              buffer_select=buffer_select,
+                              buffer_arg_set=buffer_arg_set
                               )
 
-    def get_kernel_arg_setting(self):
+    def get_kernel_arg_setting(self, names=None):
         """
         Needed for OpenCL, this generates the code that sets the kernel args
 
         Parameters
         ----------
-        None
+        names : list of str [None]
+            If supplied, only set the kernel args with these names (e.g., to
+            reset the double-buffered arrays before each kernel call)
 
         Returns
         -------
@@ -1968,12 +2370,15 @@ def get_kernel_arg_setting(self):
 
         kernel_arg_sets = []
         for i, arg in enumerate(self.kernel_data):
+            if names is not None and arg.name not in names:
+                continue
             if not isinstance(arg, lp.ValueArg):
                 kernel_arg_sets.append(
                     self.set_knl_arg_array_template.safe_substitute(
                         arg_index=i,
-                        arg_size='sizeof({})'.format('d_' + arg.name),
-                        arg_value='&d_' + arg.name)
+                        arg_size='sizeof({})'.format(
+                            self.mem.device_prefix + arg.name),
+                        arg_value='&' + self.mem.device_prefix + arg.name)
                 )
             else:
                 # workaround for integer overflow of cl_uint
@@ -2071,6 +2476,7 @@ def _generate_compiling_program(self, path):
                                              + utils.file_ext[self.lang]),
                                 self.lang, use_filter=False) as file:
                 file.add_lines(file_src.safe_substitute(
+                    knl_name=self.symbol_name,
                     filenames=file_list,
                     outname=self.bin_name,
                     platform=platform_str,
@@ -2197,6 +2603,96 @@ def __listify(arr):
         self.kwargs = kwargs.copy()
 
 
+_kernel_jobs = []
+"""
+list of (:class:`kernel_generator`, int): the kernels being built in parallel by
+:func:`_build_kernels_parallel`, inherited by the forked worker processes
+"""
+
+
+def _build_kernel_job(index):
+    """
+    Builds the kernel of the :data:`_kernel_jobs` entry at :param:`index` in a
+    worker process
+
+    Returns
+    -------
+    knl : :class:`loopy.LoopKernel`
+        The built kernel, set up for editing
+    scheduled : :class:`loopy.LoopKernel`
+        The preprocessed & scheduled :param:`knl`, such that code-generation in
+        the main process need not repeat this work, or None if scheduling failed
+    """
+
+    gen, i = _kernel_jobs[index]
+    knl = lp_utils.set_editor(gen._build_kernel(gen.kernels[i]))
+    try:
+        scheduled = lp.get_one_scheduled_kernel(lp.preprocess_kernel(knl))
+    except Exception:
+        # any real error will be raised during code-generation
+        scheduled = None
+    return knl, scheduled
+
+
+def _build_kernels_parallel(gens, jobs):
+    """
+    Builds the kernels of the supplied :class:`kernel_generator`'s in a process
+    pool
+
+    Parameters
+    ----------
+    gens : list of :class:`kernel_generator`
+        The generators to build the kernels for
+    jobs : int
+        The number of worker processes to use
+
+    Notes
+    -----
+    The workers must be forked (such that the kernel infos need not be pickled),
+    hence this is unavailable on platforms without :func:`os.fork`.  If the pool
+    cannot be used, or the built kernels cannot be transferred back to this
+    process, an empty dictionary is returned and the kernels will be built
+    serially.
+
+    Returns
+    -------
+    built : dict
+        A mapping of (id(generator), kernel index) to the built
+        :class:`loopy.LoopKernel` and its scheduled counterpart, see
+        :func:`_build_kernel_job`
+    """
+
+    global _kernel_jobs
+    logger = logging.getLogger(__name__)
+    _kernel_jobs = [(gen, i) for gen in gens for i, info in enumerate(gen.kernels)
+                    if not isinstance(info, lp.LoopKernel)]
+    if len(_kernel_jobs) < 2 or not hasattr(os, 'fork'):
+        _kernel_jobs = []
+        return {}
+
+    try:
+        try:
+            pool = multiprocessing.get_context('fork').Pool(jobs)
+        except AttributeError:
+            # python 2, always forks
+            pool = multiprocessing.Pool(jobs)
+        try:
+            # results are returned in order of submission, hence merging is
+            # deterministic
+            kernels = pool.map(_build_kernel_job, range(len(_kernel_jobs)))
+        finally:
+            pool.close()
+            pool.join()
+        return {(id(gen), i): result for (gen, i), result in zip(
+            _kernel_jobs, kernels)}
+    except Exception as e:
+        logger.warn('Parallel kernel construction failed ({}), falling back to '
+                    'serial construction.'.format(e))
+        return {}
+    finally:
+        _kernel_jobs = []
+
+
 def create_function_mangler(kernel, return_dtypes=()):
     """
     Returns a function mangler to interface loopy kernels with function calls
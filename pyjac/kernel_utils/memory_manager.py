@@ -9,6 +9,7 @@
 import six
 import logging
 import re
+import os
 
 import numpy as np
 import loopy as lp
@@ -77,6 +78,56 @@ def __limitfy(limits):
     return {}
 
 
+def load_cache_topology(path='/sys/devices/system/cpu/cpu0/cache'):
+    """
+    Loads the (data) cache topology of the host from sysfs
+
+    Parameters
+    ----------
+    path: str ['/sys/devices/system/cpu/cpu0/cache']
+        The sysfs directory describing the caches of a CPU
+
+    Returns
+    -------
+    caches: dict
+        A mapping of cache level to a tuple of the size of the cache (in bytes) and
+        the number of logical CPUs sharing the cache.  Empty if the topology is
+        not available (e.g., not on Linux)
+    """
+
+    def __read(index, name):
+        with open(os.path.join(path, index, name), 'r') as file:
+            return file.read().strip()
+
+    def __count(cpu_list):
+        # e.g., 0-3,8-11
+        count = 0
+        for span in cpu_list.split(','):
+            lo, _, hi = span.partition('-')
+            count += int(hi or lo) - int(lo) + 1
+        return count
+
+    caches = {}
+    try:
+        indicies = sorted(x for x in os.listdir(path) if x.startswith('index'))
+    except OSError:
+        return caches
+    for index in indicies:
+        try:
+            if __read(index, 'type') not in ['Data', 'Unified']:
+                continue
+            size = __read(index, 'size')
+            scale = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}.get(
+                size[-1].upper(), 1)
+            size = int(size.rstrip('KMGkmg')) * scale
+            caches[int(__read(index, 'level'))] = (
+                size, __count(__read(index, 'shared_cpu_list')))
+        except (IOError, OSError, ValueError):
+            continue
+
+    return caches
+
+
 class memory_limits(object):
     """
     Helps determine whether a kernel is using too much constant / shared memory,
@@ -370,6 +421,16 @@ def guarded_call(lang, call, message='Error'):
 """ the prefix for host arrays """
 device_prefix = 'd_'
 """ the prefix for device arrays """
+arena_name = 'arena'
+""" the name of the working memory arena, see :attr:`memory_manager.arena` """
+arena_alignment = 64
+""" the alignment (in bytes) of the arrays in the working memory arena """
+bins_name = 'bins'
+""" the name of the state binning work buffers, see
+:meth:`memory_manager.get_state_binning` """
+reorder_name = 'reorder'
+""" the name of the mechanism reordering work buffers, see
+:meth:`memory_manager.get_mechanism_reordering` """
 
 
 class memory_strategy(object):
@@ -539,6 +600,11 @@ def free(self, device, name):
 
 
 class mapped_memory(memory_strategy):
+    transfer_queue = 'queue'
+    """str: the command queue used for memory transfers"""
+    blocking = 'CL_TRUE'
+    """str: whether memory transfers block the host"""
+
     def _get_2d_templates(self, lang, use_full=False, to_device=False,
                           ndim=1):
         """
@@ -585,7 +651,8 @@ def _get_2d_templates(self, lang, use_full=False, to_device=False,
         if lang == 'opencl':
             rect_copy_template = Template(guarded_call(
                     lang,
-                    'clEnqueue${ctype}BufferRect(queue, ${dev_name}, CL_TRUE, '
+                    'clEnqueue${ctype}BufferRect(${queue}, ${dev_name}, '
+                    '${blocking}, '
                     '(size_t[]) {0, 0, 0}, '  # buffer origin
                     '(size_t[]) ${host_origin}, '  # host origin
                     '(size_t[]) ${region}, '  # region
@@ -638,22 +705,27 @@ def __f_unsplit(ctype):
         if lang == 'opencl':
             # determine operation type
             ctype = 'Write' if to_device else 'Read'
+            # full copies (i.e., host constants) are always blocking on the main
+            # queue, as they are only performed once during initialization
+            queue = 'queue' if use_full else self.transfer_queue
+            blocking = 'CL_TRUE' if use_full else self.blocking
             if use_full:
-                return Template(guarded_call(lang, Template("""
-            clEnqueue${ctype}Buffer(queue, ${dev_name}, CL_TRUE, 0,
+                template = Template(guarded_call(lang, Template("""
+            clEnqueue${ctype}Buffer(${queue}, ${dev_name}, ${blocking}, 0,
                       ${buff_size}, &${host_name},
                       0, NULL, NULL)""").safe_substitute(ctype=ctype)))
             elif order == 'C' or ndim <= 1:
                 # this is a simple opencl-copy
-                return Template(guarded_call(lang, Template("""
-            clEnqueue${ctype}Buffer(queue, ${dev_name}, CL_TRUE, 0,
+                template = Template(guarded_call(lang, Template("""
+            clEnqueue${ctype}Buffer(${queue}, ${dev_name}, ${blocking}, 0,
                       ${this_run_size}, &${host_name}[${host_offset}*${non_ic_size}],
                       0, NULL, NULL)""").safe_substitute(ctype=ctype)))
             elif have_split:
-                return __f_split(ctype)
-
+                template = __f_split(ctype)
             else:
-                return __f_unsplit(ctype)
+                template = __f_unsplit(ctype)
+            return Template(template.safe_substitute(queue=queue,
+                                                     blocking=blocking))
 
         elif lang == 'c':
             ctype = 'in' if to_device else 'out'
@@ -942,6 +1014,29 @@ def memset(self, device, *args, **kwargs):
             map_flags=map_flags, **kwargs)
 
 
+class double_buffered_memory(mapped_memory):
+    """
+    An OpenCL memory strategy that enables overlapping the memory transfers of one
+    chunk of initial conditions with the kernel execution of another.
+
+    The input / output arrays are allocated as a pair of (ping-pong) device
+    buffers, and transfers to / from these buffers are enqueued on a separate,
+    non-blocking, command queue (`copy_queue`).  The calling program is responsible
+    for selecting the active buffer (see
+    :func:`memory_manager.get_buffer_selection`), and synchronizing the kernel
+    execution with the transfers via events.
+    """
+
+    transfer_queue = 'copy_queue'
+    blocking = 'CL_FALSE'
+
+    def __init__(self, lang, order, have_split, **kwargs):
+        assert lang == 'opencl', (
+            'Double-buffered execution is only supported for OpenCL')
+        super(double_buffered_memory, self).__init__(lang, order, have_split,
+                                                     **kwargs)
+
+
 class memory_manager(object):
 
     """
@@ -949,7 +1044,8 @@ class memory_manager(object):
     """
 
     def __init__(self, lang, order, have_split,
-                 dev_type=None, strided_c_copy=False):
+                 dev_type=None, strided_c_copy=False, double_buffer=False,
+                 context='', arena=False):
         """
         Parameters
         ----------
@@ -965,6 +1061,20 @@ def __init__(self, lang, order, have_split,
             output variables
         strided_c_copy: bool [False]
             Used in testing strided memory copies for c-targets
+        double_buffer: bool [False]
+            If true, use a :class:`double_buffered_memory` strategy to overlap
+            memory transfers and kernel execution.  Only supported for OpenCL,
+            and takes precedence over the use of pinned memory for CPU devices
+        context: str ['']
+            If supplied, the name of a pointer to the structure holding the device
+            arrays (see :meth:`get_defns`), such that all device arrays (and the
+            state binning / reordering work buffers) are accessed through this
+            pointer, e.g., `ctx->d_phi`
+        arena: bool [False]
+            If true, place the device arrays in a single (aligned) allocation, the
+            working memory arena, in which arrays that are never live at the same
+            time share space -- see :meth:`set_lifetimes`.  Currently only
+            supported for C
         """
         self.arrays = []
         self.in_arrays = []
@@ -980,12 +1090,35 @@ def __init__(self, lang, order, have_split,
         self.type_map = {np.dtype('int32'): 'int',
                          np.dtype('float64'): 'double'}
         self.dev_type = dev_type
-        self.use_pinned = self.dev_type is not None and self.dev_type == DTYPE_CPU
+        self.device_prefix = device_prefix
+        self.bins = bins_name
+        self.reorder = reorder_name
+        if context:
+            self.device_prefix = context + '->' + device_prefix
+            self.bins = context + '->' + bins_name
+            self.reorder = context + '->' + reorder_name
+        if double_buffer and lang != 'opencl':
+            logger = logging.getLogger(__name__)
+            logger.warn('Double-buffered execution is not supported for language '
+                        '{}, and will be ignored.'.format(lang))
+            double_buffer = False
+        self.double_buffer = double_buffer
+        if arena and lang != 'c':
+            logger = logging.getLogger(__name__)
+            logger.warn('Arena allocation of the working memory is not supported '
+                        'for language {}, and will be ignored.'.format(lang))
+            arena = False
+        self.arena = arena
+        self.lifetimes = {}
+        self.use_pinned = self.dev_type is not None and \
+            self.dev_type == DTYPE_CPU and not self.double_buffer
         kwargs = {}
         if not utils.can_vectorize_lang[lang] and strided_c_copy:
             kwargs['use_full'] = False
 
-        if self.use_pinned:
+        if self.double_buffer:
+            self.mem = double_buffered_memory(lang, order, have_split, **kwargs)
+        elif self.use_pinned:
             self.mem = pinned_memory(lang, order, have_split, **kwargs)
         else:
             self.mem = mapped_memory(lang, order, have_split, **kwargs)
@@ -1050,6 +1183,184 @@ def _set_sort(arr):
     def host_lang(self):
         return host_langs[self.lang]
 
+    @property
+    def buffered_arrays(self):
+        """
+        The names of the arrays allocated as a pair of ping-pong device buffers
+        for double-buffered execution, i.e., the (non-host constant) input and
+        output arrays.  Empty if double-buffering is not in use.
+        """
+        if not self.double_buffer:
+            return []
+        return [x for x in self.host_arrays if not any(
+            y.name == x for y in self.host_constants)]
+
+    def get_buffer_selection(self, buffer='buffer'):
+        """
+        Returns code to point the device arrays at the given set of ping-pong
+        buffers, for double-buffered execution
+
+        Parameters
+        ----------
+        buffer: str ['buffer']
+            The name of the variable holding the index (0 or 1) of the buffers to
+            use
+
+        Returns
+        -------
+        select_str: str
+            The generated code
+        """
+
+        return '\n'.join(['{0}{1} = {0}{1}_buffers[{2}];'.format(
+            self.device_prefix, x, buffer) for x in self.buffered_arrays])
+
+    def set_lifetimes(self, kernels):
+        """
+        Records the lifetimes of this manager's arrays, i.e., the indicies of the
+        first and last of the :param:`kernels` in which each array is used
+
+        Parameters
+        ----------
+        kernels: list of :class:`loopy.LoopKernel`
+            The kernels using this manager's arrays, in the order they are
+            executed for each thermo-chemical state
+
+        Returns
+        -------
+        None
+        """
+
+        self.lifetimes = {}
+        for i, knl in enumerate(kernels):
+            for arg in knl.args:
+                if isinstance(arg, lp.ValueArg):
+                    continue
+                first, _ = self.lifetimes.get(arg.name, (i, i))
+                self.lifetimes[arg.name] = (first, i)
+
+    @property
+    def arena_slots(self):
+        """
+        The slots of the working memory arena, as a list of the arrays placed in
+        each slot.  Empty if the arena is not in use.
+
+        Intermediate arrays (i.e., not inputs / outputs) share a slot if their
+        lifetimes (see :meth:`set_lifetimes`) do not overlap, and they have the same
+        shape & data-type.  The latter ensures that the data of any given state
+        occupies the same locations in each of the arrays in a slot, such that
+        states evaluated concurrently (e.g., by different OpenMP threads) never
+        overwrite each other's data.
+        """
+
+        if not self.arena:
+            return []
+
+        arrays = [x for x in self.arrays if not any(
+            x.name == y.name for y in self.host_constants)]
+        slots = []
+        # sort by first use (stable, to keep the generated code deterministic)
+        for arr in sorted(arrays, key=lambda x: self.lifetimes.get(
+                x.name, (-1, -1))[0]):
+            shareable = arr.name in self.lifetimes and \
+                arr.name not in self.host_arrays
+            slot = None
+            if shareable:
+                key = (tuple(str(x) for x in arr.shape), self._handle_type(arr))
+                start, end = self.lifetimes[arr.name]
+                slot = next((x for x in slots if x['key'] == key and
+                             x['end'] < start), None)
+            if slot is None:
+                slot = {'key': key if shareable else None, 'arrays': []}
+                slots.append(slot)
+            slot['arrays'].append(arr)
+            if shareable:
+                slot['end'] = end
+
+        return [x['arrays'] for x in slots]
+
+    def get_entries_per_state(self, arr):
+        """
+        Returns the number of entries of a (state-dependent) array per
+        thermo-chemical state
+
+        Parameters
+        ----------
+        arr: :class:`loopy.ArrayBase`
+            The array
+
+        Returns
+        -------
+        entries: int
+            The number of entries of the array per state
+        """
+
+        sizes = self._get_size(arr, subs_n='1', include_item_size=False,
+                               return_as_dict=True)['str_size']
+        return int(np.prod([int(x) for x in sizes]))
+
+    def get_state_size(self):
+        """
+        Returns the size (in bytes) of the working buffers per thermo-chemical state,
+        accounting for any space shared in the working memory arena
+
+        Returns
+        -------
+        size: int
+            The size of the working buffers per state
+        """
+
+        def __is_state_dependent(arr):
+            return any(s.search(str(x)) for x in arr.shape
+                       for s in self.string_strides)
+
+        def __size(arr):
+            return self.get_entries_per_state(arr) * \
+                self._handle_type(arr).itemsize
+
+        arrays = self.arrays
+        if self.arena:
+            arrays = [slot[0] for slot in self.arena_slots]
+        return sum(__size(x) for x in arrays if __is_state_dependent(x))
+
+    def get_cache_tile(self, caches=None, level=2, fill=0.5):
+        """
+        Determines the number of states each (OpenMP) thread should evaluate per
+        kernel call, such that the thread's share of the working buffers remains
+        resident in cache
+
+        Parameters
+        ----------
+        caches: dict [None]
+            The cache topology, see :func:`load_cache_topology`.  If not supplied,
+            the topology of the host is loaded
+        level: int [2]
+            The cache level to fit the working buffers in.  If not present, the
+            largest level below it is used instead
+        fill: float [0.5]
+            The fraction of the thread's share of the cache the working buffers may
+            occupy, leaving space for constant data, the stack, etc.
+
+        Returns
+        -------
+        tile: int
+            The number of states per thread, or zero if the cache topology is not
+            available
+        """
+
+        if caches is None:
+            caches = load_cache_topology()
+        levels = [x for x in caches if x <= level] or list(caches)
+        if not levels:
+            logger = logging.getLogger(__name__)
+            logger.warn('Cache topology not available, the number of states per '
+                        'kernel call will not be limited by the cache size.')
+            return 0
+
+        size, shared = caches[max(levels)]
+        per_state = max(self.get_state_size(), 1)
+        return int(max((fill * size / shared) // per_state, 1))
+
     def get_defns(self):
         """
         Returns the definition strings for this memory manager's arrays
@@ -1072,6 +1383,15 @@ def __add(arraylist, lang, prefix, defn_list):
         defns = []
         # get all 'device' defns
         __add(self.arrays, self.lang, device_prefix, defns)
+        # and the working memory arena, if any
+        if self.arena:
+            defns.append('char* ' + device_prefix + arena_name +
+                         utils.line_end[self.lang])
+        # and the ping-pong buffers, if any
+        for arr in [x for x in self.arrays if x.name in self.buffered_arrays]:
+            defns.append(self.memory_types[self._handle_type(arr)][self.lang] +
+                         ' ' + device_prefix + arr.name + '_buffers[2]' +
+                         utils.line_end[self.lang])
 
         # return defn string
         return '\n'.join(sorted(set(defns)))
@@ -1149,42 +1469,102 @@ def __get_alloc_and_memset(dev_arr, prefix):
                 formatter = '(void*) {}'
                 host_ptr = formatter.format(host_prefix + dev_arr.name)
 
-            # generate allocs
-            alloc = self.mem.alloc(not host,
-                                   name=name,
-                                   readonly=readonly,
-                                   buff_size=buff_size,
-                                   host_ptr=host_ptr,
-                                   per_run_size=per_run_size,
-                                   dtype=self.memory_types[
-                                        self._handle_type(dev_arr)][self.host_lang])
-
-            if host:
-                # add a type
-                alloc = self.memory_types[self._handle_type(dev_arr)][
-                    self.host_lang] + ' ' + alloc
-
-            # generate allocs
-            return_list = [alloc]
-
-            # don't reset constants or pinned host pointers
-            if not in_host_const and host_ptr == 'NULL':
-                # add the memset
-                return_list.append(self.mem.memset(
-                    not host, name=name, buff_size=buff_size,
-                    per_run_size=per_run_size,
-                    dtype=self.type_map[self._handle_type(dev_arr)]))
+            # allocate both ping-pong buffers for double-buffered arrays
+            names = [name]
+            if not host and dev_arr.name in self.buffered_arrays:
+                names = [name + '_buffers[{}]'.format(i) for i in range(2)]
+
+            return_list = []
+            for buff_name in names:
+                # generate allocs
+                alloc = self.mem.alloc(not host,
+                                       name=buff_name,
+                                       readonly=readonly,
+                                       buff_size=buff_size,
+                                       host_ptr=host_ptr,
+                                       per_run_size=per_run_size,
+                                       dtype=self.memory_types[
+                                            self._handle_type(dev_arr)][
+                                            self.host_lang])
+
+                if host:
+                    # add a type
+                    alloc = self.memory_types[self._handle_type(dev_arr)][
+                        self.host_lang] + ' ' + alloc
+
+                # generate allocs
+                return_list.append(alloc)
+
+                # don't reset constants or pinned host pointers
+                if not in_host_const and host_ptr == 'NULL':
+                    # add the memset
+                    return_list.append(self.mem.memset(
+                        not host, name=buff_name, buff_size=buff_size,
+                        per_run_size=per_run_size,
+                        dtype=self.type_map[self._handle_type(dev_arr)]))
+
+            if len(names) > 1:
+                # and start with the first buffer
+                return_list.append('{} = {};'.format(name, names[0]))
             # return
             return '\n'.join(return_list + ['\n'])
 
         to_alloc = [
             next(x for x in self.arrays if x.name == y) for y in self.host_arrays
             ] if host else self.arrays
-        prefix = host_prefix if host else device_prefix
-        alloc_list = [__get_alloc_and_memset(arr, prefix) for arr in to_alloc]
+        prefix = host_prefix if host else self.device_prefix
+        alloc_list = []
+        if not host and self.arena:
+            alloc_list.append(self._get_arena_alloc())
+            # the host constants are still allocated seperately
+            to_alloc = [x for x in to_alloc if any(
+                x.name == y.name for y in self.host_constants)]
+        alloc_list += [__get_alloc_and_memset(arr, prefix) for arr in to_alloc]
 
         return '\n'.join(alloc_list)
 
+    def _get_arena_alloc(self):
+        """
+        Returns code to allocate the working memory arena, and point each device
+        array at its slot in the arena (see :attr:`arena_slots`)
+
+        Returns
+        -------
+        alloc_str : str
+            The generated code
+        """
+
+        arena = self.device_prefix + arena_name
+        slots = self.arena_slots
+        align = arena_alignment - 1
+        # compute the (aligned) offset of each slot
+        alloc_list = ['size_t arena_size = 0;']
+        for i, slot in enumerate(slots):
+            alloc_list.append('size_t arena_offset_{} = arena_size;'.format(i))
+            alloc_list.append(
+                'arena_size += ({size} + {align}) & ~((size_t){align});'.format(
+                    size=self._get_size(slot[0], subs_n='per_run'), align=align))
+        # allocate, padded such that we can align the start of the arena
+        alloc_list.append(self.mem.alloc(
+            True, name=arena, buff_size='arena_size + {}'.format(align),
+            dtype='char*'))
+        alloc_list.append(
+            'char* arena_base = (char*)(((uintptr_t){arena} + {align}) & '
+            '~((uintptr_t){align}));'.format(arena=arena, align=align))
+        alloc_list.append(self.mem.memset(
+            True, name='arena_base', buff_size='arena_size'))
+        # and assign the arrays
+        for i, slot in enumerate(slots):
+            for arr in slot:
+                alloc_list.append('{prefix}{name} = ({dtype})(arena_base + '
+                                  'arena_offset_{i});'.format(
+                                    prefix=self.device_prefix, name=arr.name,
+                                    dtype=self.memory_types[
+                                        self._handle_type(arr)][self.lang],
+                                    i=i))
+
+        return '\n'.join(alloc_list + ['\n'])
+
     def _get_size(self, arr, subs_n='problem_size', include_item_size=True,
                   return_as_dict=False):
         size = arr.shape
@@ -1269,7 +1649,7 @@ def __stringify(subs_n=None, do_item_size=True):
             copy_intructions.append(self.mem.copy(
                 to_device,
                 host_name=host_prefix + arr + host_postfix,
-                dev_name=device_prefix + arr,
+                dev_name=self.device_prefix + arr,
                 buff_size=__stringify(),
                 dim=len(arr_maps[arr].shape),
                 this_run_size=__stringify(subs_n='this_run'),
@@ -1317,6 +1697,168 @@ def get_mem_transfers_out(self):
 
         return self._mem_transfers(to_device=False)
 
+    def get_state_binning(self, T_mid):
+        """
+        Generates the host code to partition the input states into those below
+        and at / above the temperature breakpoint :param:`T_mid` before kernel
+        execution, and to scatter the outputs back to the original order of the
+        states afterwards (see :file:`common/state_binning.h`).
+
+        The states are binned into copies of the host arrays, held in the
+        work buffers of the evaluation context, such that the caller's arrays are
+        never permuted in place.
+
+        Parameters
+        ----------
+        T_mid: float
+            The temperature breakpoint to partition the states about
+
+        Returns
+        -------
+        bin_states : str
+            The string to partition the host arrays before execution, and point
+            the host arrays at their binned copies
+        unbin_states : str
+            The string to restore the order of the output arrays after execution
+        """
+
+        assert 'phi' in self.in_arrays, (
+            'Cannot bin states without the state vector as input')
+        assert not self.mem.have_split, (
+            'Binning of states is not supported for split arrays')
+        arr_maps = {a.name: a for a in self.arrays}
+        # find the host input / output arrays
+        in_arrays = [x for x in self.in_arrays if not any(
+            y.name == x for y in self.host_constants)]
+        out_arrays = [x for x in self.out_arrays if not any(
+            y.name == x for y in self.host_constants)]
+        binned = [x for x in self.host_arrays if x in in_arrays + out_arrays]
+        assert all(self._handle_type(arr_maps[x]) == np.float64
+                   for x in binned), (
+            'Binning of states is only supported for floating point arrays')
+
+        widths = [str(self._get_size(arr_maps[x], subs_n='',
+                                     include_item_size=False)) for x in binned]
+
+        def __permute(src, dest, arr, inverse):
+            return ('permute_states({src}, {dest}, {bins}.perm, problem_size, '
+                    '{width}, \'{order}\', {inverse});').format(
+                src=src, dest=dest, bins=self.bins,
+                width=widths[binned.index(arr)], order=self.order,
+                inverse='true' if inverse else 'false')
+
+        # the temperature is the first entry of the state vector
+        phi_width = widths[binned.index('phi')]
+        bin_states = [
+            'bool have_bins = reserve_state_bins(&{bins}, problem_size, '
+            '{width});'.format(bins=self.bins, width=' + '.join(widths)),
+            'cassert(have_bins, "Error allocating state binning arrays");',
+            'bin_states(problem_size, {name}, {stride}, {T_mid}, {bins}.perm);'
+            .format(name=host_prefix + 'phi',
+                    stride=phi_width if self.order == 'C' else 1,
+                    T_mid=repr(float(T_mid)), bins=self.bins)]
+        # place the binned copies one after another in the work buffers
+        for i, arr in enumerate(binned):
+            bin_states.append(
+                'double* bin_{name} = &{bins}.data[({offset}) * problem_size];'
+                .format(name=arr, bins=self.bins,
+                        offset=' + '.join(widths[:i]) or '0'))
+        bin_states += [__permute(host_prefix + x, 'bin_' + x, x, False)
+                       for x in in_arrays]
+        # and evaluate the kernel on the binned copies
+        bin_states += ['double* unbinned_{0} = {1}{0};'.format(x, host_prefix)
+                       for x in out_arrays]
+        bin_states += ['{1}{0} = bin_{0};'.format(x, host_prefix) for x in binned]
+
+        unbin_states = [__permute('bin_' + x, 'unbinned_' + x, x, True)
+                        for x in out_arrays]
+        return '\n'.join(bin_states), '\n'.join(unbin_states)
+
+    def get_mechanism_reordering(self, maps):
+        """
+        Generates the host code to convert the input arrays from the original
+        species / reaction order of a reordered mechanism to the order of the kernel
+        before execution, and to convert the outputs back to the original order
+        afterwards (see :file:`common/mechanism_order.h`).
+
+        As with :meth:`get_state_binning`, the arrays are reordered into copies
+        held in the work buffers of the evaluation context, such that the caller's
+        arrays are never modified.
+
+        Parameters
+        ----------
+        maps: dict of str: :class:`numpy.ndarray`
+            The entry in the original order corresponding to each entry (per state)
+            of the named host array in the kernel's order, see
+            :meth:`pyjac.pywrap.MechanismOrder.entry_maps`.  Arrays not in
+            :param:`maps` are passed through unchanged
+
+        Returns
+        -------
+        reorder_states : str
+            The string to reorder the host arrays before execution, and point
+            the host arrays at their reordered copies
+        restore_states : str
+            The string to restore the original order of the output arrays after
+            execution
+        """
+
+        assert not self.mem.have_split, (
+            'Reordering of the mechanism is not supported for split arrays')
+        arr_maps = {a.name: a for a in self.arrays}
+        # find the host input / output arrays
+        in_arrays = [x for x in self.in_arrays if x in maps and not any(
+            y.name == x for y in self.host_constants)]
+        out_arrays = [x for x in self.out_arrays if x in maps and not any(
+            y.name == x for y in self.host_constants)]
+        reordered = [x for x in self.host_arrays if x in in_arrays + out_arrays]
+        if not reordered:
+            return '', ''
+        assert all(self._handle_type(arr_maps[x]) == np.float64
+                   for x in reordered), (
+            'Reordering of the mechanism is only supported for floating point '
+            'arrays')
+
+        widths = [str(self._get_size(arr_maps[x], subs_n='',
+                                     include_item_size=False)) for x in reordered]
+        for x, width in zip(reordered, widths):
+            assert len(maps[x]) == int(width), (
+                'The reordering of array {} does not match its size'.format(x))
+
+        def __reorder(src, dest, arr, to_kernel):
+            return ('reorder_entries({src}, {dest}, reorder_{arr}, problem_size, '
+                    '{width}, \'{order}\', {to_kernel});').format(
+                src=src, dest=dest, arr=arr,
+                width=widths[reordered.index(arr)], order=self.order,
+                to_kernel='true' if to_kernel else 'false')
+
+        reorder_states = [
+            'static const int reorder_{name}[{width}] = {{{init}}};'.format(
+                name=x, width=width, init=', '.join(str(int(i)) for i in maps[x]))
+            for x, width in zip(reordered, widths)]
+        reorder_states += [
+            'bool have_reorder = reserve_reorder_buffers(&{reorder}, problem_size, '
+            '{width});'.format(reorder=self.reorder, width=' + '.join(widths)),
+            'cassert(have_reorder, "Error allocating mechanism reordering '
+            'arrays");']
+        # place the reordered copies one after another in the work buffers
+        for i, arr in enumerate(reordered):
+            reorder_states.append(
+                'double* kernel_{name} = &{reorder}.data[({offset}) * '
+                'problem_size];'.format(name=arr, reorder=self.reorder,
+                                        offset=' + '.join(widths[:i]) or '0'))
+        reorder_states += [__reorder(host_prefix + x, 'kernel_' + x, x, True)
+                           for x in in_arrays]
+        # and evaluate the kernel on the reordered copies
+        reorder_states += ['double* original_{0} = {1}{0};'.format(x, host_prefix)
+                           for x in out_arrays]
+        reorder_states += ['{1}{0} = kernel_{0};'.format(x, host_prefix)
+                           for x in reordered]
+
+        restore_states = [__reorder('kernel_' + x, 'original_' + x, x, False)
+                          for x in out_arrays]
+        return '\n'.join(reorder_states), '\n'.join(restore_states)
+
     def get_mem_strategy(self):
         """
         Returns the memory strategy MAPPED or PINNED used in memory creation
@@ -1333,6 +1875,23 @@ def get_mem_strategy(self):
 
         return 'PINNED' if isinstance(self.mem, pinned_memory) else 'MAPPED'
 
+    def get_buffer_strategy(self):
+        """
+        Returns the buffering strategy DOUBLE_BUFFER or SINGLE_BUFFER used in
+        kernel execution
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        strat: str
+            The buffering strategy
+        """
+
+        return 'DOUBLE_BUFFER' if self.double_buffer else 'SINGLE_BUFFER'
+
     def get_host_constants_in(self):
         """
         Generates the memory transfers of the host constants
@@ -1367,8 +1926,21 @@ def get_mem_frees(self, free_locals=False):
 
         if not free_locals:
             # device memory
-            frees = [self.mem.free(not free_locals, name=device_prefix + arr.name)
-                     for arr in self.arrays]
+            frees = []
+            arrays = self.arrays
+            if self.arena:
+                frees.append(self.mem.free(
+                    True, name=self.device_prefix + arena_name))
+                # the host constants are still allocated seperately
+                arrays = [x for x in arrays if any(
+                    x.name == y.name for y in self.host_constants)]
+            for arr in arrays:
+                name = self.device_prefix + arr.name
+                names = [name]
+                if arr.name in self.buffered_arrays:
+                    names = [name + '_buffers[{}]'.format(i) for i in range(2)]
+                frees.extend([self.mem.free(not free_locals, name=x)
+                              for x in names])
         else:
             frees = [self.mem.free(not free_locals,
                                    name=host_prefix + arr + '_local')
@@ -51,7 +51,22 @@
                         help='If supplied, convert the generated library to an '
                              'executable shared library (cannot be supplied w/ '
                              '--static switch)')
+    parser.add_argument('-cd', '--cache_dir',
+                        required=False,
+                        type=str,
+                        default=None,
+                        help='The directory of the persistent compiled object '
+                             'cache.  If not specified, the value of the '
+                             'PYJAC_OBJECT_CACHE_DIR environment variable, or '
+                             '~/.cache/pyjac/objects will be used.')
+    parser.add_argument('-nc', '--no_cache',
+                        required=False,
+                        default=False,
+                        action='store_true',
+                        help='If supplied, bypass the compiled object cache and '
+                             'always compile from scratch.')
 
     args = parser.parse_args()
     generate_library(args.lang, args.source_dir, args.obj_dir, args.out_dir,
-                     not args.static, args.build_type, args.executable)
+                     not args.static, args.build_type, args.executable,
+                     cache_dir=args.cache_dir, use_cache=not args.no_cache)
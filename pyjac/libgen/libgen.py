@@ -13,6 +13,7 @@
 from .. import siteconf as site
 from enum import Enum
 from ..core.exceptions import CompilationError
+from . import object_cache
 
 
 class build_type(Enum):
@@ -112,9 +113,9 @@ def get_cuda_path():
                 opencl=site.CL_LIB_DIR)
 
 
-def compiler(fstruct):
-    """Given a file structure, this method will compile the source file for the
-    language and options specified
+def compile_args(fstruct):
+    """Returns the compiler and flags used to compile the file in the given file
+    structure, excluding the include directories and the source / object files
 
     Parameters
     ----------
@@ -123,12 +124,8 @@ def compiler(fstruct):
 
     Returns
     -------
-    success : int
-        0 if the compilation process was sucessful, -1 otherwise
-
-    Notes
-    -----
-    Designed to work with a multiprocess compilation workflow
+    args : list of str
+        The compiler and flags
     """
     args = [cmd_compile[fstruct.build_lang]]
     if fstruct.auto_diff:
@@ -143,19 +140,44 @@ def compiler(fstruct):
         args.extend(shared_exec_flags[fstruct.build_lang])
     # and any other flags
     args.extend(fstruct.args)
+    return [val for val in args if val.strip()]
+
+
+def compiler(fstruct):
+    """Given a file structure, this method will compile the source file for the
+    language and options specified
+
+    Parameters
+    ----------
+    fstruct : `file_struct`
+        An information struct that holds the various compilation options
+
+    Returns
+    -------
+    success : int
+        0 if the compilation process was sucessful, -1 otherwise
+
+    Notes
+    -----
+    Designed to work with a multiprocess compilation workflow.  If the
+    :attr:`file_struct.cache_key` is set, the object file is loaded from / stored
+    in the object cache
+    """
+    source = os.path.join(fstruct.source_dir, fstruct.filename +
+                          utils.file_ext[fstruct.build_lang])
+    obj = os.path.join(fstruct.obj_dir, os.path.basename(fstruct.filename) + '.o')
+    if fstruct.cache_key and object_cache.load(
+            fstruct.cache_dir, fstruct.cache_key, obj):
+        return 0
+
+    args = compile_args(fstruct)
     # includes
     include = ['-I{}'.format(d) for d in fstruct.i_dirs +
                includes[fstruct.build_lang]
                ]
     args.extend(include)
     args.extend([
-        '-{}c'.format('d' if fstruct.lang == 'cuda' else ''),
-        os.path.join(fstruct.source_dir, fstruct.filename +
-                     utils.file_ext[fstruct.build_lang]
-                     ),
-        '-o', os.path.join(fstruct.obj_dir,
-                           os.path.basename(fstruct.filename) + '.o')
-    ])
+        '-{}c'.format('d' if fstruct.lang == 'cuda' else ''), source, '-o', obj])
     args = [val for val in args if val.strip()]
     try:
         print(' '.join(args))
@@ -172,14 +194,15 @@ def compiler(fstruct):
             fstruct.filename + utils.file_ext[fstruct.build_lang],
             exc.output))
         return exc.returncode
+    if fstruct.cache_key:
+        object_cache.store(fstruct.cache_dir, fstruct.cache_key, obj)
     return 0
 
 
-def libgen(lang, obj_dir, out_dir, filelist, shared, auto_diff, as_executable):
+def libgen(lang, obj_dir, out_dir, filelist, shared, auto_diff, as_executable,
+           object_keys=None):
     """Create a library from a list of compiled files
 
-    Parameters
-    ----------
     Parameters
     ----------
     obj_dir : str
@@ -192,6 +215,10 @@ def libgen(lang, obj_dir, out_dir, filelist, shared, auto_diff, as_executable):
         The list of object files to include in the library
     auto_diff : Optional[bool]
         Optional; if ``True``, include autodifferentiation
+    object_keys : Optional[list of str]
+        Optional; if supplied, the object cache keys of the files in
+        :param:`filelist`.  The library is only relinked if these (or the link
+        command) changed since the library was last created
 
     """
     command = cmd_lib(lang, shared)
@@ -206,13 +233,12 @@ def libgen(lang, obj_dir, out_dir, filelist, shared, auto_diff, as_executable):
 
     libname = 'lib{}_pyjac'.format(desc)
 
-    # remove the old library
-    if os.path.exists(os.path.join(out_dir, libname + lib_ext(shared))):
-        os.remove(os.path.join(out_dir, libname + lib_ext(shared)))
+    # remove the old library of the other type
     if os.path.exists(os.path.join(out_dir, libname + lib_ext(not shared))):
         os.remove(os.path.join(out_dir, libname + lib_ext(not shared)))
 
     libname += lib_ext(shared)
+    library = os.path.join(out_dir, libname)
 
     if shared:
         # add optimization / debug flags
@@ -237,6 +263,19 @@ def libgen(lang, obj_dir, out_dir, filelist, shared, auto_diff, as_executable):
         command += ['-L{}'.format(path) for path in lib_dirs[lang]]
         command.extend(libs[lang])
 
+    link_key = None
+    if object_keys is not None:
+        link_key = object_cache.get_link_key(command, object_keys)
+        if object_cache.is_current(library, link_key):
+            logger = logging.getLogger(__name__)
+            logger.info('Library {} is up to date'.format(library))
+            return libname
+
+    # remove the old library
+    if os.path.exists(library):
+        os.remove(library)
+    object_cache.mark_current(library, None)
+
     try:
         print(' '.join(command))
         subprocess.check_call(command)
@@ -252,6 +291,7 @@ def libgen(lang, obj_dir, out_dir, filelist, shared, auto_diff, as_executable):
             exc.output))
         sys.exit(exc.returncode)
 
+    object_cache.mark_current(library, link_key)
     return libname
 
 
@@ -261,7 +301,7 @@ class file_struct(object):
     """
 
     def __init__(self, lang, build_lang, filename, i_dirs, args,
-                 source_dir, obj_dir, shared, as_executable):
+                 source_dir, obj_dir, shared, as_executable, cache_dir=None):
         """
         Parameters
         ----------
@@ -283,6 +323,8 @@ def __init__(self, lang, build_lang, filename, i_dirs, args,
             If true, this is creating a shared library
         as_executable: bool
             If true, this is a shared library that is also executable
+        cache_dir: str [None]
+            If supplied, the object cache directory
         """
 
         self.lang = lang
@@ -295,9 +337,11 @@ def __init__(self, lang, build_lang, filename, i_dirs, args,
         self.shared = shared
         self.auto_diff = False
         self.as_executable = as_executable
+        self.cache_dir = cache_dir
+        self.cache_key = None
 
 
-def get_file_list(source_dir, lang, btype):
+def get_file_list(source_dir, lang, btype, as_executable=False):
     """
 
     Parameters
@@ -308,6 +352,9 @@ def get_file_list(source_dir, lang, btype):
         Programming language
     btype: :class:`build_type`
         The type of library being built
+    as_executable: bool [False]
+        If true, include the driver program (and the initial condition reader /
+        timer it uses) that evaluates the kernel from the command line
 
     Returns
     -------
@@ -318,7 +365,7 @@ def get_file_list(source_dir, lang, btype):
 
     """
     i_dirs = [source_dir]
-    files = ['read_initial_conditions', 'timer']
+    files = []
 
     # look for right code in the directory
     file_base = 'jacobian_kernel'
@@ -333,6 +380,10 @@ def get_file_list(source_dir, lang, btype):
     elif lang == 'c':
         files += [file_base + x for x in ['', '_main']]
         files += ['error_check']
+    if as_executable and lang in ['opencl', 'c']:
+        files += [file_base + '_driver']
+    if as_executable or lang not in ['opencl', 'c']:
+        files += ['read_initial_conditions', 'timer']
 
     flists = []
     for flist in flists:
@@ -354,7 +405,8 @@ def get_file_list(source_dir, lang, btype):
 
 
 def generate_library(lang, source_dir, obj_dir=None, out_dir=None, shared=None,
-                     btype=build_type.jacobian, as_executable=False):
+                     btype=build_type.jacobian, as_executable=False,
+                     cache_dir=None, use_cache=True):
     """Generate shared/static library for pyJac files.
 
     Parameters
@@ -376,6 +428,12 @@ def generate_library(lang, source_dir, obj_dir=None, out_dir=None, shared=None,
     as_executable: bool [False]
         If true, the generated library should use the '-fPIE' flag (or equivalent)
         to be executable
+    cache_dir: str [None]
+        The directory of the persistent compiled object cache.  If not specified,
+        :func:`pyjac.libgen.object_cache.default_cache_dir` will be used.
+    use_cache: bool [True]
+        If ``False``, bypass the object cache and always compile (and link) from
+        scratch
 
     Returns
     -------
@@ -418,13 +476,29 @@ def generate_library(lang, source_dir, obj_dir=None, out_dir=None, shared=None,
     out_dir = os.path.abspath(out_dir)
 
     # get file lists
-    i_dirs, files = get_file_list(source_dir, build_lang, btype)
+    i_dirs, files = get_file_list(source_dir, build_lang, btype,
+                                  as_executable=as_executable)
 
     # Compile generated source code
+    if use_cache and not cache_dir:
+        cache_dir = object_cache.default_cache_dir()
     structs = [file_struct(lang, build_lang, f, i_dirs, [],
-                           source_dir, obj_dir, shared, as_executable)
+                           source_dir, obj_dir, shared, as_executable,
+                           cache_dir=cache_dir if use_cache else None)
                for f in files]
 
+    object_keys = None
+    if use_cache:
+        # key each translation unit by its sources, compiler & flags
+        for struct in structs:
+            source = os.path.join(source_dir, struct.filename +
+                                  utils.file_ext[build_lang])
+            if os.path.isfile(source):
+                struct.cache_key = object_cache.get_object_key(
+                    compile_args(struct), build_lang, source,
+                    struct.i_dirs + includes[build_lang])
+        object_keys = [struct.cache_key for struct in structs]
+
     pool = multiprocessing.Pool()
     results = pool.map(compiler, structs)
     pool.close()
@@ -433,5 +507,9 @@ def generate_library(lang, source_dir, obj_dir=None, out_dir=None, shared=None,
         failures = [i for i, r in enumerate(results) if r != -1]
         raise CompilationError([structs[i].filename for i in failures])
 
-    libname = libgen(lang, obj_dir, out_dir, files, shared, False, as_executable)
+    if use_cache:
+        object_cache.evict(cache_dir, object_cache.default_max_size())
+
+    libname = libgen(lang, obj_dir, out_dir, files, shared, False, as_executable,
+                     object_keys=object_keys)
     return os.path.join(out_dir, libname)
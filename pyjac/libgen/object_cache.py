@@ -0,0 +1,390 @@
+"""
+object_cache.py - a persistent, content-addressed cache of compiled pyJac object
+files
+
+The test & performance matrices compile the same generated sources over and over
+again (in different build directories).  As a compiled object is a pure function
+of the source file, the headers it includes, the compiler and the compilation
+flags, we store the objects on disk keyed by a hash of these inputs and simply
+copy the stored object to the object directory on a cache hit.  The cache is
+bounded in size, with the least-recently used objects evicted first.
+"""
+
+from __future__ import division
+
+import os
+import re
+import json
+import shutil
+import hashlib
+import logging
+import platform
+import tempfile
+import subprocess
+
+from pyjac import utils
+from pyjac.core.generation_cache import default_cache_dir as \
+    default_source_cache_dir
+
+obj_ext = '.o'
+"""str: file extension of the cached objects"""
+
+include_re = re.compile(r'^\s*#\s*include\s*([<"])([^>"]+)[>"]', re.MULTILINE)
+"""re: matches the #include directives of a source file"""
+
+_compiler_versions = {}
+
+
+def default_cache_dir():
+    """
+    Returns the default directory for the compiled object cache.
+
+    If the environment variable `PYJAC_OBJECT_CACHE_DIR` is set, it will be used;
+    otherwise the cache will be placed in the 'objects' subdirectory of the
+    :func:`pyjac.core.generation_cache.default_cache_dir`
+
+    Returns
+    -------
+    cache_dir: str
+        The default cache directory
+    """
+    return os.environ.get('PYJAC_OBJECT_CACHE_DIR', os.path.join(
+        default_source_cache_dir(), 'objects'))
+
+
+def default_max_size():
+    """
+    Returns the default maximum size of the compiled object cache.
+
+    If the environment variable `PYJAC_OBJECT_CACHE_SIZE` is set, it will be used;
+    otherwise the cache is limited to 1 GiB
+
+    Returns
+    -------
+    max_size: int
+        The maximum size of the cache, in bytes
+    """
+    return int(os.environ.get('PYJAC_OBJECT_CACHE_SIZE', 1 << 30))
+
+
+def _hash_file(hasher, filename):
+    """
+    Updates :param:`hasher` with the contents of :param:`filename`
+    """
+    with open(filename, 'rb') as file:
+        hasher.update(file.read())
+
+
+def file_digest(filename):
+    """
+    Returns the digest of the contents of :param:`filename`
+
+    Parameters
+    ----------
+    filename: str
+        The file to hash
+
+    Returns
+    -------
+    digest: str
+        The hexadecimal digest of the file
+    """
+    hasher = hashlib.sha256()
+    _hash_file(hasher, filename)
+    return hasher.hexdigest()
+
+
+def compiler_version(compiler):
+    """
+    Returns the version string of the :param:`compiler`, such that an upgrade of
+    the compiler (or the system headers that come with it) invalidates the cache
+
+    Parameters
+    ----------
+    compiler: str
+        The compiler executable
+
+    Returns
+    -------
+    version: str
+        The output of `compiler --version`, or an empty string if the compiler
+        could not be run
+    """
+    if compiler not in _compiler_versions:
+        try:
+            version = subprocess.check_output([compiler, '--version'],
+                                              stderr=subprocess.STDOUT)
+            version = version.decode('utf-8', 'replace')
+        except (OSError, subprocess.CalledProcessError):
+            version = ''
+        _compiler_versions[compiler] = version
+    return _compiler_versions[compiler]
+
+
+def include_files(source, include_dirs):
+    """
+    Returns the headers (recursively) included by :param:`source` that can be
+    found in the :param:`include_dirs` -- system headers that cannot be found
+    are covered by the :func:`compiler_version`
+
+    Parameters
+    ----------
+    source: str
+        The path to the source file
+    include_dirs: list of str
+        The include directories passed to the compiler
+
+    Returns
+    -------
+    headers: list of (str, str)
+        The name (as included) and path of each header found, in order of
+        inclusion
+    """
+
+    headers = []
+    seen = set()
+
+    def __scan(filename):
+        with open(filename, 'rb') as file:
+            src = file.read().decode('utf-8', 'replace')
+        for delim, name in include_re.findall(src):
+            search = list(include_dirs)
+            if delim == '"':
+                # quoted includes are first searched relative to the includer
+                search.insert(0, os.path.dirname(filename))
+            for path in search:
+                path = os.path.abspath(os.path.join(path, name))
+                if os.path.isfile(path):
+                    break
+            else:
+                continue
+            if path not in seen:
+                seen.add(path)
+                headers.append((name, path))
+                __scan(path)
+
+    __scan(source)
+    return headers
+
+
+def get_object_key(args, lang, source, include_dirs):
+    """
+    Returns the cache key for the compilation of a single translation unit
+
+    Parameters
+    ----------
+    args: list of str
+        The compiler & flags, _excluding_ the include directories and the
+        source / object file arguments (such that identical sources compiled in
+        different build directories share a key)
+    lang: str
+        The language being compiled
+    source: str
+        The path to the source file
+    include_dirs: list of str
+        The include directories passed to the compiler
+
+    Returns
+    -------
+    key: str
+        The hexadecimal cache key
+    """
+
+    description = {'args': args,
+                   'lang': lang,
+                   'compiler': compiler_version(args[0]),
+                   'source': os.path.basename(source)}
+    if any('native' in arg for arg in args):
+        # the object is tuned for this host
+        description['host'] = platform.node()
+
+    hasher = hashlib.sha256()
+    hasher.update(json.dumps(description, sort_keys=True).encode('utf-8'))
+    _hash_file(hasher, source)
+    for name, path in include_files(source, include_dirs):
+        hasher.update(name.encode('utf-8'))
+        _hash_file(hasher, path)
+    return hasher.hexdigest()
+
+
+def load(cache_dir, key, obj_file):
+    """
+    Copies the cached object for :param:`key` (if any) to :param:`obj_file`,
+    and marks the entry as recently used
+
+    Parameters
+    ----------
+    cache_dir: str
+        The cache directory
+    key: str
+        The cache key, from :func:`get_object_key`
+    obj_file: str
+        The path of the object file to create
+
+    Returns
+    -------
+    hit: bool
+        True if the object was found in the cache and copied
+    """
+
+    entry = os.path.join(cache_dir, key + obj_ext)
+    try:
+        shutil.copyfile(entry, obj_file)
+        os.utime(entry, None)
+    except (IOError, OSError):
+        # not stored, or evicted by another process
+        return False
+
+    logger = logging.getLogger(__name__)
+    logger.info('Loaded object {} from cache entry {}'.format(obj_file, entry))
+    return True
+
+
+def store(cache_dir, key, obj_file):
+    """
+    Stores the compiled :param:`obj_file` in the cache under :param:`key`
+
+    Parameters
+    ----------
+    cache_dir: str
+        The cache directory
+    key: str
+        The cache key, from :func:`get_object_key`
+    obj_file: str
+        The path of the compiled object file
+
+    Returns
+    -------
+    None
+    """
+
+    utils.create_dir(cache_dir)
+    # write to a temporary file & move into place, such that concurrent
+    # compilations never see a partially written entry
+    handle, temp = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    os.close(handle)
+    try:
+        shutil.copyfile(obj_file, temp)
+        os.rename(temp, os.path.join(cache_dir, key + obj_ext))
+    except (IOError, OSError):
+        if os.path.exists(temp):
+            os.remove(temp)
+
+
+def evict(cache_dir, max_size):
+    """
+    Removes the least-recently used objects from the cache until the total size
+    of the cache is no larger than :param:`max_size`
+
+    Parameters
+    ----------
+    cache_dir: str
+        The cache directory
+    max_size: int
+        The maximum size of the cache, in bytes
+
+    Returns
+    -------
+    evicted: list of str
+        The keys of the evicted objects
+    """
+
+    if not os.path.isdir(cache_dir):
+        return []
+
+    entries = []
+    for f in os.listdir(cache_dir):
+        if not f.endswith(obj_ext):
+            continue
+        try:
+            stat = os.stat(os.path.join(cache_dir, f))
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, f))
+
+    total = sum(size for _, size, _ in entries)
+    evicted = []
+    for _, size, f in sorted(entries):
+        if total <= max_size:
+            break
+        try:
+            os.remove(os.path.join(cache_dir, f))
+        except OSError:
+            # removed by another process
+            pass
+        total -= size
+        evicted.append(f[:-len(obj_ext)])
+
+    if evicted:
+        logger = logging.getLogger(__name__)
+        logger.info('Evicted {} objects from cache {}'.format(
+            len(evicted), cache_dir))
+    return evicted
+
+
+def get_link_key(command, keys):
+    """
+    Returns a key describing a link (or archive) step
+
+    Parameters
+    ----------
+    command: list of str
+        The link command
+    keys: list of str
+        The :func:`get_object_key` of each of the linked objects
+
+    Returns
+    -------
+    key: str
+        The hexadecimal link key
+    """
+
+    description = {'command': command,
+                   'objects': keys}
+    hasher = hashlib.sha256()
+    hasher.update(json.dumps(description, sort_keys=True).encode('utf-8'))
+    return hasher.hexdigest()
+
+
+def _stamp_file(target):
+    return os.path.join(os.path.dirname(target),
+                        '.{}.key'.format(os.path.basename(target)))
+
+
+def is_current(target, key):
+    """
+    Returns True if :param:`target` exists and was last built with :param:`key`,
+    as recorded by :func:`mark_current`
+
+    Parameters
+    ----------
+    target: str
+        The built file, e.g., a library
+    key: str
+        The key describing the inputs of the build
+
+    Returns
+    -------
+    current: bool
+        True if the target need not be rebuilt
+    """
+
+    if not os.path.isfile(target) or not os.path.isfile(_stamp_file(target)):
+        return False
+    with open(_stamp_file(target), 'r') as file:
+        return file.read().strip() == key
+
+
+def mark_current(target, key):
+    """
+    Records that :param:`target` was built with :param:`key`, or removes the
+    record if :param:`key` is None
+    """
+
+    stamp = _stamp_file(target)
+    if key is None:
+        if os.path.exists(stamp):
+            os.remove(stamp)
+        return
+    with open(stamp, 'w') as file:
+        file.write(key)
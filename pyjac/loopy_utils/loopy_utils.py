@@ -115,10 +115,47 @@ def load_platform(codegen):
         kwargs['order'] = platform['order']
     if 'atomics' in platform:
         kwargs['use_atomics'] = platform['atomics']
+    if 'double_buffer' in platform:
+        kwargs['double_buffer'] = platform['double_buffer']
+    if 'arena' in platform:
+        kwargs['arena'] = platform['arena']
+    if 'rate_specialization' in platform:
+        kwargs['rate_spec'] = utils.EnumType(RateSpecialization)(
+            platform['rate_specialization'])
+    if 'split_rate_kernels' in platform:
+        kwargs['rate_spec_kernels'] = platform['split_rate_kernels']
+    if 'split_rop_net_kernels' in platform:
+        kwargs['rop_net_kernels'] = platform['split_rop_net_kernels']
+    if 'seperate_kernels' in platform:
+        kwargs['seperate_kernels'] = platform['seperate_kernels']
     return loopy_options(width=width, depth=depth, lang=platform['lang'],
                          platform=platform['name'], **kwargs)
 
 
+def load_kernel_options(codegen):
+    """
+    Loads the (optional) kernel options, e.g., the rate-specialization or
+    kernel-splitting, from a code-generation platform file as written by
+    :mod:`pyjac.autotune`
+
+    Parameters
+    ----------
+    codegen: str
+        The user-specified code-generation platform yaml file
+
+    Returns
+    -------
+    kernel_opts: dict
+        The kernel options specified in the platform file, keyed by the name of
+        the corresponding arguement of :func:`create_jacobian`
+    """
+
+    platform = build_and_validate('codegen_platform.yaml', codegen)['platform']
+    return {k: platform[k] for k in ['rate_specialization', 'split_rate_kernels',
+                                     'split_rop_net_kernels', 'seperate_kernels']
+            if k in platform}
+
+
 class loopy_options(object):
 
     """
@@ -180,6 +217,48 @@ class loopy_options(object):
         The format of Jacobian kernel (full or sparse) to generate
     seperate_kernels: bool [True]
         If true, break the kernel evaluation into calls to individual kernels.
+    double_buffer: bool [False]
+        If true, the generated OpenCL calling program will use a pair of
+        (ping-pong) device buffers for the input / output arrays, such that the
+        transfer of the next chunk of initial conditions overlaps with the kernel
+        execution of the current chunk.  Ignored for other languages.
+    kc_polynomials: bool [False]
+        If True, evaluate the equilibrium constants of the reversible reactions
+        from per-reaction polynomials computed at generation time, rather than
+        from the Gibbs polynomials of the species in each reaction.  Requires that
+        the species in each reversible reaction share a common temperature
+        breakpoint.
+    temperature_binning: bool [False]
+        If True, the generated calling program partitions the states into those
+        below and above the (common) temperature breakpoint of the species' NASA
+        polynomials before execution, and scatters the results back to the
+        original order afterwards.  This ensures that the states evaluated
+        together in a vector / work-group choose the same branch of the
+        polynomial evaluations.
+    arena: bool [False]
+        If True, the generated calling program places the working buffers in a
+        single aligned allocation, in which intermediate arrays that are never live
+        at the same time share space.  Currently only supported for C.
+    cache_tile: int or 'auto' [None]
+        If supplied, limit the number of states each OpenMP thread evaluates per
+        kernel call, such that the thread's working buffers remain resident in
+        cache.  If 'auto', the tile size is chosen from the cache topology of the
+        host, otherwise the supplied number of states per thread is used.
+        Ignored for languages other than C.
+    cache_topology: dict [None]
+        The cache topology used to resolve an 'auto' :param:`cache_tile`, see
+        :func:`pyjac.kernel_utils.memory_manager.load_cache_topology`.  If not
+        supplied, the topology of the host is loaded during code-generation
+    profile: bool [False]
+        If True, instrument the generated code to time the execution of each
+        sub-kernel (C), or of the wrapping kernel via OpenCL profiling events
+        (OpenCL), and write the accumulated timings to a CSV file after execution
+        of the calling program.
+    prefix: str ['']
+        If supplied, prepended to the name of every exported symbol (the kernels,
+        sub-kernels and calling interface) and include guard of the generated
+        code, such that code generated for multiple mechanisms may be linked into
+        the same program.  Must be a valid C identifier (or empty).
     """
     def __init__(self, width=None, depth=None, ilp=False, unr=None,
                  lang='opencl', order='C', rate_spec=RateSpecialization.fixed,
@@ -187,7 +266,10 @@ def __init__(self, width=None, depth=None, ilp=False, unr=None,
                  platform='', knl_type='map', auto_diff=False, use_atomics=True,
                  use_private_memory=False, jac_type=JacobianType.exact,
                  jac_format=JacobianFormat.full, seperate_kernels=True,
-                 device=None, device_type=None):
+                 device=None, device_type=None, double_buffer=False,
+                 kc_polynomials=False, temperature_binning=False, arena=False,
+                 cache_tile=None, cache_topology=None, profile=False,
+                 prefix=''):
         self.width = width
         self.depth = depth
         if not utils.can_vectorize_lang[lang]:
@@ -216,6 +298,19 @@ def __init__(self, width=None, depth=None, ilp=False, unr=None,
         self.jac_format = jac_format
         self.jac_type = jac_type
         self.seperate_kernels = seperate_kernels
+        self.double_buffer = double_buffer
+        self.kc_polynomials = kc_polynomials
+        self.temperature_binning = temperature_binning
+        self.arena = arena
+        if cache_tile is not None and cache_tile != 'auto':
+            cache_tile = int(cache_tile)
+            assert cache_tile >= 0, 'Cache tile size must be non-negative'
+        self.cache_tile = cache_tile
+        self.cache_topology = cache_topology
+        self.profile = profile
+        assert not prefix or re.match(r'^[A-Za-z_]\w*$', prefix), (
+            'Prefix {} is not a valid C identifier'.format(prefix))
+        self.prefix = prefix
         # need to find the first platform that has the device of the correct
         # type
         if self.lang == 'opencl' and self.platform and cl is not None:
@@ -8,18 +8,16 @@
 # Standard libraries
 import os
 import subprocess
+import logging
 from nose.tools import nottest
 import six
-# import io open to ignore any utf-8 characters in file output
-# (e.g., from error'd OpenCL builds)
-from io import open
-from collections import defaultdict
-import logging
 
 # Local imports
 from pyjac.libgen import build_type, generate_library
 from pyjac.tests.test_utils import _run_mechanism_tests, runner
 from pyjac.tests import get_matrix_file, platform_is_gpu
+from pyjac.performance_tester.results_store import ResultsStore, store_filename, \
+    git_revision, mechanism_hash, load_legacy, legacy_rev, load_profile
 
 
 class performance_runner(runner):
@@ -38,9 +36,10 @@ def __init__(self, rtype=build_type.jacobian, repeats=10, steplist=[]):
         -------
         None
         """
-        super(performance_runner, self).__init__(filetype='.txt', rtype=rtype)
+        super(performance_runner, self).__init__(filetype='', rtype=rtype)
         self.repeats = repeats
         self.steplist = steplist
+        self.git_rev = git_revision()
 
     def pre(self, gas, data, num_conditions, max_vec_size):
         """
@@ -49,15 +48,18 @@ def pre(self, gas, data, num_conditions, max_vec_size):
         Parameters
         ----------
         gas: :class:`cantera.Solution`
-            unused
+            The cantera object representing this mechanism, used to identify the
+            mechanism in the results store
         data: dict
-            unused
+            Used only for the mechanism name
         num_conditions: int
             The number of conditions to test
         max_vec_size: int
             unused
         """
         self.num_conditions = num_conditions
+        self.mechanism = data.get('mech_name', '')
+        self.mech_hash = mechanism_hash(gas)
         self.steplist = []
         # initialize steplist
         step = max_vec_size
@@ -70,18 +72,48 @@ def pre(self, gas, data, num_conditions, max_vec_size):
         if maxval not in self.steplist:
             self.steplist.append(maxval)
 
+    def __store(self, filename):
+        """
+        Returns the :class:`ResultsStore` and configuration name for the
+        :param:`filename` returned by :func:`get_filename`
+        """
+        return (ResultsStore(os.path.join(os.path.dirname(filename),
+                                          store_filename)),
+                os.path.basename(filename))
+
+    def __import_legacy(self, store, state, filename, config):
+        """
+        Imports the results of the text file (if any) written by older versions of
+        the performance tester for this configuration into the :param:`store`,
+        under the :data:`legacy_rev`
+        """
+        legacy = filename + '.txt'
+        if not os.path.isfile(legacy) or store.count(
+                mech_hash=self.mech_hash, rtype=self.descriptor, config=config,
+                git_rev=legacy_rev):
+            return
+        runs = load_legacy(legacy)
+        for run in runs:
+            record = self.get_record(state, config, ','.join(str(x) for x in run))
+            record['git_rev'] = legacy_rev
+            store.add(record)
+        logger = logging.getLogger(__name__)
+        logger.info('Imported {} runs from {} as revision {}'.format(
+            len(runs), legacy, legacy_rev))
+
     def check_file(self, filename, state, limits={}):
         """
-        Checks file for existing data and determines the number of runs left
-        for this file / state
+        Checks the results store for existing data and determines the number of
+        runs left for this state at the current pyJac revision
 
         Parameters
         ----------
         filename : str
-            Name of file with data
+            Name of the configuration, in the directory of the results store
         state: dict
             The current state of the :class:`OptionLoop`, used in this context
-            to provide the OpenCL platform (and determine which filetype to use)
+            to provide the OpenCL platform (and determine whether to run a range
+            of problem sizes)
         Returns
         -------
         valid: bool
@@ -94,90 +126,68 @@ def check_file(self, filename, state, limits={}):
             limited_num_conditions
 
         # first, get platform
+        steplist = [num_conditions]
         if platform_is_gpu(state['platform']):
-            self.todo = self.check_step_file(filename, num_conditions)
-        else:
-            num_completed = self.check_full_file(filename, num_conditions)
-            self.todo = {num_conditions: self.repeats - num_completed}
+            steplist = self.steplist
+
+        store, config = self.__store(filename)
+        with store:
+            self.__import_legacy(store, state, filename, config)
+            self.todo = {step: self.repeats - store.count(
+                mech_hash=self.mech_hash, rtype=self.descriptor, config=config,
+                problem_size=step, git_rev=self.git_rev) for step in steplist}
         return not any(self.todo[x] > 0 for x in self.todo)
 
-    def check_step_file(self, filename, _):
-        """checks file for existing data and returns number of runs left to do
-        for each step in :attr:`steplist`
-        Parameters
-        ----------
-        filename : str
-            Name of file with data
-        steplist : list of int
-            List of different numbers of steps
-        Returns
-        -------
-        runs : dict
-            Dictionary with number of runs left for each step
+    def get_record(self, state, config, output, profile=None):
         """
-
-        runs = defaultdict(lambda: self.repeats)
-        for step in self.steplist:
-            runs[step] = self.repeats
-
-        try:
-            with open(filename, 'r', encoding="utf8", errors='ignore') as file:
-                lines = [line.strip() for line in file.readlines()]
-            for line in lines:
-                try:
-                    vals = line.split(',')
-                    if len(vals) == 4:
-                        vals = [float(v) for v in vals]
-                        runs[vals[0]] -= 1
-                except ValueError:
-                    pass
-            return runs
-        except:
-            logger = logging.getLogger(__name__)
-            logger.exception('Error reading performance file {}'.format(filename))
-            return runs
-
-    def check_full_file(self, filename, num_conditions):
-        """Checks a file for existing data, returns number of completed runs
+        Returns the results store record for a single run of the performance
+        tester
 
         Parameters
         ----------
-        filename : str
-            Name of file with data
-        num_conditions: int
-            The number of conditions (possibly limited) to check for.
+        state: dict
+            The state of the current run
+        config: str
+            The configuration name
+        output: str
+            The output of the performance tester, i.e.
+            "problem_size,compilation_time,setup_time,kernel_time"
+        profile: OrderedDict [None]
+            The timing breakdown of the (sub-)kernels for a profiled run, as
+            returned by :func:`load_profile`
 
         Returns
         -------
-        num_completed : int
-            Number of completed runs
-
+        record: dict
+            The record to add to the :class:`ResultsStore`
         """
-        try:
-            with open(filename, 'r', encoding="utf8", errors='ignore') as file:
-                lines = [line.strip() for line in file.readlines()]
-            num_completed = 0
-            to_find = 4
-            for line in lines:
-                try:
-                    vals = line.split(',')
-                    if len(vals) == to_find:
-                        nc = int(vals[0])
-                        if nc != num_conditions:
-                            raise Exception(
-                                'Wrong number of conditions in performance test')
-
-                        float(vals[1])
-                        float(vals[2])
-                        float(vals[3])
-                        num_completed += 1
-                except ValueError:
-                    pass
-            return num_completed
-        except:
-            logger = logging.getLogger(__name__)
-            logger.exception('Error reading performance file {}'.format(filename))
-            return 0
+
+        vals = output.strip().split(',')
+        if len(vals) != 4:
+            raise ValueError('Unexpected performance tester output: {}'.format(
+                output))
+        vectype = 'w' if state['wide'] else 'd' if state['deep'] else 'par'
+        return {'mechanism': self.mechanism,
+                'mech_hash': self.mech_hash,
+                'rtype': self.descriptor,
+                'config': config,
+                'lang': state['lang'],
+                'platform': state['platform'],
+                'vectype': vectype,
+                'vecsize': state['vecsize'] if vectype != 'par' else 1,
+                'data_order': state['order'],
+                'conp': int(bool(state['conp'])),
+                'rate_spec': state['rate_spec'],
+                'split_kernels': int(bool(state['split_kernels'])),
+                'jac_type': state['jac_type'],
+                'jac_format': state['sparse'],
+                'num_cores': int(state['num_cores']),
+                'problem_size': int(vals[0]),
+                'compilation_time': float(vals[1]),
+                'setup_time': float(vals[2]),
+                'kernel_time': float(vals[3]),
+                'profile': profile,
+                'git_rev': self.git_rev}
 
     def run(self, state, asplit, dirs, phi_path, data_output, limits={}):
         """
@@ -196,7 +206,7 @@ def run(self, state, asplit, dirs, phi_path, data_output, limits={}):
         phi_path: str
             Not used
         data_output: str
-            The file to output the results to
+            The configuration name, in the directory of the results store
         limits: dict
             If supplied, a limit on the number of conditions that may be tested
             at once. Important for larger mechanisms that may cause memory overflows
@@ -219,14 +229,27 @@ def run(self, state, asplit, dirs, phi_path, data_output, limits={}):
                                   obj_dir=dirs['obj'], out_dir=dirs['test'],
                                   shared=True, btype=self.rtype, as_executable=True)
 
+        # the timing breakdown written by profiled runs
+        profile_file = '{}_kernel_profile.csv'.format(self.rtype.name)
+
         # and do runs
-        with open(data_output, 'a+') as file:
+        store, config = self.__store(data_output)
+        with store:
             for stepsize in self.todo:
                 for i in range(self.todo[stepsize]):
                     print(i, "/", self.todo[stepsize])
-                    subprocess.check_call([os.path.join(dirs['test'], tester),
-                                           str(stepsize), str(state['num_cores'])],
-                                          stdout=file)
+                    output = subprocess.check_output(
+                        [os.path.join(dirs['test'], tester), str(stepsize),
+                         str(state['num_cores'])])
+                    # ignore any utf-8 characters in output
+                    # (e.g., from error'd OpenCL builds)
+                    output = output.decode('utf-8', 'ignore').strip().splitlines()
+                    profile = None
+                    if state.get('profile', False):
+                        profile = load_profile(profile_file)
+                        os.remove(profile_file)
+                    store.add(self.get_record(state, config, output[-1],
+                                              profile=profile))
 
 
 @nottest
@@ -0,0 +1,513 @@
+"""
+results_store.py - a structured store of pyJac performance testing results, and a
+command line interface to query / compare results between pyJac revisions
+
+Each run of a compiled performance tester is stored as a single record in a SQLite
+database, keyed by the mechanism, code-generation configuration, number of
+conditions and pyJac revision.
+
+Usage
+-----
+python -m pyjac.performance_tester.results_store query performance.db
+python -m pyjac.performance_tester.results_store compare performance.db base new
+python -m pyjac.performance_tester.results_store variant performance.db _tiled
+"""
+
+# Python 2 compatibility
+from __future__ import division
+from __future__ import print_function
+
+import os
+import sys
+import csv
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import platform
+import subprocess
+from argparse import ArgumentParser
+from collections import OrderedDict, defaultdict
+
+import numpy as np
+
+from pyjac._version import __version__
+
+store_filename = 'performance.db'
+"""str: the default name of the results store in each mechanism's directory"""
+
+fields = OrderedDict([
+    ('mechanism', 'TEXT'),
+    ('mech_hash', 'TEXT'),
+    ('rtype', 'TEXT'),
+    ('config', 'TEXT'),
+    ('lang', 'TEXT'),
+    ('platform', 'TEXT'),
+    ('vectype', 'TEXT'),
+    ('vecsize', 'INTEGER'),
+    ('data_order', 'TEXT'),
+    ('conp', 'INTEGER'),
+    ('rate_spec', 'TEXT'),
+    ('split_kernels', 'INTEGER'),
+    ('jac_type', 'TEXT'),
+    ('jac_format', 'TEXT'),
+    ('num_cores', 'INTEGER'),
+    ('problem_size', 'INTEGER'),
+    ('compilation_time', 'REAL'),
+    ('setup_time', 'REAL'),
+    ('kernel_time', 'REAL'),
+    ('profile', 'TEXT'),
+    ('git_rev', 'TEXT'),
+    ('version', 'TEXT'),
+    ('host', 'TEXT'),
+    ('host_info', 'TEXT'),
+    ('timestamp', 'REAL')])
+"""OrderedDict: the fields (and SQLite types) of each record in the store"""
+
+dirty_suffix = '-dirty'
+"""str: suffix of the revisions of results measured with uncommitted changes"""
+
+legacy_rev = 'legacy'
+"""str: the revision of results imported from the text files of older versions"""
+
+identifying_fields = ['mechanism', 'mech_hash', 'rtype', 'config', 'num_cores',
+                      'problem_size']
+"""list of str: the fields that identify equivalent runs between revisions"""
+
+
+def git_revision():
+    """
+    Returns the git revision of the current pyJac source, or the pyJac version if
+    the source is not under version control.  If the working tree has uncommitted
+    changes, the revision is suffixed by :data:`dirty_suffix`
+
+    Returns
+    -------
+    rev: str
+        The revision
+    """
+    try:
+        cwd = os.path.dirname(os.path.abspath(__file__))
+        with open(os.devnull, 'w') as devnull:
+            rev = subprocess.check_output(
+                ['git', 'rev-parse', 'HEAD'], stderr=devnull, cwd=cwd)
+            # uncommitted changes to tracked files
+            status = subprocess.check_output(
+                ['git', 'status', '--porcelain', '--untracked-files=no'],
+                stderr=devnull, cwd=cwd)
+        rev = rev.decode('utf-8').strip()
+        if status.strip():
+            rev += dirty_suffix
+        return rev
+    except (subprocess.CalledProcessError, OSError):
+        return __version__
+
+
+def load_legacy(filename):
+    """
+    Loads the results of a text file written by older versions of the performance
+    tester, with one "problem_size,compilation_time,setup_time,kernel_time" line
+    per run (interleaved with any other output of the tester)
+
+    Parameters
+    ----------
+    filename: str
+        The text file
+
+    Returns
+    -------
+    runs: list of tuple
+        The (problem_size, compilation_time, setup_time, kernel_time) of each run
+    """
+
+    runs = []
+    # ignore any utf-8 characters in file output (e.g., from error'd OpenCL
+    # builds)
+    with open(filename, 'rb') as file:
+        lines = file.read().decode('utf-8', 'ignore').splitlines()
+    for line in lines:
+        vals = line.strip().split(',')
+        if len(vals) != 4:
+            continue
+        try:
+            runs.append((int(float(vals[0])),) + tuple(float(v) for v in vals[1:]))
+        except ValueError:
+            pass
+    return runs
+
+
+def host_info():
+    """
+    Returns a description of the current host
+
+    Returns
+    -------
+    host: str
+        The hostname
+    info: str
+        A JSON description of the host's platform
+    """
+    uname = platform.uname()
+    info = OrderedDict([('system', uname[0]),
+                        ('release', uname[2]),
+                        ('machine', uname[4]),
+                        ('processor', platform.processor()),
+                        ('python', platform.python_version())])
+    return uname[1], json.dumps(info)
+
+
+def load_profile(filename):
+    """
+    Loads the timing breakdown written by a profiled pyJac calling program, i.e.,
+    one generated with :attr:`loopy_options.profile`
+
+    Parameters
+    ----------
+    filename: str
+        The CSV file written by the calling program, with columns "kernel",
+        "thread", "calls" and "time" (in ms)
+
+    Returns
+    -------
+    profile: OrderedDict
+        Mapping of the name of each (sub-)kernel, in order of evaluation, to a
+        dictionary of the total number of "calls", and the total "time" (in ms)
+        summed over all threads, as well as the maximum time of any single thread
+        ("max_time")
+    """
+    profile = OrderedDict()
+    with open(filename, 'r') as file:
+        for row in csv.DictReader(file):
+            entry = profile.setdefault(row['kernel'], OrderedDict(
+                [('calls', 0), ('time', 0.), ('max_time', 0.)]))
+            entry['calls'] += int(row['calls'])
+            entry['time'] += float(row['time'])
+            entry['max_time'] = max(entry['max_time'], float(row['time']))
+    return profile
+
+
+def mechanism_hash(gas):
+    """
+    Returns a hash identifying the species and reactions of a mechanism
+
+    Parameters
+    ----------
+    gas: :class:`cantera.Solution`
+        The mechanism
+
+    Returns
+    -------
+    hash: str
+        The hexadecimal hash
+    """
+    hasher = hashlib.sha256()
+    for name in gas.species_names + gas.reaction_equations():
+        hasher.update(name.encode('utf-8'))
+    return hasher.hexdigest()
+
+
+class ResultsStore(object):
+    """
+    A SQLite database of performance testing results
+
+    Parameters
+    ----------
+    filename: str
+        The database file, created if it does not exist
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.conn = sqlite3.connect(filename)
+        self.conn.execute('CREATE TABLE IF NOT EXISTS runs ({})'.format(
+            ', '.join('{} {}'.format(k, v) for k, v in fields.items())))
+        # add any fields missing from stores created by older versions
+        existing = set(row[1] for row in self.conn.execute(
+            'PRAGMA table_info(runs)'))
+        for key in [k for k in fields if k not in existing]:
+            self.conn.execute('ALTER TABLE runs ADD COLUMN {} {}'.format(
+                key, fields[key]))
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """
+        Closes the connection to the database
+        """
+        self.conn.close()
+
+    def add(self, record):
+        """
+        Adds a single run to the store
+
+        Parameters
+        ----------
+        record: dict
+            The record to add.  Unspecified fields are stored as NULL, with the
+            exception of the :func:`git_revision`, host information and timestamp,
+            which are filled in if not supplied.  A "profile" may be supplied as
+            returned by :func:`load_profile`, and is stored as JSON.
+
+        Returns
+        -------
+        None
+        """
+
+        unknown = set(record.keys()) - set(fields.keys())
+        assert not unknown, 'Unknown record fields: {}'.format(', '.join(unknown))
+        record = record.copy()
+        if 'git_rev' not in record:
+            record['git_rev'] = git_revision()
+        if 'host' not in record:
+            record['host'], record['host_info'] = host_info()
+        record.setdefault('version', __version__)
+        record.setdefault('timestamp', time.time())
+        if isinstance(record.get('profile'), dict):
+            record['profile'] = json.dumps(record['profile'])
+        keys = list(record.keys())
+        self.conn.execute('INSERT INTO runs ({}) VALUES ({})'.format(
+            ', '.join(keys), ', '.join('?' for k in keys)),
+            [record[k] for k in keys])
+        self.conn.commit()
+
+    def __where(self, filters):
+        clauses = []
+        values = []
+        for key, value in filters.items():
+            assert key in fields, 'Unknown field {}'.format(key)
+            if value is None:
+                continue
+            if key == 'git_rev':
+                # allow abbreviated revisions, but keep results of a clean
+                # revision separate from those with uncommitted changes
+                if value.endswith(dirty_suffix):
+                    clauses.append('git_rev LIKE ?')
+                    values.append(value[:-len(dirty_suffix)] + '%' + dirty_suffix)
+                else:
+                    clauses.append('git_rev LIKE ? AND git_rev NOT LIKE ?')
+                    values.extend([value + '%', '%' + dirty_suffix])
+            else:
+                clauses.append('{} = ?'.format(key))
+                values.append(value)
+        where = ' WHERE ' + ' AND '.join(clauses) if clauses else ''
+        return where, values
+
+    def query(self, **filters):
+        """
+        Returns the records matching the given :param:`filters`
+
+        Parameters
+        ----------
+        filters: dict
+            Field / value pairs the records must match.  A `git_rev` filter
+            matches any revision starting with the supplied value
+
+        Returns
+        -------
+        records: list of dict
+            The matching records, with any stored "profile" decoded as in
+            :func:`load_profile`
+        """
+        where, values = self.__where(filters)
+        cursor = self.conn.execute('SELECT {} FROM runs{} ORDER BY timestamp'.format(
+            ', '.join(fields.keys()), where), values)
+        records = [dict(zip(fields.keys(), row)) for row in cursor]
+        for rec in records:
+            if rec['profile']:
+                rec['profile'] = json.loads(rec['profile'],
+                                            object_pairs_hook=OrderedDict)
+        return records
+
+    def count(self, **filters):
+        """
+        Returns the number of records matching the given :param:`filters`, see
+        :func:`query`
+        """
+        where, values = self.__where(filters)
+        return self.conn.execute('SELECT COUNT(*) FROM runs{}'.format(where),
+                                 values).fetchone()[0]
+
+    def summarize(self, **filters):
+        """
+        Groups the records matching :param:`filters` by
+        :data:`identifying_fields` and revision, and returns the number of runs
+        and mean / standard deviation of the kernel time for each
+
+        Returns
+        -------
+        summary: dict
+            Mapping of (identifying fields..., git_rev) to
+            (num_runs, mean kernel time, std. dev. of kernel time)
+        """
+        groups = defaultdict(list)
+        for rec in self.query(**filters):
+            key = tuple(rec[k] for k in identifying_fields) + (rec['git_rev'],)
+            groups[key].append(rec['kernel_time'])
+        return {k: (len(v), np.mean(v), np.std(v)) for k, v in groups.items()}
+
+    def compare(self, base_rev, new_rev, **filters):
+        """
+        Compares the mean kernel times of equivalent runs between two revisions
+
+        Parameters
+        ----------
+        base_rev: str
+            The (possibly abbreviated) base revision
+        new_rev: str
+            The (possibly abbreviated) revision to compare to the base
+        filters: dict
+            Further field / value pairs the records must match
+
+        Returns
+        -------
+        comparison: list of tuple
+            A list of (identifying fields, base mean time, new mean time, speedup)
+            for all configurations run at both revisions, where the speedup is
+            the ratio of the base time to the new time
+        """
+
+        def __means(rev):
+            filters['git_rev'] = rev
+            return {k[:-1]: v[1] for k, v in self.summarize(**filters).items()}
+
+        base = __means(base_rev)
+        new = __means(new_rev)
+        return [(key, base[key], new[key], base[key] / new[key])
+                for key in sorted(set(base) & set(new), key=str)]
+
+    def compare_variant(self, variant, **filters):
+        """
+        Compares the mean kernel times of equivalent runs with and without an
+        optional code-generation feature at the same revision, e.g., the cache
+        tiling of the states per OpenMP thread
+
+        Parameters
+        ----------
+        variant: str
+            The suffix of the configuration name marking runs with the feature
+            enabled, e.g., '_tiled'
+        filters: dict
+            Further field / value pairs the records must match
+
+        Returns
+        -------
+        comparison: list of tuple
+            A list of (identifying fields + revision of the base run, base mean time,
+            variant mean time, speedup) for all configurations run both with and
+            without the feature, where the speedup is the ratio of the base time to
+            the variant time
+        """
+
+        iconfig = identifying_fields.index('config')
+        means = {k: v[1] for k, v in self.summarize(**filters).items()}
+        comparison = []
+        for key in sorted(means, key=str):
+            if variant not in key[iconfig]:
+                continue
+            base = key[:iconfig] + (key[iconfig].replace(variant, '', 1),) + \
+                key[iconfig + 1:]
+            if base in means:
+                comparison.append((base, means[base], means[key],
+                                   means[base] / means[key]))
+        return comparison
+
+
+def main(args=None):
+    parser = ArgumentParser(description='results_store.py: query and compare '
+                                        'pyJac performance testing results')
+    subparsers = parser.add_subparsers(dest='command')
+    query = subparsers.add_parser('query', help='Summarize the stored results')
+    compare = subparsers.add_parser('compare',
+                                    help='Report speedups and regressions between '
+                                         'two revisions')
+    variant = subparsers.add_parser('variant',
+                                    help='Report the speedup of an optional '
+                                         'feature (e.g., cache tiling) over the '
+                                         'base configuration')
+    for sub in [query, compare, variant]:
+        sub.add_argument('store',
+                         type=str,
+                         help='The results store to read.')
+        sub.add_argument('-m', '--mechanism',
+                         type=str,
+                         default=None,
+                         help='Only consider results for this mechanism.')
+    for sub in [query, compare]:
+        sub.add_argument('-c', '--config',
+                         type=str,
+                         default=None,
+                         help='Only consider results for this configuration.')
+    for sub in [query, variant]:
+        sub.add_argument('-g', '--git_rev',
+                         type=str,
+                         default=None,
+                         help='Only consider results for this revision.')
+    variant.add_argument('suffix',
+                         type=str,
+                         nargs='?',
+                         default='_tiled',
+                         help='The suffix of the configurations with the feature '
+                              'enabled, e.g., "_tiled" for cache tiling or '
+                              '"_binned" for temperature binning.')
+    compare.add_argument('base',
+                         type=str,
+                         help='The base revision.')
+    compare.add_argument('new',
+                         type=str,
+                         help='The revision to compare against the base.')
+    compare.add_argument('-t', '--threshold',
+                         type=float,
+                         default=0.05,
+                         help='The relative change in kernel time to flag as a '
+                              'speedup / regression.')
+    args = parser.parse_args(args)
+
+    if not os.path.isfile(args.store):
+        logger = logging.getLogger(__name__)
+        logger.error('Results store {} not found'.format(args.store))
+        return 1
+
+    filters = {'mechanism': args.mechanism}
+    with ResultsStore(args.store) as store:
+        if args.command == 'variant':
+            filters['git_rev'] = args.git_rev
+            for key, base, new, speedup in store.compare_variant(args.suffix,
+                                                                 **filters):
+                print('{} {} cores={} n={} rev={}: {:.6e} -> {:.6e} ms '
+                      '({:.3f}x)'.format(key[0], key[3], key[4], key[5],
+                                         key[6][:10], base, new, speedup))
+            return 0
+
+        filters['config'] = args.config
+        if args.command == 'query':
+            filters['git_rev'] = args.git_rev
+            summary = store.summarize(**filters)
+            for key in sorted(summary, key=str):
+                num, mean, std = summary[key]
+                print('{} {} cores={} n={} rev={}: {:.6e} +/- {:.6e} ms '
+                      '({} runs)'.format(key[0], key[3], key[4], key[5],
+                                         key[6][:10], mean, std, num))
+            return 0
+
+        regressions = 0
+        for key, base, new, speedup in store.compare(args.base, args.new,
+                                                     **filters):
+            status = ''
+            if speedup > 1 + args.threshold:
+                status = 'SPEEDUP'
+            elif speedup < 1 - args.threshold:
+                status = 'REGRESSION'
+                regressions += 1
+            print('{} {} cores={} n={}: {:.6e} -> {:.6e} ms ({:.3f}x) {}'.format(
+                key[0], key[3], key[4], key[5], base, new, speedup, status))
+        return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,8 @@
 from pyjac.pywrap.pywrap_gen import generate_wrapper
 from pyjac.libgen import build_type
+from pyjac.pywrap.sparse_jacobian import SparsePattern, LUPattern, \
+    get_sparse_pattern
+from pyjac.pywrap.mechanism_order import MechanismOrder
 
-__all__ = ['generate_wrapper', 'build_type']
+__all__ = ['generate_wrapper', 'build_type', 'SparsePattern', 'LUPattern',
+           'get_sparse_pattern', 'MechanismOrder']
@@ -33,6 +33,49 @@
                         default='jacobian',
                         help='The type of library to build: {type}'.format(
                             type=str(utils.EnumType(build_type))))
+    parser.add_argument('-sr', '--output_species_rates',
+                        required=False,
+                        default=False,
+                        action='store_true',
+                        help='If supplied, the Jacobian kernel was generated to '
+                             'also output the species rates.')
+    parser.add_argument('-jv', '--jac_vec',
+                        required=False,
+                        default=False,
+                        action='store_true',
+                        help='If supplied, the Jacobian kernel was generated to '
+                             'output the Jacobian-vector product.')
+    parser.add_argument('-lu', '--jac_lu',
+                        required=False,
+                        default=False,
+                        action='store_true',
+                        help='If supplied, the Jacobian kernel was generated to '
+                             'output the sparse LU-factorization of the iteration '
+                             'matrix, and the solution of the linear system.')
+    parser.add_argument('-cd', '--cache_dir',
+                        required=False,
+                        type=str,
+                        default=None,
+                        help='The directory of the persistent compiled object '
+                             'cache.  If not specified, the value of the '
+                             'PYJAC_OBJECT_CACHE_DIR environment variable, or '
+                             '~/.cache/pyjac/objects will be used.')
+    parser.add_argument('-nc', '--no_cache',
+                        required=False,
+                        default=False,
+                        action='store_true',
+                        help='If supplied, bypass the compiled object cache and '
+                             'always compile from scratch.')
+    parser.add_argument('-pre', '--prefix',
+                        required=False,
+                        type=str,
+                        default='',
+                        help='The prefix of the exported symbols of the pyJac '
+                             'kernel, if it was generated with one.')
 
     args = parser.parse_args()
-    generate_wrapper(args.lang, args.source_dir, args.out_dir, btype=args.build_type)
+    generate_wrapper(args.lang, args.source_dir, args.out_dir, btype=args.build_type,
+                     output_species_rates=args.output_species_rates,
+                     jac_vec=args.jac_vec, jac_lu=args.jac_lu,
+                     cache_dir=args.cache_dir, use_cache=not args.no_cache,
+                     prefix=args.prefix)
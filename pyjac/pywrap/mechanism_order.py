@@ -0,0 +1,285 @@
+"""
+mechanism_order.py - utilities for converting between the original species /
+reaction order of a mechanism, and the (reordered) order used by a pyJac kernel
+generated with a :class:`pyjac.core.mech_interpret.SortType`
+
+In the original order, the state vector consists of the temperature, the extra
+variable (pressure or volume) and the moles of each species in the mechanism --
+excluding the last species (bath-gas) -- in the order they appear in the
+mechanism file.
+
+The driver of a kernel generated for a reordered mechanism converts its inputs and
+outputs to / from the original order (see :meth:`MechanismOrder.entry_maps`),
+hence the conversions here are only needed for the sparse LU-factorization (which
+is output in the order of the kernel), or to call the wrapping kernel directly.
+"""
+
+from __future__ import division
+
+import numpy as np
+
+order_filename = 'mechanism_order.npz'
+"""str: the name of the mechanism order file written alongside a reordered
+kernel"""
+
+
+class MechanismOrder(object):
+    """
+    The permutation between the original mechanism and the generated kernel
+
+    Attributes
+    ----------
+    spec_map: :class:`numpy.ndarray`
+        The original index of each species in the kernel
+    reac_map: :class:`numpy.ndarray`
+        The original index of each reaction in the kernel
+    """
+
+    def __init__(self, spec_map, reac_map):
+        self.spec_map = np.asarray(spec_map, dtype=np.int32)
+        self.reac_map = np.asarray(reac_map, dtype=np.int32)
+
+    @property
+    def state_map(self):
+        """
+        The index in the original state vector of each entry of the kernel's
+        state vector, i.e., `phi_kernel = phi_original[:, state_map]`
+        """
+        # the last (bath-gas) species is not in the state vector
+        spec_map = self.spec_map[:-1]
+        rank = np.empty_like(spec_map)
+        rank[np.argsort(spec_map, kind='mergesort')] = np.arange(
+            spec_map.size, dtype=np.int32)
+        return np.concatenate(([0, 1], rank + 2)).astype(np.int32)
+
+    def to_kernel(self, phi):
+        """
+        Converts state vectors (or their time derivatives) from the original
+        mechanism order to the order of the kernel
+
+        Parameters
+        ----------
+        phi: :class:`numpy.ndarray`
+            The state vectors in original order, of shape (n_states, NN)
+
+        Returns
+        -------
+        phi: :class:`numpy.ndarray`
+            The state vectors in the kernel's order
+        """
+        return np.asarray(phi)[:, self.state_map]
+
+    def from_kernel(self, dphi):
+        """
+        Converts state vectors (or their time derivatives, e.g., `dphi`) from the
+        order of the kernel to the original mechanism order
+
+        Parameters
+        ----------
+        dphi: :class:`numpy.ndarray`
+            The state vectors in the kernel's order, of shape (n_states, NN)
+
+        Returns
+        -------
+        dphi: :class:`numpy.ndarray`
+            The state vectors in the original order
+        """
+        dphi = np.asarray(dphi)
+        out = np.empty_like(dphi)
+        out[:, self.state_map] = dphi
+        return out
+
+    def jacobian_from_kernel(self, jac):
+        """
+        Converts (full) Jacobians from the order of the kernel to the original
+        mechanism order
+
+        Parameters
+        ----------
+        jac: :class:`numpy.ndarray`
+            The Jacobians in the kernel's order, of shape (n_states, NN, NN)
+
+        Returns
+        -------
+        jac: :class:`numpy.ndarray`
+            The Jacobians in the original order
+        """
+        jac = np.asarray(jac)
+        out = np.empty_like(jac)
+        state_map = self.state_map
+        out[:, state_map[:, np.newaxis], state_map[np.newaxis, :]] = jac
+        return out
+
+    def reactions_from_kernel(self, rates):
+        """
+        Converts per-reaction quantities (e.g., rates of progress) from the order of
+        the kernel to the original mechanism order
+
+        Parameters
+        ----------
+        rates: :class:`numpy.ndarray`
+            The per-reaction quantities in the kernel's order, of shape
+            (n_states, NR)
+
+        Returns
+        -------
+        rates: :class:`numpy.ndarray`
+            The per-reaction quantities in the original order
+        """
+        rates = np.asarray(rates)
+        out = np.empty_like(rates)
+        out[:, self.reac_map] = rates
+        return out
+
+    def subset_map(self, subset):
+        """
+        The index in the original order of each entry of a per-reaction quantity
+        defined only for a subset of the reactions (e.g., the reverse rates of
+        progress of the reversible reactions), in the order of the kernel
+
+        Parameters
+        ----------
+        subset: :class:`numpy.ndarray`
+            The (sorted) indicies of the reactions in the subset, in the kernel
+
+        Returns
+        -------
+        subset_map: :class:`numpy.ndarray`
+            The index in the original order of each entry in the kernel's order
+        """
+        original = self.reac_map[np.asarray(subset, dtype=np.int32)]
+        rank = np.empty_like(original)
+        rank[np.argsort(original, kind='mergesort')] = np.arange(
+            original.size, dtype=np.int32)
+        return rank
+
+    def jacobian_map(self, order):
+        """
+        The index in the original order of each entry of the (dense) Jacobian of a
+        single state, in the order of the kernel
+
+        Parameters
+        ----------
+        order: ['C', 'F']
+            The data-order of the kernel
+
+        Returns
+        -------
+        jacobian_map: :class:`numpy.ndarray`
+            The index in the original (flattened) Jacobian of each entry of the
+            kernel's (flattened) Jacobian
+        """
+        state_map = self.state_map
+        size = state_map.size
+        index = np.arange(size * size, dtype=np.int32).reshape(
+            (size, size), order=order)
+        jac_map = np.empty(size * size, dtype=np.int32)
+        jac_map[index] = index[np.ix_(state_map, state_map)]
+        return jac_map
+
+    def pattern_from_kernel(self, pattern):
+        """
+        Converts the sparsity pattern of a sparse Jacobian kernel to the original
+        mechanism order
+
+        Parameters
+        ----------
+        pattern: :class:`pyjac.pywrap.SparsePattern`
+            The sparsity pattern, in the kernel's order
+
+        Returns
+        -------
+        pattern: :class:`pyjac.pywrap.SparsePattern`
+            The sparsity pattern in the original order
+        nnz_map: :class:`numpy.ndarray`
+            The index in the original order of each non-zero entry in the
+            kernel's order
+        """
+        from pyjac.pywrap.sparse_jacobian import SparsePattern
+        state_map = self.state_map
+        # the row (C-ordered) or column (F-ordered) of each non-zero
+        outer = np.repeat(np.arange(pattern.indptr.size - 1, dtype=np.int32),
+                          np.diff(pattern.indptr))
+        outer = state_map[outer]
+        inner = state_map[pattern.indices]
+        # sort the non-zeros in the original order
+        perm = np.lexsort((inner, outer))
+        nnz_map = np.empty(perm.size, dtype=np.int32)
+        nnz_map[perm] = np.arange(perm.size, dtype=np.int32)
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(
+            outer, minlength=state_map.size)))).astype(np.int32)
+        return SparsePattern(indptr, inner[perm], pattern.order), nnz_map
+
+    def entry_maps(self, order, rev_map=[], thd_map=[], pattern=None):
+        """
+        Returns the index in the original order of each entry (per state) of the
+        arrays passed to the kernel, in the order of the kernel, such that the
+        kernel's driver may convert to / from the original order, see
+        :meth:`pyjac.kernel_utils.memory_manager.get_mechanism_reordering`
+
+        Notes
+        -----
+        The sparse LU-factorization `jac_lu` is not converted, as the factorization
+        is only defined in the order of the kernel
+
+        Parameters
+        ----------
+        order: ['C', 'F']
+            The data-order of the kernel
+        rev_map: :class:`numpy.ndarray` [[]]
+            The indicies of the reversible reactions in the kernel
+        thd_map: :class:`numpy.ndarray` [[]]
+            The indicies of the third-body / pressure-dependent reactions in the
+            kernel
+        pattern: :class:`pyjac.pywrap.SparsePattern` [None]
+            If supplied, the sparsity pattern of the (sparse) Jacobian in the order
+            of the kernel.  Otherwise, the Jacobian is assumed to be dense
+
+        Returns
+        -------
+        maps: dict of str: :class:`numpy.ndarray`
+            The map for each (potential) kernel array
+        """
+        state_arrays = ['phi', 'dphi', 'vec', 'jvp', 'rhs', 'sol']
+        maps = {x: self.state_map for x in state_arrays}
+        maps['jac'] = self.jacobian_map(order) if pattern is None else \
+            self.pattern_from_kernel(pattern)[1]
+        maps['rop_fwd'] = self.reac_map
+        maps['rop_net'] = self.reac_map
+        maps['rop_rev'] = self.subset_map(rev_map)
+        maps['pres_mod'] = self.subset_map(thd_map)
+        return maps
+
+    def save(self, filename):
+        """
+        Saves this mechanism order to :param:`filename`
+
+        Parameters
+        ----------
+        filename: str
+            The file to save to
+
+        Returns
+        -------
+        None
+        """
+        np.savez(filename, spec_map=self.spec_map, reac_map=self.reac_map)
+
+    @staticmethod
+    def load(filename):
+        """
+        Loads a :class:`MechanismOrder` saved via :func:`save` (e.g., the
+        :data:`order_filename` written alongside a reordered kernel)
+
+        Parameters
+        ----------
+        filename: str
+            The file to load
+
+        Returns
+        -------
+        order: :class:`MechanismOrder`
+            The loaded mechanism order
+        """
+        with np.load(filename) as data:
+            return MechanismOrder(data['spec_map'], data['reac_map'])
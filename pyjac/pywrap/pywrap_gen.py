@@ -3,16 +3,18 @@
 import sys
 import os
 import subprocess
+import sysconfig
 from string import Template
 import logging
 
 from pyjac.libgen import generate_library, build_type
+from pyjac.libgen import object_cache
 from pyjac import siteconf as site
 
 
 def generate_setup(setupfile, pyxfile, home_dir, build_dir, out_dir, libname,
                    extra_include_dirs=[], libraries=[], libdirs=[],
-                   btype=build_type.jacobian):
+                   btype=build_type.jacobian, prefix=''):
     """Helper method to fill in the template .in files
 
     Parameters
@@ -35,6 +37,11 @@ def generate_setup(setupfile, pyxfile, home_dir, build_dir, out_dir, libname,
         Optional; if supplied extra libraries to use
     libdirs : Optional[list of str]
         Optional; if supplied, library directories
+    btype : :class:`build_type` [build_type.jacobian]
+        The type of library to wrap
+    prefix : Optional[str]
+        Optional; if supplied, the prefix of the symbols of the wrapped library,
+        see :attr:`pyjac.loopy_utils.loopy_utils.loopy_options.prefix`
 
     Returns
     -------
@@ -70,7 +77,8 @@ def __arr_create(arr):
 
     nice_name = str(btype)
     nice_name = nice_name[nice_name.index('.') + 1:]
-    file_data = {'knl': nice_name}
+    file_data = {'knl': nice_name,
+                 'prefix': prefix}
 
     src = src.safe_substitute(file_data)
     with open(nice_pyx_name, 'w') as file:
@@ -104,7 +112,9 @@ def distutils_dir_name(dname):
 
 def generate_wrapper(lang, source_dir, build_dir=None, out_dir=None,
                      obj_dir=None, platform='', output_full_rop=False,
-                     btype=build_type.jacobian):
+                     btype=build_type.jacobian, output_species_rates=False,
+                     jac_vec=False, jac_lu=False, cache_dir=None, use_cache=True,
+                     prefix=''):
     """Generates a Python wrapper for the given language and source files
 
     Parameters
@@ -126,6 +136,32 @@ def generate_wrapper(lang, source_dir, build_dir=None, out_dir=None,
         -- Useful in testing, as there are serious floating point errors for
         net production rates near equilibrium, invalidating direct comparison to
         Cantera
+    btype : :class:`build_type` [build_type.jacobian]
+        The type of library to wrap
+    output_species_rates : bool [False]
+        If ``True``, the Jacobian kernel was generated to also output the species
+        rates -- see :func:`pyjac.core.create_jacobian.get_jacobian_kernel`
+    jac_vec : bool [False]
+        If ``True``, the Jacobian kernel was generated to output the product of
+        the Jacobian with a supplied vector -- see
+        :func:`pyjac.core.create_jacobian.get_jacobian_kernel`
+    jac_lu : bool [False]
+        If ``True``, the Jacobian kernel was generated to output the sparse
+        LU-factorization of the iteration matrix, and the solution of the
+        corresponding linear system -- see
+        :func:`pyjac.core.create_jacobian.get_jacobian_kernel`
+    cache_dir : Optional[str]
+        The directory of the persistent compiled object cache, see
+        :func:`pyjac.libgen.generate_library`
+    use_cache : bool [True]
+        If ``False``, bypass the object cache and always rebuild the library and
+        wrapper from scratch.  Otherwise, the wrapper is only rebuilt if the
+        library or wrapper sources changed
+    prefix : Optional[str]
+        The prefix of the exported symbols of the wrapped kernel, if it was
+        generated with one -- see
+        :attr:`pyjac.loopy_utils.loopy_utils.loopy_options.prefix`
+
     Returns
     -------
     None
@@ -146,7 +182,8 @@ def generate_wrapper(lang, source_dir, build_dir=None, out_dir=None,
     if lang != 'tchem':
         # first generate the library
         lib = generate_library(lang, source_dir, out_dir=build_dir, obj_dir=obj_dir,
-                               shared=shared, btype=btype)
+                               shared=shared, btype=btype, cache_dir=cache_dir,
+                               use_cache=use_cache)
         lib = os.path.abspath(lib)
         if shared:
             lib = lib[lib.index('lib') + len('lib'):lib.index(ext)]
@@ -162,9 +199,11 @@ def generate_wrapper(lang, source_dir, build_dir=None, out_dir=None,
     if lang == 'c':
         setupfile = 'pyjacob_setup.py.in'
         pyxfile = 'pyjacob_wrapper.pyx.in'
+        module = 'pyjac_c'
     elif lang == 'opencl':
         setupfile = 'pyocl_setup.py.in'
         pyxfile = 'pyocl_wrapper.pyx.in'
+        module = 'pyjac_ocl'
     else:
         logger = logging.getLogger(__name__)
         logger.error('Language {} not recognized'.format(lang))
@@ -174,11 +213,32 @@ def generate_wrapper(lang, source_dir, build_dir=None, out_dir=None,
         # modify the wrapper
         pyxfile = pyxfile[:pyxfile.rindex('_wrapper')] + '_ropfull' + pyxfile[
             pyxfile.rindex('_wrapper'):]
+    elif output_species_rates:
+        assert btype == build_type.jacobian, (
+            'Species rates output is only available for Jacobian kernels')
+        assert not jac_vec, (
+            'Species rates output is not available for Jacobian-vector product '
+            'kernels')
+        assert not jac_lu, (
+            'Species rates output is not available for sparse LU-factorization '
+            'kernels')
+        pyxfile = pyxfile[:pyxfile.rindex('_wrapper')] + '_fused' + pyxfile[
+            pyxfile.rindex('_wrapper'):]
+    elif jac_vec:
+        assert btype == build_type.jacobian, (
+            'The Jacobian-vector product is only available for Jacobian kernels')
+        pyxfile = pyxfile[:pyxfile.rindex('_wrapper')] + '_jvp' + pyxfile[
+            pyxfile.rindex('_wrapper'):]
+    elif jac_lu:
+        assert btype == build_type.jacobian, (
+            'The sparse LU-factorization is only available for Jacobian kernels')
+        pyxfile = pyxfile[:pyxfile.rindex('_wrapper')] + '_lu' + pyxfile[
+            pyxfile.rindex('_wrapper'):]
 
     generate_setup(os.path.join(home_dir, setupfile),
                    os.path.join(home_dir, pyxfile), home_dir, source_dir,
                    build_dir, lib, extra_include_dirs, libraries, libdirs,
-                   btype=btype)
+                   btype=btype, prefix=prefix)
 
     python_str = 'python{}.{}'.format(sys.version_info[0], sys.version_info[1])
 
@@ -195,7 +255,23 @@ def generate_wrapper(lang, source_dir, build_dir=None, out_dir=None,
         if rpath:
             call += ['--rpath', rpath]
 
+        # skip the rebuild if neither the library nor the wrapper changed
+        target = os.path.join(out_dir, module + (
+            sysconfig.get_config_var('EXT_SUFFIX') or
+            sysconfig.get_config_var('SO')))
+        build_key = None
+        if use_cache:
+            build_key = object_cache.get_link_key(call, [
+                object_cache.file_digest(f) for f in [
+                    setupfile[:setupfile.index('.in')],
+                    pyxfile[:pyxfile.rindex('.in')], lib]])
+            if object_cache.is_current(target, build_key):
+                logger = logging.getLogger(__name__)
+                logger.info('Python wrapper {} is up to date'.format(target))
+                return
+
         subprocess.check_call(call)
+        object_cache.mark_current(target, build_key)
     finally:
         # and return to base dir
         os.chdir(cwd)
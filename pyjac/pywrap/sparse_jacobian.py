@@ -0,0 +1,430 @@
+"""
+sparse_jacobian.py - utilities for using the output of a sparse pyJac Jacobian
+kernel (i.e., generated with `jac_format='sparse'`) in downstream sparse linear
+algebra
+
+The sparse Jacobian kernel outputs only the non-zero values of the Jacobian of each
+state, in either a compressed row (C-ordered kernels) or compressed column
+(F-ordered kernels) storage format.  As the sparsity pattern is fixed for a given
+mechanism, the :class:`SparsePattern` may be constructed once and reused for all
+states, e.g., to reuse symbolic factorizations in implicit integrators.
+
+Similarly, a kernel generated with `jac_lu=True` outputs the (fixed-pattern) sparse
+LU-factorization of the iteration matrix of each state, which may be reused to
+solve for additional right hand sides via the :class:`LUPattern`.
+"""
+
+from __future__ import division
+
+import logging
+
+import numpy as np
+
+pattern_filename = 'jacobian_pattern.npz'
+"""str: the name of the sparsity pattern file written alongside a generated sparse
+Jacobian kernel"""
+
+lu_pattern_filename = 'lu_pattern.npz'
+"""str: the name of the factorization pattern file written alongside a generated
+sparse LU-factorization kernel"""
+
+
+class SparsePattern(object):
+    """
+    The (fixed) sparsity pattern of the sparse Jacobian of a mechanism
+
+    Attributes
+    ----------
+    indptr: :class:`numpy.ndarray`
+        The row (for a C-ordered kernel) or column (F-ordered) pointers
+    indices: :class:`numpy.ndarray`
+        The column (C-ordered) or row (F-ordered) indicies of the non-zero entries
+    order: ['C', 'F']
+        The data-order of the kernel, determining whether the pattern is in
+        compressed row storage ('C') or compressed column storage ('F') format
+    """
+
+    def __init__(self, indptr, indices, order='C'):
+        assert order in ['C', 'F'], 'Order {} unrecognized'.format(order)
+        self.indptr = np.asarray(indptr, dtype=np.int32)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.order = order
+        assert self.indptr[-1] == self.indices.size, (
+            'Sparse pointers do not match the number of non-zero indicies')
+        self._block_cache = (None, None, None)
+
+    @property
+    def format(self):
+        """
+        The :mod:`scipy.sparse` format corresponding to this pattern, 'csr' or 'csc'
+        """
+        return 'csr' if self.order == 'C' else 'csc'
+
+    @property
+    def nnz(self):
+        """
+        The number of non-zero entries in the Jacobian of a single state
+        """
+        return self.indices.size
+
+    @property
+    def shape(self):
+        """
+        The shape of the Jacobian of a single state
+        """
+        size = self.indptr.size - 1
+        return (size, size)
+
+    def values(self, n_states):
+        """
+        Returns a (zeroed) array suitable for use as the output of the sparse
+        Jacobian kernel for :param:`n_states` states
+
+        Parameters
+        ----------
+        n_states: int
+            The number of states
+
+        Returns
+        -------
+        values: :class:`numpy.ndarray`
+            An array of shape (n_states, :attr:`nnz`) in the data-order of the
+            kernel
+        """
+        return np.zeros((n_states, self.nnz), order=self.order)
+
+    def block_pattern(self, n_states):
+        """
+        Returns the pattern of the block-diagonal matrix formed by the Jacobians of
+        :param:`n_states` states.  The pattern of the most recent number of states
+        is cached, such that it may be reused without reconstruction.
+
+        Parameters
+        ----------
+        n_states: int
+            The number of states
+
+        Returns
+        -------
+        indptr: :class:`numpy.ndarray`
+            The row (or column) pointers of the block-diagonal matrix
+        indices: :class:`numpy.ndarray`
+            The column (or row) indicies of the block-diagonal matrix
+        """
+
+        cached, indptr, indices = self._block_cache
+        if cached == n_states:
+            return indptr, indices
+
+        size = self.shape[0]
+        dtype = np.int64 if n_states * max(self.nnz, size) > np.iinfo(
+            np.int32).max else np.int32
+        states = np.arange(n_states, dtype=dtype)[:, np.newaxis]
+        indptr = np.concatenate(((self.indptr[:-1] + states * self.nnz).flatten(),
+                                 [n_states * self.nnz])).astype(dtype)
+        indices = (self.indices + states * size).flatten().astype(dtype)
+        self._block_cache = (n_states, indptr, indices)
+        return indptr, indices
+
+    def to_scipy(self, values, block_diagonal=True):
+        """
+        Converts the output of the sparse Jacobian kernel to :mod:`scipy.sparse`
+        matrices
+
+        Parameters
+        ----------
+        values: :class:`numpy.ndarray`
+            The Jacobian values, of shape (n_states, :attr:`nnz`), or (:attr:`nnz`,)
+            for a single state
+        block_diagonal: bool [True]
+            If True, return a single block-diagonal matrix formed by the Jacobians
+            of all the states, else return a list of matrices for each state
+
+        Returns
+        -------
+        matrix: :class:`scipy.sparse.csr_matrix` or :class:`scipy.sparse.csc_matrix`
+            The block-diagonal Jacobian matrix, or a list of the Jacobian matrices
+            of each state if not :param:`block_diagonal`
+        """
+
+        try:
+            from scipy import sparse
+        except ImportError:
+            logger = logging.getLogger(__name__)
+            logger.error('scipy is required to convert sparse Jacobians to '
+                         'scipy.sparse matrices.')
+            raise
+
+        matrix = sparse.csr_matrix if self.order == 'C' else sparse.csc_matrix
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim == 1:
+            values = values[np.newaxis, :]
+        assert values.ndim == 2 and values.shape[1] == self.nnz, (
+            'Values of shape {} do not match the number of non-zero Jacobian '
+            'entries ({})'.format(values.shape, self.nnz))
+
+        n_states = values.shape[0]
+        if not block_diagonal:
+            return [matrix((values[i], self.indices, self.indptr),
+                           shape=self.shape) for i in range(n_states)]
+
+        indptr, indices = self.block_pattern(n_states)
+        size = self.shape[0] * n_states
+        # note: the values of each state must be contiguous
+        return matrix((np.ascontiguousarray(values).reshape(-1), indices, indptr),
+                      shape=(size, size))
+
+    def save(self, filename):
+        """
+        Saves this pattern to :param:`filename`
+
+        Parameters
+        ----------
+        filename: str
+            The file to save to
+
+        Returns
+        -------
+        None
+        """
+        np.savez(filename, indptr=self.indptr, indices=self.indices,
+                 order=np.array(self.order))
+
+    @staticmethod
+    def load(filename):
+        """
+        Loads a :class:`SparsePattern` saved via :func:`save` (e.g., the
+        :data:`pattern_filename` written alongside a sparse Jacobian kernel)
+
+        Parameters
+        ----------
+        filename: str
+            The file to load
+
+        Returns
+        -------
+        pattern: :class:`SparsePattern`
+            The loaded pattern
+        """
+        with np.load(filename) as data:
+            return SparsePattern(data['indptr'], data['indices'],
+                                 str(data['order']))
+
+
+class LUPattern(object):
+    """
+    The (fixed) pattern of the sparse LU-factorization of the iteration matrix,
+    :math:`\\mathcal{I} - \\gamma \\mathcal{J}`, output by a kernel generated with
+    `jac_lu=True`.  Both factors are stored in a single compressed row storage
+    matrix, with the unit diagonal of the lower factor omitted.
+
+    Attributes
+    ----------
+    perm: :class:`numpy.ndarray`
+        The symmetric permutation of the iteration matrix, i.e., row `i` of the
+        factored matrix is row `perm[i]` of the iteration matrix
+    indptr: :class:`numpy.ndarray`
+        The row pointers of the factored matrix
+    indices: :class:`numpy.ndarray`
+        The (permuted) column indicies of the factored matrix
+    diag: :class:`numpy.ndarray`
+        The position of the diagonal entry of each row of the factored matrix
+    """
+
+    def __init__(self, perm, indptr, indices, diag):
+        self.perm = np.asarray(perm, dtype=np.int32)
+        self.indptr = np.asarray(indptr, dtype=np.int32)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.diag = np.asarray(diag, dtype=np.int32)
+        assert self.indptr[-1] == self.indices.size, (
+            'Sparse pointers do not match the number of non-zero indicies')
+        assert self.perm.size == self.diag.size == self.indptr.size - 1, (
+            'Permutation and diagonal do not match the factorization size')
+
+    @property
+    def nnz(self):
+        """
+        The number of non-zero entries in the factorization of a single state
+        """
+        return self.indices.size
+
+    @property
+    def shape(self):
+        """
+        The shape of the iteration matrix of a single state
+        """
+        return (self.perm.size, self.perm.size)
+
+    def solve(self, values, rhs):
+        """
+        Solves the linear system(s) with the factored iteration matrices output by
+        the kernel, e.g., to reuse the factorization in subsequent Newton iterations
+
+        Parameters
+        ----------
+        values: :class:`numpy.ndarray`
+            The factored matrices, of shape (n_states, :attr:`nnz`), or
+            (:attr:`nnz`,) for a single state
+        rhs: :class:`numpy.ndarray`
+            The right hand sides, of shape (n_states, size), or (size,) for a
+            single state
+
+        Returns
+        -------
+        sol: :class:`numpy.ndarray`
+            The solution(s), of the same shape as :param:`rhs`
+        """
+
+        values = np.asarray(values, dtype=np.float64)
+        rhs = np.asarray(rhs, dtype=np.float64)
+        single = rhs.ndim == 1
+        values = np.atleast_2d(values)
+        rhs = np.atleast_2d(rhs)
+        assert values.shape[1] == self.nnz, (
+            'Values of shape {} do not match the number of non-zero factorization '
+            'entries ({})'.format(values.shape, self.nnz))
+
+        # solve in the permuted order, vectorized over the states
+        sol = rhs[:, self.perm].copy()
+        for i in range(self.perm.size):
+            start = self.indptr[i]
+            sol[:, i] -= np.sum(values[:, start:self.diag[i]] * sol[
+                :, self.indices[start:self.diag[i]]], axis=1)
+        for i in reversed(range(self.perm.size)):
+            end = self.indptr[i + 1]
+            sol[:, i] -= np.sum(values[:, self.diag[i] + 1:end] * sol[
+                :, self.indices[self.diag[i] + 1:end]], axis=1)
+            sol[:, i] /= values[:, self.diag[i]]
+
+        out = np.empty_like(sol)
+        out[:, self.perm] = sol
+        return out[0] if single else out
+
+    def save(self, filename):
+        """
+        Saves this pattern to :param:`filename`
+
+        Parameters
+        ----------
+        filename: str
+            The file to save to
+
+        Returns
+        -------
+        None
+        """
+        np.savez(filename, perm=self.perm, indptr=self.indptr, indices=self.indices,
+                 diag=self.diag)
+
+    @staticmethod
+    def load(filename):
+        """
+        Loads a :class:`LUPattern` saved via :func:`save` (e.g., the
+        :data:`lu_pattern_filename` written alongside a sparse LU-factorization
+        kernel)
+
+        Parameters
+        ----------
+        filename: str
+            The file to load
+
+        Returns
+        -------
+        pattern: :class:`LUPattern`
+            The loaded pattern
+        """
+        with np.load(filename) as data:
+            return LUPattern(data['perm'], data['indptr'], data['indices'],
+                             data['diag'])
+
+    @staticmethod
+    def from_lu_info(lu_info):
+        """
+        Returns the :class:`LUPattern` corresponding to the symbolic factorization
+        found via :func:`pyjac.core.create_jacobian.determine_lu_structure`
+
+        Parameters
+        ----------
+        lu_info: dict
+            The result of :func:`determine_lu_structure`
+
+        Returns
+        -------
+        pattern: :class:`LUPattern`
+            The factorization pattern
+        """
+        return LUPattern(lu_info['perm'], lu_info['row_ptr'], lu_info['col_ind'],
+                         lu_info['diag'])
+
+
+def pattern_from_jac_inds(jac_inds, order='C'):
+    """
+    Returns the :class:`SparsePattern` corresponding to the Jacobian indicies
+    found via :func:`pyjac.core.create_jacobian.determine_jac_inds`
+
+    Parameters
+    ----------
+    jac_inds: dict
+        The 'jac_inds' entry of the result of :func:`determine_jac_inds`
+    order: ['C', 'F']
+        The data-order of the kernel
+
+    Returns
+    -------
+    pattern: :class:`SparsePattern`
+        The sparsity pattern
+    """
+    if order == 'C':
+        return SparsePattern(jac_inds['crs']['row_ptr'], jac_inds['crs']['col_ind'],
+                             order)
+    return SparsePattern(jac_inds['ccs']['col_ptr'], jac_inds['ccs']['row_ind'],
+                         order)
+
+
+def get_sparse_pattern(mech_name=None, therm_name=None, gas=None, last_spec=None,
+                       order='C', jac_type='exact'):
+    """
+    Returns the sparsity pattern of the sparse Jacobian kernel that would be
+    generated for the given mechanism.  The kernels generated for a reordered
+    mechanism output the Jacobian in the original order, hence the pattern is
+    independent of the `sort_type` supplied to
+    :func:`pyjac.core.create_jacobian.create_jacobian`
+
+    Parameters
+    ----------
+    mech_name : str, optional
+        Reaction mechanism filename (e.g. 'mech.dat')
+    therm_name : str, optional
+        Thermodynamic database filename (e.g. 'therm.dat')
+    gas : cantera.Solution, optional
+        The Cantera object representing the mechanism
+    last_spec : str, optional
+        The name of the last species, as supplied to
+        :func:`pyjac.core.create_jacobian.create_jacobian`
+    order : ['C', 'F']
+        The data-order of the kernel
+    jac_type : ['exact', 'approximate']
+        The type of Jacobian
+
+    Returns
+    -------
+    pattern: :class:`SparsePattern`
+        The sparsity pattern
+    """
+
+    from pyjac import utils
+    from pyjac.core import mech_interpret as mech
+    from pyjac.core.create_jacobian import determine_jac_inds, find_last_species
+    from pyjac.loopy_utils import JacobianType, RateSpecialization
+
+    assert mech_name is not None or gas is not None, 'No mechanism specified!'
+    if gas is not None or mech_name.endswith(tuple(['.cti', '.xml'])):
+        _, specs, reacs = mech.read_mech_ct(mech_name, gas)
+    else:
+        _, specs, reacs = mech.read_mech(mech_name, therm_name)
+    specs = find_last_species(specs, last_spec=last_spec)
+
+    jac_type = utils.EnumType(JacobianType)(jac_type.lower())
+    jac_inds = determine_jac_inds(reacs, specs, RateSpecialization.fixed,
+                                  jacobian_type=jac_type)['jac_inds']
+    return pattern_from_jac_inds(jac_inds, order)
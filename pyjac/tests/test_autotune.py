@@ -0,0 +1,141 @@
+# Python 2 compatibility
+from __future__ import print_function
+from __future__ import division
+
+import os
+import csv
+import shutil
+import tempfile
+
+from nose.tools import assert_raises
+
+from pyjac.autotune.autotune import autotuner, config_name, default_options, \
+    get_search_stages
+from pyjac.loopy_utils.loopy_utils import load_kernel_options
+from pyjac.core.create_jacobian import create_jacobian
+
+
+class fake_tuner(autotuner):
+    """
+    An :class:`autotuner` with synthetic timings, in place of building and running
+    the generated code
+    """
+
+    def __init__(self, lang, timings, *args, **kwargs):
+        super(fake_tuner, self).__init__(lang, 'data.bin', *args, **kwargs)
+        self.timings = timings
+        self.runs = []
+
+    def get_num_states(self):
+        return 1024
+
+    def build(self, options):
+        if options['vectype'] == 'deep' and options['vecsize'] == 8:
+            raise Exception('Unsupported vectorization')
+        return options
+
+    def run(self, options):
+        self.runs.append(config_name(options))
+        return self.timings(options)
+
+
+def __timings(options):
+    # wide vectorizations are best at a width of 4, deep vectorizations improve
+    # with width (but fail to build at a width of 8), F-ordering and the hybrid
+    # rate-specialization are faster, and the rest are irrelevant
+    time = 100.
+    if options['vectype'] == 'wide':
+        time /= {2: 2, 4: 4, 8: 3}[options['vecsize']]
+    elif options['vectype'] == 'deep':
+        time /= 0.6 * options['vecsize']
+    if options['order'] == 'F':
+        time *= 0.9
+    if options['rate_specialization'] == 'hybrid':
+        time *= 0.8
+    elif options['rate_specialization'] == 'fixed':
+        # clearly worse
+        time *= 5
+    return time
+
+
+def test_search_stages():
+    stages = dict(get_search_stages('c'))
+    # no vectorizations or atomics for C
+    assert 'vectorization' not in stages and 'atomics' not in stages
+    assert stages['order'] == [{'order': 'C'}, {'order': 'F'}]
+
+    stages = get_search_stages('opencl', [4, 2])
+    name, vecs = stages[0]
+    assert name == 'vectorization'
+    assert vecs[:3] == [{'vectype': 'par', 'vecsize': None},
+                        {'vectype': 'wide', 'vecsize': 2},
+                        {'vectype': 'wide', 'vecsize': 4}]
+
+
+def test_autotune():
+    path = tempfile.mkdtemp()
+    try:
+        tuner = fake_tuner('opencl', __timings, work_dir=path, platform='intel',
+                           repeats=3)
+        best = tuner.tune()
+        assert best.options['vectype'] == 'wide'
+        assert best.options['vecsize'] == 4
+        assert best.options['order'] == 'F'
+        assert best.options['rate_specialization'] == 'hybrid'
+        assert best.time == 100. / 4 * 0.9 * 0.8
+
+        results = tuner.results
+        # the failed deep vectorization is recorded
+        failed = [x for x in results.values() if x.status == 'failed']
+        assert len(failed) == 1 and failed[0].options['vecsize'] == 8
+        # the fixed rate-specialization was pruned after a single run
+        fixed = next(x for x in results.values()
+                     if x.options['rate_specialization'] == 'fixed')
+        assert fixed.status == 'pruned' and len(fixed.times) == 1
+        # atomics were not tuned, as the best vectorization is wide
+        assert not any(not x.options['atomics'] for x in results.values())
+        # and each configuration is only timed once
+        assert len(tuner.runs) == sum(len(x.times) for x in results.values())
+
+        # check the report
+        report = tuner.write_report()
+        with open(report, 'r') as file:
+            rows = list(csv.DictReader(file))
+        assert len(rows) == len(results)
+        assert rows[0]['config'] == best.name and rows[0]['rank'] == '1'
+        assert rows[-1]['status'] == 'failed'
+
+        # and the platform file
+        platform = tuner.write_platform(best)
+        assert os.path.isfile(platform)
+        assert load_kernel_options(platform) == {
+            'rate_specialization': 'hybrid',
+            'split_rate_kernels': default_options['split_rate_kernels'],
+            'split_rop_net_kernels': default_options['split_rop_net_kernels'],
+            'seperate_kernels': default_options['seperate_kernels']}
+    finally:
+        shutil.rmtree(path)
+
+
+def test_autotune_c():
+    path = tempfile.mkdtemp()
+    try:
+        tuner = fake_tuner('c', __timings, work_dir=path, repeats=1)
+        best = tuner.tune()
+        assert best.options['vectype'] == 'par'
+        assert best.options['order'] == 'F'
+        platform = tuner.write_platform(best)
+        with open(platform, 'r') as file:
+            contents = file.read()
+        assert 'name: openmp' in contents and 'lang: c' in contents
+        assert 'vecsize' not in contents
+
+        # kernel options that conflict with the platform file are an error,
+        # rather than being silently overridden
+        other = next(x for x in ['fixed', 'hybrid', 'full']
+                     if x != best.options['rate_specialization'])
+        with assert_raises(Exception):
+            create_jacobian('c', mech_name='unused.cti', platform=platform,
+                            rate_specialization=other, build_path=path)
+    finally:
+        shutil.rmtree(path)
@@ -2,10 +2,33 @@
 from __future__ import print_function
 from __future__ import division
 
+import os
 import sys
+import shutil
+import tempfile
+
+import numpy as np
+import cantera as ct
 
 from ..functional_tester import partially_stirred_reactor
 from ..functional_tester import test
+from ..core.mech_interpret import read_mech_ct
+from ..core.reference_eval import reference_evaluator
+
+
+def _get_states(gas, num_conditions):
+    # random constant-pressure states
+    rng = np.random.RandomState(0)
+    phi = np.zeros((num_conditions, gas.n_species + 2))
+    for i in range(num_conditions):
+        gas.TPY = rng.uniform(800, 2500), rng.uniform(1e5, 1e6), \
+            rng.uniform(0, 1, gas.n_species)
+        phi[i, 0] = gas.T
+        phi[i, 1] = gas.P
+        phi[i, 2] = 1
+        phi[i, 3:] = gas.concentrations[:-1]
+    return phi
+
 
 class TestPartiallyStirredReactor(object):
     """
@@ -15,6 +38,72 @@ def test_imported(self):
         """
         assert 'pyjac.functional_tester.partially_stirred_reactor' in sys.modules
 
+    def __get_particles(self, mech):
+        # fresh, burnt and partially burnt hydrogen / air particles
+        gas = ct.Solution(mech)
+        _, specs, reacs = read_mech_ct(mech)
+        thermo = reference_evaluator(specs, reacs)
+        particles = np.zeros((6, gas.n_species + 2))
+        for i, T in enumerate([400, 1000, 1200]):
+            gas.TPX = T, ct.one_atm, 'H2:2,O2:1,N2:3.76'
+            particles[2 * i] = np.hstack((gas.T, gas.enthalpy_mass, gas.Y))
+            gas.equilibrate('HP')
+            particles[2 * i + 1] = np.hstack((gas.T, gas.enthalpy_mass, gas.Y))
+        return thermo, particles
+
+    def test_mix_substep(self):
+        """Ensure the vectorized mixing conserves enthalpy and mass fractions
+        """
+        mech = os.path.join(os.path.dirname(__file__), 'test.cti')
+        thermo, particles = self.__get_particles(mech)
+        # the enthalpies are consistent with Cantera's
+        assert np.allclose(partially_stirred_reactor.enthalpy(
+            thermo, particles[:, 0], particles[:, 2:]), particles[:, 1])
+
+        mixed = particles.copy()
+        partially_stirred_reactor.mix_substep(mixed, 1.e-4, 1.e-3, thermo)
+        # each pair mixes towards its mean
+        means = 0.5 * (particles[0::2, 1:] + particles[1::2, 1:])
+        assert np.allclose(0.5 * (mixed[0::2, 1:] + mixed[1::2, 1:]), means)
+        assert np.all(np.abs(mixed[0::2, 1] - mixed[1::2, 1]) <
+                      np.abs(particles[0::2, 1] - particles[1::2, 1]))
+        # and the temperatures are consistent with the mixed enthalpy
+        assert np.allclose(partially_stirred_reactor.enthalpy(
+            thermo, mixed[:, 0], mixed[:, 2:]), mixed[:, 1])
+
+    def test_select_pairs(self):
+        """Ensure the selected pairs are moved intact before the skipped pairs
+        """
+        particles = np.tile(np.arange(20.)[:, np.newaxis], (1, 3))
+        partially_stirred_reactor.select_pairs(particles, 3, 2)
+        assert np.array_equal(np.sort(particles[:, 0]), np.arange(20))
+        assert np.array_equal(particles[16:, 0], np.arange(16, 20))
+        pairs = np.sort(particles[:, 0].reshape((-1, 2)), axis=1)
+        assert np.all(pairs[:, 0] % 2 == 0)
+        assert np.all(pairs[:, 1] - pairs[:, 0] == 1)
+
+    def test_batched_reactor(self):
+        """Ensure the batched integration matches per-particle Cantera reactors
+        """
+        mech = os.path.join(os.path.dirname(__file__), 'test.cti')
+        thermo, particles = self.__get_particles(mech)
+        # mix the fresh and burnt particles, such that they react
+        partially_stirred_reactor.mix_substep(particles, 1.e-4, 1.e-4, thermo)
+
+        pool = partially_stirred_reactor.ReactorPool(mech, 2)
+        try:
+            ref = particles.copy()
+            pool(ref, ct.one_atm, 1.e-5)
+        finally:
+            pool.close()
+
+        reactor = partially_stirred_reactor.BatchedReactor(
+            partially_stirred_reactor.reference_source(thermo), thermo.mw,
+            rtol=1.e-8, atol=1.e-14)
+        reactor(particles, ct.one_atm, 1.e-5)
+        assert np.allclose(particles[:, 0], ref[:, 0], rtol=1.e-6)
+        assert np.allclose(particles[:, 2:], ref[:, 2:], atol=1.e-8)
+
 class TestTest(object):
     """
     """
@@ -22,3 +111,78 @@ def test_imported(self):
         """Ensure test module imported.
         """
         assert 'pyjac.functional_tester.test' in sys.modules
+
+    def test_nasa_cp_h(self):
+        """Ensure the vectorized thermo evaluation matches Cantera
+        """
+        gas = ct.Solution(os.path.join(os.path.dirname(__file__), 'test.cti'))
+        T = np.linspace(300, 3000, 50)
+        cp, h = test.nasa_cp_h(gas.species(), T)
+        for j, spec in enumerate(gas.species()):
+            assert np.allclose(cp[:, j], [spec.thermo.cp(t) for t in T])
+            assert np.allclose(h[:, j], [spec.thermo.h(t) for t in T])
+
+    def test_sharded_reference_answers(self):
+        """Ensure the parallel reference answers match the serial evaluation
+        """
+        gas = ct.Solution(os.path.join(os.path.dirname(__file__), 'test.cti'))
+        gas.basis = 'molar'
+        phi = _get_states(gas, 25)
+
+        path = tempfile.mkdtemp()
+        cwd = os.getcwd()
+        try:
+            os.chdir(path)
+            answers = []
+            for num_procs in [1, 3]:
+                helper = test.spec_rate_eval(gas, phi.shape[0],
+                                             num_procs=num_procs)
+                # use multiple (uneven) shards
+                helper.chunk_size = 4
+                helper.eval_answer(phi, {'conp': True})
+                answers.append([np.array(x[:]) for x in
+                                helper.ref_answers({'conp': True}) +
+                                helper.ref_answers({'conp': False})])
+                helper.release()
+
+            for serial, parallel in zip(*answers):
+                assert np.array_equal(serial, parallel)
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(path, ignore_errors=True)
+
+    def test_jacobian_views(self):
+        """Ensure the dense / F-ordered views of the sparse reference Jacobian
+        """
+        size = 4
+        inds_C = np.array([[0, 0], [0, 1], [1, 0], [2, 2], [2, 3], [3, 1]])
+        inds_F = np.array(sorted(inds_C.tolist(), key=lambda x: (x[1], x[0])))
+        values = np.random.RandomState(0).uniform(size=(10, inds_C.shape[0]))
+
+        path = tempfile.mkdtemp()
+        cwd = os.getcwd()
+        store = test.hdf5_store()
+        try:
+            os.chdir(path)
+            sparse = store.open_for_chunked_write(
+                'jac.hdf5', (0, inds_C.shape[0]), values.shape[0])
+            sparse.append(values)
+            sparse = store.open_for_read('jac.hdf5')
+
+            dense = test._densified_jacobian(sparse, inds_C, size)
+            assert dense.shape == (10, size, size) and dense.ndim == 3
+            ref = np.zeros((10, size, size))
+            ref[:, inds_C[:, 0], inds_C[:, 1]] = values
+            assert np.array_equal(dense[2:7, :], ref[2:7])
+
+            # find the map from C to F-ordering
+            flat_C = [tuple(x) for x in inds_C]
+            F_map = np.array([flat_C.index(tuple(x)) for x in inds_F])
+            reordered = test._reordered_jacobian(sparse, F_map)
+            assert reordered.shape == values.shape
+            assert np.array_equal(reordered[3:10, :],
+                                  ref[3:10, inds_F[:, 0], inds_F[:, 1]])
+        finally:
+            store.release()
+            os.chdir(cwd)
+            shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,123 @@
+# Python 2 compatibility
+from __future__ import print_function
+from __future__ import division
+
+import os
+import shutil
+import tempfile
+
+from pyjac.core import generation_cache as gcache
+from pyjac.core.chem_model import SpecInfo
+
+
+class dummy_opts(object):
+    def __init__(self, **kwargs):
+        self.lang = 'c'
+        self.order = 'C'
+        self.width = None
+        self.depth = None
+        self.platform = ''
+        self.device = None
+        self.__dict__.update(kwargs)
+
+    @property
+    def platform_name(self):
+        return self.platform
+
+
+def __specs(names):
+    specs = []
+    for name in names:
+        specs.append(SpecInfo(name))
+        specs[-1].mw = 1.0
+    return specs
+
+
+def test_cache_key():
+    specs = __specs(['H2', 'O2', 'N2'])
+    key = gcache.get_cache_key(specs, [], dummy_opts(), conp=True)
+    # identical inputs give identical keys
+    assert key == gcache.get_cache_key(__specs(['H2', 'O2', 'N2']), [],
+                                       dummy_opts(), conp=True)
+    # while any change in the mechanism, options or kwargs changes the key
+    assert key != gcache.get_cache_key(__specs(['O2', 'H2', 'N2']), [],
+                                       dummy_opts(), conp=True)
+    assert key != gcache.get_cache_key(specs, [], dummy_opts(order='F'),
+                                       conp=True)
+    assert key != gcache.get_cache_key(specs, [], dummy_opts(), conp=False)
+
+    # and automatic cache tiling is keyed on the cache topology it is resolved with
+    def __auto(l2):
+        return gcache.get_cache_key(specs, [], dummy_opts(
+            cache_tile='auto', cache_topology={1: (32 * 1024, 1), 2: (l2, 1)}),
+            conp=True)
+    assert __auto(256 * 1024) == __auto(256 * 1024)
+    assert __auto(256 * 1024) != __auto(1024 * 1024)
+
+
+def test_store_and_load():
+    cache_dir = tempfile.mkdtemp()
+    build = tempfile.mkdtemp()
+    other = tempfile.mkdtemp()
+    try:
+        with open(os.path.join(build, 'untouched.c'), 'w') as file:
+            file.write('not generated')
+        before = gcache.snapshot(build)
+        # ensure the new file is detected in the snapshot
+        with open(os.path.join(build, 'kernel.c'), 'w') as file:
+            file.write('char* path = "{}/kernel.bin";'.format(build))
+
+        assert not gcache.load(cache_dir, 'key', other)
+        gcache.store(cache_dir, 'key', build, before)
+        assert os.listdir(os.path.join(cache_dir, 'key')) == ['kernel.c']
+
+        # and load into a different build path
+        assert gcache.load(cache_dir, 'key', other)
+        assert os.listdir(other) == ['kernel.c']
+        with open(os.path.join(other, 'kernel.c'), 'r') as file:
+            assert file.read() == 'char* path = "{}/kernel.bin";'.format(other)
+    finally:
+        for d in [cache_dir, build, other]:
+            shutil.rmtree(d, ignore_errors=True)
+
+
+def test_snapshot():
+    build = tempfile.mkdtemp()
+    try:
+        fname = os.path.join(build, 'kernel.c')
+        with open(fname, 'w') as file:
+            file.write('int a = 1;')
+        stat = os.stat(fname)
+        before = gcache.snapshot(build)
+        # a rewrite of the same size, within the resolution of the modification
+        # time is still detected
+        with open(fname, 'w') as file:
+            file.write('int a = 2;')
+        os.utime(fname, (stat.st_atime, stat.st_mtime))
+        assert gcache.snapshot(build)['kernel.c'] != before['kernel.c']
+    finally:
+        shutil.rmtree(build, ignore_errors=True)
+
+
+def test_evict():
+    cache_dir = tempfile.mkdtemp()
+    build = tempfile.mkdtemp()
+    try:
+        keys = [gcache.get_cache_key(__specs([name]), [], dummy_opts())
+                for name in ['H2', 'O2', 'N2']]
+        for i, key in enumerate(keys):
+            before = gcache.snapshot(build)
+            with open(os.path.join(build, 'kernel{}.c'.format(i)), 'w') as file:
+                file.write('x' * 10)
+            gcache.store(cache_dir, key, build, before)
+            os.utime(os.path.join(cache_dir, key), (i, i))
+        # other contents of the cache directory are untouched
+        os.mkdir(os.path.join(cache_dir, 'objects'))
+        # loading an entry marks it as recently used
+        assert gcache.load(cache_dir, keys[0], build)
+        assert gcache.evict(cache_dir, 30) == []
+        assert gcache.evict(cache_dir, 15) == keys[1:]
+        assert sorted(os.listdir(cache_dir)) == sorted([keys[0], 'objects'])
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        shutil.rmtree(build, ignore_errors=True)
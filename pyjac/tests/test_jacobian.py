@@ -18,15 +18,16 @@
 from pyjac.loopy_utils.loopy_utils import (
     loopy_options, RateSpecialization,
     kernel_call, set_adept_editor, populate,
-    FiniteDifferenceMode)
+    FiniteDifferenceMode, JacobianType, JacobianFormat)
 from pyjac.core.create_jacobian import (
     dRopi_dnj, dci_thd_dnj, dci_lind_dnj, dci_sri_dnj, dci_troe_dnj,
     total_specific_energy, dTdot_dnj, dEdot_dnj, thermo_temperature_derivative,
     dRopidT, dRopi_plog_dT, dRopi_cheb_dT, dTdotdT, dci_thd_dT, dci_lind_dT,
     dci_troe_dT, dci_sri_dT, dEdotdT, dTdotdE, dEdotdE, dRopidE, dRopi_plog_dE,
     dRopi_cheb_dE, dci_thd_dE, dci_lind_dE, dci_troe_dE, dci_sri_dE,
-    determine_jac_inds, reset_arrays, get_jacobian_kernel,
-    finite_difference_jacobian)
+    determine_jac_inds, determine_fd_coloring, reset_arrays, get_jacobian_kernel,
+    finite_difference_jacobian, determine_lu_structure, sparse_lu_factor,
+    sparse_lu_solve)
 from pyjac.core import array_creator as arc
 from pyjac.core.reaction_types import reaction_type, falloff_form
 from pyjac.kernel_utils import kernel_gen as k_gen
@@ -473,6 +474,122 @@ def __pregen(kernel_call):
     return _make_array(self, kernel_call.kernel_args[editor.output.name])
 
 
+def _reference_jac_inds(val, jacobian_type):
+    """
+    The original (loop-based) construction of the non-zero Jacobian indicies in
+    :func:`determine_jac_inds`, used to check the vectorized implementation
+    """
+    inds = []
+    row_size = val['Ns'] + 1
+    species_offset = 2
+
+    def __add_row(row):
+        inds.extend([(row, x) for x in range(row_size)])
+
+    __add_row(0)
+    __add_row(1)
+
+    def __offset(arr):
+        return np.array(np.concatenate(
+            (np.cumsum(arr) - arr, np.array([np.sum(arr)]))),
+            dtype=np.int32)
+
+    non_zero_specs = val['net_per_spec']['map']
+    rxn_count = __offset(val['net_per_spec']['reac_count'])
+    rxn_maps = val['net_per_spec']['reacs']
+    rxn_to_specs_map = val['net']['reac_to_spec']
+    num_specs_in_rxn = __offset(val['net']['num_reac_to_spec'])
+    has_ns = val['reac_has_ns']
+    thd_has_ns = val['thd']['has_ns']
+    thd_spec = val['thd']['spec']
+    thd_eff = val['thd']['eff']
+    thd_map = val['thd']['map']
+    rev_map = val['rev']['map']
+    nu_map = val['net']['nu']
+    num_specs_in_thd = __offset(val['thd']['spec_num'])
+    ns = val['Ns'] - 1
+
+    for spec in non_zero_specs:
+        if spec == ns:
+            continue
+        row = spec + species_offset
+        nonzero_derivs = set([0, 1])
+
+        def __add_specs(slist):
+            nonzero_derivs.update([x + species_offset for x in slist
+                                   if x + species_offset < row_size])
+
+        inner_ind = np.where(non_zero_specs == spec)[0][0]
+        for rxn in rxn_maps[rxn_count[inner_ind]:rxn_count[inner_ind + 1]]:
+            thd_ind = None
+            if rxn in thd_map:
+                thd_ind = np.where(thd_map == rxn)[0][0]
+
+            if (rxn in has_ns or (thd_ind is not None and thd_ind in thd_has_ns)) \
+                    and jacobian_type != JacobianType.approximate:
+                __add_specs(range(row_size))
+                break
+
+            deriv_specs = rxn_to_specs_map[
+                num_specs_in_rxn[rxn]:num_specs_in_rxn[rxn + 1]]
+            if rxn not in rev_map:
+                nu = nu_map[2 * num_specs_in_rxn[rxn]:2 * num_specs_in_rxn[rxn + 1]]
+                is_prod = [nu[2 * i] != 0 for i in range(len(deriv_specs))]
+                is_reac = [nu[2 * i + 1] != 0 for i in range(len(deriv_specs))]
+                spec_ind = np.where(deriv_specs == spec)[0][0]
+                if not (is_prod[spec_ind] and is_reac[spec_ind]):
+                    deriv_specs = [x for i, x in enumerate(deriv_specs)
+                                   if is_reac[i]]
+            __add_specs(deriv_specs)
+
+            if thd_ind is not None:
+                last_spec_eff = 1.0
+                third_body_inds = np.arange(num_specs_in_thd[
+                    thd_ind], num_specs_in_thd[thd_ind + 1])
+                third_body_species = thd_spec[third_body_inds]
+                third_body_eff = thd_eff[third_body_inds]
+                if ns in third_body_species:
+                    last_spec_eff = third_body_eff[np.where(
+                        third_body_species == ns)]
+                __add_specs([x for i, x in enumerate(third_body_species)
+                             if third_body_eff[i] != last_spec_eff])
+
+        inds.extend([(row, x) for x in sorted(nonzero_derivs)])
+
+    rows, cols = zip(*inds)
+    rows = np.array(rows, dtype=np.int32)
+    cols = np.array(cols, dtype=np.int32)
+
+    inds_F = np.array(inds, copy=True)
+    offset = 0
+    for col in np.unique(cols):
+        row_F = rows[np.where(cols == col)[0]]
+        inds_F[offset:offset + row_F.size] = np.asarray(
+            (row_F, [col] * row_F.size), dtype=np.int32).T
+        offset += row_F.size
+
+    row_ptr = []
+    col_ind = []
+    col_ptr = []
+    row_ind = []
+    for i in range(row_size):
+        in_row = np.where(rows == i)[0]
+        row_ptr.append(in_row.size)
+        col_ind.extend(cols[in_row])
+        in_col = np.where(cols == i)[0]
+        col_ptr.append(in_col.size)
+        row_ind.extend(rows[in_col])
+
+    return {
+        'flat_C': np.asarray(inds, dtype=np.int32),
+        'flat_F': np.asarray(inds_F, dtype=np.int32),
+        'crs': {'col_ind': np.array(col_ind, dtype=np.int32),
+                'row_ptr': __offset(row_ptr)},
+        'ccs': {'row_ind': np.array(row_ind, dtype=np.int32),
+                'col_ptr': __offset(col_ptr)}
+    }
+
+
 class SubTest(TestClass):
     """
     The base Jacobian tester class
@@ -2415,6 +2532,51 @@ def test_index_determination(self):
         assert np.array_equal(ret['ccs']['col_ptr'], ccs.indptr) and \
             np.array_equal(ret['ccs']['row_ind'], ccs.indices)
 
+    def test_index_regression(self):
+        # compare the vectorized index determination to the original
+        # implementation
+        for jac_type in [JacobianType.exact, JacobianType.approximate]:
+            ret = determine_jac_inds(self.store.reacs, self.store.specs,
+                                     RateSpecialization.fixed, jac_type)
+            ref = _reference_jac_inds(ret, jac_type)
+            for key in ['flat_C', 'flat_F']:
+                assert ret['jac_inds'][key].dtype == ref[key].dtype
+                assert np.array_equal(ret['jac_inds'][key], ref[key])
+            for key in ['crs', 'ccs']:
+                for subkey in ref[key]:
+                    assert np.array_equal(ret['jac_inds'][key][subkey],
+                                          ref[key][subkey])
+
+    def test_fd_coloring(self):
+        jac_inds = determine_jac_inds(self.store.reacs, self.store.specs,
+                                      RateSpecialization.fixed)['jac_inds']
+        coloring = determine_fd_coloring(jac_inds)
+        jac_size = len(self.store.specs) + 1
+        pattern = np.zeros((jac_size, jac_size), dtype=np.int32)
+        pattern[jac_inds['flat_C'][:, 0], jac_inds['flat_C'][:, 1]] = 1
+
+        # each column is perturbed exactly once
+        assert np.array_equal(np.sort(coloring['cols']), np.arange(jac_size))
+        assert coloring['col_count'].size == coloring['num']
+        assert coloring['num'] <= jac_size
+        # the temperature and extra variable columns have separate colors
+        assert np.array_equal(coloring['col_count'][:2], [1, 1])
+        assert np.array_equal(coloring['cols'][:2], [0, 1])
+        # the species rows of the columns of each color are structurally
+        # orthogonal
+        col_offsets = np.cumsum(coloring['col_count']) - coloring['col_count']
+        for offset, count in zip(col_offsets, coloring['col_count']):
+            cols = coloring['cols'][offset:offset + count]
+            assert np.all(np.sum(pattern[2:, cols], axis=1) <= 1)
+
+        # and each non-zero entry is updated exactly once, except for the
+        # temperature and extra variable rows of the species columns
+        assert np.sum(coloring['entry_count']) == coloring['entry_rows'].size
+        updated = np.zeros_like(pattern)
+        np.add.at(updated, (coloring['entry_rows'], coloring['entry_cols']), 1)
+        pattern[:2, 2:] = 0
+        assert np.array_equal(updated, pattern)
+
     @attr('long')
     def test_reset_arrays(self):
         # find our non-zero indicies
@@ -2443,6 +2605,123 @@ def __set(order):
 
         return self._generic_jac_tester(reset_arrays, kc)
 
+    def test_jacobian_vector_product_storage(self):
+        # the matrix-free kernel should never store the Jacobian, i.e., no per-state
+        # array may be as large as the (sparse) Jacobian
+        nnz = determine_jac_inds(self.store.reacs, self.store.specs,
+                                 RateSpecialization.fixed)['jac_inds'][
+            'flat_C'].shape[0]
+        for order in ['C', 'F']:
+            for jac_format in [JacobianFormat.full, JacobianFormat.sparse]:
+                opts = loopy_options(order=order, lang='c', jac_format=jac_format)
+                kgen = get_jacobian_kernel(self.store.reacs, self.store.specs, opts,
+                                           jac_vec=True)
+                kgen._make_kernels()
+                for knl in kgen.kernels:
+                    arrays = [x for x in list(knl.args) + list(
+                        knl.temporary_variables.values())
+                        if not isinstance(x, lp.ValueArg)]
+                    assert not any(x.name == 'jac' for x in arrays), knl.name
+                    for arr in arrays:
+                        shape = arr.shape if arr.shape else ()
+                        fixed = [s for s in shape
+                                 if isinstance(s, (int, np.integer))]
+                        if len(fixed) == len(shape):
+                            # not a per-state array
+                            continue
+                        assert np.prod(fixed) < nnz, (knl.name, arr.name)
+
+    def __lu_system(self):
+        # returns the symbolic factorization, and a random jacobian / scaling
+        # factor and the corresponding (dense) factored iteration matrix
+        jac_inds = determine_jac_inds(self.store.reacs, self.store.specs,
+                                      RateSpecialization.fixed)['jac_inds']
+        lu_info = determine_lu_structure(jac_inds)
+
+        non_zero_inds = jac_inds['flat_C']
+        jac_size = len(self.store.specs) + 1
+        rand = np.random.RandomState(seed=0)
+        jac = np.zeros((self.store.test_size,) + (jac_size,) * 2)
+        jac[:, non_zero_inds[:, 0], non_zero_inds[:, 1]] = rand.rand(
+            self.store.test_size, non_zero_inds.shape[0])
+        gamma = rand.uniform(1e-8, 1e-2, size=self.store.test_size)
+
+        # dense, non-pivoted LU-factorization of the permuted iteration matrix
+        perm = lu_info['perm']
+        lu = np.eye(jac_size)[np.newaxis, :, :] - gamma[:, np.newaxis, np.newaxis] \
+            * jac
+        lu = lu[:, perm][:, :, perm]
+        for k in range(jac_size - 1):
+            lu[:, k + 1:, k] /= lu[:, k, k][:, np.newaxis]
+            lu[:, k + 1:, k + 1:] -= lu[:, k + 1:, k][:, :, np.newaxis] * \
+                lu[:, k, k + 1:][:, np.newaxis, :]
+
+        return lu_info, jac, gamma, lu
+
+    def test_lu_structure(self):
+        lu_info, jac, gamma, lu = self.__lu_system()
+        jac_size = jac.shape[1]
+        rows = np.repeat(np.arange(jac_size), np.diff(lu_info['row_ptr']))
+        cols = lu_info['col_ind']
+
+        # the permutation is valid
+        assert np.array_equal(np.sort(lu_info['perm']), np.arange(jac_size))
+        # the diagonal is present in each row
+        assert np.array_equal(rows[lu_info['diag']], np.arange(jac_size))
+        assert np.array_equal(cols[lu_info['diag']], np.arange(jac_size))
+        # the Jacobian entries are mapped correctly
+        jac_inds = determine_jac_inds(self.store.reacs, self.store.specs,
+                                      RateSpecialization.fixed)['jac_inds']
+        entry = lu_info['jac_entry']
+        flat = jac_inds['flat_C'][entry[entry >= 0]]
+        assert np.array_equal(flat[:, 0], lu_info['perm'][rows[entry >= 0]])
+        assert np.array_equal(flat[:, 1], lu_info['perm'][cols[entry >= 0]])
+        assert np.unique(entry[entry >= 0]).size == jac_inds['flat_C'].shape[0]
+        # and the pattern contains all non-zeros of the factors
+        pattern = np.zeros((jac_size, jac_size), dtype=bool)
+        pattern[rows, cols] = True
+        assert not np.any(lu[:, ~pattern])
+
+    def test_sparse_lu_factor(self):
+        lu_info, jac, gamma, lu = self.__lu_system()
+        rows = np.repeat(np.arange(jac.shape[1]), np.diff(lu_info['row_ptr']))
+        ref = lu[:, rows, lu_info['col_ind']]
+
+        args = {'jac': lambda x: np.array(jac, order=x, copy=True),
+                'gamma': lambda x: np.array(gamma, order=x, copy=True)}
+        kc = kernel_call('sparse_lu_factor', [ref], compare_axis=-1, **args)
+
+        def __rate_info(*args, **kwargs):
+            rate_info = determine_jac_inds(*args, **kwargs)
+            rate_info['jac_lu'] = lu_info
+            return rate_info
+
+        return _generic_tester(self, sparse_lu_factor, [kc], __rate_info,
+                               do_sparse=True, lu_info=lu_info)
+
+    def test_sparse_lu_solve(self):
+        lu_info, jac, gamma, lu = self.__lu_system()
+        rows = np.repeat(np.arange(jac.shape[1]), np.diff(lu_info['row_ptr']))
+        jac_lu = lu[:, rows, lu_info['col_ind']]
+        rhs = np.random.RandomState(seed=1).rand(*jac.shape[:2])
+
+        # the reference answer
+        iter_mat = np.eye(jac.shape[1])[np.newaxis, :, :] - \
+            gamma[:, np.newaxis, np.newaxis] * jac
+        ref = np.linalg.solve(iter_mat, rhs)
+
+        args = {'jac_lu': lambda x: np.array(jac_lu, order=x, copy=True),
+                'rhs': lambda x: np.array(rhs, order=x, copy=True)}
+        kc = kernel_call('sparse_lu_solve', [ref], compare_axis=-1, **args)
+
+        def __rate_info(*args, **kwargs):
+            rate_info = determine_jac_inds(*args, **kwargs)
+            rate_info['jac_lu'] = lu_info
+            return rate_info
+
+        return _generic_tester(self, sparse_lu_solve, [kc], __rate_info,
+                               do_sparse=True, lu_info=lu_info)
+
     def test_sparse_indexing(self):
         from ..core import instruction_creator as ic
         # a simple test to ensure our sparse indexing is working correctly
@@ -2680,7 +2959,21 @@ def test_jacobian(self, lang):
 
     @parameterized.expand([(x,) for x in get_test_langs()])
     @attr('verylong')
-    def test_fd_jacobian(self, lang):
+    def test_jacobian_vector_product(self, lang):
+        vec = np.random.RandomState(seed=0).rand(
+            self.store.test_size, self.store.jac_dim)
+        _full_kernel_test(self, lang, get_jacobian_kernel, 'jvp',
+                          lambda conp: np.einsum(
+                            'ijk,ik->ij', self.__get_full_jac(conp), vec),
+                          btype=build_type.jacobian, call_name='jacobian',
+                          call_kwds={'jac_vec': True},
+                          wrapper_kwds={'jac_vec': True},
+                          extra_inputs=[('vec', lambda conp: vec)])
+
+    @parameterized.expand([(x, y) for x in get_test_langs()
+                           for y in [False, True]])
+    @attr('verylong')
+    def test_fd_jacobian(self, lang, coloring):
         def __looser_tol_finder(arr, order, have_split, conp):
             last_spec_name = self.store.gas.species_names[-1]
             # look for derivatives resulting from the last species' prescense in the
@@ -2780,4 +3073,5 @@ def __add(rxn, wrt=None):
                           atol=100, rtol=100, loose_rtol=1e7, loose_atol=100,
                           looser_tol_finder=__looser_tol_finder,
                           call_kwds={'mode': FiniteDifferenceMode.central,
-                                     'order': 8})
+                                     'order': 8,
+                                     'coloring': coloring})
@@ -21,6 +21,7 @@
 from pyjac.core.mech_auxiliary import write_aux
 from pyjac.core.array_creator import array_splitter, problem_size
 from pyjac.pywrap.pywrap_gen import generate_wrapper
+from pyjac.kernel_utils.file_writers import write_native_initial_conditions
 from pyjac.core.exceptions import IncorrectInputSpecificationException
 
 
@@ -57,6 +58,38 @@ def __get_objs(self, lang='opencl', depth=None, width=None, order='C'):
             ('shared', [True, False])]))
         return opts, oploop
 
+    @parameterized.expand([('C',), ('F',)])
+    def test_specrates_evaluator(self, order):
+        opts, _ = self.__get_objs(lang='c', order=order)
+        build_dir = self.store.build_dir
+        obj_dir = self.store.obj_dir
+        lib_dir = self.store.lib_dir
+        # clean old
+        self.__cleanup()
+        # create / write files
+        self.__get_spec_lib({'conp': True}, opts)
+        generate_wrapper(opts.lang, build_dir, obj_dir=obj_dir, out_dir=lib_dir,
+                         btype=build_type.species_rates)
+
+        # save inputs
+        phi = os.path.join(lib_dir, 'phi.npy')
+        param = os.path.join(lib_dir, 'param.npy')
+        np.save(phi, self.store.phi_cp)
+        np.save(param, self.store.P)
+
+        # create the test stub, and run
+        evaluator = test_utils.get_evaluator_source()
+        with open(os.path.join(lib_dir, 'test_evaluator.py'), 'w') as file:
+            file.write(evaluator.substitute(
+                package='pyjac_c', call_name='species_rates', phi=phi,
+                param=param, out_shape=self.store.phi_cp.shape[1:]))
+
+        python_str = 'python{}.{}'.format(
+            sys.version_info[0], sys.version_info[1])
+        subprocess.check_call([python_str,
+                               os.path.join(lib_dir, 'test_evaluator.py')],
+                              cwd=lib_dir)
+
     @parameterized.expand([('opencl',), ('c',)])
     def test_compile_specrates_knl(self, lang):
         opts, oploop = self.__get_objs(lang=lang)
@@ -146,6 +179,107 @@ def test_compile_jacobian(self, state):
             subprocess.check_call([python_str,
                                    os.path.join(lib_dir, 'test_import.py')])
 
+    @parameterized.expand([('opencl',), ('c',)])
+    def test_compile_fused_jacobian(self, lang):
+        opts, _ = self.__get_objs(lang=lang)
+        build_dir = self.store.build_dir
+        obj_dir = self.store.obj_dir
+        lib_dir = self.store.lib_dir
+        packages = {'c': 'pyjac_c', 'opencl': 'pyjac_ocl'}
+        # clean old
+        self.__cleanup()
+        # create / write files
+        kgen = get_jacobian_kernel(self.store.reacs, self.store.specs, opts,
+                                   conp=True, output_species_rates=True)
+        kgen.generate(build_dir)
+        write_aux(build_dir, opts, self.store.specs, self.store.reacs)
+
+        # check that both the species rates and Jacobian are output
+        with open(kgen.header_name, 'r') as file:
+            header = file.read()
+        call = re.search(r'void jacobian_kernel_call\(([^)]+)\)', header)
+        assert call
+        args = [x.strip().split()[-1].strip('*') for x in call.group(1).split(',')]
+        assert args[-2:] == ['h_dphi', 'h_jac']
+
+        # test wrapper generation
+        generate_wrapper(opts.lang, build_dir, obj_dir=obj_dir, out_dir=lib_dir,
+                         btype=build_type.jacobian, output_species_rates=True)
+
+        # create the test importer, and run
+        imp = test_utils.get_import_source()
+        with open(os.path.join(lib_dir, 'test_import.py'), 'w') as file:
+            file.write(imp.substitute(path=lib_dir, package=packages[lang]))
+
+        python_str = 'python{}.{}'.format(
+            sys.version_info[0], sys.version_info[1])
+        subprocess.check_call([python_str,
+                               os.path.join(lib_dir, 'test_import.py')])
+
+    def test_double_buffer(self):
+        # test that the double-buffered OpenCL calling program alternates between
+        # the two sets of device buffers for consecutive chunks of states
+        build_dir = self.store.build_dir
+        for double_buffer in [False, True]:
+            self.__cleanup()
+            create_jacobian('opencl', gas=self.store.gas, build_path=build_dir,
+                            double_buffer=double_buffer)
+            with open(os.path.join(build_dir, 'jacobian_kernel_main.ocl'),
+                      'r') as file:
+                src = file.read()
+
+            assert ('#define DOUBLE_BUFFER' in src) == double_buffer
+            # the buffers used are determined by the parity of the chunk
+            selects = re.findall(
+                r'int buffer = \(offset / per_run\) % 2;\s*'
+                r'ctx->d_phi = ctx->d_phi_buffers\[buffer\];', src)
+            if not double_buffer:
+                assert not selects
+                continue
+            # both for the transfers into the device, and the kernel execution
+            assert len(selects) == 2
+            assert re.search(r'ctx->d_jac = ctx->d_jac_buffers\[buffer\];', src)
+            # and the kernel arguments are reset to the selected buffers
+            assert re.search(r'd_phi_buffers\[buffer\];[^}]*clSetKernelArg\('
+                             r'kernel, \d+, sizeof\(ctx->d_phi\), &ctx->d_phi\)',
+                             src)
+
+    def test_prefix(self):
+        # test that the exported symbols & include guards of the generated code
+        # are prefixed, while the file names are not
+        build_dir = self.store.build_dir
+        for lang in ['c', 'opencl']:
+            self.__cleanup()
+            create_jacobian(lang, gas=self.store.gas, build_path=build_dir,
+                            prefix='h2_')
+            header = utils.header_ext[lang]
+            with open(os.path.join(build_dir, 'jacobian_kernel_main' + header),
+                      'r') as file:
+                src = file.read()
+            assert '#ifndef H2_JACOBIAN_KERNEL_MAIN_' in src
+            assert 'h2_jacobian_kernel_context* h2_jacobian_kernel_create(' in src
+            with open(os.path.join(build_dir, 'mechanism' + header), 'r') as file:
+                assert '#ifndef H2_MECHANISM_' in file.read()
+
+            with open(os.path.join(build_dir, 'jacobian_kernel_main' +
+                                   utils.file_ext['c']), 'r') as file:
+                src = file.read()
+            assert '#include "jacobian_kernel_main{}"'.format(header) in src
+            # the driver program is not part of the library source
+            assert not re.search(r'\bmain\(', src)
+            with open(os.path.join(build_dir, 'jacobian_kernel_driver' +
+                                   utils.file_ext['c']), 'r') as file:
+                assert re.search(r'\bmain\(', file.read())
+
+            # and the (sub-)kernels are all prefixed
+            with open(os.path.join(build_dir, 'jacobian_kernel' +
+                                   utils.file_ext[lang]), 'r') as file:
+                src = file.read()
+            names = re.findall(r'^(?:__kernel\s+)?void\s+'
+                               r'(?:__attribute__\s*\(\(.*\)\)\s+)?(\w+)\(',
+                               src, re.MULTILINE)
+            assert names and all(x.startswith('h2_') for x in names)
+
     def test_fixed_size(self):
         # test bad fixed size
         with assert_raises(IncorrectInputSpecificationException):
@@ -163,6 +297,68 @@ def test_fixed_size(self):
         # and make sure we don't have 'problem_size'
         assert not re.search(r'\b{}\b'.format(problem_size.name), file)
 
+    def test_parallel_kernel_construction(self):
+        build_dir = self.store.build_dir
+
+        def __read():
+            files = {}
+            for f in os.listdir(build_dir):
+                if os.path.isfile(os.path.join(build_dir, f)):
+                    with open(os.path.join(build_dir, f), 'rb') as file:
+                        files[f] = file.read()
+            return files
+
+        for lang in ['opencl', 'c']:
+            opts, _ = self.__get_objs(lang=lang)
+            sources = []
+            for jobs in [1, 2]:
+                self.__cleanup()
+                kgen = get_jacobian_kernel(self.store.reacs, self.store.specs, opts)
+                kgen.generate(build_dir, jobs=jobs)
+                sources.append(__read())
+            # the generated source should be byte-identical
+            assert sources[0] == sources[1]
+
+    def test_parallel_kernel_scheduling(self):
+        # test that the kernels built in parallel through create_jacobian arrive
+        # at code-generation already scheduled, and give the same source
+        import loopy as lp
+        build_dir = self.store.build_dir
+        generate_code_v2 = lp.generate_code_v2
+
+        def __read():
+            files = {}
+            for f in os.listdir(build_dir):
+                if os.path.isfile(os.path.join(build_dir, f)):
+                    with open(os.path.join(build_dir, f), 'rb') as file:
+                        files[f] = file.read()
+            return files
+
+        sources = []
+        scheduled = []
+        for jobs in [1, 2]:
+            self.__cleanup()
+            generated = []
+
+            def __generate(knl):
+                generated.append(knl.schedule is not None)
+                return generate_code_v2(knl)
+
+            lp.generate_code_v2 = __generate
+            try:
+                create_jacobian('c', gas=self.store.gas, build_path=build_dir,
+                                jobs=jobs)
+            finally:
+                lp.generate_code_v2 = generate_code_v2
+            sources.append(__read())
+            scheduled.append(generated)
+
+        # serially, all kernels are scheduled during code-generation
+        assert not any(scheduled[0])
+        # while in parallel, the workers schedule the kernels
+        assert any(scheduled[1])
+        assert sources[0] == sources[1]
+
     def test_read_initial_conditions(self):
         build_dir = self.store.build_dir
         obj_dir = self.store.obj_dir
@@ -196,7 +392,8 @@ def test_read_initial_conditions(self):
                 ric = Template(file.read())
             # subs
             ric = ric.safe_substitute(mechanism='mechanism.h',
-                                      vectorization='vectorization.h')
+                                      vectorization='vectorization.h',
+                                      header_ext='.h')
             # write
             with open(os.path.join(
                     build_dir, 'read_initial_conditions.c'), 'w') as file:
@@ -247,6 +444,9 @@ def test_read_initial_conditions(self):
             out_file = out_file.flatten('K')
             with open(os.path.join(lib_dir, 'data.bin'), 'wb') as file:
                 out_file.tofile(file)
+            # and in the native data layout
+            write_native_initial_conditions(
+                os.path.join(lib_dir, 'native.bin'), phi, param, opts)
 
             # and run
             subprocess.check_call(
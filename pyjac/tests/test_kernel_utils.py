@@ -1,8 +1,12 @@
 # TODO way more tests here
 from __future__ import division
 
-from tempfile import NamedTemporaryFile
+from tempfile import NamedTemporaryFile, mkdtemp
+import os
+import shutil
+import subprocess
 from collections import OrderedDict
+from string import Template
 import re
 
 import loopy as lp
@@ -12,7 +16,8 @@
 
 from pyjac.core.array_creator import array_splitter, problem_size
 from pyjac.kernel_utils.memory_manager import memory_limits, memory_type, \
-  memory_manager
+  memory_manager, load_cache_topology
+from pyjac.pywrap.mechanism_order import MechanismOrder
 
 
 def loopy_opts(langs=['opencl'],
@@ -93,3 +98,340 @@ def test_stride_limiter(dtype):
 
         # finally, test that we get the same limit from can_fit
         assert limit == limits.can_fit(mtype=memory_type.m_global)
+
+
+@parameterized([('C',), ('F',)])
+def test_state_binning(order):
+    # tests the generated partitioning of the states about the temperature
+    # breakpoint
+    phi = lp.GlobalArg('phi', shape=(problem_size.name, 10), dtype=np.float64)
+    P = lp.GlobalArg('P_arr', shape=(problem_size.name,), dtype=np.float64)
+    dphi = lp.GlobalArg('dphi', shape=(problem_size.name, 10), dtype=np.float64)
+    mem = memory_manager('c', order, False)
+    mem.add_arrays([phi, P, dphi], in_arrays=['phi', 'P_arr'],
+                   out_arrays=['dphi'])
+    bin_states, unbin_states = mem.get_state_binning(1000)
+
+    # the work buffers are sized for all the binned arrays
+    assert 'reserve_state_bins(&bins, problem_size, 10 + 1 + 10);' in bin_states
+    # the temperatures are strided in C-order
+    stride = 10 if order == 'C' else 1
+    assert 'bin_states(problem_size, h_phi, {}, 1000.0, bins.perm);'.format(
+        stride) in bin_states
+    assert 'double* bin_P_arr = &bins.data[(10) * problem_size];' in bin_states
+    assert 'double* bin_dphi = &bins.data[(10 + 1) * problem_size];' in bin_states
+
+    def __permute(src, dest, width, inverse):
+        return ("permute_states({}, {}, bins.perm, problem_size, {}, "
+                "'{}', {});".format(src, dest, width, order,
+                                    'true' if inverse else 'false'))
+
+    # the inputs are binned into the work buffers before execution
+    assert __permute('h_phi', 'bin_phi', 10, False) in bin_states
+    assert __permute('h_P_arr', 'bin_P_arr', 1, False) in bin_states
+    assert __permute('h_dphi', 'bin_dphi', 10, False) not in bin_states
+    # and the kernel is evaluated on the binned copies
+    assert 'double* unbinned_dphi = h_dphi;' in bin_states
+    assert 'h_phi = bin_phi;' in bin_states
+    assert 'h_dphi = bin_dphi;' in bin_states
+
+    # while only the outputs are restored afterwards, as the inputs are untouched
+    assert __permute('bin_dphi', 'unbinned_dphi', 10, True) in unbin_states
+    assert 'phi' not in unbin_states.replace('dphi', '')
+
+    # and with an evaluation context, the work buffers belong to the context
+    mem = memory_manager('c', order, False, context='ctx')
+    mem.add_arrays([phi, P, dphi], in_arrays=['phi', 'P_arr'],
+                   out_arrays=['dphi'])
+    bin_states, _ = mem.get_state_binning(1000)
+    assert 'reserve_state_bins(&ctx->bins, ' in bin_states
+
+
+@parameterized([('C',), ('F',)])
+def test_state_binning_permutation(order):
+    # numerically tests the partitioning of the states about the temperature
+    # breakpoint, and the restoration of their original order
+    from pyjac.libgen.libgen import compiler, file_struct, libgen
+    num, width, T_mid = 11, 3, 1000.
+    np.random.seed(0)
+    phi = np.random.uniform(500, 1500, (num, width))
+    # ensure both bins (and a state exactly at the breakpoint) are present
+    phi[:3, 0] = [600, T_mid, 1400]
+
+    src = Template("""
+#include <stdio.h>
+#include "state_binning.h"
+
+int main()
+{
+    const double phi[${size}] = {${phi}};
+    double restored[${size}];
+    state_bins bins = {0, NULL, NULL};
+    if (!reserve_state_bins(&bins, ${num}, ${width}))
+        return 1;
+    size_t num_lo = bin_states(${num}, phi, ${stride}, ${T_mid}, bins.perm);
+    permute_states(phi, bins.data, bins.perm, ${num}, ${width}, '${order}', false);
+    permute_states(bins.data, restored, bins.perm, ${num}, ${width}, '${order}',
+                   true);
+    FILE* file = fopen("binned.bin", "wb");
+    fwrite(bins.data, sizeof(double), ${size}, file);
+    fwrite(restored, sizeof(double), ${size}, file);
+    fclose(file);
+    free_state_bins(&bins);
+    return num_lo == ${num_lo} ? 0 : 2;
+}
+""").substitute(size=phi.size,
+                phi=', '.join(repr(float(x)) for x in phi.flatten(order)),
+                num=num, width=width, T_mid=repr(T_mid), order=order,
+                stride=width if order == 'C' else 1,
+                num_lo=np.count_nonzero(phi[:, 0] < T_mid))
+
+    build = mkdtemp()
+    try:
+        with open(os.path.join(build, 'test.c'), 'w') as file:
+            file.write(src)
+        shutil.copyfile(os.path.join(
+            os.path.dirname(__file__), os.pardir, 'kernel_utils', 'common',
+            'state_binning.h'), os.path.join(build, 'state_binning.h'))
+        assert not compiler(file_struct('c', 'c', 'test', [build], [], build,
+                                        build, True, True))
+        lib = libgen('c', build, build, ['test'], True, False, True)
+        subprocess.check_call([os.path.join(build, lib)], cwd=build)
+
+        binned, restored = np.fromfile(
+            os.path.join(build, 'binned.bin')).reshape((2, -1))
+        binned = binned.reshape(phi.shape, order=order)
+        restored = restored.reshape(phi.shape, order=order)
+        # the states below the breakpoint come first, in their original order
+        lo = phi[:, 0] < T_mid
+        perm = np.concatenate((np.where(lo)[0], np.where(~lo)[0]))
+        assert np.array_equal(binned, phi[perm])
+        # and the original order is restored exactly
+        assert np.array_equal(restored, phi)
+    finally:
+        shutil.rmtree(build, ignore_errors=True)
+
+
+@parameterized([('C',), ('F',)])
+def test_mechanism_reordering(order):
+    # tests the generated conversion to / from the original order of a reordered
+    # mechanism
+    phi = lp.GlobalArg('phi', shape=(problem_size.name, 4), dtype=np.float64)
+    P = lp.GlobalArg('P_arr', shape=(problem_size.name,), dtype=np.float64)
+    jac = lp.GlobalArg('jac', shape=(problem_size.name, 4, 4), dtype=np.float64)
+    mem = memory_manager('c', order, False, context='ctx')
+    mem.add_arrays([phi, P, jac], in_arrays=['phi', 'P_arr'],
+                   out_arrays=['jac'])
+    maps = MechanismOrder([1, 0, 2], [0]).entry_maps(order)
+    reorder_states, restore_states = mem.get_mechanism_reordering(maps)
+
+    # the maps are stored, and the work buffers are sized for the reordered
+    # arrays only
+    assert 'static const int reorder_phi[4] = {0, 1, 3, 2};' in reorder_states
+    assert 'reorder_P_arr' not in reorder_states
+    assert 'reserve_reorder_buffers(&ctx->reorder, problem_size, 4 + 16);' in \
+        reorder_states
+    assert 'double* kernel_jac = &ctx->reorder.data[(4) * problem_size];' in \
+        reorder_states
+
+    def __reorder(src, dest, arr, width, to_kernel):
+        return ("reorder_entries({}, {}, reorder_{}, problem_size, {}, "
+                "'{}', {});".format(src, dest, arr, width, order,
+                                    'true' if to_kernel else 'false'))
+
+    # the inputs are converted to the kernel's order before execution
+    assert __reorder('h_phi', 'kernel_phi', 'phi', 4, True) in reorder_states
+    assert 'h_phi = kernel_phi;' in reorder_states
+    assert 'double* original_jac = h_jac;' in reorder_states
+    # and only the outputs are converted back afterwards
+    assert restore_states == __reorder(
+        'kernel_jac', 'original_jac', 'jac', 16, False)
+
+    # while a kernel without reordered arrays is unchanged
+    assert mem.get_mechanism_reordering({}) == ('', '')
+
+
+@parameterized([('C',), ('F',)])
+def test_mechanism_reordering_conversion(order):
+    # numerically tests the conversion of the kernel's arrays to / from the
+    # original order of a reordered mechanism
+    from pyjac.libgen.libgen import compiler, file_struct, libgen
+    num = 3
+    mech_order = MechanismOrder([2, 0, 3, 1], [1, 0])
+    maps = mech_order.entry_maps(order)
+    np.random.seed(0)
+    phi = np.random.rand(num, 5)
+    jac = np.random.rand(num, 5, 5)
+    kernel_jac = jac[:, mech_order.state_map][:, :, mech_order.state_map]
+
+    def __arr(arr):
+        return ', '.join(repr(float(x)) for x in arr.flatten(order))
+
+    src = Template("""
+#include <stdio.h>
+#include "mechanism_order.h"
+
+int main()
+{
+    const int phi_map[5] = {${phi_map}};
+    const int jac_map[25] = {${jac_map}};
+    const double phi[${phi_size}] = {${phi}};
+    const double kernel_jac[${jac_size}] = {${kernel_jac}};
+    double kernel_phi[${phi_size}];
+    double jac[${jac_size}];
+    reorder_entries(phi, kernel_phi, phi_map, ${num}, 5, '${order}', true);
+    reorder_entries(kernel_jac, jac, jac_map, ${num}, 25, '${order}', false);
+    FILE* file = fopen("reordered.bin", "wb");
+    fwrite(kernel_phi, sizeof(double), ${phi_size}, file);
+    fwrite(jac, sizeof(double), ${jac_size}, file);
+    fclose(file);
+    return 0;
+}
+""").substitute(phi_map=', '.join(str(x) for x in maps['phi']),
+                jac_map=', '.join(str(x) for x in maps['jac']),
+                phi_size=phi.size, jac_size=jac.size, phi=__arr(phi),
+                kernel_jac=__arr(kernel_jac), num=num, order=order)
+
+    build = mkdtemp()
+    try:
+        with open(os.path.join(build, 'test.c'), 'w') as file:
+            file.write(src)
+        shutil.copyfile(os.path.join(
+            os.path.dirname(__file__), os.pardir, 'kernel_utils', 'common',
+            'mechanism_order.h'), os.path.join(build, 'mechanism_order.h'))
+        assert not compiler(file_struct('c', 'c', 'test', [build], [], build,
+                                        build, True, True))
+        lib = libgen('c', build, build, ['test'], True, False, True)
+        subprocess.check_call([os.path.join(build, lib)], cwd=build)
+
+        out = np.fromfile(os.path.join(build, 'reordered.bin'))
+        # the state vectors are converted to the kernel's order
+        assert np.array_equal(out[:phi.size].reshape(phi.shape, order=order),
+                              mech_order.to_kernel(phi))
+        # and the Jacobian back to the original order
+        assert np.array_equal(out[phi.size:].reshape(jac.shape, order=order), jac)
+    finally:
+        shutil.rmtree(build, ignore_errors=True)
+
+
+def test_arena():
+    # tests the assignment of arrays to the slots of the working memory arena
+    def __arr(name, size=10):
+        return lp.GlobalArg(name, shape=(problem_size.name, size), dtype=np.float64)
+
+    phi = __arr('phi')
+    dphi = __arr('dphi')
+    kf = __arr('kf')
+    kr = __arr('kr')
+    rop = __arr('rop')
+    Kc = __arr('Kc', 5)
+    mem = memory_manager('c', 'C', False, arena=True)
+    mem.add_arrays([phi, dphi, kf, kr, rop, Kc], in_arrays=['phi'],
+                   out_arrays=['dphi'])
+
+    def __knl(*args):
+        return type('', (object,), {'args': list(args)})
+
+    mem.set_lifetimes([__knl(phi, kf), __knl(phi, Kc, kr), __knl(kf, kr, rop),
+                       __knl(rop, dphi)])
+    assert mem.lifetimes['kf'] == (0, 2)
+    assert mem.lifetimes['rop'] == (2, 3)
+
+    slots = [[x.name for x in slot] for slot in mem.arena_slots]
+    # the inputs / outputs are never shared, nor are simultaneously live or
+    # differently-shaped arrays
+    assert slots == [['phi'], ['kf'], ['kr'], ['Kc'], ['rop'], ['dphi']]
+
+    # whereas kf and rop are never live at the same time
+    mem.set_lifetimes([__knl(phi, kf), __knl(kf, kr), __knl(phi, rop),
+                       __knl(rop, Kc, dphi)])
+    slots = [[x.name for x in slot] for slot in mem.arena_slots]
+    assert ['kf', 'rop'] in slots
+    assert ['kr'] in slots and ['Kc'] in slots
+
+    # and check the generated allocation
+    allocs = mem.get_mem_allocs()
+    assert 'malloc(arena_size + 63)' in allocs
+    assert 'd_kf = (double*)(arena_base + arena_offset_1);' in allocs
+    assert 'd_rop = (double*)(arena_base + arena_offset_1);' in allocs
+    assert 'free(d_arena);' in mem.get_mem_frees()
+    assert 'free(d_kf);' not in mem.get_mem_frees()
+
+    # and unsupported languages
+    assert not memory_manager('opencl', 'C', False, arena=True).arena_slots
+
+
+def test_cache_tile():
+    # create a fake sysfs cache topology
+    path = mkdtemp()
+    try:
+        caches = [(1, 'Data', '32K', '0,4'),
+                  (1, 'Instruction', '32K', '0,4'),
+                  (2, 'Unified', '256K', '0,4'),
+                  (3, 'Unified', '8192K', '0-7')]
+        for i, (level, ctype, size, shared) in enumerate(caches):
+            index = os.path.join(path, 'index{}'.format(i))
+            os.mkdir(index)
+            for name, value in [('level', level), ('type', ctype), ('size', size),
+                                ('shared_cpu_list', shared)]:
+                with open(os.path.join(index, name), 'w') as file:
+                    file.write('{}\n'.format(value))
+
+        topology = load_cache_topology(path)
+        assert topology == {1: (32 * 1024, 2), 2: (256 * 1024, 2),
+                            3: (8192 * 1024, 8)}
+        assert load_cache_topology(os.path.join(path, 'missing')) == {}
+    finally:
+        shutil.rmtree(path)
+
+    # 10 + 100 doubles per state
+    phi = lp.GlobalArg('phi', shape=(problem_size.name, 10), dtype=np.float64)
+    jac = lp.GlobalArg('jac', shape=(problem_size.name, 100), dtype=np.float64)
+    const = lp.GlobalArg('const', shape=(1000,), dtype=np.float64)
+    mem = memory_manager('c', 'C', False)
+    mem.add_arrays([phi, jac, const], in_arrays=['phi'], out_arrays=['jac'])
+    assert mem.get_state_size() == 110 * 8
+
+    # half of each thread's share of the L2 cache
+    assert mem.get_cache_tile(topology) == (256 * 1024 // 4) // (110 * 8)
+    assert mem.get_cache_tile(topology, level=3) == (8192 * 1024 // 16) // (110 * 8)
+    # and fallbacks
+    assert mem.get_cache_tile({1: (32 * 1024, 1)}) == (16 * 1024) // (110 * 8)
+    assert mem.get_cache_tile({}) == 0
+
+
+def test_profile_instructions():
+    # tests the instrumentation of the sub-kernel calls in the C wrapping kernel
+    from pyjac.kernel_utils.kernel_gen import c_kernel_generator
+    kgen = c_kernel_generator.__new__(c_kernel_generator)
+    kgen.name = 'jacobian_kernel'
+    kgen.lang = 'c'
+    names = ['rateconst_Kc', 'spec_rates', 'dRopi_dnj']
+    instructions = ['{}(j, phi, jac);'.format(x) for x in names]
+    defines, timed, headers, arg = kgen._profile_instructions(names, instructions)
+
+    # the sub-kernel names are stored in order, and padded to a cache line
+    assert 'static const char* jacobian_kernel_profiled[3] = {' \
+        '"rateconst_Kc", "spec_rates", "dRopi_dnj"};' in defines
+    assert 'times[jacobian_kernel_profile_threads][8]' in defines
+    assert '${' not in defines
+    # the timings are stored in the evaluation context, rather than globals
+    assert 'static double' not in defines and 'static size_t' not in defines
+    # and OpenMP is optional
+    assert '#ifdef _OPENMP\n #include <omp.h>' in defines
+
+    # each call is timed, and recorded under its own index in the passed data
+    assert arg == 'jacobian_kernel_profile* profile'
+    assert len(timed) == len(instructions)
+    for i, (insn, call) in enumerate(zip(timed, instructions)):
+        assert call in insn
+        assert insn.count('clock_gettime(CLOCK_MONOTONIC') == 2
+        assert 'jacobian_kernel_profile_record(profile, {}, '.format(i) in insn
+        start = insn.index('&profile_start);')
+        assert start < insn.index(call) < insn.index('&profile_end);')
+
+    # and the profiling data type & functions are exported
+    assert headers[0] == \
+        'typedef struct jacobian_kernel_profile jacobian_kernel_profile;'
+    assert 'void jacobian_kernel_profile_reset(jacobian_kernel_profile* profile);' \
+        in headers
@@ -13,3 +13,15 @@ def test_imported(self):
         """Ensure libgen module imported.
         """
         assert 'pyjac.libgen.libgen' in sys.modules
+
+    def test_driver_files(self):
+        """Ensure the driver program is only built into executables.
+        """
+        for lang in ['c', 'opencl']:
+            _, files = libgen.get_file_list('.', lang, libgen.build_type.jacobian)
+            assert 'jacobian_kernel_main' in files
+            assert 'jacobian_kernel_driver' not in files
+            _, files = libgen.get_file_list('.', lang, libgen.build_type.jacobian,
+                                            as_executable=True)
+            assert 'jacobian_kernel_driver' in files
+            assert 'read_initial_conditions' in files
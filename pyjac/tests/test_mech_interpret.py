@@ -3,11 +3,16 @@
 import tempfile
 import difflib
 import re
+from copy import deepcopy
 
+import numpy as np
 from cantera import __version__ as ct_version
 
 from pyjac.tests import script_dir
-from pyjac.core.mech_interpret import read_mech, read_mech_ct
+from pyjac.core.mech_interpret import read_mech, read_mech_ct, sort_mechanism, \
+    SortType
+from pyjac.pywrap.mechanism_order import MechanismOrder
+from pyjac.pywrap.sparse_jacobian import SparsePattern
 from pyjac.tests.test_utils import xfail
 
 
@@ -64,3 +69,106 @@ def test_equality_checking():
     assert specs_ck[0] == specs_cti[0]
     for i in range(1, len(specs_ck)):
         assert specs_ck[0] != specs_cti[i]
+
+
+def test_sort_mechanism():
+    """ test that mechanism reordering is a permutation of the original mechanism,
+        and that the sorted read matches"""
+    def __names(specs, reacs):
+        return [(sorted(specs[x].name for x in rxn.reac),
+                 sorted(specs[x].name for x in rxn.prod),
+                 sorted((specs[x[0]].name, x[1]) for x in rxn.thd_body_eff),
+                 None if rxn.pdep_sp is None else specs[rxn.pdep_sp].name)
+                for rxn in reacs]
+
+    _, specs, reacs = read_mech_ct(cti_file)
+    names = __names(specs, reacs)
+    spec_names = [sp.name for sp in specs]
+    new_specs, new_reacs, spec_map, reac_map = sort_mechanism(
+        specs, reacs, SortType.rcm)
+
+    assert np.array_equal(np.sort(spec_map), np.arange(len(specs)))
+    assert np.array_equal(np.sort(reac_map), np.arange(len(reacs)))
+    assert [sp.name for sp in new_specs] == [spec_names[i] for i in spec_map]
+    new_names = __names(new_specs, new_reacs)
+    for i, irxn in enumerate(reac_map):
+        assert new_names[i] == names[irxn]
+    # reactions should be grouped by type
+    types = [rxn.type[1].value for rxn in new_reacs]
+    assert types == sorted(types)
+
+    # and check that the sorted read matches
+    _, sort_specs, sort_reacs = read_mech_ct(cti_file, sort_type='rcm')
+    assert [sp.name for sp in sort_specs] == [sp.name for sp in new_specs]
+    assert all(sort_reacs[i] == new_reacs[i] for i in range(len(new_reacs)))
+
+
+def test_sort_mechanism_copies():
+    """ test that mechanism reordering leaves the supplied mechanism untouched, and
+        handles reactions without products"""
+    _, specs, reacs = read_mech_ct(cti_file)
+    reacs[0].prod, reacs[0].prod_nu = [], []
+    original_specs, original_reacs = deepcopy(specs), deepcopy(reacs)
+    new_specs, new_reacs, _, reac_map = sort_mechanism(specs, reacs, SortType.rcm)
+
+    assert all(specs[i] == original_specs[i] for i in range(len(specs)))
+    assert all(reacs[i] == original_reacs[i] for i in range(len(reacs)))
+    assert not any(sp is orig for sp in new_specs for orig in specs)
+    assert not any(rxn is orig for rxn in new_reacs for orig in reacs)
+    irxn = list(reac_map).index(0)
+    assert new_reacs[irxn].prod == [] and new_reacs[irxn].prod_nu == []
+
+
+def test_mechanism_order():
+    """ test conversion to / from the reordered kernel state"""
+    order = MechanismOrder([2, 0, 3, 1], [1, 0])
+    phi = np.random.rand(3, 5)
+    kernel_phi = order.to_kernel(phi)
+    # temperature / extra variable are unchanged
+    assert np.array_equal(kernel_phi[:, :2], phi[:, :2])
+    # the first kernel species is the third species in the original order
+    assert np.array_equal(kernel_phi[:, 2], phi[:, 3])
+    assert np.array_equal(order.from_kernel(kernel_phi), phi)
+
+    jac = np.random.rand(3, 5, 5)
+    kernel_jac = jac[:, order.state_map][:, :, order.state_map]
+    assert np.array_equal(order.jacobian_from_kernel(kernel_jac), jac)
+
+    rop = np.random.rand(3, 2)
+    assert np.array_equal(order.reactions_from_kernel(rop[:, order.reac_map]), rop)
+
+    # per-reaction quantities of a subset of the reactions
+    assert np.array_equal(order.subset_map([0, 1]), [1, 0])
+    assert np.array_equal(order.subset_map([1]), [0])
+
+    # the (flattened) Jacobian
+    for data_order in ['C', 'F']:
+        jac_map = order.jacobian_map(data_order)
+        flat_jac = jac.reshape((3, -1), order=data_order)
+        flat_kernel_jac = kernel_jac.reshape((3, -1), order=data_order)
+        assert np.array_equal(flat_jac[:, jac_map], flat_kernel_jac)
+
+
+def test_mechanism_order_pattern():
+    """ test conversion of the sparsity pattern of the reordered kernel"""
+    order = MechanismOrder([2, 0, 3, 1], [1, 0])
+    np.random.seed(0)
+    jac = np.random.rand(5, 5) * (np.random.rand(5, 5) > 0.5)
+    kernel_jac = jac[np.ix_(order.state_map, order.state_map)]
+
+    def __compress(dense, data_order):
+        dense = dense if data_order == 'C' else dense.T
+        nonzero = [np.nonzero(row)[0] for row in dense]
+        indptr = np.cumsum([0] + [x.size for x in nonzero])
+        values = np.concatenate([row[x] for row, x in zip(dense, nonzero)])
+        return SparsePattern(indptr, np.concatenate(nonzero), data_order), values
+
+    for data_order in ['C', 'F']:
+        kernel_pattern, kernel_values = __compress(kernel_jac, data_order)
+        pattern, values = __compress(jac, data_order)
+        new_pattern, nnz_map = order.pattern_from_kernel(kernel_pattern)
+        assert np.array_equal(new_pattern.indptr, pattern.indptr)
+        assert np.array_equal(new_pattern.indices, pattern.indices)
+        assert np.array_equal(values[nnz_map], kernel_values)
+        assert np.array_equal(order.entry_maps(
+            data_order, pattern=kernel_pattern)['jac'], nnz_map)
@@ -0,0 +1,114 @@
+# Python 2 compatibility
+from __future__ import print_function
+from __future__ import division
+
+import os
+import shutil
+import tempfile
+
+from pyjac.libgen import object_cache as ocache
+
+# a compiler that need not exist, as the tests never compile anything
+args = ['not-a-compiler', '-O3', '-std=c99']
+
+
+def __write(path, contents):
+    with open(path, 'w') as file:
+        file.write(contents)
+
+
+def __source(build):
+    __write(os.path.join(build, 'kernel.c'),
+            '#include "kernel.h"\n#include <stdio.h>\nint f() { return VAL; }\n')
+    __write(os.path.join(build, 'kernel.h'), '#include "defines.h"\n')
+    __write(os.path.join(build, 'defines.h'), '#define VAL 1\n')
+    return os.path.join(build, 'kernel.c')
+
+
+def test_include_files():
+    build = tempfile.mkdtemp()
+    try:
+        source = __source(build)
+        # system headers are not found, while the local headers are found
+        # recursively
+        assert ocache.include_files(source, [build]) == [
+            ('kernel.h', os.path.join(build, 'kernel.h')),
+            ('defines.h', os.path.join(build, 'defines.h'))]
+    finally:
+        shutil.rmtree(build, ignore_errors=True)
+
+
+def test_object_key():
+    build = tempfile.mkdtemp()
+    other = tempfile.mkdtemp()
+    try:
+        source = __source(build)
+        key = ocache.get_object_key(args, 'c', source, [build])
+        # identical sources in another build directory give identical keys
+        assert key == ocache.get_object_key(args, 'c', __source(other), [other])
+        # while any change in the flags, language or includes changes the key
+        assert key != ocache.get_object_key(args + ['-g'], 'c', source, [build])
+        assert key != ocache.get_object_key(args, 'opencl', source, [build])
+        __write(os.path.join(build, 'defines.h'), '#define VAL 2\n')
+        assert key != ocache.get_object_key(args, 'c', source, [build])
+    finally:
+        shutil.rmtree(build, ignore_errors=True)
+        shutil.rmtree(other, ignore_errors=True)
+
+
+def test_store_and_load():
+    cache_dir = tempfile.mkdtemp()
+    build = tempfile.mkdtemp()
+    try:
+        obj = os.path.join(build, 'kernel.o')
+        assert not ocache.load(cache_dir, 'key', obj)
+        __write(obj, 'object code')
+        ocache.store(cache_dir, 'key', obj)
+        os.remove(obj)
+        assert ocache.load(cache_dir, 'key', obj)
+        with open(obj, 'r') as file:
+            assert file.read() == 'object code'
+        # no temporary files are left behind
+        assert os.listdir(cache_dir) == ['key' + ocache.obj_ext]
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        shutil.rmtree(build, ignore_errors=True)
+
+
+def test_evict():
+    cache_dir = tempfile.mkdtemp()
+    build = tempfile.mkdtemp()
+    try:
+        obj = os.path.join(build, 'kernel.o')
+        __write(obj, 'x' * 10)
+        for i, key in enumerate(['a', 'b', 'c']):
+            ocache.store(cache_dir, key, obj)
+            entry = os.path.join(cache_dir, key + ocache.obj_ext)
+            os.utime(entry, (i, i))
+        # loading an entry marks it as recently used
+        assert ocache.load(cache_dir, 'a', obj)
+        assert ocache.evict(cache_dir, 30) == []
+        assert ocache.evict(cache_dir, 15) == ['b', 'c']
+        assert os.listdir(cache_dir) == ['a' + ocache.obj_ext]
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        shutil.rmtree(build, ignore_errors=True)
+
+
+def test_is_current():
+    build = tempfile.mkdtemp()
+    try:
+        lib = os.path.join(build, 'libc_pyjac.a')
+        key = ocache.get_link_key(['ar', 'rcs', lib], ['a', 'b'])
+        assert key != ocache.get_link_key(['ar', 'rcs', lib], ['a', 'c'])
+        # no library
+        ocache.mark_current(lib, key)
+        assert not ocache.is_current(lib, key)
+        __write(lib, 'library')
+        assert ocache.is_current(lib, key)
+        assert not ocache.is_current(lib, 'other')
+        # and the record may be removed
+        ocache.mark_current(lib, None)
+        assert not ocache.is_current(lib, key)
+    finally:
+        shutil.rmtree(build, ignore_errors=True)
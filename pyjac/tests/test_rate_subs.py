@@ -1,5 +1,6 @@
 # system
 from collections import defaultdict
+import copy
 
 # local imports
 from pyjac.core.rate_subs import (
@@ -20,6 +21,7 @@
 from pyjac.tests.test_utils import (get_comparable, indexer, _generic_tester,
                                     _full_kernel_test)
 from pyjac.libgen import build_type
+from pyjac import utils
 
 # modules
 import cantera as ct
@@ -30,6 +32,70 @@
 import six
 
 
+def _reference_stoichiometry(reacs, specs):
+    """
+    The original (loop-based) construction of the net stoichiometric information
+    in :func:`assign_rates`, used to check the vectorized implementation
+    """
+    nu_sum = []
+    net_num_spec = []
+    net_spec = []
+    net_nu = []
+    reac_has_ns = []
+    ns_nu = []
+    for i_rxn, rxn in enumerate(reacs):
+        spec_list = sorted(set(rxn.reac[:] + rxn.prod[:]))
+        net_spec.extend(spec_list)
+        net_num_spec.append(len(spec_list))
+        for spec in spec_list:
+            ind = next((i for i, x in enumerate(rxn.reac) if x == spec), None)
+            reac_nu = rxn.reac_nu[ind] if ind is not None else 0
+            ind = next((i for i, x in enumerate(rxn.prod) if x == spec), None)
+            prod_nu = rxn.prod_nu[ind] if ind is not None else 0
+            net_nu.extend([prod_nu, reac_nu])
+        nu_sum.append(sum([utils.get_nu(isp, rxn) for isp in spec_list]))
+
+        ns_reac_ind = next((i for i, x in enumerate(rxn.reac[:])
+                            if x == len(specs) - 1), None)
+        ns_reac_nu = rxn.reac_nu[ns_reac_ind] if ns_reac_ind is not None else 0
+        ns_prod_ind = next((i for i, x in enumerate(rxn.prod[:])
+                            if x == len(specs) - 1), None)
+        ns_prod_nu = rxn.prod_nu[ns_prod_ind] if ns_prod_ind is not None else 0
+        if ns_reac_nu or ns_prod_nu:
+            reac_has_ns.append(i_rxn)
+            ns_nu.extend([ns_prod_nu, ns_reac_nu])
+
+    spec_to_reac = []
+    spec_nu = []
+    spec_reac_count = []
+    spec_list = []
+    for ispec, spec in enumerate(specs):
+        reac_list = [x for x in [(irxn, utils.get_nu(ispec, rxn))
+                                 for irxn, rxn in enumerate(reacs)] if x[1]]
+        if reac_list:
+            reac_list, nu_list = zip(*reac_list)
+            spec_to_reac.extend(reac_list)
+            spec_nu.extend(nu_list)
+            spec_reac_count.append(len(reac_list))
+            spec_list.append(ispec)
+
+    allint = all(utils.is_integer(nu) for nu in net_nu)
+    dtype = np.int32 if allint else np.float64
+    return {'net': {'num_reac_to_spec': np.array(net_num_spec, dtype=np.int32),
+                    'nu_sum': np.array(nu_sum, dtype=dtype),
+                    'nu': np.array(net_nu, dtype=dtype),
+                    'reac_to_spec': np.array(net_spec, dtype=np.int32),
+                    'allint': allint},
+            'net_per_spec': {
+                'reac_count': np.array(spec_reac_count, dtype=np.int32),
+                'nu': np.array(spec_nu, dtype=dtype),
+                'reacs': np.array(spec_to_reac, dtype=np.int32),
+                'map': np.array(spec_list, dtype=np.int32),
+                'allint': allint},
+            'reac_has_ns': np.array(reac_has_ns, dtype=np.int32),
+            'ns_nu': np.array(ns_nu, dtype=dtype)}
+
+
 class kf_wrapper(object):
     """
     Simple wrapper that calculates Kf / Kf_fall based on order for use in a
@@ -442,6 +508,35 @@ def test_assign(type_max, fall):
         assert np.array_equal(result['thd']['spec_num'], thd_sp_num)
         assert np.array_equal(result['thd']['spec'], thd_sp)
 
+    def test_assign_rates_stoichiometry(self):
+        def __check(reacs, specs):
+            result = assign_rates(reacs, specs, RateSpecialization.fixed)
+            ref = _reference_stoichiometry(reacs, specs)
+            for key in ['net', 'net_per_spec']:
+                for subkey in ref[key]:
+                    if subkey == 'allint':
+                        assert result[key][subkey] == ref[key][subkey]
+                        continue
+                    assert result[key][subkey].dtype == ref[key][subkey].dtype
+                    assert np.array_equal(result[key][subkey], ref[key][subkey])
+            for key in ['reac_has_ns', 'ns_nu']:
+                assert result[key].dtype == ref[key].dtype
+                assert np.array_equal(result[key], ref[key])
+
+        reacs = self.store.reacs
+        specs = self.store.specs
+        __check(reacs, specs)
+
+        # and check non-integer stoichiometric coefficients / repeated species
+        reacs = [copy.deepcopy(x) for x in reacs]
+        for i, rxn in enumerate(reacs):
+            if i % 3 == 0:
+                rxn.reac_nu = type(rxn.reac_nu)(0.5 * nu for nu in rxn.reac_nu)
+            if i % 5 == 0:
+                rxn.prod = rxn.prod[:] + rxn.reac[:1]
+                rxn.prod_nu = rxn.prod_nu[:] + rxn.reac_nu[:1]
+        __check(reacs, specs)
+
     def __generic_rate_tester(self, func, kernel_calls, do_ratespec=False,
                               do_ropsplit=False, do_conp=False, **kwargs):
         """
@@ -694,7 +789,9 @@ def test_rev_rates(self):
         ref_kc = self.store.equilibrium_constants.copy()
         ref_B = self.store.ref_B_rev.copy()
         ref_rev = self.store.rev_rate_constants.copy()
+        phi = self.store.phi_cp.copy()
         args = {'b': lambda x: np.array(ref_B, order=x, copy=True),
+                'phi': lambda x: np.array(phi, order=x, copy=True),
                 'kf': lambda x: np.array(ref_fwd_rates, order=x, copy=True),
                 'Kc': lambda x: np.zeros_like(ref_kc, order=x),
                 'kr': lambda x: np.zeros_like(ref_rev, order=x)}
@@ -709,7 +806,31 @@ def test_rev_rates(self):
         kc = kernel_call('Kc', [ref_kc, ref_rev],
                          out_mask=[0, 1], **args)
 
-        self.__generic_rate_tester(get_rev_rates, kc, allint=allint)
+        self.__generic_rate_tester(get_rev_rates, kc, allint=allint,
+                                   do_kc_polynomials=True)
+
+    def test_kc_polynomials(self):
+        result = assign_rates(self.store.reacs, self.store.specs,
+                              RateSpecialization.fixed)
+        rev = result['rev']
+        assert rev['kc']['common']
+        T = self.store.T
+        # evaluate the B-sum from the per-reaction polynomials
+        lo = T[:, np.newaxis] < rev['kc']['T_mid'][np.newaxis, :]
+
+        def __eval(c):
+            return (T[:, np.newaxis] * (T[:, np.newaxis] * (
+                T[:, np.newaxis] * (T[:, np.newaxis] * c[:, 4] + c[:, 3]) +
+                c[:, 2]) + c[:, 1]) + c[:, 0] * np.log(T[:, np.newaxis]) +
+                c[:, 5] / T[:, np.newaxis] + c[:, 6])
+        B_sum = np.where(lo, __eval(rev['kc']['lo']), __eval(rev['kc']['hi']))
+
+        # and compare to the sum over the species Gibbs polynomials
+        nu = self.store.gas.product_stoich_coeffs() - \
+            self.store.gas.reactant_stoich_coeffs()
+        ref_B = self.store.ref_B_rev.copy()
+        ref_B_sum = np.dot(ref_B, nu[:, rev['map']])
+        assert np.allclose(B_sum, ref_B_sum, rtol=1e-8, atol=1e-8)
 
     @attr('long')
     def test_pressure_mod(self):
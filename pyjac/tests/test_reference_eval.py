@@ -0,0 +1,65 @@
+import os
+from unittest.case import SkipTest
+
+import numpy as np
+
+from pyjac.core.reference_eval import reference_evaluator
+from pyjac.core.mech_interpret import read_mech, read_mech_ct
+from pyjac.tests import TestClass, script_dir, get_mechanism_file
+
+
+class SubTest(TestClass):
+
+    def __get_eval(self):
+        return reference_evaluator(self.store.specs, self.store.reacs)
+
+    def test_thermo(self):
+        thermo = self.__get_eval().thermo(self.store.T)
+        assert np.allclose(thermo['cp'], self.store.spec_cp)
+        assert np.allclose(thermo['cv'], self.store.spec_cv)
+        assert np.allclose(thermo['h'], self.store.spec_h)
+        assert np.allclose(thermo['u'], self.store.spec_u)
+        assert np.allclose(thermo['b'], self.store.spec_b)
+
+    def test_rates(self):
+        evaluator = self.__get_eval()
+        values = evaluator.eval(self.store.phi_cp, self.store.P, conp=True)
+
+        assert np.allclose(values['conc'], self.store.concs)
+        assert np.allclose(values['Kc'], self.store.equilibrium_constants)
+        assert np.allclose(values['pres_mod'], self.store.ref_pres_mod)
+
+        # the forward / reverse rates of progress exclude the pressure
+        # modification
+        fwd = values['rop_fwd'].copy()
+        fwd[:, evaluator.thd_map] *= values['pres_mod']
+        assert np.allclose(fwd, self.store.fwd_rxn_rate)
+        rev = values['rop_rev'].copy()
+        rev_thd = np.where(np.in1d(evaluator.rev_map, evaluator.thd_map))[0]
+        thd_rev = np.where(np.in1d(evaluator.thd_map, evaluator.rev_map))[0]
+        rev[:, rev_thd] *= values['pres_mod'][:, thd_rev]
+        assert np.allclose(rev, self.store.rev_rxn_rate)
+
+        assert np.allclose(values['rop_net'], self.store.rxn_rates)
+        assert np.allclose(values['wdot'], self.store.species_rates)
+
+    def test_dphi(self):
+        evaluator = self.__get_eval()
+        values = evaluator.eval(self.store.phi_cp, self.store.P, conp=True)
+        assert np.allclose(values['dphi'], self.store.dphi_cp)
+        values = evaluator.eval(self.store.phi_cv, self.store.V, conp=False)
+        assert np.allclose(values['dphi'], self.store.dphi_cv)
+
+    def test_chemkin(self):
+        # the chemkin and cantera formats of the test mechanism give the same
+        # answers
+        if os.path.basename(get_mechanism_file()) != 'test.cti':
+            raise SkipTest('Test states are not for the test mechanism')
+        _, specs, reacs = read_mech_ct(os.path.join(script_dir, 'test.cti'))
+        ct_values = reference_evaluator(specs, reacs).eval(
+            self.store.phi_cp, self.store.P)
+        _, specs, reacs = read_mech(os.path.join(script_dir, 'test.inp'), None)
+        ck_values = reference_evaluator(specs, reacs).eval(
+            self.store.phi_cp, self.store.P)
+        for key in ['kf', 'pres_mod', 'wdot', 'dphi']:
+            assert np.allclose(ct_values[key], ck_values[key]), key
@@ -0,0 +1,147 @@
+# Python 2 compatibility
+from __future__ import print_function
+from __future__ import division
+
+import os
+import shutil
+import sqlite3
+import tempfile
+
+from pyjac.performance_tester import results_store as rs
+
+
+def __record(rev, kernel_time, problem_size=1024, config='jac_c_1_C'):
+    return {'mechanism': 'h2', 'mech_hash': 'hash', 'rtype': 'jac',
+            'config': config, 'num_cores': 1, 'problem_size': problem_size,
+            'setup_time': 0.1, 'compilation_time': -1, 'kernel_time': kernel_time,
+            'git_rev': rev}
+
+
+def test_store_and_compare():
+    path = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(path, rs.store_filename)
+        with rs.ResultsStore(filename) as store:
+            for time in [2., 4.]:
+                store.add(__record('abcdef', time))
+                store.add(__record('123456', time / 2.))
+            # only in the base revision
+            store.add(__record('abcdef', 1., config='jac_c_1_F'))
+
+        # check persistence
+        with rs.ResultsStore(filename) as store:
+            assert store.count() == 5
+            assert store.count(git_rev='abc') == 3
+            assert store.count(git_rev='abc', config='jac_c_1_C') == 2
+            record = store.query(git_rev='123456')[0]
+            assert record['host'] and record['version'] == rs.__version__
+
+            comparison = store.compare('abc', '123')
+            assert len(comparison) == 1
+            key, base, new, speedup = comparison[0]
+            assert key[3] == 'jac_c_1_C'
+            assert base == 3. and new == 1.5 and speedup == 2.
+
+        # and the command line interface flags regressions
+        assert rs.main(['compare', filename, 'abc', '123']) == 0
+        assert rs.main(['compare', filename, '123', 'abc']) == 1
+        assert rs.main(['query', filename, '-g', 'abc']) == 0
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def test_compare_variant():
+    path = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(path, rs.store_filename)
+        with rs.ResultsStore(filename) as store:
+            for size in [1024, 65536]:
+                store.add(__record('abcdef', 4., problem_size=size,
+                                   config='jac_c_1_C_conp'))
+                store.add(__record('abcdef', 4. if size == 1024 else 2.,
+                                   problem_size=size,
+                                   config='jac_c_1_C_conp_tiled'))
+            # no untiled run to compare to
+            store.add(__record('abcdef', 1., config='jac_c_1_F_conp_tiled'))
+            # or at a different revision
+            store.add(__record('123456', 1., config='jac_c_1_C_conp_tiled'))
+
+            comparison = store.compare_variant('_tiled')
+            assert len(comparison) == 2
+            assert all(key[3] == 'jac_c_1_C_conp' and key[6] == 'abcdef'
+                       for key, _, _, _ in comparison)
+            assert [(key[5], speedup) for key, _, _, speedup in comparison] == [
+                (1024, 1.), (65536, 2.)]
+            assert not store.compare_variant('_binned')
+
+        assert rs.main(['variant', filename, '-g', 'abc']) == 0
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def test_profile():
+    path = tempfile.mkdtemp()
+    try:
+        # a profiled run on two threads
+        profile_file = os.path.join(path, 'jacobian_kernel_profile.csv')
+        with open(profile_file, 'w') as file:
+            file.write('kernel,thread,calls,time\n'
+                       'rateconst_Kc,0,512,1.5\n'
+                       'spec_rates,0,512,4.0\n'
+                       'rateconst_Kc,1,512,2.5\n'
+                       'spec_rates,1,512,3.0\n')
+        profile = rs.load_profile(profile_file)
+        assert list(profile.keys()) == ['rateconst_Kc', 'spec_rates']
+        assert profile['rateconst_Kc'] == {'calls': 1024, 'time': 4.,
+                                           'max_time': 2.5}
+        assert profile['spec_rates'] == {'calls': 1024, 'time': 7.,
+                                         'max_time': 4.}
+
+        filename = os.path.join(path, rs.store_filename)
+        # create a store without the profile field, as in older versions
+        fields = rs.fields.copy()
+        del fields['profile']
+        conn = sqlite3.connect(filename)
+        conn.execute('CREATE TABLE runs ({})'.format(
+            ', '.join('{} {}'.format(k, v) for k, v in fields.items())))
+        conn.commit()
+        conn.close()
+
+        with rs.ResultsStore(filename) as store:
+            record = __record('abcdef', 11.)
+            record['profile'] = profile
+            store.add(record)
+            store.add(__record('abcdef', 10.))
+            stored = store.query()
+            assert stored[0]['profile'] == profile
+            assert list(stored[0]['profile'].keys()) == list(profile.keys())
+            assert stored[1]['profile'] is None
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def test_dirty_and_legacy():
+    path = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(path, rs.store_filename)
+        with rs.ResultsStore(filename) as store:
+            store.add(__record('abcdef', 1.))
+            store.add(__record('abcdef' + rs.dirty_suffix, 2.))
+            # results of uncommitted changes are kept separate from the clean
+            # revision
+            assert store.count(git_rev='abc') == 1
+            assert store.count(git_rev='abcdef') == 1
+            assert store.count(git_rev='abc' + rs.dirty_suffix) == 1
+            assert store.query(git_rev='abcdef-dirty')[0]['kernel_time'] == 2.
+
+        # results of older versions of the performance tester
+        legacy = os.path.join(path, 'jac_c_1_C.txt')
+        with open(legacy, 'w') as file:
+            file.write('compiling...\n'
+                       '1024,-1,0.1,2.5\n'
+                       'not,a,valid,run\n'
+                       '2048,-1,0.2,5.0\n')
+        assert rs.load_legacy(legacy) == [(1024, -1., 0.1, 2.5),
+                                          (2048, -1., 0.2, 5.)]
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
@@ -127,10 +127,13 @@ def test_load_codegen():
     assert platform.width == 4
     assert not platform.depth
     assert platform.use_atomics is True
+    assert platform.double_buffer is False
+    assert platform.arena is False
 
 
 def test_matrix_schema_specification():
     runschema('test_matrix_schema.yaml', 'test_matrix.yaml')
+    runschema('test_matrix_schema.yaml', 'cache_tiling_benchmark.yaml')
 
 
 def __get_test_matrix(**kwargs):
@@ -292,6 +295,9 @@ def test_override():
                 gpuvecsize: [128]
                 vectype: ['wide']
                 models: ['C2H4']
+                temperature_binning: [True, False]
+                cache_tiling: [True]
+                profile: [True, False]
             """))
         file.flush()
         file.seek(0)
@@ -304,6 +310,9 @@ def test_override():
     assert data['gpuvecsize'] == [128]
     assert data['vectype'] == ['wide']
     assert data['models'] == ['C2H4']
+    assert data['temperature_binning'] == [True, False]
+    assert data['cache_tiling'] == [True]
+    assert data['profile'] == [True, False]
 
     # now test embedded overrides
     with NamedTemporaryFile(mode='w', suffix='.yaml') as file:
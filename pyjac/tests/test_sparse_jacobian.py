@@ -0,0 +1,123 @@
+# Python 2 compatibility
+from __future__ import print_function
+from __future__ import division
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from unittest.case import SkipTest
+from parameterized import parameterized
+
+from pyjac.core.create_jacobian import determine_jac_inds, determine_lu_structure
+from pyjac.loopy_utils.loopy_utils import RateSpecialization
+from pyjac.pywrap.sparse_jacobian import SparsePattern, LUPattern, \
+    pattern_from_jac_inds
+from pyjac.tests import TestClass
+
+
+class SubTest(TestClass):
+    def __jac_inds(self):
+        return determine_jac_inds(self.store.reacs, self.store.specs,
+                                  RateSpecialization.fixed)['jac_inds']
+
+    def __dense(self, values, order):
+        # construct the dense Jacobian from the sparse values
+        inds = self.__jac_inds()['flat_{}'.format(order)]
+        size = len(self.store.specs) + 1
+        jac = np.zeros((values.shape[0], size, size))
+        jac[:, inds[:, 0], inds[:, 1]] = values
+        return jac
+
+    @parameterized.expand([('C',), ('F',)])
+    def test_pattern(self, order):
+        jac_inds = self.__jac_inds()
+        pattern = pattern_from_jac_inds(jac_inds, order)
+        size = len(self.store.specs) + 1
+        assert pattern.shape == (size, size)
+        assert pattern.nnz == jac_inds['flat_C'].shape[0]
+        assert pattern.format == ('csr' if order == 'C' else 'csc')
+        values = pattern.values(self.store.test_size)
+        assert values.shape == (self.store.test_size, pattern.nnz)
+        assert values.flags['{}_CONTIGUOUS'.format(order)]
+
+        # check save / load roundtrip
+        path = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(path, 'pattern.npz')
+            pattern.save(filename)
+            loaded = SparsePattern.load(filename)
+            assert loaded.order == order
+            assert np.array_equal(loaded.indptr, pattern.indptr)
+            assert np.array_equal(loaded.indices, pattern.indices)
+        finally:
+            shutil.rmtree(path, ignore_errors=True)
+
+    @parameterized.expand([('C',), ('F',)])
+    def test_to_scipy(self, order):
+        try:
+            from scipy import sparse
+        except ImportError:
+            raise SkipTest('Cannot test sparse Jacobian conversion without scipy')
+
+        pattern = pattern_from_jac_inds(self.__jac_inds(), order)
+        n_states = 5
+        values = pattern.values(n_states)
+        values[:] = np.random.uniform(1, 2, size=values.shape)
+        dense = self.__dense(values, order)
+
+        # individual matricies
+        for i, mat in enumerate(pattern.to_scipy(values, block_diagonal=False)):
+            assert mat.format == pattern.format
+            assert np.array_equal(mat.toarray(), dense[i])
+
+        # and block diagonal
+        block = pattern.to_scipy(values)
+        assert block.format == pattern.format
+        assert np.array_equal(block.toarray(),
+                              sparse.block_diag(dense).toarray())
+        # check that the cached pattern is reused
+        indptr, indices = pattern.block_pattern(n_states)
+        assert pattern.block_pattern(n_states)[0] is indptr
+        assert np.array_equal(indptr, block.indptr)
+        assert np.array_equal(indices, block.indices)
+
+    def test_lu_pattern(self):
+        jac_inds = self.__jac_inds()
+        pattern = LUPattern.from_lu_info(determine_lu_structure(jac_inds))
+        size = len(self.store.specs) + 1
+        assert pattern.shape == (size, size)
+
+        # factor a random iteration matrix on the pattern
+        n_states = 5
+        rand = np.random.RandomState(seed=0)
+        values = np.zeros((n_states, size, size))
+        values[:, jac_inds['flat_C'][:, 0], jac_inds['flat_C'][:, 1]] = \
+            rand.uniform(-1, 1, size=(n_states, jac_inds['flat_C'].shape[0]))
+        iter_mat = np.eye(size)[np.newaxis, :, :] - 1e-3 * values
+        lu = iter_mat[:, pattern.perm][:, :, pattern.perm]
+        for k in range(size - 1):
+            lu[:, k + 1:, k] /= lu[:, k, k][:, np.newaxis]
+            lu[:, k + 1:, k + 1:] -= lu[:, k + 1:, k][:, :, np.newaxis] * \
+                lu[:, k, k + 1:][:, np.newaxis, :]
+        rows = np.repeat(np.arange(size), np.diff(pattern.indptr))
+        lu = lu[:, rows, pattern.indices]
+        assert lu.shape == (n_states, pattern.nnz)
+
+        # check the solution
+        rhs = rand.rand(n_states, size)
+        sol = pattern.solve(lu, rhs)
+        assert np.allclose(np.einsum('ijk,ik->ij', iter_mat, sol), rhs)
+        assert np.allclose(pattern.solve(lu[0], rhs[0]), sol[0])
+
+        # and the save / load roundtrip
+        path = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(path, 'lu_pattern.npz')
+            pattern.save(filename)
+            loaded = LUPattern.load(filename)
+            for attr in ['perm', 'indptr', 'indices', 'diag']:
+                assert np.array_equal(getattr(loaded, attr), getattr(pattern, attr))
+        finally:
+            shutil.rmtree(path, ignore_errors=True)
@@ -24,9 +24,12 @@ def __test_cases():
     for state in OptionLoop(OrderedDict(
             [('lang', ['opencl', 'c']), ('order', ['C', 'F']),
              ('width', [4, None]), ('depth', [4, None]),
-             ('device_type', (cl.device_type.CPU, cl.device_type.GPU, None))])):
+             ('device_type', (cl.device_type.CPU, cl.device_type.GPU, None)),
+             ('double_buffer', [False, True])])):
         if state['depth'] and state['width']:
             continue
+        elif state['double_buffer'] and state['lang'] != 'opencl':
+            continue
         elif (state['depth'] is not None or state['width'] is not None) \
                 and state['lang'] == 'c':
             continue
@@ -111,7 +114,8 @@ def __create(shape):
     # now create a simple library
     mem = memory_manager(opts.lang, opts.order, asplit._have_split(),
                          dev_type=state['device_type'],
-                         strided_c_copy=lang == 'c')
+                         strided_c_copy=lang == 'c',
+                         double_buffer=state['double_buffer'])
     mem.add_arrays([x for x in lp_arrays],
                    in_arrays=[x.name for x in lp_arrays if x not in const],
                    out_arrays=[x.name for x in lp_arrays if x not in const],
@@ -138,13 +142,20 @@ def __create(shape):
     {
         ${type} this_run = problem_size - offset < per_run ? \
             problem_size - offset : per_run;
+        /* select the ping-pong buffers, if double-buffered */
+        int buffer = (offset / per_run) % 2;
+        ${buffer_select}
         /* Memory Transfers into the kernel, if any */
         ${mem_transfers_in}
 
         /* Memory Transfers out */
         ${mem_transfers_out}
     }
+    ${sync}
     """).safe_substitute(type=size_type,
+                         buffer_select=mem.get_buffer_selection(),
+                         sync='check_err(clFinish(copy_queue));'
+                              if mem.double_buffer else '',
                          mem_transfers_in=mem._mem_transfers(
                             to_device=True, host_postfix='_save'),
                          mem_transfers_out=mem.get_mem_transfers_out(),
@@ -213,6 +224,12 @@ def __create(shape):
     queue = clCreateCommandQueue(context, device[0], 0, &return_code);
     check_err(return_code);
     """
+    if mem.double_buffer:
+        ocl_preamble += """
+    cl_command_queue copy_queue;
+    copy_queue = clCreateCommandQueue(context, device[0], 0, &return_code);
+    check_err(return_code);
+    """
     preamble = ''
     if lang == 'opencl':
         preamble = ocl_preamble
@@ -221,9 +238,13 @@ def __create(shape):
     if lang == 'opencl':
         end = """
         check_err(clFlush(queue));
+        ${release_copy_queue}
         check_err(clReleaseCommandQueue(queue));
         check_err(clReleaseContext(context));
     """
+        end = Template(end).safe_substitute(
+            release_copy_queue='check_err(clReleaseCommandQueue(copy_queue));'
+            if mem.double_buffer else '')
 
     file_src = Template("""
 ${lang_headers}
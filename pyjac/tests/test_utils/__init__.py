@@ -64,6 +64,10 @@ def get_read_ics_source():
     return __get_template(os.path.join(script_dir, 'read_ic_setup.py.in'))
 
 
+def get_evaluator_source():
+    return __get_template(os.path.join(script_dir, 'test_evaluator.py.in'))
+
+
 def clean_dir(dirname, remove_dir=True):
     if not os.path.exists(dirname):
         return
@@ -621,7 +625,7 @@ def reduce_oploop(base, add=None):
 def _get_oploop(owner, do_ratespec=False, do_ropsplit=False, do_conp=True,
                 langs=['c', 'opencl'], do_vector=True, do_sparse=False,
                 do_approximate=False, do_finite_difference=False,
-                sparse_only=False):
+                sparse_only=False, do_kc_polynomials=False):
 
     platforms = load_platforms(owner.store.test_platforms, langs=langs)
     oploop = [('order', ['C', 'F']),
@@ -634,6 +638,9 @@ def _get_oploop(owner, do_ratespec=False, do_ropsplit=False, do_conp=True,
     if do_ropsplit:
         oploop += [
             ('rop_net_kernels', [True])]
+    if do_kc_polynomials:
+        oploop += [
+            ('kc_polynomials', [True, False])]
     if do_conp:
         oploop += [('conp', [True, False])]
     else:
@@ -658,7 +665,7 @@ def _get_oploop(owner, do_ratespec=False, do_ropsplit=False, do_conp=True,
 def _generic_tester(owner, func, kernel_calls, rate_func, do_ratespec=False,
                     do_ropsplit=False, do_conp=False, do_vector=True,
                     do_sparse=False, langs=None,
-                    sparse_only=False, **kwargs):
+                    sparse_only=False, do_kc_polynomials=False, **kwargs):
     """
     A generic testing method that can be used for to test the correctness of
     any _pyJac_ kernel via the supplied :class:`kernel_call`'s
@@ -690,6 +697,8 @@ def _generic_tester(owner, func, kernel_calls, rate_func, do_ratespec=False,
         If true, test sparse jacobian alongside full
     sparse_only: bool [False]
             Test only the sparse jacobian (e.g. for testing indexing)
+    do_kc_polynomials: bool [False]
+        If true, test the per-reaction equilibrium constant polynomials
     kwargs: dict
         Any additional arguements to pass to the :param:`func`
     """
@@ -703,7 +712,8 @@ def _generic_tester(owner, func, kernel_calls, rate_func, do_ratespec=False,
 
     oploop = _get_oploop(owner, do_ratespec=do_ratespec, do_ropsplit=do_ropsplit,
                          langs=langs, do_conp=do_conp, do_sparse=do_sparse,
-                         sparse_only=sparse_only)
+                         sparse_only=sparse_only,
+                         do_kc_polynomials=do_kc_polynomials)
 
     reacs = owner.store.reacs
     specs = owner.store.specs
@@ -798,7 +808,7 @@ def _generic_tester(owner, func, kernel_calls, rate_func, do_ratespec=False,
 def _full_kernel_test(self, lang, kernel_gen, test_arr_name, test_arr,
                       btype, call_name, call_kwds={}, looser_tol_finder=None,
                       atol=1e-8, rtol=1e-5, loose_rtol=1e-4, loose_atol=1,
-                      **oploop_kwds):
+                      extra_inputs=[], wrapper_kwds={}, **oploop_kwds):
     oploop = _get_oploop(self, do_conp=True, do_vector=lang != 'c', langs=[lang],
                          **oploop_kwds)
 
@@ -881,7 +891,7 @@ def __cleanup():
         # generate wrapper
         generate_wrapper(opts.lang, build_dir, build_dir=obj_dir,
                          out_dir=lib_dir, platform=str(opts.platform),
-                         btype=btype)
+                         btype=btype, **wrapper_kwds)
 
         # get arrays
         phi = np.array(
@@ -900,6 +910,9 @@ def __saver(arr, name, namelist):
         args = []
         __saver(phi, 'phi', args)
         __saver(param, 'param', args)
+        # and any additional inputs of the kernel
+        for name, arr in extra_inputs:
+            __saver(np.array(arr(conp), order=opts.order, copy=True), name, args)
 
         # and now the test values
         tests = []
@@ -1198,11 +1211,16 @@ def get_filename(self, state):
         platform = state['platform']
         split = 'split' if state['split_kernels'] else 'single'
         conp = 'conp' if state['conp'] else 'conv'
+        # only mark binned runs, such that existing results remain valid
+        binned = '_binned' if state.get('temperature_binning', False) else ''
+        tiled = '_tiled' if state.get('cache_tiling', False) else ''
+        profiled = '_profiled' if state.get('profile', False) else ''
 
-        return '{}_{}_{}_{}_{}_{}_{}_{}_{}_{}'.format(
+        return '{}_{}_{}_{}_{}_{}_{}_{}_{}_{}{}{}{}'.format(
                 desc, state['lang'], vecsize, state['order'],
                 vectype, platform, state['rate_spec'],
-                split, state['num_cores'], conp) + self.filetype
+                split, state['num_cores'], conp, binned, tiled,
+                profiled) + self.filetype
 
     def post(self):
         pass
@@ -1393,7 +1411,8 @@ def __change_limit(keylist):
         # resize data
         moles = data[:num_conditions, 2:].copy()
 
-        run.pre(gas, {'T': T, 'P': P, 'V': V, 'moles': moles},
+        run.pre(gas, {'T': T, 'P': P, 'V': V, 'moles': moles,
+                      'mech_name': mech_name},
                 num_conditions, max_vec_width)
 
         # clear old data
@@ -1485,6 +1504,11 @@ def __change_limit(keylist):
                                     jac_type=jac_type,
                                     for_validation=for_validation,
                                     seperate_kernels=state['seperate_kernels'],
+                                    temperature_binning=state.get(
+                                        'temperature_binning', False),
+                                    cache_tile='auto' if state.get(
+                                        'cache_tiling', False) else None,
+                                    profile=state.get('profile', False),
                                     mem_limits=test_matrix)
             except MissingPlatformError:
                 # can't run on this platform
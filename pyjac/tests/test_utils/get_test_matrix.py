@@ -213,7 +213,8 @@ def _get(add_none):
 
 # todo -- feed these directly into override schema
 allowed_overrides = ['num_cores', 'gpuorder', 'order', 'conp', 'vecsize', 'vectype',
-                     'gpuvecsize', 'gpuvectype', 'models']
+                     'gpuvecsize', 'gpuvectype', 'models', 'temperature_binning',
+                     'cache_tiling', 'profile']
 jacobian_sub_override_keys = {enum_to_string(JacobianFormat.sparse):
                               allowed_overrides,
                               enum_to_string(JacobianFormat.full):
@@ -528,6 +529,10 @@ def apply_vectypes(lookup, widths, is_wide=is_wide, is_deep=is_deep):
             # default is both conp / conv
             conp = [True, False]
             order = ['C', 'F']
+            # and no temperature binning / cache tiling / profiling
+            binning = [False]
+            tiling = [False]
+            profile = [False]
 
             # loop over possible overrides
             oploop = OptionLoop(OrderedDict(
@@ -554,6 +559,9 @@ def override_log(key, old, new):
                 icores = cores[:]
                 iorder = order[:]
                 iconp = conp[:]
+                ibinning = binning[:]
+                itiling = tiling[:]
+                iprofile = profile[:]
                 ivecsizes = widths[:] if widths is not None else [None]
                 imodels = tuple(models.keys())
                 # load overides
@@ -610,6 +618,18 @@ def override_log(key, old, new):
                             ivectypes_override = overrides[override]
                         elif override == 'gpuvectype' and is_gpu:
                             ivectypes_override = overrides[override]
+                        elif override == 'temperature_binning':
+                            override_log('temperature_binning', ibinning,
+                                         overrides[override])
+                            ibinning = overrides[override]
+                        elif override == 'cache_tiling':
+                            override_log('cache_tiling', itiling,
+                                         overrides[override])
+                            itiling = overrides[override]
+                        elif override == 'profile':
+                            override_log('profile', iprofile,
+                                         overrides[override])
+                            iprofile = overrides[override]
                         elif override == 'models':
                             # check that all models are valid
                             for model in overrides[override]:
@@ -647,6 +667,9 @@ def override_log(key, old, new):
                     ('rate_spec', rate_spec),
                     ('split_kernels', split_kernels),
                     ('conp', iconp),
+                    ('temperature_binning', ibinning),
+                    ('cache_tiling', itiling),
+                    ('profile', iprofile),
                     ('sparse', [stype]),
                     ('jac_type', [jtype]),
                     ('models', [imodels])] +
@@ -2,12 +2,25 @@
 import numpy as np
 cimport numpy as np
 from cpython cimport bool
+from libc.string cimport memcpy
 
 cdef extern from "read_initial_conditions.h":
     void read_initial_conditions (const char *filename, unsigned int NUM,
                          double *phi_host, double *param_host,
                          const char order);
 
+    ctypedef struct mapped_initial_conditions:
+        void* mapping
+        size_t size
+
+    mapped_initial_conditions map_initial_conditions(
+                         const char *filename, unsigned int NUM,
+                         double **phi_host, double **param_host,
+                         const char order, int zero_copy);
+
+    void unmap_initial_conditions(mapped_initial_conditions* ics,
+                                  double **phi_host, double **param_host);
+
 cdef char C_ord = 'C'
 cdef char F_ord = 'F'
 
@@ -20,4 +33,25 @@ def read_ics(const char* filename,
             bool C_order):
     read_initial_conditions(filename, NUM, &phi[0], &param[0],
                             C_ord if C_order else F_ord)
-    return None
\ No newline at end of file
+    return None
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def map_ics(const char* filename,
+            np.uint_t NUM,
+            np.ndarray[np.float64_t] phi,
+            np.ndarray[np.float64_t] param,
+            bool C_order,
+            bool zero_copy):
+    cdef double* phi_ptr = &phi[0]
+    cdef double* param_ptr = &param[0]
+    cdef mapped_initial_conditions ics = map_initial_conditions(
+        filename, NUM, &phi_ptr, &param_ptr, C_ord if C_order else F_ord,
+        1 if zero_copy else 0)
+    # copy out of the mapped file, if used directly
+    if phi_ptr != &phi[0]:
+        memcpy(&phi[0], phi_ptr, phi.shape[0] * sizeof(double))
+    if param_ptr != &param[0]:
+        memcpy(&param[0], param_ptr, param.shape[0] * sizeof(double))
+    unmap_initial_conditions(&ics, &phi_ptr, &param_ptr)
+    return None
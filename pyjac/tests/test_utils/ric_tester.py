@@ -7,6 +7,7 @@
 home_dir = os.path.dirname(__file__)
 read_ics = importlib.import_module('py_readics')
 data = six.u(os.path.join(home_dir, 'data.bin')).encode('UTF-8')
+native = six.u(os.path.join(home_dir, 'native.bin')).encode('UTF-8')
 
 phi_test = np.fromfile(os.path.join(home_dir, 'phi_test.npy'))
 param_test = np.fromfile(os.path.join(home_dir, 'param_test.npy'))
@@ -15,15 +16,25 @@
 num = int(sys.argv[2])
 assert order in ['C', 'F']
 
-param_in = np.zeros_like(param_test)
-phi_in = np.zeros_like(phi_test)
 
-read_ics.read_ics(data, num, phi_in, param_in, order == 'C')
+def check(reader, filename, *args):
+    param_in = np.zeros_like(param_test)
+    phi_in = np.zeros_like(phi_test)
 
-# check extra variable
-allclear = np.allclose(param_in, param_test)
+    reader(filename, num, phi_in, param_in, order == 'C', *args)
 
-# and check
-allclear = allclear and np.allclose(phi_in, phi_test)
+    # check extra variable
+    allclear = np.allclose(param_in, param_test)
+
+    # and check
+    return allclear and np.allclose(phi_in, phi_test)
+
+
+allclear = check(read_ics.read_ics, data)
+# test the memory-mapped reader on both the sequential & native data layouts,
+# with and without use of the mapped file
+for filename in [data, native]:
+    for zero_copy in [False, True]:
+        allclear = allclear and check(read_ics.map_ics, filename, zero_copy)
 
 sys.exit(not allclear)
@@ -543,26 +543,31 @@ def get_parser():
                         "CPUs) or 'F' (column-major, recommended for GPUs)")
     parser.add_argument('-rs', '--rate_specialization',
                         type=str,
-                        default='hybrid',
+                        default=None,
                         choices=['fixed', 'hybrid', 'full'],
                         help="The level of specialization in evaluating reaction "
                         "rates. 'Full' is the full form suggested by Lu et al. "
                         "(citation) 'Hybrid' turns off specializations in the "
                         "exponential term (Ta = 0, b = 0) 'Fixed' is a fixed"
-                        " expression exp(logA + b logT + Ta / T)")
+                        " expression exp(logA + b logT + Ta / T).  If not "
+                        "specified, the value in the code-generation platform "
+                        "file, or 'hybrid' is used.")
     parser.add_argument('-rk', '--split_rate_kernels',
                         type=bool,
-                        default=True,
+                        default=None,
                         help="If True, and the :param`rate_specialization` is not "
                         "'Fixed', split different rate evaluation types into "
-                        "different kernels")
+                        "different kernels.  If not specified, the value in the "
+                        "code-generation platform file, or True is used.")
     parser.add_argument('-rn', '--split_rop_net_kernels',
                         type=bool,
-                        default=False,
+                        default=None,
                         help="If True, break evaluation of different rate of "
                         "progress values (fwd / back / pdep) into different "
                         "kernels. Note that for a deep vectorization this will "
-                        "introduce additional synchronization requirements.")
+                        "introduce additional synchronization requirements.  If "
+                        "not specified, the value in the code-generation "
+                        "platform file, or False is used.")
     parser.add_argument('-conv', '--constant_volume',
                         required=False,
                         dest='conp',
@@ -626,6 +631,141 @@ def get_parser():
                              'limiting memory usage during runtime. '
                              'The keys of this file are the members of '
                              ':class:`pyjac.kernel_utils.memory_manager.mem_type`')
+    parser.add_argument('-cd', '--cache_dir',
+                        required=False,
+                        type=str,
+                        default=None,
+                        help='The directory of the persistent generated source '
+                             'cache.  If not specified, the value of the '
+                             'PYJAC_CACHE_DIR environment variable, or '
+                             '~/.cache/pyjac will be used.  The cache is limited '
+                             'to the value of the PYJAC_CACHE_SIZE environment '
+                             'variable (in bytes, 1 GiB by default), with the '
+                             'least-recently used entries evicted first.')
+    parser.add_argument('-nc', '--no_cache',
+                        required=False,
+                        default=False,
+                        action='store_true',
+                        help='If supplied, bypass the generated source cache and '
+                             'always regenerate the source code from scratch.')
+    parser.add_argument('-j', '--jobs',
+                        required=False,
+                        type=int,
+                        default=1,
+                        help='The number of processes to use for constructing the '
+                             'loopy kernels.  The generated source is identical '
+                             'regardless of the number of jobs.')
+    parser.add_argument('-sr', '--output_species_rates',
+                        required=False,
+                        default=False,
+                        action='store_true',
+                        help='If supplied, the generated Jacobian kernel will also '
+                             'output the species rates, sharing all intermediate '
+                             'quantities (rate constants, thermodynamic properties, '
+                             'etc.) between the two.')
+    parser.add_argument('-jv', '--jac_vec',
+                        required=False,
+                        default=False,
+                        action='store_true',
+                        help='If supplied, the generated Jacobian kernel will take '
+                             'an additional input vector, and output the product '
+                             'of the Jacobian with this vector (e.g., for use in '
+                             'Krylov subspace solvers) rather than the Jacobian '
+                             'itself.')
+    parser.add_argument('-lu', '--jac_lu',
+                        required=False,
+                        default=False,
+                        action='store_true',
+                        help='If supplied, the generated Jacobian kernel will take '
+                             'additional inputs gamma and rhs, and output the '
+                             'sparse LU-factorization of the implicit integrator '
+                             'iteration matrix (I - gamma * J), as well as the '
+                             'solution of the corresponding linear system, rather '
+                             'than the Jacobian itself.')
+    parser.add_argument('-st', '--sort_type',
+                        required=False,
+                        default=None,
+                        choices=['rcm'],
+                        help='If supplied, reorder the species and reactions of '
+                             'the mechanism to improve the memory locality of the '
+                             'generated kernels.  "rcm" applies a reverse '
+                             'Cuthill-McKee ordering to the species.  The '
+                             'kernel inputs / outputs remain in the original '
+                             'order, and the resulting permutation is written to '
+                             'the build path.')
+    parser.add_argument('-fdc', '--fd_coloring',
+                        required=False,
+                        default=False,
+                        action='store_true',
+                        help='If supplied, and the Jacobian type is '
+                             'finite_difference, perturb structurally orthogonal '
+                             'columns of the Jacobian simultaneously.  This reduces '
+                             'the number of species rates evaluations from the '
+                             'number of columns of the Jacobian to the number of '
+                             'colors in a coloring of the sparsity pattern.')
+    parser.add_argument('-kc', '--kc_polynomials',
+                        required=False,
+                        default=False,
+                        action='store_true',
+                        help='If supplied, evaluate the equilibrium constants of '
+                             'reversible reactions from per-reaction polynomials '
+                             'computed during code-generation, rather than from '
+                             'the Gibbs polynomials of each species in the '
+                             'reaction.')
+    parser.add_argument('-tb', '--temperature_binning',
+                        required=False,
+                        default=False,
+                        action='store_true',
+                        help='If supplied, the generated calling program '
+                             'partitions the thermochemical states into those '
+                             'below and above the temperature breakpoint of the '
+                             'NASA polynomials before execution, such that '
+                             'vectorized evaluations do not diverge.')
+    parser.add_argument('-db', '--double_buffer',
+                        required=False,
+                        default=None,
+                        action='store_true',
+                        help='If supplied, the generated OpenCL calling program '
+                             'uses a pair of device buffers for the input / output '
+                             'arrays, such that the memory transfers of the next '
+                             'chunk of states overlap with kernel execution.  '
+                             'Only used for OpenCL.')
+    parser.add_argument('-ar', '--arena',
+                        required=False,
+                        default=False,
+                        action='store_true',
+                        help='If supplied, the generated calling program allocates '
+                             'its working buffers in a single arena, in which '
+                             'intermediate arrays that are never live at the same '
+                             'time share space.  Currently only supported for C.')
+    parser.add_argument('-ct', '--cache_tile',
+                        required=False,
+                        default=None,
+                        nargs='?',
+                        const='auto',
+                        help='If supplied, limit the number of states each OpenMP '
+                             'thread evaluates per kernel call, such that its '
+                             'working buffers remain resident in cache.  If no '
+                             'value (or "auto") is given, the number of states is '
+                             'chosen based on the cache topology of the host, '
+                             'otherwise the given number of states per thread is '
+                             'used.  Only used for C.')
+    parser.add_argument('-prof', '--profile',
+                        required=False,
+                        default=False,
+                        action='store_true',
+                        help='If supplied, the generated code times the execution '
+                             'of each sub-kernel (C) or the kernel (OpenCL), and '
+                             'the calling program writes the timings to '
+                             '"[kernel]_profile.csv" after execution.')
+    parser.add_argument('-pre', '--prefix',
+                        required=False,
+                        type=str,
+                        default='',
+                        help='If supplied, prepend this prefix to every exported '
+                             'symbol and include guard of the generated code, '
+                             'such that the code generated for multiple '
+                             'mechanisms may be linked into the same program.')
 
     args = parser.parse_args()
     return args
@@ -634,6 +774,17 @@ def get_parser():
 def create():
     args = get_parser()
     from .core.create_jacobian import create_jacobian
+    from .core.generation_cache import default_cache_dir
+    from .loopy_utils.loopy_utils import load_kernel_options
+    cache_dir = None
+    if not args.no_cache:
+        cache_dir = args.cache_dir if args.cache_dir else default_cache_dir()
+    rate_specialization = args.rate_specialization
+    if rate_specialization is None and not (
+            args.platform and os.path.isfile(args.platform) and
+            'rate_specialization' in load_kernel_options(args.platform)):
+        # the command-line default
+        rate_specialization = 'hybrid'
     create_jacobian(lang=args.lang,
                     mech_name=args.input,
                     therm_name=args.thermo,
@@ -646,7 +797,7 @@ def create():
                     skip_jac=args.skip_jac,
                     platform=args.platform,
                     data_order=args.data_order,
-                    rate_specialization=args.rate_specialization,
+                    rate_specialization=rate_specialization,
                     split_rate_kernels=args.split_rate_kernels,
                     split_rop_net_kernels=args.split_rop_net_kernels,
                     conp=args.conp,
@@ -654,5 +805,19 @@ def create():
                     jac_type=args.jac_type,
                     jac_format=args.jac_format,
                     mem_limits=args.memory_limits,
-                    fixed_size=args.fixed_size
+                    fixed_size=args.fixed_size,
+                    cache_dir=cache_dir,
+                    jobs=args.jobs,
+                    output_species_rates=args.output_species_rates,
+                    sort_type=args.sort_type,
+                    fd_coloring=args.fd_coloring,
+                    kc_polynomials=args.kc_polynomials,
+                    temperature_binning=args.temperature_binning,
+                    jac_vec=args.jac_vec,
+                    jac_lu=args.jac_lu,
+                    double_buffer=args.double_buffer,
+                    arena=args.arena,
+                    cache_tile=args.cache_tile,
+                    profile=args.profile,
+                    prefix=args.prefix
                     )